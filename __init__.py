@@ -41,27 +41,92 @@ import bpy
 
 if __package__ is None or __package__ == "":
     # When running as a standalone script from Blender Text View "Run Script"
+    import logmixalot
+    import importcachemixalot
     import commonmixalot
     import motionmixalot
     import fcurvesmixalot
     import actormixalot
+    import meshoptmixalot
+    import skeletonmixalot
+    import lodmixalot
+    import variantmixalot
+    import featuredbmixalot
+    import clipstoremixalot
+    import apimixalot
+    import profilemixalot
 else:
     # When running as an installed AddOn, then it runs in package mode.
+    from . import logmixalot
+    from . import importcachemixalot
     from . import commonmixalot
     from . import motionmixalot
     from . import fcurvesmixalot
     from . import actormixalot
+    from . import meshoptmixalot
+    from . import skeletonmixalot
+    from . import lodmixalot
+    from . import variantmixalot
+    from . import featuredbmixalot
+    from . import clipstoremixalot
+    from . import apimixalot
+    from . import profilemixalot
 
 if "bpy" in locals():
     from importlib import reload
+    if "logmixalot" in locals():
+        reload(logmixalot)
+    if "importcachemixalot" in locals():
+        reload(importcachemixalot)
     if "commonmixalot" in locals():
         reload(commonmixalot)
     if "motionmixalot" in locals():
         reload(motionmixalot)
     if "fcurvesmixalot" in locals():
         reload(fcurvesmixalot)
+    if "meshoptmixalot" in locals():
+        reload(meshoptmixalot)
     if "actormixalot" in locals():
         reload(actormixalot)
+    if "skeletonmixalot" in locals():
+        reload(skeletonmixalot)
+    if "lodmixalot" in locals():
+        reload(lodmixalot)
+    if "variantmixalot" in locals():
+        reload(variantmixalot)
+    if "featuredbmixalot" in locals():
+        reload(featuredbmixalot)
+    if "clipstoremixalot" in locals():
+        reload(clipstoremixalot)
+    if "apimixalot" in locals():
+        reload(apimixalot)
+    if "profilemixalot" in locals():
+        reload(profilemixalot)
+
+
+def _MakePipeline(operator: bpy.types.Operator, context: bpy.types.Context) -> apimixalot.Pipeline:
+    """
+    Returns a Pipeline with the options of the UI, that reports each step through @operator.
+    """
+    options = apimixalot.PipelineOptions.FromPropertyGroup(context.scene.mixalot)
+    return apimixalot.Pipeline(context.scene, options,
+        statusCallback=lambda status: operator.report({'INFO'}, "Step Done: " + str(status)))
+
+
+def _GetTargetArmatures(context: bpy.types.Context) -> list[bpy.types.Object]:
+    """
+    Returns the Armatures selected by the "armatureScope" option. The active
+    Armature goes first.
+    """
+    scope = context.scene.mixalot.armatureScope
+    activeObj = context.object
+    if scope == 'ACTIVE':
+        armatureObjs = []
+    else:
+        armatureObjs = commonmixalot.GetArmatures(context.scene, selectedOnly=(scope == 'SELECTED'))
+    if (activeObj is not None) and (activeObj.type == 'ARMATURE'):
+        armatureObjs = [activeObj] + [obj for obj in armatureObjs if obj != activeObj]
+    return armatureObjs
 
 
 # A MessageBox utility:
@@ -75,6 +140,23 @@ def _ShowMessageBox(message: str, title: str = "Lumbermixalot Info", icon = 'INF
 ###############################################################################
 # Scene Properties
 ###############################################################################
+def _OnLogLevelChanged(self, context):
+    logmixalot.SetLevel(self.logLevel)
+
+
+def _OnQuietConsoleChanged(self, context):
+    logmixalot.SetQuietMode(self.quietConsole)
+
+
+def _OnProfileRnaAccessChanged(self, context):
+    if self.profileRnaAccess:
+        profilemixalot.StartProfiling()
+        return
+    profiler = profilemixalot.StopProfiling()
+    if profiler is not None:
+        profiler.LogReport()
+
+
 class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
     """Container of options for Mixamo To O3DE Converter"""
     importedFbxFilename: bpy.props.StringProperty(
@@ -90,6 +172,23 @@ class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
         default = "",
         subtype='BYTE_STRING')
 
+    useImportCache: bpy.props.BoolProperty(
+        name="Use Import Cache",
+        description="If enabled, imported FBX files are cached as .blend files. Importing the same "
+            "FBX content again loads the .blend file, which is much faster",
+        default = False)
+    importCachePath: bpy.props.StringProperty(
+        name="Cache dir",
+        description="Directory of the import cache. Will be created if it doesn't exist.",
+        maxlen = 1024,
+        default = importcachemixalot.DEFAULT_CACHE_DIRECTORY,
+        subtype='DIR_PATH')
+    importCacheMaxMB: bpy.props.IntProperty(
+        name="Max Cache Size (MB)",
+        description="The least recently used files are removed when the cache grows beyond this size",
+        min=1,
+        default=2048)
+
     removeUVMaps: bpy.props.BoolProperty(
         name="Remove UV Maps",
         description="Remove unnecessary UV Maps. O3DE fails to import an actor with too many UV Maps.",
@@ -102,6 +201,78 @@ class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
         default=2
     )
 
+    mergeMeshes: bpy.props.BoolProperty(
+        name="Merge Skinned Meshes",
+        description="Joins all the meshes skinned to the Armature into a single mesh. Each mesh is a separate draw call in O3DE.",
+        default = False)
+    consolidateMaterials: bpy.props.BoolProperty(
+        name="Consolidate Materials",
+        description="Replaces materials with identical settings by a single material.",
+        default = False)
+    atlasTextures: bpy.props.BoolProperty(
+        name="Pack Textures In Atlas",
+        description="Packs the texture of each material into a single texture atlas and remaps the UVs. "
+            "Only materials with a single color texture and UVs in the [0, 1] range are packed.",
+        default = False)
+    atlasMaxSize: bpy.props.IntProperty(
+        name="Max Atlas Size",
+        description="Maximum width and height, in pixels, of the texture atlas",
+        min=256,
+        max=16384,
+        default=4096
+    )
+
+    optimizeVertexCache: bpy.props.BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorders the triangles and vertices of each mesh for better GPU vertex cache and vertex fetch locality.",
+        default = False)
+    vertexCacheSize: bpy.props.IntProperty(
+        name="Cache Size",
+        description="Size of the post transform vertex cache to optimize for",
+        min=4,
+        max=64,
+        default=32
+    )
+
+    pruneBonesByPattern: bpy.props.BoolProperty(
+        name="Prune Bones By Name",
+        description="Removes the bones that match the name patterns, together with all their children.",
+        default = True)
+    pruneBonePatterns: bpy.props.StringProperty(
+        name="Patterns",
+        description="Comma separated list of bone name patterns. Supports '*' and '?' wildcards.",
+        maxlen = 1024,
+        default = skeletonmixalot.DEFAULT_PRUNE_PATTERNS)
+    pruneStaticBones: bpy.props.BoolProperty(
+        name="Prune Bones Without Motion",
+        description="Removes the bones that never move away from their rest pose in any of the animations.",
+        default = False)
+    pruneMotionTolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Maximum deviation from the rest pose for a bone to be considered without motion",
+        min=0.0,
+        default=0.001,
+        precision=4)
+
+    featureDbClipsPath: bpy.props.StringProperty(
+        name="Clips dir",
+        description="Directory with the converted motion FBX files (root motion already extracted)",
+        maxlen = 1024,
+        default = "",
+        subtype='DIR_PATH')
+
+    featureDbOutputFile: bpy.props.StringProperty(
+        name="Database file",
+        description="Output motion matching feature database file",
+        maxlen = 1024,
+        default = "",
+        subtype='FILE_PATH')
+
+    featureDbFootBones: bpy.props.StringProperty(
+        name="Foot bones",
+        description="Comma separated fnmatch style patterns of the foot bones",
+        default = featuredbmixalot.DEFAULT_FOOT_BONE_PATTERNS)
+
     extractTranslationX: bpy.props.BoolProperty(
         name="X axis (X Right)",
         description="Extract X Axis Translation from Hip bone to the Armature tranform.",
@@ -120,6 +291,55 @@ class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
         description="Extract Rotation around Z Axis from Hip bone to the Armature tranform.",
         default = False)
 
+    retimeFps: bpy.props.IntProperty(
+        name="Retime To FPS",
+        description="If greater than 0, the animation is resampled to this frame rate before extracting "
+            "the root motion. Use the frame rate of the O3DE project",
+        min=0,
+        max=240,
+        default=0)
+
+    keyFrameInterpolation: bpy.props.EnumProperty(
+        name="Interpolation",
+        description="Interpolation of all the key frames. Mixamo animations have one key frame per frame, "
+            "Linear or Constant interpolation make the extraction and the FBX export faster",
+        items=[
+            ('KEEP', "Keep", "Keep the interpolation of the imported key frames"),
+            ('LINEAR', "Linear", "Straight lines between key frames"),
+            ('CONSTANT', "Constant", "No interpolation, the value of each key frame is held until the next one"),
+        ],
+        default='KEEP')
+
+    streamingChunkSize: bpy.props.IntProperty(
+        name="Streaming Chunk Size",
+        description="If greater than 0, very long clips are processed in windows of this many key frames, "
+            "this way memory usage doesn't grow with the length of the clip. CSV files are not generated in this mode",
+        min=0,
+        default=0)
+
+    frameRanges: bpy.props.StringProperty(
+        name="Frame Ranges",
+        description="OPTIONAL. Comma separated list of frame ranges, Example: '1-120, 150-300'. "
+            "If not empty, only these frames are processed, and one FBX file is exported per range. "
+            "If the animation is retimed, frame numbers refer to the retimed animation",
+        default="")
+
+    trimToFrameRange: bpy.props.BoolProperty(
+        name="Trim To Frame Range",
+        description="If there's exactly one frame range, all the key frames outside of it are removed from the animation",
+        default=False)
+
+    armatureScope: bpy.props.EnumProperty(
+        name="Armatures",
+        description="Armatures processed by root motion extraction, post processing and export",
+        items=[
+            ('ACTIVE', "Active", "Only the active Armature"),
+            ('SELECTED', "Selected", "All the selected Armatures, in one pass"),
+            ('SCENE', "All In Scene", "All the Armatures in the scene, in one pass. "
+                "When exporting, each Armature goes to its own FBX file"),
+        ],
+        default='ACTIVE')
+
     debugDumpCSVs: bpy.props.BoolProperty(
         name="Generate CSV files?",
         description="OPTIONAL. For Developers. If True, dumps motion vector "
@@ -139,19 +359,82 @@ class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
         description="Sets Translation.Z to 0.0 across all animation frames for the Armature transform.",
         default = False)
     
+    rotateAroundZAxis: bpy.props.BoolProperty(
+        name="Rotate around Z Axis",
+        description="If enabled, the combined post processing also rotates the whole Root Motion animation "
+            "by the Degrees around Z Axis of the Rotate box. Leave it disabled if the clip was already rotated.",
+        default = False)
     degreesAroundZAxis: bpy.props.FloatProperty(
         name="",
         description="Angle in Degrees around Z Axis to rotate the whole Root Motion animation.",
         default = -90.0)
 
+    spinDegreesPerSecond: bpy.props.FloatProperty(
+        name="Spin (Degrees/s)",
+        description="Adds a rotation around Z Axis that increases linearly with time to the Root Motion orientation.",
+        default = 0.0)
+
+    rootMotionScale: bpy.props.FloatProperty(
+        name="Scale",
+        description="Scales the Root Motion translation.",
+        min=0.0,
+        default = 1.0)
+
+    rootMotionOffset: bpy.props.FloatVectorProperty(
+        name="Offset",
+        description="Added to the Root Motion translation of all key frames.",
+        size=3,
+        subtype='TRANSLATION',
+        default=(0.0, 0.0, 0.0))
+
     cacheFbxExportOptions: bpy.props.BoolProperty(
         name="Cache FBX Export Options",
         description="If enabled, a json file will be created in the directory where the current scene was imported from.",
         default = True)
+    exportFormat: bpy.props.EnumProperty(
+        name="Format",
+        description="File format of the exported Actors and Motions",
+        items=[
+            (commonmixalot.EXPORT_FORMAT_FBX, "FBX", "Autodesk FBX"),
+            (commonmixalot.EXPORT_FORMAT_GLB, "glTF Binary", "Binary glTF (.glb), textures are embedded"),
+            (commonmixalot.EXPORT_FORMAT_BOTH, "Both", "Exports FBX and glTF Binary, and logs the time and size of each"),
+        ],
+        default=commonmixalot.EXPORT_FORMAT_FBX)
+    exportProfile: bpy.props.EnumProperty(
+        name="Profile",
+        description="Exporter settings tuned for the kind of file being exported",
+        items=[
+            (commonmixalot.EXPORT_PROFILE_DEFAULT, "Default", "The whole scene with the default exporter settings"),
+            (commonmixalot.EXPORT_PROFILE_AUTO, "Auto", "Actor if the Armature has skinned meshes, Motion otherwise"),
+            (commonmixalot.EXPORT_PROFILE_ACTOR, "Actor", "Meshes and skeleton, no animation, no leaf bones"),
+            (commonmixalot.EXPORT_PROFILE_MOTION, "Motion", "Deform bones and the animation only. "
+                "No meshes, no leaf bones and no key frame simplification"),
+        ],
+        default=commonmixalot.EXPORT_PROFILE_DEFAULT)
     unpackTextures: bpy.props.BoolProperty(
         name="Unpack Textures",
         description="If enabled, all textures found inside the imported FBX will be unpacked into the output directory. This is helpful to define the material",
         default = True)
+    exportRootMotionMetadata: bpy.props.BoolProperty(
+        name="Export Root Motion Metadata",
+        description="If enabled, a <name>_rootmotion.json file is written next to each exported FBX with the "
+            "displacement, speeds, turn angle, start/end transforms and a downsampled trajectory of the root motion",
+        default = False)
+    persistClipStore: bpy.props.BoolProperty(
+        name="Save To Clip Store",
+        description="If enabled, the exported action is also saved in the clip store, a directory of memory mappable "
+            "files with the location and rotation tracks of every bone. Clips can be loaded back without importing FBX files",
+        default = False)
+    clipStorePath: bpy.props.StringProperty(
+        name="Clip store dir",
+        description="Directory of the clip store. Will be created if it doesn't exist.",
+        maxlen = 1024,
+        default = "",
+        subtype='DIR_PATH')
+    clipStoreClipName: bpy.props.StringProperty(
+        name="Clip name",
+        description="Name of the clip to load from the clip store",
+        default = "")
     fbxFilename: bpy.props.StringProperty(
         name="Fbx name",
         description="Optional. Name of the output fbx (no path). Leave it"
@@ -167,6 +450,75 @@ class LumbermixalotPropertyGroup(bpy.types.PropertyGroup):
         default = "",
         subtype='DIR_PATH')
 
+    exportMotionLods: bpy.props.BoolProperty(
+        name="Export Motion LODs",
+        description="Also exports cheaper variants of the motion, armature only, with less bones and a lower sample rate, "
+            "named <Fbx name>_lod<N>.fbx",
+        default = False)
+    motionLod1Fps: bpy.props.FloatProperty(
+        name="LOD 1 FPS",
+        description="Sample rate of the LOD 1 motion",
+        min=1.0,
+        default=15.0)
+    motionLod1ExcludedBones: bpy.props.StringProperty(
+        name="LOD 1 Excluded Bones",
+        description="Comma separated list of bone name patterns that are not animated in LOD 1. "
+            "Children of matching bones are excluded too.",
+        maxlen = 1024,
+        default = skeletonmixalot.DEFAULT_PRUNE_PATTERNS)
+    exportMotionLod2: bpy.props.BoolProperty(
+        name="Export LOD 2",
+        description="Also exports a LOD 2 motion",
+        default = False)
+    motionLod2Fps: bpy.props.FloatProperty(
+        name="LOD 2 FPS",
+        description="Sample rate of the LOD 2 motion",
+        min=1.0,
+        default=10.0)
+    motionLod2ExcludedBones: bpy.props.StringProperty(
+        name="LOD 2 Excluded Bones",
+        description="Comma separated list of bone name patterns that are not animated in LOD 2. "
+            "Children of matching bones are excluded too.",
+        maxlen = 1024,
+        default = skeletonmixalot.DEFAULT_PRUNE_PATTERNS + ", *ToeBase")
+
+    exportClipVariants: bpy.props.BoolProperty(
+        name="Export Clip Variants",
+        description="Also exports mirrored, retimed and turning variants of the motion, "
+            "named <Fbx name>_<variant>.fbx",
+        default = False)
+    clipVariants: bpy.props.StringProperty(
+        name="Clip Variants",
+        description="Comma separated list of variants. Each variant is one or more of 'mirror', "
+            "'speed:<factor>' and 'turn:<degrees per second>' joined with '+'. "
+            "Example: mirror, speed:1.5, mirror+turn:-45",
+        maxlen = 1024,
+        default = "mirror")
+
+    logLevel: bpy.props.EnumProperty(
+        name="Log Level",
+        description="Messages below this level are discarded",
+        items=[(levelName, levelName.capitalize(), "") for levelName in logmixalot.LEVEL_NAMES],
+        default="INFO",
+        update=_OnLogLevelChanged)
+    quietConsole: bpy.props.BoolProperty(
+        name="Quiet Console",
+        description="Only print warnings and errors to the system console. "
+            "All the messages are still shown in the Log panel",
+        default = False,
+        update=_OnQuietConsoleChanged)
+    logLineCount: bpy.props.IntProperty(
+        name="Lines",
+        description="Number of recent log messages shown in the Log panel",
+        min=1,
+        max=100,
+        default=10)
+    profileRnaAccess: bpy.props.BoolProperty(
+        name="Profile RNA Access",
+        description="Counts and times the key frame, fcurve, bpy.ops and frame_set calls of each step. "
+            "Slows down all the steps. The report is logged when disabled",
+        default = False,
+        update=_OnProfileRnaAccessChanged)
 
 
 ###############################################################################
@@ -190,7 +542,7 @@ class ImportFbxOperator(bpy.types.Operator):
         mixalot.importedFbxFilename = self.filename.encode('utf-8')
         mixalot.importedFbxDirectoryPath = self.directory.encode('utf-8')
         try:
-            commonmixalot.ImportFBX(self.filepath)
+            _MakePipeline(self, context).Import(self.filepath, clearScene=False, requireArmature=False)
         except Exception as e:
             self.report({'ERROR'}, f"Error: Failed to import FBX: '{self.filepath}': {e}")
             return{'CANCELLED'}
@@ -222,11 +574,8 @@ class ActorConvertOperator(bpy.types.Operator):
     armatureObj: bpy.types.Armature
 
     def execute(self, context):
-        mixalot = context.scene.mixalot
-        conversion_iterator = actormixalot.Convert(self.armatureObj, mixalot.countOfUVMapsToKeep)
         try:
-            for status in conversion_iterator:
-                self.report({'INFO'}, "Step Done: " + str(status))
+            _MakePipeline(self, context).ConvertActor(self.armatureObj)
         except Exception as e:
             self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
             return{'CANCELLED'}
@@ -252,36 +601,22 @@ class ActorConvertOperator(bpy.types.Operator):
         return self.execute(context)
 
 
-class RootMotionExtractionOperator(bpy.types.Operator):
-    """This operator runs the main root motion extraction algorithm."""
-    bl_idname = "lumbermixalot.extract_root_motion"
-    bl_label = "Extract Root Motion"
-    bl_description = "Extract root motion animation data from the Hip bone to the Armature transform."
+class PruneSkeletonOperator(bpy.types.Operator):
+    """Removes unnecessary bones, reassigns their skin weights and deletes their fcurves"""
+    bl_idname = "lumbermixalot.prune_skeleton"
+    bl_label = "Prune Skeleton"
+    bl_description = "Removes unnecessary bones, reassigns their skin weights to the nearest kept bone and deletes their animation data"
     #Custom properties
     armatureObj: bpy.types.Armature
-    hipBoneName: str
 
     def execute(self, context):
-        mixalot = context.scene.mixalot
-
-        conversion_iterator = motionmixalot.ExtractRootMotion(
-            sceneObj=context.scene,
-            armatureObj=self.armatureObj,
-            hipBoneName=self.hipBoneName,
-            extractTranslationX=mixalot.extractTranslationX,
-            extractTranslationY=mixalot.extractTranslationY,
-            extractTranslationZ=mixalot.extractTranslationZ,
-            extractRotationZ=mixalot.extractRotationZ,
-            dumpCSVs=mixalot.debugDumpCSVs)
-
         try:
-            for status in conversion_iterator:
-                self.report({'INFO'}, "Step Done: " + str(status))
+            _MakePipeline(self, context).PruneSkeleton(self.armatureObj)
         except Exception as e:
             self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
             return{'CANCELLED'}
-        self.report({'INFO'}, "Root Motion Extraction Completed")
-        _ShowMessageBox("Root Motion Extraction Completed")
+        self.report({'INFO'}, "Skeleton Pruned Successfully")
+        _ShowMessageBox("Skeleton Pruned Successfully")
         return {'FINISHED'}
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
@@ -293,17 +628,114 @@ class RootMotionExtractionOperator(bpy.types.Operator):
             self.report({'ERROR_INVALID_INPUT'}, f"Error: '{context.object.name}' is not an Armature.")
             return {'CANCELLED'}
 
-        hip_bone = commonmixalot.GetRootBone(context.object)
-        if hip_bone is None:
-            self.report({'ERROR'}, "Error: The Armature must have at least one bone.")
+        mixalot = context.scene.mixalot
+        if (not mixalot.pruneBonesByPattern) and (not mixalot.pruneStaticBones):
+            self.report({'ERROR_INVALID_INPUT'}, "No pruning criteria has been selected.")
             return {'CANCELLED'}
-        
+
         self.armatureObj = context.object
-        self.hipBoneName = hip_bone.name
+        return self.execute(context)
+
+
+class BuildFeatureDatabaseOperator(bpy.types.Operator):
+    """Builds the motion matching feature database from a directory of converted clips"""
+    bl_idname = "lumbermixalot.build_feature_database"
+    bl_label = "Build Feature Database"
+    bl_description = ("Imports each converted FBX clip, extracts its motion matching features and writes "
+        "the memory mappable feature database. All objects in the scene are removed")
+
+    def execute(self, context):
+        mixalot = context.scene.mixalot
+        clipsPath = bpy.path.abspath(mixalot.featureDbClipsPath)
+        outputFile = bpy.path.abspath(mixalot.featureDbOutputFile)
+        try:
+            conversion_iterator = featuredbmixalot.BuildFeatureDatabaseFromFbxFiles(context.scene,
+                featuredbmixalot.FindFbxFiles(clipsPath), outputFile,
+                footBonePatterns=skeletonmixalot.ParseBonePatterns(mixalot.featureDbFootBones))
+            for status in conversion_iterator:
+                self.report({'INFO'}, "Step Done: " + str(status))
+        except Exception as e:
+            self.report({'ERROR'}, 'Error: ' + str(e))
+            return{'CANCELLED'}
+        self.report({'OPERATOR'}, f"Feature database written to '{outputFile}'")
+        _ShowMessageBox(f"Feature database written to '{outputFile}'")
+        return {'FINISHED'}
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        mixalot = context.scene.mixalot
+        if mixalot.featureDbClipsPath.strip() == "":
+            self.report({'ERROR_INVALID_INPUT'}, "Error: A directory with FBX clips is necessary.")
+            return {'CANCELLED'}
+        if mixalot.featureDbOutputFile.strip() == "":
+            self.report({'ERROR_INVALID_INPUT'}, "Error: An output file is necessary.")
+            return {'CANCELLED'}
+        return self.execute(context)
+
+
+class RootMotionExtractionOperator(bpy.types.Operator):
+    """This operator runs the main root motion extraction algorithm."""
+    bl_idname = "lumbermixalot.extract_root_motion"
+    bl_label = "Extract Root Motion"
+    bl_description = "Extract root motion animation data from the Hip bone to the Armature transform."
+    #Custom properties
+    armatureObjs: list
+
+    def execute(self, context):
+        try:
+            _MakePipeline(self, context).ExtractRootMotionFromArmatures(self.armatureObjs)
+        except Exception as e:
+            self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
+            return{'CANCELLED'}
+        self.report({'INFO'}, f"Root Motion Extraction Completed for {len(self.armatureObjs)} Armatures")
+        _ShowMessageBox(f"Root Motion Extraction Completed for {len(self.armatureObjs)} Armatures")
+        return {'FINISHED'}
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        armatureObjs = _GetTargetArmatures(context)
+        if len(armatureObjs) < 1:
+            self.report({'ERROR_INVALID_INPUT'}, "Error: no Armature selected. Please select the Armature object.")
+            return {'CANCELLED'}
+
+        for armatureObj in armatureObjs:
+            if commonmixalot.GetRootBone(armatureObj) is None:
+                self.report({'ERROR'}, f"Error: The Armature '{armatureObj.name}' must have at least one bone.")
+                return {'CANCELLED'}
+
+        self.armatureObjs = armatureObjs
         return self.execute(context)
         
 
 
+class RootMotionRevertOperator(bpy.types.Operator):
+    """Restores the original hip bone animation, saved by the first root motion extraction."""
+    bl_idname = "lumbermixalot.revert_root_motion"
+    bl_label = "Revert Root Motion"
+    bl_description = ("Restores the original Hip bone animation and removes the root motion of the Armature. "
+        "No need to import the FBX file again")
+    #Custom properties
+    armatureObjs: list
+
+    def execute(self, context):
+        try:
+            pipeline = _MakePipeline(self, context)
+            for armatureObj in self.armatureObjs:
+                pipeline.RevertRootMotion(armatureObj)
+        except Exception as e:
+            self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
+            return{'CANCELLED'}
+        self.report({'INFO'}, f"Reverted the Root Motion of {len(self.armatureObjs)} Armatures")
+        return {'FINISHED'}
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        armatureObjs = _GetTargetArmatures(context)
+        if len(armatureObjs) < 1:
+            self.report({'ERROR_INVALID_INPUT'}, "Error: no Armature selected. Please select the Armature object.")
+            return {'CANCELLED'}
+
+        self.armatureObjs = armatureObjs
+        return self.execute(context)
+
+
 class RootMotionClearAnimationDataOperator(bpy.types.Operator):
     """This operator is used to clear the desired vector components from the root motion."""
     bl_idname = "lumbermixalot.clear_root_motion_translation"
@@ -316,15 +748,10 @@ class RootMotionClearAnimationDataOperator(bpy.types.Operator):
         mixalot = context.scene.mixalot
 
         if mixalot.zeroOutTranslationX or mixalot.zeroOutTranslationY or mixalot.zeroOutTranslationZ:
-            conversion_iterator = motionmixalot.ClearRootMotionTranslation(
-                armatureObj=self.armatureObj,
-                zeroOutTranslationX=mixalot.zeroOutTranslationX,
-                zeroOutTranslationY=mixalot.zeroOutTranslationY,
-                zeroOutTranslationZ=mixalot.zeroOutTranslationZ)
-
+            zeroAxesOp = motionmixalot.ZeroAxesOp(mixalot.zeroOutTranslationX,
+                mixalot.zeroOutTranslationY, mixalot.zeroOutTranslationZ)
             try:
-                for status in conversion_iterator:
-                    self.report({'INFO'}, "Step Done: " + str(status))
+                _MakePipeline(self, context).PostProcess(self.armatureObj, [zeroAxesOp])
             except Exception as e:
                 self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
                 return{'CANCELLED'}
@@ -359,11 +786,9 @@ class RootMotionRotateAnimationOperator(bpy.types.Operator):
     degreesAroundZAxis: float
 
     def execute(self, context):
-        conversion_iterator = motionmixalot.RotateArmatureAnimationData(self.armatureObj,
-            commonmixalot.Axis.Z, math.radians(self.degreesAroundZAxis))
+        rotateOp = motionmixalot.RotateOp(commonmixalot.Axis.Z, math.radians(self.degreesAroundZAxis))
         try:
-            for status in conversion_iterator:
-                self.report({'INFO'}, "Step Done: " + str(status))
+            _MakePipeline(self, context).PostProcess(self.armatureObj, [rotateOp])
         except Exception as e:
             self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
             return{'CANCELLED'}
@@ -392,6 +817,38 @@ class RootMotionRotateAnimationOperator(bpy.types.Operator):
         return self.execute(context)
 
 
+class RootMotionPostProcessOperator(bpy.types.Operator):
+    """This operator applies all the root motion post processing options in a single pass."""
+    bl_idname = "lumbermixalot.apply_root_motion_post_processing"
+    bl_label = "Apply All Post Processing"
+    bl_description = ("Clears the selected axes, optionally rotates, spins, scales and offsets the Root Motion. "
+        "All the steps are composed and applied in one pass over the key frames.")
+    #Custom properties
+    armatureObjs: list
+
+    def execute(self, context):
+        try:
+            opCount = _MakePipeline(self, context).PostProcessArmatures(self.armatureObjs)
+        except Exception as e:
+            self.report({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
+            return{'CANCELLED'}
+        if opCount < 1:
+            self.report({'ERROR_INVALID_INPUT'}, "No post processing option has been selected.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Applied {opCount} post processing steps to the Root Motion of {len(self.armatureObjs)} Armatures")
+        _ShowMessageBox(f"Applied {opCount} post processing steps to the Root Motion of {len(self.armatureObjs)} Armatures")
+        return {'FINISHED'}
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        armatureObjs = _GetTargetArmatures(context)
+        if len(armatureObjs) < 1:
+            self.report({'ERROR_INVALID_INPUT'}, "Error: no Armature selected. Please select the Armature object.")
+            return {'CANCELLED'}
+
+        self.armatureObjs = armatureObjs
+        return self.execute(context)
+
+
 class ExportFbxOperator(bpy.types.Operator):
     """
     Button/Operator for export the current scene as FBX.
@@ -402,16 +859,18 @@ class ExportFbxOperator(bpy.types.Operator):
     bl_label = "Export FBX"
     bl_description = "Export current scene as FBX. Unpacks material textures (if enabled)"
     #Custom properties
+    armatureObjs: list
     fbxFilename: str
     fbxOutputPath: str
 
     def execute(self, context):
+        mixalot = context.scene.mixalot
         try:
-            out_filename = commonmixalot.ExportFBX(self.fbxFilename, self.fbxOutputPath, self.unpackTextures)
+            out_filenames = _MakePipeline(self, context).ExportArmatures(self.armatureObjs, self.fbxFilename, self.fbxOutputPath)
         except Exception as e:
             self.report({'ERROR'}, 'Error: ' + str(e))
             return{'CANCELLED'}
-        mixalot = context.scene.mixalot
+        out_filename = ", ".join(out_filenames)
         if mixalot.cacheFbxExportOptions:
             commonmixalot.StoreFbxExportProperty(mixalot.importedFbxDirectoryPath.decode('UTF-8'), "fbxOutputPath", mixalot.fbxOutputPath)
         self.report({'OPERATOR'}, f"Scene exported as FBX file: '{out_filename}'")
@@ -420,14 +879,11 @@ class ExportFbxOperator(bpy.types.Operator):
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
         mixalot = context.scene.mixalot
-        if context.object == None:
-            self.report({'ERROR_INVALID_INPUT'}, "Error: no object selected. Please select the Armature object.")
+        armatureObjs = _GetTargetArmatures(context)
+        if len(armatureObjs) < 1:
+            self.report({'ERROR_INVALID_INPUT'}, "Error: no Armature selected. Please select the Armature object.")
             return {'CANCELLED'}
 
-        if context.object.type != 'ARMATURE':
-            self.report({'ERROR_INVALID_INPUT'}, f"Error: active object '{context.object.name}' is not an Armature.")
-            return {'CANCELLED'}
-        
         fbxFilename = mixalot.fbxFilename.decode('UTF-8')
         fbxFilename = "" if (fbxFilename is None) else fbxFilename.strip()
         if fbxFilename == "":
@@ -440,15 +896,83 @@ class ExportFbxOperator(bpy.types.Operator):
             self.report({'ERROR'}, f"Error: An output directory is necessary")
             return {'CANCELLED'}
 
+        self.armatureObjs = armatureObjs
         self.fbxFilename = fbxFilename
         self.fbxOutputPath = fbxOutputPath
-        self.unpackTextures = mixalot.unpackTextures
         return self.execute(context)
 
 
 ###############################################################################
 # UI
 ###############################################################################
+class LoadClipFromStoreOperator(bpy.types.Operator):
+    """Loads a clip from the clip store into the selected Armature"""
+    bl_idname = "lumbermixalot.load_clip_from_store"
+    bl_label = "Load Clip"
+    bl_description = "Creates a new action from a clip of the clip store and assigns it to the selected Armature"
+    #Custom properties
+    armatureObj: bpy.types.Armature
+
+    def execute(self, context):
+        mixalot = context.scene.mixalot
+        store = clipstoremixalot.ClipStore(bpy.path.abspath(mixalot.clipStorePath))
+        try:
+            with store.OpenClip(mixalot.clipStoreClipName.strip()) as reader:
+                action = clipstoremixalot.ApplyClipToArmature(reader, self.armatureObj)
+                context.scene.frame_start = int(reader.GetFrames()[0])
+                context.scene.frame_end = int(reader.GetFrames()[-1])
+        except Exception as e:
+            self.report({'ERROR'}, 'Error: ' + str(e))
+            return{'CANCELLED'}
+        self.report({'OPERATOR'}, f"Loaded action '{action.name}' from the clip store")
+        return {'FINISHED'}
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        if context.object == None:
+            self.report({'ERROR_INVALID_INPUT'}, "Error: no object selected. Please select the Armature object.")
+            return {'CANCELLED'}
+
+        if context.object.type != 'ARMATURE':
+            self.report({'ERROR_INVALID_INPUT'}, f"Error: active object '{context.object.name}' is not an Armature.")
+            return {'CANCELLED'}
+
+        mixalot = context.scene.mixalot
+        if (mixalot.clipStorePath.strip() == "") or (mixalot.clipStoreClipName.strip() == ""):
+            self.report({'ERROR_INVALID_INPUT'}, "Error: The clip store directory and the clip name are necessary.")
+            return {'CANCELLED'}
+
+        self.armatureObj = context.object
+        return self.execute(context)
+
+
+class ClearLogOperator(bpy.types.Operator):
+    """Removes all the messages from the Log panel"""
+    bl_idname = "lumbermixalot.clear_log"
+    bl_label = "Clear Log"
+    bl_description = "Removes all the messages from the Log panel"
+
+    def execute(self, context):
+        logmixalot.ClearRecentMessages()
+        return {'FINISHED'}
+
+
+class LogRnaProfileOperator(bpy.types.Operator):
+    """Logs the RNA profile report collected so far and starts a new one"""
+    bl_idname = "lumbermixalot.log_rna_profile"
+    bl_label = "Log RNA Profile"
+    bl_description = "Logs the RNA profile report collected so far and starts a new one"
+
+    @classmethod
+    def poll(cls, context):
+        return profilemixalot.GetActiveProfiler() is not None
+
+    def execute(self, context):
+        profiler = profilemixalot.GetActiveProfiler()
+        profiler.LogReport()
+        profiler.Reset()
+        return {'FINISHED'}
+
+
 class LUMBERMIXALOT_VIEW_3D_PT_fbx_import(bpy.types.Panel):
     """Imports an FBX file that may contain Armature or Motions"""
     bl_label = "FBX Import options"
@@ -475,6 +999,14 @@ class LUMBERMIXALOT_VIEW_3D_PT_fbx_import(bpy.types.Panel):
         row.prop(scene.mixalot, "importedFbxDirectoryPath")
         row.enabled = False
 
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "useImportCache")
+        col = box.column()
+        col.enabled = scene.mixalot.useImportCache
+        col.prop(scene.mixalot, "importCachePath")
+        col.prop(scene.mixalot, "importCacheMaxMB")
+
 
 class LUMBERMIXALOT_VIEW_3D_PT_actor_processing(bpy.types.Panel):
     """Actor processing panel 3D_View"""
@@ -514,6 +1046,26 @@ class LUMBERMIXALOT_VIEW_3D_PT_actor_processing(bpy.types.Panel):
         col_label2 = row.column()
         col_label2.label(text=" UV Maps")
 
+        box = layout.box()
+        box.label(text="Draw Call Reduction")
+        row = box.row()
+        row.prop(scene.mixalot, "mergeMeshes")
+        row = box.row()
+        row.prop(scene.mixalot, "consolidateMaterials")
+        row = box.row()
+        row.prop(scene.mixalot, "atlasTextures")
+        row = box.row()
+        row.prop(scene.mixalot, "atlasMaxSize")
+        row.enabled = scene.mixalot.atlasTextures
+
+        box = layout.box()
+        box.label(text="Mesh Optimization")
+        row = box.row()
+        row.prop(scene.mixalot, "optimizeVertexCache")
+        row = box.row()
+        row.prop(scene.mixalot, "vertexCacheSize")
+        row.enabled = scene.mixalot.optimizeVertexCache
+
         row = layout.row()
         row.operator("lumbermixalot.actor_convert")
 
@@ -562,6 +1114,25 @@ class LUMBERMIXALOT_VIEW_3D_PT_root_motion_extraction(bpy.types.Panel):
         row = rotationBox.row()
         row.prop(scene.mixalot, "extractRotationZ")
 
+        box = layout.box()
+        box.label(text="Resampling Options")
+        row = box.row()
+        row.prop(scene.mixalot, "retimeFps")
+        row = box.row()
+        row.prop(scene.mixalot, "keyFrameInterpolation")
+
+        box = layout.box()
+        box.label(text="Frame Range Options")
+        row = box.row()
+        row.prop(scene.mixalot, "frameRanges")
+        row = box.row()
+        row.prop(scene.mixalot, "trimToFrameRange")
+
+        box = layout.box()
+        box.label(text="Memory Options")
+        row = box.row()
+        row.prop(scene.mixalot, "streamingChunkSize")
+
         box = layout.box()
         box.label(text="DEBUG Options")
         row = box.row()
@@ -569,8 +1140,13 @@ class LUMBERMIXALOT_VIEW_3D_PT_root_motion_extraction(bpy.types.Panel):
 
         box = layout.box()
         row = box.row()
+        row.prop(scene.mixalot, "armatureScope")
+        row = box.row()
         row.scale_y = 2.0
         row.operator("lumbermixalot.extract_root_motion")
+        row = box.row()
+        row.enabled = motionmixalot.HasSourceTracks(context.object)
+        row.operator("lumbermixalot.revert_root_motion")
 
 
 class LUMBERMIXALOT_VIEW_3D_PT_root_motion_post_processing(bpy.types.Panel):
@@ -624,6 +1200,120 @@ class LUMBERMIXALOT_VIEW_3D_PT_root_motion_post_processing(bpy.types.Panel):
         row = box.row()
         row.operator("lumbermixalot.rotate_root_motion_animation")
 
+        row = layout.row()
+        row.label(text="")
+
+        box = layout.box()
+        box.label(text="Combined Post Processing")
+        row = box.row()
+        row.prop(scene.mixalot, "rotateAroundZAxis")
+        row = box.row()
+        row.prop(scene.mixalot, "spinDegreesPerSecond")
+        row = box.row()
+        row.prop(scene.mixalot, "rootMotionScale")
+        row = box.row()
+        row.prop(scene.mixalot, "rootMotionOffset")
+        row = box.row()
+        row.prop(scene.mixalot, "armatureScope")
+        row = box.row()
+        row.operator("lumbermixalot.apply_root_motion_post_processing")
+
+
+class LUMBERMIXALOT_VIEW_3D_PT_skeleton_pruning(bpy.types.Panel):
+    """Removes unnecessary bones from the skeleton and the animations."""
+    bl_label = "Skeleton Pruning"
+    bl_idname = "LUMBERMIXALOT_VIEW_3D_PT_skeleton_pruning"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Lumbermixalot"
+    bl_order = 5
+
+    @classmethod
+    def poll(cls, context):
+        if context.object == None:
+            return None
+        if context.object.type != 'ARMATURE':
+            return None
+        return commonmixalot.GetRootBone(context.object) is not None
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "pruneBonesByPattern")
+        row = box.row()
+        row.prop(scene.mixalot, "pruneBonePatterns")
+        row.enabled = scene.mixalot.pruneBonesByPattern
+
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "pruneStaticBones")
+        row = box.row()
+        row.prop(scene.mixalot, "pruneMotionTolerance")
+        row.enabled = scene.mixalot.pruneStaticBones
+
+        row = layout.row()
+        row.operator("lumbermixalot.prune_skeleton")
+
+
+class LUMBERMIXALOT_VIEW_3D_PT_motion_matching(bpy.types.Panel):
+    """Builds motion matching data from converted clips."""
+    bl_label = "Motion Matching"
+    bl_idname = "LUMBERMIXALOT_VIEW_3D_PT_motion_matching"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Lumbermixalot"
+    bl_order = 6
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        row = layout.row()
+        row.prop(scene.mixalot, "featureDbClipsPath")
+        row = layout.row()
+        row.prop(scene.mixalot, "featureDbFootBones")
+        row = layout.row()
+        row.prop(scene.mixalot, "featureDbOutputFile")
+        row = layout.row()
+        row.operator("lumbermixalot.build_feature_database")
+
+
+class LUMBERMIXALOT_VIEW_3D_PT_log(bpy.types.Panel):
+    """Shows the most recent log messages"""
+    bl_label = "Log"
+    bl_idname = "LUMBERMIXALOT_VIEW_3D_PT_log"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Lumbermixalot"
+    bl_order = 101
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        row = layout.row()
+        row.prop(scene.mixalot, "logLevel")
+        row.prop(scene.mixalot, "quietConsole")
+        row = layout.row()
+        row.prop(scene.mixalot, "logLineCount")
+        row.operator("lumbermixalot.clear_log")
+        row = layout.row()
+        row.prop(scene.mixalot, "profileRnaAccess")
+        row.operator("lumbermixalot.log_rna_profile")
+
+        box = layout.box()
+        col = box.column(align=True)
+        messages = logmixalot.GetRecentMessages(scene.mixalot.logLineCount)
+        if len(messages) == 0:
+            col.label(text="No messages")
+        for message in messages:
+            col.label(text=message)
+
 
 class LUMBERMIXALOT_VIEW_3D_PT_fbx_export(bpy.types.Panel):
     """Exports the current Armature, Mesh & Motions to an fbx file"""
@@ -649,11 +1339,48 @@ class LUMBERMIXALOT_VIEW_3D_PT_fbx_export(bpy.types.Panel):
         row = layout.row()
         row.prop(scene.mixalot, "cacheFbxExportOptions")
         row = layout.row()
+        row.prop(scene.mixalot, "exportFormat")
+        row.prop(scene.mixalot, "exportProfile")
+        row = layout.row()
         row.prop(scene.mixalot, "unpackTextures")
         row = layout.row()
+        row.prop(scene.mixalot, "exportRootMotionMetadata")
+        row = layout.row()
         row.prop(scene.mixalot, "fbxFilename")
         row = layout.row()
         row.prop(scene.mixalot, "fbxOutputPath")
+
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "exportMotionLods")
+        col = box.column()
+        col.enabled = scene.mixalot.exportMotionLods
+        col.prop(scene.mixalot, "motionLod1Fps")
+        col.prop(scene.mixalot, "motionLod1ExcludedBones")
+        col.prop(scene.mixalot, "exportMotionLod2")
+        col = box.column()
+        col.enabled = scene.mixalot.exportMotionLods and scene.mixalot.exportMotionLod2
+        col.prop(scene.mixalot, "motionLod2Fps")
+        col.prop(scene.mixalot, "motionLod2ExcludedBones")
+
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "exportClipVariants")
+        row = box.row()
+        row.enabled = scene.mixalot.exportClipVariants
+        row.prop(scene.mixalot, "clipVariants")
+
+        box = layout.box()
+        row = box.row()
+        row.prop(scene.mixalot, "persistClipStore")
+        row = box.row()
+        row.prop(scene.mixalot, "clipStorePath")
+        row = box.row()
+        row.prop(scene.mixalot, "clipStoreClipName")
+        row.operator("lumbermixalot.load_clip_from_store")
+
+        row = layout.row()
+        row.prop(scene.mixalot, "armatureScope")
         row = layout.row()
         row.operator("lumbermixalot.exportfbx")
 
@@ -665,15 +1392,25 @@ classes = (
     LumbermixalotPropertyGroup,
     ImportFbxOperator,
     ActorConvertOperator,
+    PruneSkeletonOperator,
+    BuildFeatureDatabaseOperator,
     RootMotionExtractionOperator,
+    RootMotionRevertOperator,
     RootMotionClearAnimationDataOperator,
     RootMotionRotateAnimationOperator,
+    RootMotionPostProcessOperator,
     ExportFbxOperator,
+    LoadClipFromStoreOperator,
+    ClearLogOperator,
+    LogRnaProfileOperator,
     LUMBERMIXALOT_VIEW_3D_PT_fbx_import,
     LUMBERMIXALOT_VIEW_3D_PT_actor_processing,
     LUMBERMIXALOT_VIEW_3D_PT_root_motion_extraction,
     LUMBERMIXALOT_VIEW_3D_PT_root_motion_post_processing,
-    LUMBERMIXALOT_VIEW_3D_PT_fbx_export
+    LUMBERMIXALOT_VIEW_3D_PT_skeleton_pruning,
+    LUMBERMIXALOT_VIEW_3D_PT_motion_matching,
+    LUMBERMIXALOT_VIEW_3D_PT_fbx_export,
+    LUMBERMIXALOT_VIEW_3D_PT_log
 )
 
 
@@ -694,15 +1431,16 @@ def _myHack():
     Used for debugging purposes, when it is not convenient to register the UI
     of this plugin.
     """
-    print("\n\n\n\nWelcome To _myHack\n")
+    logger = logmixalot.GetLogger("_myHack")
+    logger.info("Welcome To _myHack")
     context = bpy.context
     if context.object.type != 'ARMATURE':
-        print({'ERROR_INVALID_INPUT'}, "Error: {} is not an Armature.".format(context.object.name))
+        logger.error("Error: %s is not an Armature.", context.object.name)
         return
 
     hip_bone = commonmixalot.GetRootBone(context.object)
     if hip_bone is None:
-        print({'ERROR'}, "Error: The Armature must have at least one bone.")
+        logger.error("Error: The Armature must have at least one bone.")
         return
 
     hip_bone_name = hip_bone.name
@@ -718,11 +1456,11 @@ def _myHack():
         dumpCSVs=True)
     try:
         for status in conversion_iterator:
-            print({'INFO'}, "Step Done: " + str(status))
+            pass
     except Exception as e:
-        print({'ERROR_INVALID_INPUT'}, 'Error: ' + str(e))
+        logger.error("Error: %s", e)
         return
-    print({'INFO'}, "Extracted Root Motion")
+    logger.info("Extracted Root Motion")
 
 if __name__ == "__main__":
     register()
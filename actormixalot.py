@@ -21,18 +21,31 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
 SOFTWARE.
 """
+import math
+from array import array
+
 import bpy
+import bmesh
 
 #The modules of lumbermixalot
 if __package__ is None or __package__ == "":
     # When running as a standalone script from Blender Text View "Run Script"
     from commonmixalot import Status
     import commonmixalot as cmn
+    import meshoptmixalot as mopt
+    import logmixalot as log
 else:
-    print(__package__)
     # When running as an installed AddOn, then it runs in package mode.
     from .commonmixalot import Status
     from . import commonmixalot as cmn
+    from . import meshoptmixalot as mopt
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+# Each texture of the atlas is surrounded by copies of its edge pixels, this
+# way bilinear filtering and the first mip levels don't sample the neighbour tiles.
+ATLAS_GUTTER_PIXELS = 4
 
 
 def _RemoveUnnecessaryUvMaps(obj: bpy.types.Armature, numUVMapsToKeep: int) -> list[int, int]:
@@ -46,7 +59,7 @@ def _RemoveUnnecessaryUvMaps(obj: bpy.types.Armature, numUVMapsToKeep: int) -> l
         while len(uvlayers) > numUVMapsToKeep:
             layerToRemove = uvlayers[numUVMapsToKeep]
             uvlayers.remove(layerToRemove)
-            print(f"From mesh '{childObj.name}'', Removed unnecessary UV Map '{layerToRemove.name}'")
+            _logger.debug("From mesh '%s', Removed unnecessary UV Map '%s'", childObj.name, layerToRemove.name)
             removedUVMapsCount += 1
     return meshCount, removedUVMapsCount
 
@@ -61,7 +74,418 @@ def CheckArmatureContainsMesh(obj: bpy.types.Armature):
     return False
 
 
-def Convert(armatureObj: bpy.types.Armature, numUVMapsToKeep: int = -1):
+def _AlignUvMapNames(meshObjs: list[bpy.types.Object]):
+    """
+    bpy.ops.object.join() merges UV Maps by name. Mixamo meshes often name
+    their UV Maps differently, and joining them as-is would add one UV Map per
+    distinct name. This function renames the UV Maps of all meshes, by index,
+    after the UV Maps of the mesh with the most UV Maps.
+    The UV Maps of a mesh are first renamed to temporary unique names, otherwise
+    a new name could collide with another UV Map of the same mesh, and Blender
+    would add a ".001" suffix to it.
+    """
+    referenceNames = []
+    for meshObj in meshObjs:
+        uvlayers = meshObj.data.uv_layers
+        if len(uvlayers) > len(referenceNames):
+            referenceNames = [uvlayer.name for uvlayer in uvlayers]
+    for meshObj in meshObjs:
+        uvlayers = meshObj.data.uv_layers
+        if all(uvlayer.name == referenceNames[idx] for idx, uvlayer in enumerate(uvlayers)):
+            continue
+        for idx, uvlayer in enumerate(uvlayers):
+            uvlayer.name = f"lumbermixalot_uv_{idx}"
+        for idx, uvlayer in enumerate(uvlayers):
+            uvlayer.name = referenceNames[idx]
+
+
+def _JoinMeshes(armatureObj: bpy.types.Armature, meshObjs: list[bpy.types.Object]) -> bpy.types.Object:
+    """
+    Joins all the meshes in @meshObjs into the first one. Vertex groups are
+    merged by name, so skinning against @armatureObj is preserved.
+    Returns the joined mesh object. At the end @armatureObj is left as the
+    active object.
+    """
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.select_all(action='DESELECT')
+    for meshObj in meshObjs:
+        meshObj.select_set(True)
+    viewLayer = bpy.context.view_layer
+    viewLayer.objects.active = meshObjs[0]
+    bpy.ops.object.join()
+    joinedObj = viewLayer.objects.active
+    bpy.ops.object.select_all(action='DESELECT')
+    armatureObj.select_set(True)
+    viewLayer.objects.active = armatureObj
+    return joinedObj
+
+
+def _GetSocketValueSignature(socket: bpy.types.NodeSocket):
+    if socket.is_linked:
+        return "linked"
+    if not hasattr(socket, "default_value"):
+        return None
+    value = socket.default_value
+    try:
+        return tuple(round(v, 5) for v in value)
+    except TypeError:
+        if isinstance(value, float):
+            return round(value, 5)
+        return value
+
+
+def _GetMaterialSignature(material: bpy.types.Material) -> tuple:
+    """
+    Returns a hashable tuple that describes the settings of @material.
+    Two materials with the same signature render identically and can be
+    consolidated into a single material.
+    """
+    if material is None:
+        return (None,)
+    signature = [material.blend_method, tuple(round(v, 5) for v in material.diffuse_color)]
+    if (not material.use_nodes) or (material.node_tree is None):
+        signature.append(round(material.metallic, 5))
+        signature.append(round(material.roughness, 5))
+        return tuple(signature)
+    nodeTree = material.node_tree
+    for node in sorted(nodeTree.nodes, key=lambda n: n.name):
+        nodeSignature = [node.name, node.bl_idname]
+        if node.type == 'TEX_IMAGE':
+            nodeSignature.append(node.image.name if node.image else None)
+            nodeSignature.append(node.interpolation)
+            nodeSignature.append(node.extension)
+        for socket in node.inputs:
+            nodeSignature.append((socket.identifier, _GetSocketValueSignature(socket)))
+        signature.append(tuple(nodeSignature))
+    links = [(link.from_node.name, link.from_socket.identifier,
+              link.to_node.name, link.to_socket.identifier) for link in nodeTree.links]
+    signature.append(tuple(sorted(links)))
+    return tuple(signature)
+
+
+def _DeduplicateMaterialSlots(meshObj: bpy.types.Object) -> int:
+    """
+    Collapses the material slots of @meshObj that point to the same material
+    into a single slot, remapping the material index of every polygon.
+    Returns the number of removed slots.
+    """
+    mesh = meshObj.data
+    uniqueMaterials = []
+    slotRemap = []
+    for material in mesh.materials:
+        if material in uniqueMaterials:
+            slotRemap.append(uniqueMaterials.index(material))
+        else:
+            slotRemap.append(len(uniqueMaterials))
+            uniqueMaterials.append(material)
+    removedCount = len(mesh.materials) - len(uniqueMaterials)
+    if removedCount == 0:
+        return 0
+    materialIndices = [0] * len(mesh.polygons)
+    mesh.polygons.foreach_get("material_index", materialIndices)
+    slotCount = len(slotRemap)
+    materialIndices = [slotRemap[idx] if idx < slotCount else 0 for idx in materialIndices]
+    mesh.materials.clear()
+    for material in uniqueMaterials:
+        mesh.materials.append(material)
+    mesh.polygons.foreach_set("material_index", materialIndices)
+    return removedCount
+
+
+def _ConsolidateMaterials(meshObjs: list[bpy.types.Object]) -> tuple[int, int]:
+    """
+    Replaces materials with identical settings by a single material across
+    all meshes in @meshObjs, then removes the redundant material slots.
+    Returns tuple (replacedMaterialsCount, removedSlotsCount)
+    """
+    canonicalMaterials = {}
+    replacedMaterials = set()
+    for meshObj in meshObjs:
+        materials = meshObj.data.materials
+        for slotIndex, material in enumerate(materials):
+            if material is None:
+                continue
+            signature = _GetMaterialSignature(material)
+            canonical = canonicalMaterials.setdefault(signature, material)
+            if canonical != material:
+                materials[slotIndex] = canonical
+                replacedMaterials.add(material.name)
+    removedSlotsCount = 0
+    for meshObj in meshObjs:
+        removedSlotsCount += _DeduplicateMaterialSlots(meshObj)
+    return len(replacedMaterials), removedSlotsCount
+
+
+def _GetActiveRenderUvLayer(mesh: bpy.types.Mesh) -> bpy.types.MeshUVLoopLayer:
+    for uvlayer in mesh.uv_layers:
+        if uvlayer.active_render:
+            return uvlayer
+    return mesh.uv_layers.active
+
+
+def _GetAtlasImageTextureNode(material: bpy.types.Material) -> bpy.types.ShaderNodeTexImage:
+    """
+    Returns the image texture node of @material if it is eligible for the
+    texture atlas, otherwise returns None.
+    To keep the UV remapping valid, a material is only eligible if it has
+    exactly one sRGB image texture, and that texture reads from the default UV Map.
+    """
+    if (material is None) or (not material.use_nodes) or (material.node_tree is None):
+        return None
+    imageNodes = [node for node in material.node_tree.nodes if node.type == 'TEX_IMAGE']
+    if len(imageNodes) != 1:
+        return None
+    imageNode = imageNodes[0]
+    image = imageNode.image
+    if (image is None) or (not image.has_data) or (image.colorspace_settings.name != 'sRGB'):
+        return None
+    if imageNode.inputs["Vector"].is_linked:
+        return None
+    return imageNode
+
+
+def _GetMeshPolygonLoopRanges(mesh: bpy.types.Mesh) -> list[int, int, int]:
+    """
+    Returns tuple (loopStarts, loopTotals, materialIndices) with one entry per polygon.
+    """
+    polygonCount = len(mesh.polygons)
+    loopStarts = [0] * polygonCount
+    loopTotals = [0] * polygonCount
+    materialIndices = [0] * polygonCount
+    mesh.polygons.foreach_get("loop_start", loopStarts)
+    mesh.polygons.foreach_get("loop_total", loopTotals)
+    mesh.polygons.foreach_get("material_index", materialIndices)
+    return loopStarts, loopTotals, materialIndices
+
+
+def _NextPowerOfTwo(value: int) -> int:
+    return 1 << max(0, math.ceil(math.log2(max(1, value))))
+
+
+def _PackRectangles(sizes: list[tuple[int, int]], maxSize: int, padding: int = 2):
+    """
+    Simple shelf packing of the rectangles in @sizes, a list of (width, height).
+    Returns tuple (atlasWidth, atlasHeight, positions) where positions is a list
+    of (x, y) pixel offsets, in the same order as @sizes. Returns None if the
+    rectangles don't fit in a @maxSize x @maxSize atlas.
+    """
+    if len(sizes) < 1:
+        return None
+    order = sorted(range(len(sizes)), key=lambda idx: sizes[idx][1], reverse=True)
+    totalArea = sum((w + padding) * (h + padding) for w, h in sizes)
+    widestRectangle = max(w for w, _ in sizes) + padding
+    atlasWidth = _NextPowerOfTwo(max(widestRectangle, int(math.sqrt(totalArea))))
+    while atlasWidth <= maxSize:
+        positions = [None] * len(sizes)
+        shelfX, shelfY, shelfHeight = 0, 0, 0
+        for idx in order:
+            w, h = sizes[idx]
+            if shelfX + w + padding > atlasWidth:
+                shelfY += shelfHeight
+                shelfX, shelfHeight = 0, 0
+            positions[idx] = (shelfX, shelfY)
+            shelfX += w + padding
+            shelfHeight = max(shelfHeight, h + padding)
+        atlasHeight = _NextPowerOfTwo(shelfY + shelfHeight)
+        if atlasHeight <= maxSize:
+            return atlasWidth, atlasHeight, positions
+        atlasWidth *= 2
+    return None
+
+
+def _CollectAtlasCandidates(meshObjs: list[bpy.types.Object]) -> dict:
+    """
+    Returns a dictionary {image: [imageNodes]} with the images that can be packed
+    into the atlas. Images sampled with UVs outside of the [0, 1] range (tiling)
+    are discarded because they can not be remapped into a sub rectangle.
+    """
+    candidates = {}
+    rejectedImages = set()
+    for meshObj in meshObjs:
+        mesh = meshObj.data
+        uvlayer = _GetActiveRenderUvLayer(mesh)
+        if uvlayer is None:
+            continue
+        uvs = array('f', [0.0]) * (len(mesh.loops) * 2)
+        uvlayer.data.foreach_get("uv", uvs)
+        loopStarts, loopTotals, materialIndices = _GetMeshPolygonLoopRanges(mesh)
+        slotNodes = [_GetAtlasImageTextureNode(material) for material in mesh.materials]
+        for loopStart, loopTotal, materialIndex in zip(loopStarts, loopTotals, materialIndices):
+            if materialIndex >= len(slotNodes):
+                continue
+            imageNode = slotNodes[materialIndex]
+            if (imageNode is None) or (imageNode.image in rejectedImages):
+                continue
+            for uvIndex in range(loopStart * 2, (loopStart + loopTotal) * 2):
+                if (uvs[uvIndex] < -0.001) or (uvs[uvIndex] > 1.001):
+                    rejectedImages.add(imageNode.image)
+                    break
+        for imageNode in slotNodes:
+            if imageNode is None:
+                continue
+            nodes = candidates.setdefault(imageNode.image, [])
+            if imageNode not in nodes:
+                nodes.append(imageNode)
+    for image in rejectedImages:
+        candidates.pop(image, None)
+    return candidates
+
+
+def _RemapAtlasUVs(meshObj: bpy.types.Object, imageRects: dict):
+    """
+    Remaps the UVs of every polygon of @meshObj that samples one of the images in
+    @imageRects, a dictionary {image: (u0, v0, uScale, vScale)}, into the atlas.
+    """
+    mesh = meshObj.data
+    uvlayer = _GetActiveRenderUvLayer(mesh)
+    if uvlayer is None:
+        return
+    slotRects = []
+    for material in mesh.materials:
+        imageNode = _GetAtlasImageTextureNode(material)
+        slotRects.append(imageRects.get(imageNode.image) if imageNode else None)
+    uvs = array('f', [0.0]) * (len(mesh.loops) * 2)
+    uvlayer.data.foreach_get("uv", uvs)
+    loopStarts, loopTotals, materialIndices = _GetMeshPolygonLoopRanges(mesh)
+    for loopStart, loopTotal, materialIndex in zip(loopStarts, loopTotals, materialIndices):
+        if materialIndex >= len(slotRects):
+            continue
+        rect = slotRects[materialIndex]
+        if rect is None:
+            continue
+        u0, v0, uScale, vScale = rect
+        for loopIndex in range(loopStart, loopStart + loopTotal):
+            uvs[loopIndex * 2] = u0 + uvs[loopIndex * 2] * uScale
+            uvs[loopIndex * 2 + 1] = v0 + uvs[loopIndex * 2 + 1] * vScale
+    uvlayer.data.foreach_set("uv", uvs)
+    mesh.update()
+
+
+def _ConvertPixelsToRGBA(pixels: array, channels: int) -> array:
+    """
+    Returns @pixels, with @channels floats per pixel, as RGBA. Grayscale is
+    copied to RGB, and the alpha is 1.0 if @pixels don't have one.
+    """
+    if channels == 4:
+        return pixels
+    pixelCount = len(pixels) // channels
+    rgbaPixels = array('f', [1.0]) * (pixelCount * 4)
+    if channels >= 3:
+        for channel in range(3):
+            rgbaPixels[channel::4] = pixels[channel::channels]
+    else:
+        for channel in range(3):
+            rgbaPixels[channel::4] = pixels[0::channels]
+        if channels == 2:
+            rgbaPixels[3::4] = pixels[1::2]
+    return rgbaPixels
+
+
+def _CopyTileWithGutter(atlasPixels: array, atlasWidth: int, pixels: array, w: int, h: int, x: int, y: int,
+                        gutter: int):
+    """
+    Copies the RGBA @pixels, of a @w x @h image, into @atlasPixels at (@x + @gutter, @y + @gutter).
+    The @gutter pixels wide border around it is filled by extending the edge pixels.
+    """
+    for row in range(-gutter, h + gutter):
+        src = min(max(row, 0), h - 1) * w * 4
+        rowPixels = pixels[src:src + w * 4]
+        paddedRow = rowPixels[0:4] * gutter + rowPixels + rowPixels[-4:] * gutter
+        dst = ((y + gutter + row) * atlasWidth + x) * 4
+        atlasPixels[dst:dst + len(paddedRow)] = paddedRow
+
+
+def _PackTexturesIntoAtlas(armatureObj: bpy.types.Armature, meshObjs: list[bpy.types.Object], atlasMaxSize: int) -> int:
+    """
+    Packs the eligible textures of all materials of @meshObjs into a single atlas
+    image and remaps the UVs of the affected polygons accordingly.
+    Returns the number of textures that were packed in the atlas.
+    """
+    candidates = _CollectAtlasCandidates(meshObjs)
+    if len(candidates) < 2:
+        _logger.info("Not enough eligible textures to build a texture atlas")
+        return 0
+    images = list(candidates.keys())
+    sizes = [(image.size[0], image.size[1]) for image in images]
+    gutter = ATLAS_GUTTER_PIXELS
+    packing = _PackRectangles([(w + 2 * gutter, h + 2 * gutter) for w, h in sizes], atlasMaxSize, padding=0)
+    if packing is None:
+        _logger.warning("The textures don't fit in a %dx%d atlas", atlasMaxSize, atlasMaxSize)
+        return 0
+    atlasWidth, atlasHeight, positions = packing
+    atlasPixels = array('f', [0.0]) * (atlasWidth * atlasHeight * 4)
+    imageRects = {}
+    for image, (w, h), (x, y) in zip(images, sizes, positions):
+        pixels = array('f', [0.0]) * (w * h * image.channels)
+        image.pixels.foreach_get(pixels)
+        pixels = _ConvertPixelsToRGBA(pixels, image.channels)
+        _CopyTileWithGutter(atlasPixels, atlasWidth, pixels, w, h, x, y, gutter)
+        imageRects[image] = ((x + gutter) / atlasWidth, (y + gutter) / atlasHeight, w / atlasWidth, h / atlasHeight)
+    atlasName = f"{armatureObj.name}_atlas"
+    atlasImage = bpy.data.images.new(atlasName, atlasWidth, atlasHeight, alpha=True)
+    atlasImage.pixels.foreach_set(atlasPixels)
+    atlasImage.file_format = 'PNG'
+    atlasImage.filepath_raw = f"{atlasName}.png"
+    atlasImage.pack()
+    for meshObj in meshObjs:
+        _RemapAtlasUVs(meshObj, imageRects)
+    for image, imageNodes in candidates.items():
+        for imageNode in imageNodes:
+            imageNode.image = atlasImage
+        if image.users == 0:
+            bpy.data.images.remove(image)
+    _logger.info("Packed %d textures into atlas '%s' (%dx%d)", len(images), atlasName, atlasWidth, atlasHeight)
+    return len(images)
+
+
+def _OptimizeMeshVertexCache(meshObj: bpy.types.Object, cacheSize: int) -> list[float, float]:
+    """
+    Reorders the polygons of @meshObj for post transform vertex cache locality,
+    and then the vertices in the order they are first used by the polygons.
+    Returns tuple (acmrBefore, acmrAfter)
+    """
+    mesh = meshObj.data
+    mesh.calc_loop_triangles()
+    triangleCount = len(mesh.loop_triangles)
+    indices = [0] * (triangleCount * 3)
+    polygonIndices = [0] * triangleCount
+    mesh.loop_triangles.foreach_get("vertices", indices)
+    mesh.loop_triangles.foreach_get("polygon_index", polygonIndices)
+    acmrBefore = mopt.CalculateACMR(indices, cacheSize)
+
+    drawOrder = mopt.OptimizeTriangleOrder(indices, len(mesh.vertices), cacheSize)
+    # Blender meshes are made of polygons, a polygon is drawn
+    # when its first triangle is drawn.
+    polygonRanks = [-1] * len(mesh.polygons)
+    polygonTriangles = [[] for _ in range(len(mesh.polygons))]
+    nextRank = 0
+    for triangleIndex in drawOrder:
+        polygonIndex = polygonIndices[triangleIndex]
+        if polygonRanks[polygonIndex] < 0:
+            polygonRanks[polygonIndex] = nextRank
+            nextRank += 1
+    for triangleIndex, polygonIndex in enumerate(polygonIndices):
+        polygonTriangles[polygonIndex].append(triangleIndex)
+    sortedPolygons = sorted(range(len(polygonRanks)), key=polygonRanks.__getitem__)
+    newDrawOrder = [triangleIndex for polygonIndex in sortedPolygons for triangleIndex in polygonTriangles[polygonIndex]]
+    newIndices = mopt.ReorderTriangles(indices, newDrawOrder)
+    acmrAfter = mopt.CalculateACMR(newIndices, cacheSize)
+    vertexRemap = mopt.OptimizeVertexFetchOrder(newIndices, len(mesh.vertices))
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.sort(key=lambda face: polygonRanks[face.index])
+    bm.verts.sort(key=lambda vert: vertexRemap[vert.index])
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    return acmrBefore, acmrAfter
+
+
+def Convert(armatureObj: bpy.types.Armature, numUVMapsToKeep: int = -1,
+            mergeMeshes: bool = False, consolidateMaterials: bool = False,
+            atlasTextures: bool = False, atlasMaxSize: int = 4096,
+            optimizeVertexCache: bool = False, vertexCacheSize: int = mopt.DEFAULT_CACHE_SIZE):
     """
     Main function that converts an Actor/Character type of asset per 
     O3DE requirements.
@@ -71,17 +495,51 @@ def Convert(armatureObj: bpy.types.Armature, numUVMapsToKeep: int = -1):
     Optionally removes any other UVMaps in excess of @numUVMapsToKeep.
     The reason is because O3DE reserves those extra uvmaps as vertex streams
     and there's a limit of 12 streams.
+
+    Optionally reduces the amount of draw calls of the actor:
+    @mergeMeshes Joins all the meshes skinned to @armatureObj into a single mesh.
+    @consolidateMaterials Replaces materials with identical settings by a single material.
+    @atlasTextures Packs the textures of the materials into a single atlas
+        of at most @atlasMaxSize x @atlasMaxSize pixels and remaps the UVs.
+
+    Optionally reorders the triangles and vertices of all the meshes for
+    GPU vertex cache and vertex fetch locality:
+    @optimizeVertexCache Enables the reordering.
+    @vertexCacheSize Size of the post transform vertex cache to optimize for.
     """
     yield Status(f"Will apply current rotation of '{armatureObj.name}' as 0,0,0")
     # Set the current rotation as 0,0,0
     cmn.ApplyCurrentRotationAs000(armatureObj)
     yield Status(f"Applied current rotation of '{armatureObj.name}' as 0,0,0")
 
-    if numUVMapsToKeep < 0:
-        yield Status("Actor was converted successfully")
+    if numUVMapsToKeep >= 0:
+        yield Status("Starting removal of unnecessary uvmaps")
+        meshCount, removeCount = _RemoveUnnecessaryUvMaps(armatureObj, numUVMapsToKeep)
+        yield Status(f"Removed {removeCount} UV Maps across {meshCount} meshes")
+
+    meshObjs = cmn.GetSkinnedChildMeshes(armatureObj)
+    if mergeMeshes and (len(meshObjs) > 1):
+        _AlignUvMapNames(meshObjs)
+        meshCount = len(meshObjs)
+        meshObjs = [_JoinMeshes(armatureObj, meshObjs)]
+        yield Status(f"Merged {meshCount} skinned meshes into '{meshObjs[0].name}'")
+        if numUVMapsToKeep >= 0:
+            _, removeCount = _RemoveUnnecessaryUvMaps(armatureObj, numUVMapsToKeep)
+            yield Status(f"Removed {removeCount} UV Maps from the merged mesh")
+
+    if atlasTextures and (len(meshObjs) > 0):
+        packedCount = _PackTexturesIntoAtlas(armatureObj, meshObjs, atlasMaxSize)
+        yield Status(f"Packed {packedCount} textures into a texture atlas")
+
+    if (consolidateMaterials or atlasTextures) and (len(meshObjs) > 0):
+        replacedCount, removedSlotsCount = _ConsolidateMaterials(meshObjs)
+        yield Status(f"Consolidated {replacedCount} duplicated materials, removed {removedSlotsCount} material slots")
 
-    yield Status("Starting removal of unnecessary uvmaps")
-    meshCount, removeCount = _RemoveUnnecessaryUvMaps(armatureObj, numUVMapsToKeep)
-    yield Status(f"Removed {removeCount} UV Maps across {meshCount} meshes")
+    if optimizeVertexCache:
+        for childObj in armatureObj.children:
+            if childObj.type != 'MESH':
+                continue
+            acmrBefore, acmrAfter = _OptimizeMeshVertexCache(childObj, vertexCacheSize)
+            yield Status(f"Optimized vertex cache order of mesh '{childObj.name}'. ACMR before={acmrBefore:.3f}, after={acmrAfter:.3f}")
 
-    yield Status("Actor was converted successfully")
\ No newline at end of file
+    yield Status("Actor was converted successfully")
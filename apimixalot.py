@@ -0,0 +1,497 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Programmatic API of lumbermixalot.
+# The operators in __init__.py depend on the Blender UI context. The Pipeline
+# class exposes the same features with explicit scene and armature arguments,
+# no context overrides, no operator dispatch and no UI side effects. It can
+# be used from scripts, headless batch runs and tight loops:
+#
+#   options = PipelineOptions(extractRotationZ=True, unpackTextures=False)
+#   pipeline = Pipeline(bpy.context.scene, options)
+#   armatureObj = pipeline.Import("/path/Walking.fbx")
+#   pipeline.ExtractRootMotion(armatureObj)
+#   pipeline.Export(armatureObj, "Walking.fbx", "/path/output")
+
+import math
+import os
+import time
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import motionmixalot as mmx
+    import fcurvesmixalot as fcv
+    import actormixalot as amx
+    import skeletonmixalot as skl
+    import lodmixalot as lod
+    import variantmixalot as variant
+    import clipstoremixalot as clipstore
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import motionmixalot as mmx
+    from . import fcurvesmixalot as fcv
+    from . import actormixalot as amx
+    from . import skeletonmixalot as skl
+    from . import lodmixalot as lod
+    from . import variantmixalot as variant
+    from . import clipstoremixalot as clipstore
+
+
+class PipelineOptions:
+    """
+    All the processing options. The names and the defaults are the same as
+    the properties of LumbermixalotPropertyGroup in __init__.py, see their
+    descriptions there.
+    """
+    _DEFAULTS = {
+        # Import
+        "useImportCache": False,
+        "importCachePath": "",
+        "importCacheMaxMB": 2048,
+        # Actor conversion
+        "removeUVMaps": True,
+        "countOfUVMapsToKeep": 2,
+        "mergeMeshes": False,
+        "consolidateMaterials": False,
+        "atlasTextures": False,
+        "atlasMaxSize": 4096,
+        "optimizeVertexCache": False,
+        "vertexCacheSize": 32,
+        # Skeleton pruning
+        "pruneBonesByPattern": True,
+        "pruneBonePatterns": skl.DEFAULT_PRUNE_PATTERNS,
+        "pruneStaticBones": False,
+        "pruneMotionTolerance": 0.001,
+        # Root motion extraction
+        "extractTranslationX": True,
+        "extractTranslationY": True,
+        "extractTranslationZ": True,
+        "extractRotationZ": False,
+        "retimeFps": 0,
+        "keyFrameInterpolation": "KEEP",
+        "streamingChunkSize": 0,
+        "frameRanges": "",
+        "trimToFrameRange": False,
+        "debugDumpCSVs": False,
+        # Root motion post processing
+        "zeroOutTranslationX": False,
+        "zeroOutTranslationY": False,
+        "zeroOutTranslationZ": False,
+        "rotateAroundZAxis": False,
+        "degreesAroundZAxis": -90.0,
+        "spinDegreesPerSecond": 0.0,
+        "rootMotionScale": 1.0,
+        "rootMotionOffset": (0.0, 0.0, 0.0),
+        # Export
+        "exportFormat": cmn.EXPORT_FORMAT_FBX,
+        "exportProfile": cmn.EXPORT_PROFILE_DEFAULT,
+        "unpackTextures": True,
+        "exportRootMotionMetadata": False,
+        "persistClipStore": False,
+        "clipStorePath": "",
+        "exportMotionLods": False,
+        "motionLod1Fps": 15.0,
+        "motionLod1ExcludedBones": skl.DEFAULT_PRUNE_PATTERNS,
+        "exportMotionLod2": False,
+        "motionLod2Fps": 10.0,
+        "motionLod2ExcludedBones": skl.DEFAULT_PRUNE_PATTERNS + ", *ToeBase",
+        "exportClipVariants": False,
+        "clipVariants": "mirror",
+    }
+
+    def __init__(self, **options):
+        for name, value in self._DEFAULTS.items():
+            setattr(self, name, value)
+        for name, value in options.items():
+            if name not in self._DEFAULTS:
+                raise Exception(f"Unknown pipeline option '{name}'")
+            setattr(self, name, value)
+
+    @classmethod
+    def FromPropertyGroup(cls, propertyGroup) -> "PipelineOptions":
+        """
+        Returns the options with the current values of @propertyGroup,
+        usually bpy.context.scene.mixalot.
+        """
+        options = {}
+        for name in cls._DEFAULTS:
+            value = getattr(propertyGroup, name)
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            elif not isinstance(value, (bool, int, float, str)):
+                value = tuple(value)
+            options[name] = value
+        return cls(**options)
+
+    def GetFrameRanges(self) -> list[int, int]:
+        return cmn.ParseFrameRanges(self.frameRanges)
+
+    def BuildPostProcessOps(self, animationFps: float) -> list[mmx.PostProcessOp]:
+        """
+        Returns the root motion post processing operations enabled by these options.
+        """
+        postProcessOps = []
+        if self.zeroOutTranslationX or self.zeroOutTranslationY or self.zeroOutTranslationZ:
+            postProcessOps.append(mmx.ZeroAxesOp(self.zeroOutTranslationX,
+                self.zeroOutTranslationY, self.zeroOutTranslationZ))
+        frac, _ = math.modf(self.degreesAroundZAxis / 360.0)
+        if self.rotateAroundZAxis and not math.isclose(360.0 * frac, 0.0, abs_tol=0.01):
+            postProcessOps.append(mmx.RotateOp(cmn.Axis.Z, math.radians(self.degreesAroundZAxis)))
+        if not math.isclose(self.spinDegreesPerSecond, 0.0, abs_tol=0.01):
+            postProcessOps.append(mmx.SpinOp(cmn.Axis.Z, math.radians(self.spinDegreesPerSecond), animationFps))
+        if not math.isclose(self.rootMotionScale, 1.0):
+            postProcessOps.append(mmx.ScaleOp(self.rootMotionScale))
+        if any(self.rootMotionOffset):
+            postProcessOps.append(mmx.OffsetOp(self.rootMotionOffset))
+        return postProcessOps
+
+    def BuildMotionLods(self) -> list[lod.MotionLod]:
+        if not self.exportMotionLods:
+            return []
+        motionLods = [lod.MotionLod(1, self.motionLod1Fps, skl.ParseBonePatterns(self.motionLod1ExcludedBones))]
+        if self.exportMotionLod2:
+            motionLods.append(lod.MotionLod(2, self.motionLod2Fps, skl.ParseBonePatterns(self.motionLod2ExcludedBones)))
+        return motionLods
+
+    def BuildClipVariants(self) -> list[variant.ClipVariant]:
+        if not self.exportClipVariants:
+            return []
+        return variant.ParseClipVariants(self.clipVariants)
+
+
+class ExportRecord:
+    """
+    Time and size of the files written by one backend in one call to Pipeline.Export().
+    """
+    def __init__(self, exportFormat: str, filenames: list[str], seconds: float, sizeBytes: int):
+        self.exportFormat = exportFormat
+        self.filenames = filenames
+        self.seconds = seconds
+        self.sizeBytes = sizeBytes
+
+    def __str__(self):
+        return f"{self.exportFormat} {self.seconds:.2f}s {self.sizeBytes / (1024 * 1024):.2f}MB"
+
+
+def _HasAction(armatureObj: bpy.types.Armature) -> bool:
+    return (armatureObj.animation_data is not None) and (armatureObj.animation_data.action is not None)
+
+
+class Pipeline:
+    """
+    Runs the lumbermixalot steps on explicit scene and armature objects.
+    Errors are raised as exceptions.
+    @statusCallback Optional. Called with each Status of each step.
+    """
+    def __init__(self, sceneObj: bpy.types.Scene, options: PipelineOptions = None, statusCallback=None):
+        self.sceneObj = sceneObj
+        self.options = options if options is not None else PipelineOptions()
+        self.statusCallback = statusCallback
+        # One ExportRecord per backend per exported armature, to compare the backends.
+        self.exportRecords = []
+
+    def _Drain(self, iterator):
+        for status in iterator:
+            if self.statusCallback is not None:
+                self.statusCallback(status)
+
+    def _Status(self, message: str):
+        self._Drain((Status(message),))
+
+    def Import(self, fbxFilePath: str, clearScene: bool = True, requireArmature: bool = True) -> bpy.types.Armature:
+        """
+        Imports @fbxFilePath and returns its Armature.
+        @clearScene If True, all the objects in the scene are removed first.
+        @requireArmature If False, files without an Armature (e.g. only meshes)
+            are imported too, and None is returned for them.
+        """
+        if clearScene:
+            cmn.ClearSceneObjects(self.sceneObj)
+        cacheDirectory = bpy.path.abspath(self.options.importCachePath) if self.options.useImportCache else None
+        cmn.ImportFBX(fbxFilePath, cacheDirectory, self.options.importCacheMaxMB * 1024 * 1024)
+        armatureObj = cmn.GetFirstAmature(self.sceneObj)
+        if (armatureObj is None) and requireArmature:
+            raise Exception(f"'{fbxFilePath}' doesn't have an Armature")
+        self._Status(f"Imported '{fbxFilePath}'")
+        return armatureObj
+
+    def ConvertActor(self, armatureObj: bpy.types.Armature):
+        options = self.options
+        if cmn.GetRootBone(armatureObj) is None:
+            raise Exception(f"The Armature '{armatureObj.name}' must have at least one bone.")
+        numUVMapsToKeep = options.countOfUVMapsToKeep if options.removeUVMaps else -1
+        self._Drain(amx.Convert(armatureObj, numUVMapsToKeep,
+            mergeMeshes=options.mergeMeshes,
+            consolidateMaterials=options.consolidateMaterials,
+            atlasTextures=options.atlasTextures,
+            atlasMaxSize=options.atlasMaxSize,
+            optimizeVertexCache=options.optimizeVertexCache,
+            vertexCacheSize=options.vertexCacheSize))
+
+    def PruneSkeleton(self, armatureObj: bpy.types.Armature):
+        options = self.options
+        bonePatterns = skl.ParseBonePatterns(options.pruneBonePatterns) if options.pruneBonesByPattern else []
+        self._Drain(skl.PruneSkeleton(armatureObj,
+            bonePatterns=bonePatterns,
+            pruneStaticBones=options.pruneStaticBones,
+            motionTolerance=options.pruneMotionTolerance))
+
+    def _GetHipBoneName(self, armatureObj: bpy.types.Armature) -> str:
+        hipBone = cmn.GetRootBone(armatureObj)
+        if hipBone is None:
+            raise Exception(f"The Armature '{armatureObj.name}' must have at least one bone.")
+        return hipBone.name
+
+    def ExtractRootMotion(self, armatureObj: bpy.types.Armature, hipBoneName: str = None):
+        """
+        @hipBoneName Defaults to the root bone of @armatureObj.
+        """
+        options = self.options
+        if hipBoneName is None:
+            hipBoneName = self._GetHipBoneName(armatureObj)
+        self.ConvertInterpolation(armatureObj)
+        self._Drain(mmx.ExtractRootMotion(
+            sceneObj=self.sceneObj,
+            armatureObj=armatureObj,
+            hipBoneName=hipBoneName,
+            extractTranslationX=options.extractTranslationX,
+            extractTranslationY=options.extractTranslationY,
+            extractTranslationZ=options.extractTranslationZ,
+            extractRotationZ=options.extractRotationZ,
+            dumpCSVs=options.debugDumpCSVs,
+            targetFps=options.retimeFps,
+            chunkSize=options.streamingChunkSize,
+            frameRanges=options.GetFrameRanges(),
+            trimToFrameRange=options.trimToFrameRange))
+        self.ConvertInterpolation(armatureObj, rootMotionOnly=True)
+
+    def ExtractRootMotionFromArmatures(self, armatureObjs: list[bpy.types.Armature]):
+        """
+        Extracts the root motion of all @armatureObjs in one pass, sharing the
+        timeline sweep. The hip bone of each armature is its root bone.
+        The "debugDumpCSVs" option only works with a single armature, the CSV
+        files have fixed names.
+        """
+        if len(armatureObjs) == 1:
+            self.ExtractRootMotion(armatureObjs[0])
+            return
+        options = self.options
+        if options.debugDumpCSVs:
+            self._Status(f"CSV files are not dumped, it requires a single armature but there are {len(armatureObjs)}")
+        for armatureObj in armatureObjs:
+            self.ConvertInterpolation(armatureObj)
+        self._Drain(mmx.ExtractRootMotionFromArmatures(
+            sceneObj=self.sceneObj,
+            armatureObjs=armatureObjs,
+            hipBoneNames=[self._GetHipBoneName(armatureObj) for armatureObj in armatureObjs],
+            extractTranslationX=options.extractTranslationX,
+            extractTranslationY=options.extractTranslationY,
+            extractTranslationZ=options.extractTranslationZ,
+            extractRotationZ=options.extractRotationZ,
+            targetFps=options.retimeFps,
+            chunkSize=options.streamingChunkSize,
+            frameRanges=options.GetFrameRanges(),
+            trimToFrameRange=options.trimToFrameRange))
+        for armatureObj in armatureObjs:
+            self.ConvertInterpolation(armatureObj, rootMotionOnly=True)
+
+    def ConvertInterpolation(self, armatureObj: bpy.types.Armature, rootMotionOnly: bool = False) -> int:
+        """
+        Sets the interpolation of the key frames of @armatureObj to the "keyFrameInterpolation"
+        option, unless it is 'KEEP'. Done before the extraction, this way the timeline
+        sweep evaluates cheap curves, and again after it for the new root motion fcurves.
+        @rootMotionOnly If True, only the location and rotation fcurves of @armatureObj itself are changed.
+        Returns the number of changed key frames.
+        """
+        interpolation = self.options.keyFrameInterpolation
+        if (interpolation == 'KEEP') or not _HasAction(armatureObj):
+            return 0
+        if rootMotionOnly:
+            changedCount = fcv.SetFCurvesInterpolation(fcv.GetArmatureFCurves(armatureObj,
+                fcv.LOCATION_DATA_PATHS + fcv.QUATERNION_DATA_PATHS), interpolation)
+        else:
+            changedCount = fcv.SetActionInterpolation(armatureObj.animation_data.action, interpolation)
+        self._Status(f"Set {interpolation} interpolation in {changedCount} key frames of '{armatureObj.name}'")
+        return changedCount
+
+    def RevertRootMotion(self, armatureObj: bpy.types.Armature):
+        """
+        Restores the hip bone tracks saved by the first extraction of the action
+        of @armatureObj, and removes its root motion.
+        """
+        self._Drain(mmx.RevertRootMotionExtraction(self.sceneObj, armatureObj))
+
+    def PostProcess(self, armatureObj: bpy.types.Armature, postProcessOps: list[mmx.PostProcessOp] = None) -> int:
+        """
+        Applies all the enabled root motion post processing options in a single pass.
+        @postProcessOps Optional. Applies these operations instead of the ones
+            enabled by the options, e.g. a single mmx.RotateOp.
+        Returns the number of applied operations.
+        """
+        if postProcessOps is None:
+            postProcessOps = self.options.BuildPostProcessOps(cmn.GetSceneFps(self.sceneObj))
+        if len(postProcessOps) > 0:
+            self._Drain(mmx.ApplyPostProcessOps(armatureObj, postProcessOps))
+        return len(postProcessOps)
+
+    def PostProcessArmatures(self, armatureObjs: list[bpy.types.Armature]) -> int:
+        """
+        Same as PostProcess() for each armature in @armatureObjs.
+        Returns the number of applied operations per armature.
+        """
+        opCount = 0
+        for armatureObj in armatureObjs:
+            opCount = self.PostProcess(armatureObj)
+        return opCount
+
+    def _GetExportProfile(self, exportProfile: str, autoProfile: str) -> str:
+        """
+        Returns @exportProfile, or the "exportProfile" option if it is None.
+        EXPORT_PROFILE_AUTO is replaced with @autoProfile, for the steps that
+        know the kind of file they export.
+        """
+        if exportProfile is None:
+            exportProfile = self.options.exportProfile
+        return autoProfile if exportProfile == cmn.EXPORT_PROFILE_AUTO else exportProfile
+
+    def Export(self, armatureObj: bpy.types.Armature, fbxFilename: str, fbxOutputPath: str,
+               armatureOnly: bool = False, exportProfile: str = None) -> list[str]:
+        """
+        Exports the scene as FBX, one file per frame range if there are several,
+        plus the optional root motion metadata, motion LODs, clip variants and clip store entry.
+        The "exportFormat" option selects FBX, GLB or both, the time and size of
+        each backend are added to self.exportRecords.
+        @armatureOnly If True, only @armatureObj and its children are exported.
+        @exportProfile Optional. One of the cmn.EXPORT_PROFILE_* constants, overrides
+            the "exportProfile" option for this file.
+        Returns the list of exported files.
+        """
+        if exportProfile is None:
+            exportProfile = self.options.exportProfile
+        exportProfile = cmn.ResolveExportProfile(exportProfile, armatureObj)
+        if armatureOnly:
+            previousSelection = cmn.SelectOnlyObjects(self.sceneObj, cmn.GetObjectHierarchy(armatureObj))
+            try:
+                return self._Export(armatureObj, fbxFilename, fbxOutputPath, True, exportProfile)
+            finally:
+                cmn.SelectOnlyObjects(self.sceneObj, previousSelection)
+        return self._Export(armatureObj, fbxFilename, fbxOutputPath, False, exportProfile)
+
+    def ExportArmatures(self, armatureObjs: list[bpy.types.Armature], fbxFilename: str, fbxOutputPath: str,
+                        exportProfile: str = None) -> list[str]:
+        """
+        Exports each armature in @armatureObjs, with its children, to its own FBX file
+        named after @fbxFilename and the armature, see cmn.MakeArmatureFilename().
+        A single armature is exported as the whole scene, same as Export().
+        Returns the list of exported FBX files.
+        """
+        if len(armatureObjs) == 1:
+            return self.Export(armatureObjs[0], fbxFilename, fbxOutputPath, exportProfile=exportProfile)
+        outputFilenames = []
+        for armatureObj in armatureObjs:
+            outputFilenames.extend(self.Export(armatureObj,
+                cmn.MakeArmatureFilename(fbxFilename, armatureObj.name), fbxOutputPath, armatureOnly=True,
+                exportProfile=exportProfile))
+        return outputFilenames
+
+    def _Export(self, armatureObj: bpy.types.Armature, fbxFilename: str, fbxOutputPath: str,
+                useSelection: bool, exportProfile: str) -> list[str]:
+        options = self.options
+        frameRanges = options.GetFrameRanges()
+        exportFormats = cmn.GetExportFormats(options.exportFormat)
+        outputFilenames = []
+        formatRecords = []
+        for exportFormat in exportFormats:
+            startTime = time.perf_counter()
+            if len(frameRanges) > 1:
+                filenames = cmn.ExportFBXClips(self.sceneObj, fbxFilename, fbxOutputPath,
+                    options.unpackTextures, frameRanges, useSelection, exportFormat, exportProfile)
+            else:
+                filenames = [cmn.ExportFBX(fbxFilename, fbxOutputPath, options.unpackTextures, useSelection,
+                    exportFormat, exportProfile)]
+            record = ExportRecord(exportFormat, filenames, time.perf_counter() - startTime,
+                sum(os.path.getsize(filename) for filename in filenames))
+            formatRecords.append(record)
+            outputFilenames.extend(filenames)
+            self._Status(f"Exported {', '.join(filenames)} ({record})")
+        self.exportRecords.extend(formatRecords)
+        if len(formatRecords) > 1:
+            self._Status(f"Export backends: {', '.join(str(record) for record in formatRecords)}")
+        if options.exportRootMotionMetadata:
+            clipFrameRanges = frameRanges if frameRanges else [None]
+            # The metadata is the same for all the backends, it's named after the files of the first one.
+            for clipFilename, clipFrameRange in zip(formatRecords[0].filenames, clipFrameRanges):
+                metadataFilename = mmx.ExportRootMotionMetadata(self.sceneObj, armatureObj, clipFilename, clipFrameRange)
+                self._Status(f"Root motion metadata exported as '{metadataFilename}'")
+        if _HasAction(armatureObj):
+            motionLods = options.BuildMotionLods()
+            if len(motionLods) > 0:
+                for exportFormat in exportFormats:
+                    self._Drain(lod.ExportMotionLods(self.sceneObj, armatureObj, fbxFilename, fbxOutputPath, motionLods,
+                        exportFormat, exportProfile))
+            clipVariants = options.BuildClipVariants()
+            if len(clipVariants) > 0:
+                for exportFormat in exportFormats:
+                    self._Drain(variant.ExportClipVariants(self.sceneObj, armatureObj, fbxFilename, fbxOutputPath,
+                        clipVariants, useSelection, exportFormat, exportProfile))
+            if options.persistClipStore:
+                clipName, _ = os.path.splitext(fbxFilename)
+                clipFilename = clipstore.WriteActionToClipStore(self.sceneObj, armatureObj,
+                    bpy.path.abspath(options.clipStorePath), clipName)
+                self._Status(f"Action saved in the clip store as '{clipFilename}'")
+        return outputFilenames
+
+    def ProcessMotion(self, fbxFilePath: str, fbxOutputPath: str, postProcess: bool = False,
+                      exportProfile: str = None) -> list[str]:
+        """
+        Import, root motion extraction, optional post processing and export
+        of a motion FBX file. The output file has the same name as the input.
+        @exportProfile Optional. Overrides the "exportProfile" option. If it is
+            cmn.EXPORT_PROFILE_AUTO, the motion profile is used.
+        Returns the list of exported FBX files.
+        """
+        armatureObj = self.Import(fbxFilePath)
+        self.ExtractRootMotion(armatureObj)
+        if postProcess:
+            self.PostProcess(armatureObj)
+        return self.Export(armatureObj, os.path.basename(fbxFilePath), fbxOutputPath,
+            exportProfile=self._GetExportProfile(exportProfile, cmn.EXPORT_PROFILE_MOTION))
+
+    def ProcessActor(self, fbxFilePath: str, fbxOutputPath: str, exportProfile: str = None) -> list[str]:
+        """
+        Import, actor conversion and export of an actor FBX file.
+        @exportProfile Optional. Overrides the "exportProfile" option. If it is
+            cmn.EXPORT_PROFILE_AUTO, the actor profile is used.
+        Returns the list of exported FBX files.
+        """
+        armatureObj = self.Import(fbxFilePath)
+        self.ConvertActor(armatureObj)
+        return self.Export(armatureObj, os.path.basename(fbxFilePath), fbxOutputPath,
+            exportProfile=self._GetExportProfile(exportProfile, cmn.EXPORT_PROFILE_ACTOR))
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Headless batch conversion of motion FBX files.
+# Several hosts can drain the same input directory, over a shared file system,
+# without a job server:
+#   - Deterministic sharding: a file belongs to shard crc32(relativePath) % shardCount.
+#   - Lock files: before processing a file, a host must create its lock file
+#     with O_CREAT | O_EXCL, which only one host can do. Lock files of crashed
+#     hosts expire after some time and can be stolen.
+#   - Done markers: processed files are skipped by later runs.
+#
+# Usage:
+#   blender -b -P batchmixalot.py -- --input <dir> --output <dir> [--shard i --shard-count N]
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+import zlib
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    # or from the command line with "blender -b -P batchmixalot.py".
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import apimixalot as api
+    import logmixalot as log
+    import profilemixalot as profile
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import apimixalot as api
+    from . import logmixalot as log
+    from . import profilemixalot as profile
+
+
+_logger = log.GetLogger(__name__)
+
+DEFAULT_LOCK_DIRECTORY_NAME = ".lumbermixalot-locks"
+DEFAULT_STALE_LOCK_SECONDS = 30 * 60
+
+
+class BatchOptions:
+    """
+    Settings of a batch run.
+    @inputDirectory All the .fbx files under this directory are processed.
+    @outputDirectory Exported files mirror the subdirectories of @inputDirectory.
+    @shardIndex, @shardCount This host only processes shard @shardIndex of @shardCount.
+    @lockDirectory Shared by all hosts. Defaults to a subdirectory of @outputDirectory.
+    @staleLockSeconds Locks not refreshed for this long belong to dead hosts and can be stolen.
+    @importCacheDirectory Optional. Cache of imported FBX scenes, see importcachemixalot.
+    @keyFrameInterpolation 'KEEP', 'LINEAR' or 'CONSTANT', see apimixalot.Pipeline.ConvertInterpolation().
+    @exportFormat 'FBX', 'GLB' or 'BOTH', see commonmixalot.GetExportFormats().
+    @exportProfile One of the commonmixalot.EXPORT_PROFILE_* constants.
+    @clipVariants Optional. Clip variants exported next to each file, see variantmixalot.ParseClipVariants().
+    """
+    def __init__(self, inputDirectory: str, outputDirectory: str, shardIndex: int = 0, shardCount: int = 1,
+                 lockDirectory: str = None, staleLockSeconds: float = DEFAULT_STALE_LOCK_SECONDS,
+                 extractTranslationX: bool = True, extractTranslationY: bool = True,
+                 extractTranslationZ: bool = True, extractRotationZ: bool = False,
+                 unpackTextures: bool = False, importCacheDirectory: str = None,
+                 keyFrameInterpolation: str = "KEEP", exportFormat: str = cmn.EXPORT_FORMAT_FBX,
+                 exportProfile: str = cmn.EXPORT_PROFILE_DEFAULT, clipVariants: str = ""):
+        if (shardCount < 1) or not (0 <= shardIndex < shardCount):
+            raise Exception(f"Invalid shard {shardIndex} of {shardCount}")
+        self.inputDirectory = inputDirectory
+        self.outputDirectory = outputDirectory
+        self.shardIndex = shardIndex
+        self.shardCount = shardCount
+        self.lockDirectory = lockDirectory if lockDirectory else os.path.join(outputDirectory, DEFAULT_LOCK_DIRECTORY_NAME)
+        self.staleLockSeconds = staleLockSeconds
+        self.extractTranslationX = extractTranslationX
+        self.extractTranslationY = extractTranslationY
+        self.extractTranslationZ = extractTranslationZ
+        self.extractRotationZ = extractRotationZ
+        self.unpackTextures = unpackTextures
+        self.importCacheDirectory = importCacheDirectory
+        self.keyFrameInterpolation = keyFrameInterpolation
+        self.exportFormat = exportFormat
+        self.exportProfile = exportProfile
+        self.clipVariants = clipVariants
+
+
+def FindInputFiles(inputDirectory: str) -> list[str]:
+    """
+    Returns the sorted list of paths, relative to @inputDirectory and with
+    forward slashes, of all the .fbx files under @inputDirectory.
+    """
+    relativePaths = []
+    for directory, subdirectories, filenames in os.walk(inputDirectory):
+        subdirectories.sort()
+        for filename in filenames:
+            if filename.lower().endswith(".fbx"):
+                relativePath = os.path.relpath(os.path.join(directory, filename), inputDirectory)
+                relativePaths.append(relativePath.replace(os.sep, "/"))
+    return sorted(relativePaths)
+
+
+def GetShardIndex(relativePath: str, shardCount: int) -> int:
+    """
+    Returns the shard of @relativePath. Doesn't depend on the host, the
+    Python version or the order of the files.
+    """
+    return zlib.crc32(relativePath.encode('utf-8')) % shardCount
+
+
+def _GetMarkerPath(lockDirectory: str, relativePath: str, extension: str) -> str:
+    # Flat directory of markers. The hash avoids creating the input subdirectories.
+    return os.path.join(lockDirectory, hashlib.sha1(relativePath.encode('utf-8')).hexdigest() + extension)
+
+
+def _GetOwnerId() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def IsDone(lockDirectory: str, relativePath: str) -> bool:
+    return os.path.exists(_GetMarkerPath(lockDirectory, relativePath, ".done"))
+
+
+def _CreateLockFile(lockPath: str, relativePath: str) -> bool:
+    try:
+        fd = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, 'w') as lockFile:
+        json.dump({"file": relativePath, "owner": _GetOwnerId(), "time": time.time()}, lockFile)
+    return True
+
+
+def _ReadLockOwner(lockPath: str) -> str:
+    """
+    Returns the owner id recorded in the lock file @lockPath, or None if the
+    lock doesn't exist or is being written.
+    """
+    try:
+        with open(lockPath, 'r') as lockFile:
+            return json.load(lockFile).get("owner")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def TryClaim(lockDirectory: str, relativePath: str, staleLockSeconds: float) -> bool:
+    """
+    Returns True if this process now owns the lock of @relativePath.
+    A lock older than @staleLockSeconds is stolen: it is first renamed to a
+    name unique to this process. Rename is atomic, so if several hosts try to
+    steal the same lock only one of them gets the stale file. Another host may
+    have replaced the stale lock with a fresh one between the age check and the
+    rename, so the renamed file is compared with the stale one, and put back
+    if they differ.
+    """
+    lockPath = _GetMarkerPath(lockDirectory, relativePath, ".lock")
+    if _CreateLockFile(lockPath, relativePath):
+        return True
+    try:
+        staleMtime = os.stat(lockPath).st_mtime_ns
+    except FileNotFoundError:
+        # The owner just released it. Try again in the next run.
+        return False
+    lockAge = time.time() - staleMtime / 1e9
+    if lockAge < staleLockSeconds:
+        return False
+    stolenPath = f"{lockPath}.stolen-{socket.gethostname()}-{os.getpid()}"
+    try:
+        os.rename(lockPath, stolenPath)
+    except FileNotFoundError:
+        return False
+    if os.stat(stolenPath).st_mtime_ns != staleMtime:
+        # Renamed the fresh lock of another host. Put it back, unless yet
+        # another lock was created in the meantime.
+        try:
+            os.link(stolenPath, lockPath)
+        except FileExistsError:
+            _logger.warning("Lost the lock of '%s' of another host while stealing it", relativePath)
+        os.remove(stolenPath)
+        return False
+    os.remove(stolenPath)
+    _logger.warning("Stole stale lock of '%s', it was %.0f seconds old", relativePath, lockAge)
+    return _CreateLockFile(lockPath, relativePath)
+
+
+def OwnsClaim(lockDirectory: str, relativePath: str) -> bool:
+    """Returns True if the lock of @relativePath exists and belongs to this process."""
+    return _ReadLockOwner(_GetMarkerPath(lockDirectory, relativePath, ".lock")) == _GetOwnerId()
+
+
+def RefreshClaim(lockDirectory: str, relativePath: str) -> bool:
+    """
+    Heartbeat. Keeps the lock of @relativePath from becoming stale.
+    Returns False, and doesn't touch the lock, if it was stolen by another host.
+    """
+    if not OwnsClaim(lockDirectory, relativePath):
+        _logger.warning("The lock of '%s' was stolen while processing it", relativePath)
+        return False
+    try:
+        os.utime(_GetMarkerPath(lockDirectory, relativePath, ".lock"))
+    except FileNotFoundError:
+        _logger.warning("The lock of '%s' was stolen while processing it", relativePath)
+        return False
+    return True
+
+
+def ReleaseClaim(lockDirectory: str, relativePath: str, succeeded: bool, message: str = ""):
+    """
+    Writes the .done (or .failed) marker of @relativePath and removes its lock.
+    Failed files are retried by later runs.
+    If the lock was stolen, nothing is written nor removed, the host that
+    owns the lock now writes the markers.
+    """
+    if not OwnsClaim(lockDirectory, relativePath):
+        _logger.warning("The lock of '%s' is owned by another host, its markers are not written", relativePath)
+        return
+    extension = ".done" if succeeded else ".failed"
+    with open(_GetMarkerPath(lockDirectory, relativePath, extension), 'w') as markerFile:
+        json.dump({"file": relativePath, "owner": _GetOwnerId(), "time": time.time(), "message": message}, markerFile)
+    if succeeded:
+        failedPath = _GetMarkerPath(lockDirectory, relativePath, ".failed")
+        if os.path.exists(failedPath):
+            os.remove(failedPath)
+    try:
+        os.remove(_GetMarkerPath(lockDirectory, relativePath, ".lock"))
+    except FileNotFoundError:
+        pass
+
+
+def MakePipelineOptions(options: BatchOptions) -> api.PipelineOptions:
+    return api.PipelineOptions(
+        extractTranslationX=options.extractTranslationX,
+        extractTranslationY=options.extractTranslationY,
+        extractTranslationZ=options.extractTranslationZ,
+        extractRotationZ=options.extractRotationZ,
+        unpackTextures=options.unpackTextures,
+        useImportCache=bool(options.importCacheDirectory),
+        importCachePath=options.importCacheDirectory if options.importCacheDirectory else "",
+        keyFrameInterpolation=options.keyFrameInterpolation,
+        exportFormat=options.exportFormat,
+        exportProfile=options.exportProfile,
+        exportClipVariants=bool(options.clipVariants),
+        clipVariants=options.clipVariants)
+
+
+def ProcessFile(sceneObj: bpy.types.Scene, inputFilePath: str, outputDirectory: str, options: BatchOptions):
+    """
+    Import, root motion extraction and export of a single motion FBX file.
+    All the objects in @sceneObj are removed first.
+    Runs the steps of apimixalot.Pipeline, yielding their Status after each step.
+    Returns the list of apimixalot.ExportRecord of the exported files.
+    """
+    statuses = []
+    pipeline = api.Pipeline(sceneObj, MakePipelineOptions(options), statuses.append)
+    armatureObj = pipeline.Import(inputFilePath)
+    yield from statuses
+    statuses.clear()
+    pipeline.ExtractRootMotion(armatureObj)
+    yield from statuses
+    statuses.clear()
+    pipeline.Export(armatureObj, os.path.basename(inputFilePath), outputDirectory)
+    yield from statuses
+    return pipeline.exportRecords
+
+
+def _ProcessFileWithClaim(sceneObj: bpy.types.Scene, inputFilePath: str, outputDirectory: str, options: BatchOptions,
+                          relativePath: str):
+    """
+    Same as ProcessFile(), but the claim of @relativePath is refreshed after each step.
+    If the claim was stolen by another host, the remaining steps, including the
+    export, are skipped, and None is returned: the other host exports the file.
+    """
+    fileIterator = ProcessFile(sceneObj, inputFilePath, outputDirectory, options)
+    while True:
+        try:
+            status = next(fileIterator)
+        except StopIteration as result:
+            return result.value
+        if not RefreshClaim(options.lockDirectory, relativePath):
+            fileIterator.close()
+            return None
+        yield status
+
+
+def _FormatExportTotals(exportTotals: dict) -> str:
+    return ", ".join(f"{exportFormat} {count} files {seconds:.2f}s {sizeBytes / (1024 * 1024):.2f}MB"
+                     for exportFormat, (count, seconds, sizeBytes) in exportTotals.items())
+
+
+def RunBatch(sceneObj: bpy.types.Scene, options: BatchOptions):
+    """
+    Processes all the files of this shard that are not done nor claimed by
+    another host. Yields one Status per step.
+    Returns tuple (processedCount, skippedCount, failedList).
+    """
+    os.makedirs(options.lockDirectory, exist_ok=True)
+    relativePaths = [relativePath for relativePath in FindInputFiles(options.inputDirectory)
+                     if GetShardIndex(relativePath, options.shardCount) == options.shardIndex]
+    yield Status(f"Shard {options.shardIndex} of {options.shardCount} has {len(relativePaths)} files")
+    processedCount = 0
+    skippedCount = 0
+    failedList = []
+    # Export format to [fileCount, seconds, sizeBytes].
+    exportTotals = {}
+    for relativePath in relativePaths:
+        if IsDone(options.lockDirectory, relativePath) or \
+                not TryClaim(options.lockDirectory, relativePath, options.staleLockSeconds):
+            skippedCount += 1
+            continue
+        inputFilePath = os.path.join(options.inputDirectory, relativePath)
+        outputDirectory = os.path.join(options.outputDirectory, os.path.dirname(relativePath))
+        try:
+            exportRecords = yield from _ProcessFileWithClaim(sceneObj, inputFilePath, outputDirectory, options,
+                                                             relativePath)
+        except Exception as e:
+            ReleaseClaim(options.lockDirectory, relativePath, False, str(e))
+            failedList.append((relativePath, str(e)))
+            yield Status(f"Failed to process '{relativePath}': {e}")
+            continue
+        if exportRecords is None:
+            skippedCount += 1
+            yield Status(f"Stopped processing '{relativePath}', its lock was stolen by another host")
+            continue
+        ReleaseClaim(options.lockDirectory, relativePath, True)
+        processedCount += 1
+        for record in exportRecords:
+            totals = exportTotals.setdefault(record.exportFormat, [0, 0.0, 0])
+            totals[0] += len(record.filenames)
+            totals[1] += record.seconds
+            totals[2] += record.sizeBytes
+    cmn.ClearSceneObjects(sceneObj)
+    if exportTotals:
+        yield Status(f"Export totals: {_FormatExportTotals(exportTotals)}")
+    yield Status(f"Processed {processedCount} files, skipped {skippedCount}, failed {len(failedList)}")
+    return processedCount, skippedCount, failedList
+
+
+def ParseArguments(argv: list[str]) -> BatchOptions:
+    """
+    @argv The command line arguments. Only the arguments after "--" are
+        parsed, the ones before belong to Blender.
+    """
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="blender -b -P batchmixalot.py --",
+        description="Extracts the root motion of all the FBX files in a directory.")
+    parser.add_argument("--input", required=True, help="Directory with the input FBX files")
+    parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--shard", type=int, default=0, help="Index of the shard processed by this host")
+    parser.add_argument("--shard-count", type=int, default=1, help="Total number of shards")
+    parser.add_argument("--lock-dir", default=None, help="Shared lock directory. Defaults to a subdirectory of --output")
+    parser.add_argument("--stale-lock-seconds", type=float, default=DEFAULT_STALE_LOCK_SECONDS,
+                        help="Age after which a lock is considered abandoned")
+    parser.add_argument("--axes", default="XYZ", help="Translation axes to extract, example: XY")
+    parser.add_argument("--rotation-z", action="store_true", help="Also extract the rotation around Z axis")
+    parser.add_argument("--unpack-textures", action="store_true", help="Unpack the textures next to the exported files")
+    parser.add_argument("--format", default=cmn.EXPORT_FORMAT_FBX,
+                        choices=(cmn.EXPORT_FORMAT_FBX, cmn.EXPORT_FORMAT_GLB, cmn.EXPORT_FORMAT_BOTH),
+                        help="Output file format. BOTH reports the export time and size of each format")
+    parser.add_argument("--export-profile", default=cmn.EXPORT_PROFILE_DEFAULT,
+                        choices=(cmn.EXPORT_PROFILE_DEFAULT, cmn.EXPORT_PROFILE_AUTO,
+                                 cmn.EXPORT_PROFILE_ACTOR, cmn.EXPORT_PROFILE_MOTION),
+                        help="Exporter settings. MOTION skips meshes, leaf bones and non deform bones")
+    parser.add_argument("--interpolation", default="KEEP", choices=("KEEP", "LINEAR", "CONSTANT"),
+                        help="Interpolation of all the key frames. LINEAR or CONSTANT make extraction and export faster")
+    parser.add_argument("--variants", default="",
+                        help="Optional. Clip variants exported next to each file, example: \"mirror, speed:1.5, turn:45\"")
+    parser.add_argument("--import-cache", default=None, help="Optional. Directory of the cache of imported FBX scenes")
+    parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors")
+    parser.add_argument("--log-level", default="INFO", choices=log.LEVEL_NAMES, help="Minimum level of the log messages")
+    parser.add_argument("--profile", action="store_true",
+                        help="Log a report of the key frame, fcurve, bpy.ops and frame_set calls per step at the end")
+    args = parser.parse_args(argv)
+    log.SetLevel(args.log_level)
+    log.SetQuietMode(args.quiet)
+    if args.profile:
+        profile.StartProfiling()
+    axes = args.axes.upper()
+    return BatchOptions(args.input, args.output, args.shard, args.shard_count, args.lock_dir,
+                        args.stale_lock_seconds, "X" in axes, "Y" in axes, "Z" in axes,
+                        args.rotation_z, args.unpack_textures, args.import_cache, args.interpolation, args.format,
+                        args.export_profile, args.variants)
+
+
+def main(argv: list[str]) -> int:
+    options = ParseArguments(argv)
+    batch_iterator = RunBatch(bpy.context.scene, options)
+    try:
+        while True:
+            # Each Status logs its own message.
+            next(batch_iterator)
+    except StopIteration as result:
+        _, _, failedList = result.value
+    for relativePath, message in failedList:
+        _logger.error("FAILED: '%s': %s", relativePath, message)
+    profiler = profile.StopProfiling()
+    if profiler is not None:
+        # Logged as warnings, this way the report is printed in quiet mode too.
+        for line in profiler.FormatReport():
+            _logger.warning("%s", line)
+    return 1 if failedList else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
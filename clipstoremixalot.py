@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Columnar on-disk store of processed actions.
+# Each clip is one file. The location and rotation_quaternion tracks of the
+# Armature object and each of its pose bones are sampled on a common timeline
+# and stored as contiguous float32 columns, this way a single channel of a
+# single bone can be read, zero copy, from a memory mapped file.
+#
+# File layout (little endian):
+#   magic       8 bytes, CLIP_STORE_MAGIC
+#   version     uint32
+#   indexSize   uint32, size in bytes of the json index.
+#   index       utf-8 json, see _BuildIndex(). Padded with spaces to 16 bytes.
+#   frames      float32[frameCount], frame number of each sample.
+#   columns     float32[trackCount][channelCount][frameCount]
+
+import json
+import mmap
+import os
+import struct
+from array import array
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import commonmixalot as cmn
+    from . import fcurvesmixalot as fcv
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+
+CLIP_STORE_MAGIC = b"LMXCLIPS"
+CLIP_STORE_VERSION = 1
+CLIP_FILE_EXTENSION = ".lmxclip"
+# Name of the track with the animation of the Armature object itself (the root motion).
+ARMATURE_TRACK = ""
+CHANNELS = fcv.LOCATION_DATA_PATHS + fcv.QUATERNION_DATA_PATHS
+# Values of the channels when a track doesn't have fcurves for them.
+_REST_VALUES = (0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+_PREAMBLE_FORMAT = "<8sII"
+_ALIGNMENT = 16
+
+
+def _GetTrackFCurves(armatureObj: bpy.types.Armature, trackName: str, dataPaths: list[fcv.FCurveDataPath]) -> list[bpy.types.FCurve]:
+    if trackName == ARMATURE_TRACK:
+        return fcv.GetArmatureFCurves(armatureObj, dataPaths)
+    return fcv.GetPoseBoneFCurves(armatureObj, trackName, dataPaths)
+
+
+def _SampleTrack(armatureObj: bpy.types.Armature, trackName: str, frames: list[float]) -> list[list[float]]:
+    """
+    Returns one list of samples per channel in CHANNELS. Channels without
+    fcurves are filled with their rest value. Quaternions are only slerped if
+    all their channels have fcurves, otherwise each channel is lerped.
+    """
+    columns = []
+    for dataPaths, isQuaternion in ((fcv.LOCATION_DATA_PATHS, False), (fcv.QUATERNION_DATA_PATHS, True)):
+        fcurves = _GetTrackFCurves(armatureObj, trackName, dataPaths)
+        if None not in fcurves:
+            samples = fcv.SampleFCurves(fcurves, frames, isQuaternion)
+            columns.extend(list(column) for column in zip(*samples))
+            continue
+        offset = len(columns)
+        for idx, fcurve in enumerate(fcurves):
+            if fcurve is None:
+                columns.append([_REST_VALUES[offset + idx]] * len(frames))
+            else:
+                columns.append([sample[0] for sample in fcv.SampleFCurves([fcurve], frames)])
+    return columns
+
+
+def _BuildIndex(name: str, fps: float, frameCount: int, tracks: list[str]) -> dict:
+    return {
+        "name": name,
+        "fps": fps,
+        "frameCount": frameCount,
+        "channels": [f"{dataPath}[{index}]" for dataPath, index in CHANNELS],
+        "tracks": tracks,
+    }
+
+
+def MakeClipStoreFilename(storeDirectory: str, clipName: str) -> str:
+    return os.path.join(storeDirectory, f"{clipName}{CLIP_FILE_EXTENSION}")
+
+
+def WriteClip(filePath: str, name: str, fps: float, frames: list[float], tracks: list[str],
+              columns: list[list[float]]):
+    """
+    Doesn't depend on bpy.
+    @columns One list of len(@frames) samples per (track, channel), in track
+        major order, this is: columns[trackIndex * len(CHANNELS) + channelIndex]
+    """
+    index = json.dumps(_BuildIndex(name, fps, len(frames), tracks)).encode('utf-8')
+    headerSize = struct.calcsize(_PREAMBLE_FORMAT) + len(index)
+    paddedHeaderSize = (headerSize + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+    index += b" " * (paddedHeaderSize - headerSize)
+    data = array('f', frames)
+    for column in columns:
+        if len(column) != len(frames):
+            raise Exception(f"Clip '{name}' has a column with {len(column)} samples, expected {len(frames)}")
+        data.extend(column)
+    if struct.pack("=I", 1) != struct.pack("<I", 1):
+        data.byteswap()
+    with open(filePath, 'wb') as outfile:
+        outfile.write(struct.pack(_PREAMBLE_FORMAT, CLIP_STORE_MAGIC, CLIP_STORE_VERSION, len(index)))
+        outfile.write(index)
+        data.tofile(outfile)
+
+
+def WriteActionToClipStore(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature,
+                           storeDirectory: str, clipName: str = None) -> str:
+    """
+    Persists the current action of @armatureObj in @storeDirectory. All the
+    tracks are sampled on the union of the key frames of the action.
+    @clipName Defaults to the action name.
+    Returns the fully qualified path of the clip file.
+    """
+    action = armatureObj.animation_data.action if armatureObj.animation_data else None
+    if action is None:
+        raise Exception(f"The armature '{armatureObj.name}' doesn't have animation data")
+    if clipName is None:
+        clipName = action.name
+    frames = fcv.BuildUnionTimeline(action.fcurves)
+    tracks = [ARMATURE_TRACK] + [poseBone.name for poseBone in armatureObj.pose.bones]
+    columns = []
+    for trackName in tracks:
+        columns.extend(_SampleTrack(armatureObj, trackName, frames))
+    os.makedirs(storeDirectory, exist_ok=True)
+    filePath = MakeClipStoreFilename(storeDirectory, clipName)
+    WriteClip(filePath, clipName, cmn.GetSceneFps(sceneObj), frames, tracks, columns)
+    return filePath
+
+
+class ClipReader:
+    """
+    Memory maps a clip file. Only the json index is parsed, the samples are
+    memoryviews of the mapped file.
+    Assumes a little endian host. Use it as a context manager, or call Close() when done.
+    """
+    def __init__(self, filePath: str):
+        self._file = open(filePath, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        preambleSize = struct.calcsize(_PREAMBLE_FORMAT)
+        magic, version, indexSize = struct.unpack_from(_PREAMBLE_FORMAT, self._mmap, 0)
+        if (magic != CLIP_STORE_MAGIC) or (version != CLIP_STORE_VERSION):
+            self._mmap.close()
+            self._file.close()
+            raise Exception(f"'{filePath}' is not a version {CLIP_STORE_VERSION} clip file")
+        self.index = json.loads(self._mmap[preambleSize:preambleSize + indexSize].decode('utf-8'))
+        self.name = self.index["name"]
+        self.fps = self.index["fps"]
+        self.frameCount = self.index["frameCount"]
+        self.tracks = self.index["tracks"]
+        self._trackIndices = {trackName: idx for idx, trackName in enumerate(self.tracks)}
+        self._view = memoryview(self._mmap)[preambleSize + indexSize:]
+        self._samples = self._view.cast('f')
+        # Slices returned by GetFrames() and GetChannel().
+        self._sliceViews = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+    def Close(self):
+        """
+        Closes the file. The memoryviews returned by GetFrames() and
+        GetChannel() are released, they can't be used after this.
+        """
+        if self._mmap is None:
+            return
+        try:
+            # All the memoryviews must be released before the mmap can be closed.
+            for view in self._sliceViews:
+                view.release()
+            self._sliceViews = []
+            self._samples.release()
+            self._view.release()
+            self._mmap.close()
+        finally:
+            self._file.close()
+            self._mmap = None
+
+    def _GetSlice(self, start: int, end: int) -> memoryview:
+        view = self._samples[start:end]
+        self._sliceViews.append(view)
+        return view
+
+    def GetFrames(self) -> memoryview:
+        return self._GetSlice(0, self.frameCount)
+
+    def HasTrack(self, trackName: str) -> bool:
+        return trackName in self._trackIndices
+
+    def GetChannel(self, trackName: str, channelIndex: int) -> memoryview:
+        """
+        Returns the samples of channel @channelIndex (position in CHANNELS)
+        of track @trackName, without copying them.
+        """
+        column = self._trackIndices[trackName] * len(CHANNELS) + channelIndex
+        start = self.frameCount * (column + 1)
+        return self._GetSlice(start, start + self.frameCount)
+
+    def _GetSamples(self, trackName: str, channelIndices: range) -> list[tuple]:
+        column = self._trackIndices[trackName] * len(CHANNELS)
+        channels = []
+        for channelIndex in channelIndices:
+            start = self.frameCount * (column + channelIndex + 1)
+            with self._samples[start:start + self.frameCount] as view:
+                channels.append(view.tolist())
+        return list(zip(*channels))
+
+    def GetLocations(self, trackName: str) -> list[tuple]:
+        return self._GetSamples(trackName, range(3))
+
+    def GetQuaternions(self, trackName: str) -> list[tuple]:
+        return self._GetSamples(trackName, range(3, 7))
+
+
+class ClipStore:
+    """
+    A directory of clip files.
+    """
+    def __init__(self, storeDirectory: str):
+        self.storeDirectory = storeDirectory
+
+    def GetClipNames(self) -> list[str]:
+        if not os.path.isdir(self.storeDirectory):
+            return []
+        return sorted(os.path.splitext(filename)[0] for filename in os.listdir(self.storeDirectory)
+                      if filename.endswith(CLIP_FILE_EXTENSION))
+
+    def OpenClip(self, clipName: str) -> ClipReader:
+        return ClipReader(MakeClipStoreFilename(self.storeDirectory, clipName))
+
+    def GetClipIndices(self) -> dict:
+        """
+        Returns a dictionary, clip name to json index. Only the headers are read.
+        """
+        indices = {}
+        for clipName in self.GetClipNames():
+            with self.OpenClip(clipName) as reader:
+                indices[clipName] = reader.index
+        return indices
+
+
+def ApplyClipToArmature(reader: ClipReader, armatureObj: bpy.types.Armature, actionName: str = None) -> bpy.types.Action:
+    """
+    Creates a new action from the clip in @reader and assigns it to @armatureObj.
+    Tracks of bones that don't exist in @armatureObj are skipped.
+    Returns the new action.
+    """
+    action = bpy.data.actions.new(actionName if actionName else reader.name)
+    frames = list(reader.GetFrames())
+    for trackName in reader.tracks:
+        if trackName == ARMATURE_TRACK:
+            prefix = ""
+            groupName = "Object Transforms"
+        elif trackName in armatureObj.pose.bones:
+            prefix = f"pose.bones[\"{trackName}\"]."
+            groupName = trackName
+        else:
+            _logger.warning("Skipping track of bone '%s', it doesn't exist in armature '%s'", trackName, armatureObj.name)
+            continue
+        for channelIndex, (dataPath, index) in enumerate(CHANNELS):
+            fcurve = action.fcurves.new(prefix + dataPath, index=index, action_group=groupName)
+            fcv.SetFCurveKeyFrames(fcurve, frames, reader.GetChannel(trackName, channelIndex))
+    if armatureObj.animation_data is None:
+        armatureObj.animation_data_create()
+    armatureObj.animation_data.action = action
+    armatureObj.rotation_mode = 'QUATERNION'
+    for poseBone in armatureObj.pose.bones:
+        poseBone.rotation_mode = 'QUATERNION'
+    return action
@@ -23,10 +23,23 @@ SOFTWARE.
 """
 import os
 import json
+import math
 
 import bpy
 from mathutils import *
 
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    import importcachemixalot as icache
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import importcachemixalot as icache
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
 class Axis:
     X = Vector([1, 0, 0])
     Y = Vector([0, 1, 0])
@@ -34,13 +47,13 @@ class Axis:
 
 #For debugging.
 def Dump(obj):
-    print(type(obj))
-    print(dir(obj))
+    _logger.debug("%s", type(obj))
+    _logger.debug("%s", dir(obj))
 
 class Status:
     """ Used for yield statements """
     def __init__(self, msg, status_type='default'):
-        print(msg)
+        _logger.info("%s", msg)
         self.msg = msg
         self.status_type = status_type
     def __str__(self):
@@ -57,7 +70,43 @@ def ApplyCurrentRotationAs000(obj: bpy.types.Object, verbose: bool = False):
     bpy.ops.object.mode_set(mode='OBJECT')
     bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
     if verbose:
-        print(f"Applied current rotation as 0,0,0 to object named '{obj.name}'")
+        _logger.info("Applied current rotation as 0,0,0 to object named '%s'", obj.name)
+
+
+def SelectOnlyObjects(scene: bpy.types.Scene, objs: list[bpy.types.Object]) -> list[bpy.types.Object]:
+    """
+    Selects @objs and deselects all the other objects of @scene.
+    Returns the list of objects that were selected before, to restore the selection later.
+    """
+    previousSelection = [obj for obj in scene.objects if obj.select_get()]
+    objsSet = set(objs)
+    for obj in scene.objects:
+        obj.select_set(obj in objsSet)
+    return previousSelection
+
+
+def ApplyCurrentRotationAs000ToObjects(objs: list[bpy.types.Object]):
+    """
+    Same as ApplyCurrentRotationAs000() for all @objs, with a single mode switch
+    and a single operator call. The selection is restored afterwards.
+    """
+    scene = bpy.context.scene
+    previousSelection = SelectOnlyObjects(scene, objs)
+    try:
+        bpy.ops.object.mode_set(mode='OBJECT')
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
+    finally:
+        SelectOnlyObjects(scene, previousSelection)
+
+
+def GetObjectHierarchy(obj: bpy.types.Object) -> list[bpy.types.Object]:
+    """
+    Returns @obj followed by all its descendants.
+    """
+    hierarchy = [obj]
+    for childObj in obj.children:
+        hierarchy.extend(GetObjectHierarchy(childObj))
+    return hierarchy
 
 
 def GetRootBone(obj: bpy.types.Armature) -> bpy.types.Bone:
@@ -125,6 +174,59 @@ def GetPoseBoneFromArmature(armatureObj, boneName):
             return bone
     return None
 
+def GetNearestAncestorBoneNotIn(bone: bpy.types.Bone, excludedBoneNames: set[str]) -> bpy.types.Bone:
+    """
+    Walks up the hierarchy of @bone and returns the first ancestor whose name is
+    not in @excludedBoneNames. Returns None if there's no such ancestor.
+    """
+    parent = bone.parent
+    while (parent is not None) and (parent.name in excludedBoneNames):
+        parent = parent.parent
+    return parent
+
+
+def GetSkinnedChildMeshes(armatureObj: bpy.types.Armature) -> list[bpy.types.Object]:
+    """
+    Returns the first level children of @armatureObj that are of type 'MESH'
+    and are deformed by an Armature modifier that targets @armatureObj.
+    """
+    meshObjs = []
+    for childObj in armatureObj.children:
+        if childObj.type != 'MESH':
+            continue
+        for modifier in childObj.modifiers:
+            if (modifier.type == 'ARMATURE') and (modifier.object == armatureObj):
+                meshObjs.append(childObj)
+                break
+    return meshObjs
+
+
+def RemoveBones(armatureObj: bpy.types.Armature, boneNames: set[str]):
+    """
+    Removes the bones named in @boneNames from @armatureObj.
+    Children of removed bones are reparented by Blender to the parent
+    of the removed bone. At the end @armatureObj is left as the active object.
+    """
+    #Edit Mode applies to the active object, which may be a mesh.
+    viewLayer = bpy.context.view_layer
+    activeObj = viewLayer.objects.active
+    if (activeObj is not None) and (activeObj.mode != 'OBJECT'):
+        bpy.ops.object.mode_set(mode='OBJECT')
+    viewLayer.objects.active = armatureObj
+    armatureObj.select_set(True)
+    #Enter Edit Mode
+    bpy.ops.object.mode_set(mode='EDIT', toggle=False)
+
+    ebones = armatureObj.data.edit_bones
+    for boneName in boneNames:
+        ebone = ebones.get(boneName)
+        if ebone is not None:
+            ebones.remove(ebone)
+
+    #Exit edit mode to save bones so they can be used in pose mode
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+
 def AddSiblingRootBone(obj, boneName):
     hasOnlyOneRootBone = cmn.HasOnlyOneRootBone(obj)
     hasRootMotionBone = cmn.HasRootMotionBone(obj, boneName)
@@ -132,7 +234,7 @@ def AddSiblingRootBone(obj, boneName):
         raise Exception("Most likely this asset was already processed because it contains a single 'root' bone")
         return
     if hasRootMotionBone:
-        print("Armature already had root motion bone")
+        _logger.info("Armature already had root motion bone")
         return
     #Enter Edit Mode
     bpy.ops.object.mode_set(mode='EDIT', toggle=False)
@@ -147,7 +249,7 @@ def AddSiblingRootBone(obj, boneName):
     #Exit edit mode to save bones so they can be used in pose mode
     bpy.ops.object.mode_set(mode='OBJECT')
 
-    print("Added bone '{}' as sibling of the current root bone.".format(boneName))
+    _logger.info("Added bone '%s' as sibling of the current root bone.", boneName)
 
 
 def MakeParentBone(obj, parentBoneName, childBoneName):
@@ -157,38 +259,183 @@ def MakeParentBone(obj, parentBoneName, childBoneName):
     ebones = obj.data.edit_bones
     rootBoneIndex = ebones.find(parentBoneName)
     childBoneIndex = ebones.find(childBoneName)
-    print("root bone index = {}, child bone index = {}".format(rootBoneIndex, childBoneIndex))
+    _logger.debug("root bone index = %d, child bone index = %d", rootBoneIndex, childBoneIndex)
     ebones[childBoneIndex].parent = ebones[rootBoneIndex]
     
     #Exit edit mode to save bones so they can be used in pose mode
     bpy.ops.object.mode_set(mode='OBJECT')
 
 
-def _ExportFbxInternal(fbxFilePath: str):
+# Export backends. 'BOTH' exports each file twice, to compare their time and size.
+EXPORT_FORMAT_FBX = 'FBX'
+EXPORT_FORMAT_GLB = 'GLB'
+EXPORT_FORMAT_BOTH = 'BOTH'
+EXPORT_FORMAT_EXTENSIONS = {
+    EXPORT_FORMAT_FBX: ".fbx",
+    EXPORT_FORMAT_GLB: ".glb",
+}
+
+
+def GetExportFormats(exportFormat: str) -> list[str]:
+    """
+    Returns the list of backends used by the export format option @exportFormat.
+    """
+    if exportFormat == EXPORT_FORMAT_BOTH:
+        return [EXPORT_FORMAT_FBX, EXPORT_FORMAT_GLB]
+    if exportFormat not in EXPORT_FORMAT_EXTENSIONS:
+        raise Exception(f"Unknown export format '{exportFormat}'")
+    return [exportFormat]
+
+
+# Export profiles. Each one is a set of exporter settings tuned for a kind of output file.
+#   DEFAULT: The whole scene with the exporter defaults, same as older versions of lumbermixalot.
+#   ACTOR: Meshes and skeleton, no animation.
+#   MOTION: Deform bones and the action only. No meshes, no leaf bones, and the
+#     baked key frames are written as they are, without the simplification pass,
+#     because the actions already have one key frame per frame.
+#   AUTO: ACTOR if the armature has skinned meshes, MOTION otherwise. See ResolveExportProfile().
+# The glTF exporter has no filter by object type, for MOTION only the armatures
+# are selected while exporting, see _ExportGlbInternal().
+EXPORT_PROFILE_DEFAULT = 'DEFAULT'
+EXPORT_PROFILE_ACTOR = 'ACTOR'
+EXPORT_PROFILE_MOTION = 'MOTION'
+EXPORT_PROFILE_AUTO = 'AUTO'
+
+_FBX_PROFILE_SETTINGS = {
+    EXPORT_PROFILE_DEFAULT: {},
+    EXPORT_PROFILE_ACTOR: {
+        "object_types": {'ARMATURE', 'MESH'},
+        "add_leaf_bones": False,
+        "bake_anim": False,
+    },
+    EXPORT_PROFILE_MOTION: {
+        "object_types": {'ARMATURE'},
+        "use_armature_deform_only": True,
+        "add_leaf_bones": False,
+        "bake_anim": True,
+        "bake_anim_use_all_bones": True,
+        "bake_anim_use_nla_strips": False,
+        "bake_anim_use_all_actions": False,
+        "bake_anim_force_startend_keying": False,
+        "bake_anim_simplify_factor": 0.0,
+    },
+}
+
+_GLB_PROFILE_SETTINGS = {
+    EXPORT_PROFILE_DEFAULT: {},
+    EXPORT_PROFILE_ACTOR: {
+        "export_animations": False,
+    },
+    EXPORT_PROFILE_MOTION: {
+        "export_def_bones": True,
+        "export_materials": 'NONE',
+    },
+}
+
+
+def ResolveExportProfile(exportProfile: str, armatureObj: bpy.types.Object) -> str:
+    """
+    Returns @exportProfile, or the profile chosen for @armatureObj if it is EXPORT_PROFILE_AUTO.
+    The choice depends on the skinned meshes, not on the action: Mixamo characters
+    are imported with a short "mixamo.com" action, and they must keep their meshes.
+    """
+    if exportProfile != EXPORT_PROFILE_AUTO:
+        if exportProfile not in _FBX_PROFILE_SETTINGS:
+            raise Exception(f"Unknown export profile '{exportProfile}'")
+        return exportProfile
+    if armatureObj is None:
+        return EXPORT_PROFILE_DEFAULT
+    if len(GetSkinnedChildMeshes(armatureObj)) > 0:
+        return EXPORT_PROFILE_ACTOR
+    return EXPORT_PROFILE_MOTION
+
+
+def _ExportFbxInternal(fbxFilePath: str, bakeAnimStep: float = 1.0, useSelection: bool = False,
+                       exportProfile: str = EXPORT_PROFILE_DEFAULT):
     """
     Exports the current scene with the right settings for O3DE.
     @fbxFilePath A fully qualified file path, suitable for file exporting.
+    @bakeAnimStep How often, in frames, the animation is sampled.
+    @useSelection If True, only the selected objects are exported.
+    @exportProfile One of the EXPORT_PROFILE_* constants, except EXPORT_PROFILE_AUTO.
+    Returns the step, in frames, used to sample the animation.
     """
-    bpy.ops.export_scene.fbx(filepath=fbxFilePath, check_existing=False, axis_forward='-Y', axis_up='Z')#, path_mode='COPY')
-    print(f"FBX file '{fbxFilePath}' was exported successfully")
+    bpy.ops.export_scene.fbx(filepath=fbxFilePath, check_existing=False, axis_forward='-Y', axis_up='Z',
+                             bake_anim_step=bakeAnimStep, use_selection=useSelection,
+                             **_FBX_PROFILE_SETTINGS[exportProfile])#, path_mode='COPY')
+    _logger.info("FBX file '%s' was exported successfully with the %s profile", fbxFilePath, exportProfile)
+    return bakeAnimStep
 
 
-def _MakeFilePathForFBX(fbxFilename: str, fbxOutputPath: str) -> str:
+def _ExportGlbInternal(glbFilePath: str, bakeAnimStep: float = 1.0, useSelection: bool = False,
+                       exportProfile: str = EXPORT_PROFILE_DEFAULT):
+    """
+    Same as _ExportFbxInternal() but writes binary glTF. glTF is always Y up, the
+    exporter converts from Blender Z up, and importers convert back, this way
+    the result matches the FBX files exported with axis_up='Z'. The root motion
+    is the animation of the Armature node, same as in the FBX files.
+    Only the frames inside the scene frame range are exported. Textures are
+    embedded in the .glb file. With EXPORT_PROFILE_MOTION only the armatures
+    are exported, without meshes nor materials.
+    The glTF exporter only supports whole frame steps, @bakeAnimStep is rounded
+    and a warning is logged if that changes the sample rate.
+    Returns the step, in frames, used to sample the animation.
+    """
+    settings = {"export_animations": True}
+    settings.update(_GLB_PROFILE_SETTINGS[exportProfile])
+    frameStep = max(1, int(round(bakeAnimStep)))
+    if not math.isclose(frameStep, bakeAnimStep, abs_tol=1e-3):
+        _logger.warning("glTF only supports whole frame steps, '%s' is sampled every %d frames instead of every %.3f frames",
+                        glbFilePath, frameStep, bakeAnimStep)
+    previousSelection = None
+    if exportProfile == EXPORT_PROFILE_MOTION:
+        # Same as object_types={'ARMATURE'} of the FBX exporter.
+        scene = bpy.context.scene
+        armatureObjs = [obj for obj in scene.objects
+                        if (obj.type == 'ARMATURE') and (obj.select_get() or not useSelection)]
+        previousSelection = SelectOnlyObjects(scene, armatureObjs)
+        useSelection = True
+    try:
+        bpy.ops.export_scene.gltf(filepath=glbFilePath, check_existing=False, export_format='GLB',
+                                  export_yup=True, use_selection=useSelection, export_frame_range=True,
+                                  export_frame_step=frameStep, **settings)
+    finally:
+        if previousSelection is not None:
+            SelectOnlyObjects(bpy.context.scene, previousSelection)
+    _logger.info("GLB file '%s' was exported successfully with the %s profile", glbFilePath, exportProfile)
+    return float(frameStep)
+
+
+def _ExportInternal(filePath: str, exportFormat: str, bakeAnimStep: float = 1.0, useSelection: bool = False,
+                    exportProfile: str = EXPORT_PROFILE_DEFAULT):
+    """
+    Exports the current scene to @filePath with the backend @exportFormat,
+    EXPORT_FORMAT_FBX or EXPORT_FORMAT_GLB.
+    Returns the step, in frames, used to sample the animation. It may differ
+    from @bakeAnimStep, see _ExportGlbInternal().
+    """
+    if exportFormat == EXPORT_FORMAT_GLB:
+        return _ExportGlbInternal(filePath, bakeAnimStep, useSelection, exportProfile)
+    return _ExportFbxInternal(filePath, bakeAnimStep, useSelection, exportProfile)
+
+
+def _MakeFilePathForFBX(fbxFilename: str, fbxOutputPath: str, exportFormat: str = EXPORT_FORMAT_FBX) -> str:
     """
     Returns a fully qualified file path, suitable for file exporting.
     @fbxFilename File name (no path). '.fbx' extension is optional.
         Can not be empty or None.
     @fbxOutputPath Output directory. The directory will be created if it doesn't exist.
+    @exportFormat The extension of the file path is the one of this backend.
     """
     #Clean the fbxFilename.
     name, _ = os.path.splitext(fbxFilename)
-    fbxFilename = f"{name}.fbx"
+    fbxFilename = name + EXPORT_FORMAT_EXTENSIONS[exportFormat]
     #Make sure the output directory exists. If not, create it.
     if not os.path.exists(fbxOutputPath):
         try:
             os.makedirs(fbxOutputPath)
         except:
-            print(f"Failed to create output dir: '{fbxOutputPath}'")
+            _logger.error("Failed to create output dir: '%s'", fbxOutputPath)
             return None
     return os.path.join(fbxOutputPath, fbxFilename)
 
@@ -213,7 +460,7 @@ def _CreateTexturesSubdir(outputDirectoryPath: str, subdirName: str = "textures"
         try:
             os.makedirs(finalDir)
         except:
-            print(f"Failed to create output textures dir: '{finalDir}'")
+            _logger.error("Failed to create output textures dir: '%s'", finalDir)
             return outputDirectoryPath
     return finalDir
 
@@ -236,13 +483,14 @@ def _UnpackTextures(outputDirectoryPath: str, filenamePrefix: str):
         image.filepath = finalOutputPath
         image.filepath_raw = finalOutputPath
         image.save()
-        print(f"Unpacked Texture {image.name} As: {finalOutputPath}")
+        _logger.info("Unpacked Texture %s As: %s", image.name, finalOutputPath)
         # Leave as is.
         image.filepath = originalFilepath
         image.filepath_raw = originalFilepathRaw
 
 
-def ExportFBX(fbxFilename: str, fbxOutputPath: str, unpackTextures: bool) -> str:
+def ExportFBX(fbxFilename: str, fbxOutputPath: str, unpackTextures: bool, useSelection: bool = False,
+              exportFormat: str = EXPORT_FORMAT_FBX, exportProfile: str = EXPORT_PROFILE_DEFAULT) -> str:
     """
     Convenience function to export the current scene as FBX per the required
     O3DE configuration. 
@@ -250,20 +498,126 @@ def ExportFBX(fbxFilename: str, fbxOutputPath: str, unpackTextures: bool) -> str
     @fbxFilename File name (no path). '.fbx' extension is optional.
     @fbxOutputPath Output directory. Only relevant if @fbxFilename
         is valid.
+    @useSelection If True, only the selected objects are exported.
+    @exportFormat EXPORT_FORMAT_FBX or EXPORT_FORMAT_GLB. The extension of
+        the output file is replaced accordingly. GLB files embed their textures.
+    @exportProfile One of the EXPORT_PROFILE_* constants, except EXPORT_PROFILE_AUTO,
+        see ResolveExportProfile().
     
-    If Successful, returns the fully qualified path of the exported FBX file.
+    If Successful, returns the fully qualified path of the exported file.
     """
     outputFilename = _MakeFilePathForFBX(fbxFilename,
-                                        fbxOutputPath)
+                                        fbxOutputPath, exportFormat)
     if outputFilename is None:
         raise Exception("Undefined output filename")
-    _ExportFbxInternal(outputFilename)
-    if unpackTextures:
+    _ExportInternal(outputFilename, exportFormat, useSelection=useSelection, exportProfile=exportProfile)
+    if unpackTextures and (exportFormat == EXPORT_FORMAT_FBX) and (exportProfile != EXPORT_PROFILE_MOTION):
         prefix, _ = os.path.splitext(fbxFilename)
         _UnpackTextures(fbxOutputPath, prefix)
     return outputFilename
 
 
+def ParseFrameRanges(frameRangesText: str) -> list[int, int]:
+    """
+    Parses a comma separated list of frame ranges. Example: "1-120, 150-300"
+    Returns a list of tuples (startFrame, endFrame) sorted by startFrame.
+    Returns an empty list if @frameRangesText is empty.
+    Raises an exception if a range is malformed or if the ranges overlap.
+    """
+    frameRanges = []
+    for rangeText in frameRangesText.split(","):
+        rangeText = rangeText.strip()
+        if rangeText == "":
+            continue
+        parts = rangeText.split("-")
+        if len(parts) != 2:
+            raise Exception(f"Invalid frame range '{rangeText}'. Expected format is 'start-end'")
+        try:
+            startFrame, endFrame = int(parts[0]), int(parts[1])
+        except ValueError:
+            raise Exception(f"Invalid frame range '{rangeText}'. Frame numbers must be integers")
+        if startFrame > endFrame:
+            raise Exception(f"Invalid frame range '{rangeText}'. Start frame is greater than end frame")
+        frameRanges.append((startFrame, endFrame))
+    frameRanges.sort()
+    for (_, previousEnd), (startFrame, endFrame) in zip(frameRanges, frameRanges[1:]):
+        if startFrame <= previousEnd:
+            raise Exception(f"The frame range {startFrame}-{endFrame} overlaps with a previous range")
+    return frameRanges
+
+
+def MakeClipFilename(fbxFilename: str, startFrame: int, endFrame: int) -> str:
+    """
+    Returns the file name of the clip between @startFrame and @endFrame of @fbxFilename.
+    Example: "Walking.fbx" -> "Walking_1_120.fbx"
+    """
+    name, _ = os.path.splitext(fbxFilename)
+    return f"{name}_{startFrame}_{endFrame}.fbx"
+
+
+def MakeArmatureFilename(fbxFilename: str, armatureName: str) -> str:
+    """
+    Returns the file name of the armature named @armatureName when several
+    armatures of the same scene are exported.
+    Example: "Crowd.fbx", "Armature.001" -> "Crowd_Armature_001.fbx"
+    """
+    name, _ = os.path.splitext(fbxFilename)
+    return f"{name}_{bpy.path.clean_name(armatureName)}.fbx"
+
+
+def ExportFBXClips(sceneObj: bpy.types.Scene, fbxFilename: str, fbxOutputPath: str,
+                   unpackTextures: bool, frameRanges: list[int, int], useSelection: bool = False,
+                   exportFormat: str = EXPORT_FORMAT_FBX,
+                   exportProfile: str = EXPORT_PROFILE_DEFAULT) -> list[str]:
+    """
+    Exports one FBX file per frame range in @frameRanges. The FBX exporter only
+    bakes the frames inside the scene frame range, this way the cost of each
+    export is proportional to the length of its range.
+    @exportFormat EXPORT_FORMAT_FBX or EXPORT_FORMAT_GLB.
+    @exportProfile One of the EXPORT_PROFILE_* constants, except EXPORT_PROFILE_AUTO.
+    Returns the list of fully qualified paths of the exported files.
+    """
+    originalFrameStart = sceneObj.frame_start
+    originalFrameEnd = sceneObj.frame_end
+    outputFilenames = []
+    try:
+        for startFrame, endFrame in frameRanges:
+            outputFilename = _MakeFilePathForFBX(MakeClipFilename(fbxFilename, startFrame, endFrame), fbxOutputPath,
+                                                 exportFormat)
+            if outputFilename is None:
+                raise Exception("Undefined output filename")
+            sceneObj.frame_start = startFrame
+            sceneObj.frame_end = endFrame
+            _ExportInternal(outputFilename, exportFormat, useSelection=useSelection, exportProfile=exportProfile)
+            outputFilenames.append(outputFilename)
+    finally:
+        sceneObj.frame_start = originalFrameStart
+        sceneObj.frame_end = originalFrameEnd
+    if unpackTextures and (exportFormat == EXPORT_FORMAT_FBX) and (exportProfile != EXPORT_PROFILE_MOTION):
+        prefix, _ = os.path.splitext(fbxFilename)
+        _UnpackTextures(fbxOutputPath, prefix)
+    return outputFilenames
+
+
+def GetSceneFps(scene: bpy.types.Scene) -> float:
+    return scene.render.fps / scene.render.fps_base
+
+
+def SetSceneFrame(scene: bpy.types.Scene, frame: int):
+    """
+    Same as scene.frame_set(), all the add-on code goes through this function,
+    this way profilemixalot can count and time the depsgraph evaluations.
+    """
+    scene.frame_set(frame)
+
+
+def GetArmatures(scene: bpy.types.Scene, selectedOnly: bool = False) -> list[bpy.types.Object]:
+    """
+    Returns all the Armatures in the scene, or only the selected ones if @selectedOnly.
+    """
+    return [obj for obj in scene.objects if (obj.type == 'ARMATURE') and ((not selectedOnly) or obj.select_get())]
+
+
 def GetFirstAmature(scene: bpy.types.Scene):
     """
     Returns the first Armature in the scene.
@@ -283,11 +637,10 @@ def _ClearCachedCollectionData(collection: bpy.types.bpy_prop_collection, collec
     for name in collection.keys():
         dataNames.append(name)
     if len(dataNames) > 0:
-        print(f"Found {len(dataNames)} leftover {collectionTypeName}s. Will proceed to remove them...")
         for name in dataNames:
             collection.remove(collection[name])
-            print(f"Removed leftover {collectionTypeName} '{name}'")
-        print(f"Removed all leftover {collectionTypeName}s")
+            _logger.debug("Removed leftover %s '%s'", collectionTypeName, name)
+        _logger.info("Removed %d leftover %ss", len(dataNames), collectionTypeName)
 
 
 def _ClearOldAnimationData():
@@ -298,19 +651,37 @@ def _ClearOldTextureData():
     _ClearCachedCollectionData(bpy.data.images, "texture")
 
 
-def ImportFBX(fbxFilepath: str):
+def ClearSceneObjects(scene: bpy.types.Scene):
+    """
+    Removes all the objects of @scene, and the animation data left behind.
+    Useful when processing several FBX files in the same Blender session.
     """
-    Convenience function to  import an FBX file. 
+    for obj in list(scene.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    _ClearOldAnimationData()
 
-    @fbxFilename File name (no path). '.fbx' extension is optional.
-    @fbxOutputPath Output directory. Only relevant if @fbxFilename
-        is valid.
-    
-    If Successful, returns the fully qualified path of the exported FBX file.
+
+def ImportFBX(fbxFilepath: str, cacheDirectory: str = None, maxCacheBytes: int = icache.DEFAULT_CACHE_MAX_BYTES):
+    """
+    Convenience function to import an FBX file into the current scene.
+    Left over animation and texture data is removed first.
+
+    @fbxFilepath Fully qualified path of the FBX file.
+    @cacheDirectory Optional. If not None, the imported scene is cached as
+        a .blend file in this directory, and reimporting the same FBX content
+        loads it from the cache. See importcachemixalot.
+    @maxCacheBytes Only used with @cacheDirectory. Size limit of the cache,
+        the least recently used entries are evicted when it is exceeded.
+
+    Returns None, errors are raised as exceptions. Use GetFirstAmature() to
+    find the imported Armature.
     """
     #Before importing, let's clear any left over animation and texture data.
     _ClearOldAnimationData()
     _ClearOldTextureData()
+    if cacheDirectory:
+        icache.ImportFBXCached(fbxFilepath, cacheDirectory, maxCacheBytes)
+        return
     bpy.ops.import_scene.fbx(filepath=fbxFilepath)
 
 
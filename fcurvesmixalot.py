@@ -1,7 +1,21 @@
 # Useful functions to work with fcurves (animation key frames)
+import bisect
+import math
+from array import array
+
 import bpy
 import mathutils
 
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
 class FCurveDataPath:
     LOCATION_X = ('location', 0)
     LOCATION_Y = ('location', 1)
@@ -14,9 +28,35 @@ class FCurveDataPath:
     SCALE_Y = ('scale', 1)
     SCALE_Z = ('scale', 2)
 
+LOCATION_DATA_PATHS = (
+    FCurveDataPath.LOCATION_X,
+    FCurveDataPath.LOCATION_Y,
+    FCurveDataPath.LOCATION_Z,
+)
+
+QUATERNION_DATA_PATHS = (
+    FCurveDataPath.QUATERNION_W,
+    FCurveDataPath.QUATERNION_X,
+    FCurveDataPath.QUATERNION_Y,
+    FCurveDataPath.QUATERNION_Z,
+)
+
 def BuildPoseBoneFCurveDataPath(boneName, vectorName):
     return f"pose.bones[\"{boneName}\"].{vectorName}"
 
+def GetPoseBoneNameFromDataPath(dataPath: str) -> str:
+    """
+    Inverse of BuildPoseBoneFCurveDataPath.
+    Returns the bone name in @dataPath, or None if @dataPath doesn't belong to a pose bone.
+    """
+    prefix = "pose.bones[\""
+    if not dataPath.startswith(prefix):
+        return None
+    endIndex = dataPath.find("\"]", len(prefix))
+    if endIndex < 0:
+        return None
+    return dataPath[len(prefix):endIndex]
+
 def GetPoseBoneFCurveFromArmature(armatureObj, poseBoneName, data_path, parameterIndex):
     """
     In Blender the FCurves are used to define the Key Frames.
@@ -53,10 +93,19 @@ def GetArmatureFCurveFromDataPath(armatureObj: bpy.types.Armature, fCurveDataPat
     return armatureObj.animation_data.action.fcurves.find(fCurveDataPath[0], index=fCurveDataPath[1])
 
 
+def GetPoseBoneFCurves(armatureObj: bpy.types.Armature, poseBoneName: str, fCurveDataPaths: list[FCurveDataPath]) -> list[bpy.types.FCurve]:
+    return [GetPoseBoneFCurveFromDataPath(armatureObj, poseBoneName, dataPath) for dataPath in fCurveDataPaths]
+
+
+def GetArmatureFCurves(armatureObj: bpy.types.Armature, fCurveDataPaths: list[FCurveDataPath]) -> list[bpy.types.FCurve]:
+    return [GetArmatureFCurveFromDataPath(armatureObj, dataPath) for dataPath in fCurveDataPaths]
+
+
 def GetPoseBoneLocalLocationsFromFcurves(armatureObj, poseBoneName):
     """
     Returns a list of vectors. Each vector is the raw location
-    data as found in the FCurves
+    data as found in the FCurves. If the FCurves have different lengths
+    they are first resampled, in place, on a common timeline.
     """
     retList = []
     fcurveX = GetPoseBoneFCurveFromDataPath(armatureObj, poseBoneName, FCurveDataPath.LOCATION_X)
@@ -66,12 +115,14 @@ def GetPoseBoneLocalLocationsFromFcurves(armatureObj, poseBoneName):
     lenY = len(fcurveY.keyframe_points)
     lenZ = len(fcurveZ.keyframe_points)
     if (lenX != lenY) or (lenX != lenZ):
-        print(f"Was expecting fcurves of the same length. lenX={lenX}, lenY={lenY}, lenZ={lenZ}")
-        return retList
+        _logger.info("The fcurves have different lengths, lenX=%d, lenY=%d, lenZ=%d. Will resample them in place on a common timeline",
+            lenX, lenY, lenZ)
+        samples = _AlignFCurvesOnUnionTimeline((fcurveX, fcurveY, fcurveZ))
+        return [mathutils.Vector(sample) for sample in samples]
     keyFramesCount = lenX
-    print(lenX)
+    _logger.debug("Number of location keyframes in bone '%s' = %d", poseBoneName, lenX)
     if keyFramesCount < 1:
-        print("The fcurves are empty!")
+        _logger.warning("The fcurves are empty!")
         return retList
 
     for frameIndex in range(keyFramesCount):
@@ -87,7 +138,8 @@ def GetPoseBoneLocalLocationsFromFcurves(armatureObj, poseBoneName):
 def GetArmatureLocalLocationsFromFcurves(armatureObj):
     """
     Returns a list of vectors. Each vector is the raw location
-    data as found in the FCurves
+    data as found in the FCurves. If the FCurves have different lengths
+    they are first resampled, in place, on a common timeline.
     """
     retList = []
     fcurveX = GetArmatureFCurveFromDataPath(armatureObj, FCurveDataPath.LOCATION_X)
@@ -97,12 +149,14 @@ def GetArmatureLocalLocationsFromFcurves(armatureObj):
     lenY = len(fcurveY.keyframe_points)
     lenZ = len(fcurveZ.keyframe_points)
     if (lenX != lenY) or (lenX != lenZ):
-        print(f"Was expecting fcurves of the same length. lenX={lenX}, lenY={lenY}, lenZ={lenZ}")
-        return retList
+        _logger.info("The fcurves have different lengths, lenX=%d, lenY=%d, lenZ=%d. Will resample them in place on a common timeline",
+            lenX, lenY, lenZ)
+        samples = _AlignFCurvesOnUnionTimeline((fcurveX, fcurveY, fcurveZ))
+        return [mathutils.Vector(sample) for sample in samples]
     keyFramesCount = lenX
-    print(lenX)
+    _logger.debug("Number of location keyframes in armature '%s' = %d", armatureObj.name, lenX)
     if keyFramesCount < 1:
-        print("The fcurves are empty!")
+        _logger.warning("The fcurves are empty!")
         return retList
 
     for frameIndex in range(keyFramesCount):
@@ -115,6 +169,102 @@ def GetArmatureLocalLocationsFromFcurves(armatureObj):
     return retList
 
 
+def GetFCurveKeyFrameValues(fcurve: bpy.types.FCurve) -> array:
+    """
+    Bulk read of all the key frame values (KeyFrame.co.y) of @fcurve.
+    Returns an array of floats.
+    """
+    keyFramesCount = len(fcurve.keyframe_points)
+    coordinates = array('f', [0.0]) * (keyFramesCount * 2)
+    fcurve.keyframe_points.foreach_get("co", coordinates)
+    return coordinates[1::2]
+
+
+def GetKeyFrameNumbersInRange(fcurve: bpy.types.FCurve, startIndex: int, count: int) -> list[int]:
+    """
+    Returns the frame numbers of @count key frames of @fcurve, starting at
+    array location @startIndex. Only the requested key frames are accessed.
+    """
+    keyFramePoints = fcurve.keyframe_points
+    return [int(keyFramePoints[frameIndex].co.x) for frameIndex in range(startIndex, startIndex + count)]
+
+
+def GetChannelValuesInRange(fcurves: list[bpy.types.FCurve], startIndex: int, count: int) -> list[tuple]:
+    """
+    Reads @count key frames, starting at array location @startIndex, from each
+    fcurve in @fcurves. The fcurves are expected to have the same key frames.
+    Only the requested key frames are accessed, this way memory usage is
+    proportional to @count instead of the length of the fcurves.
+    Returns a list with one tuple, of len(@fcurves) values, per key frame.
+    """
+    channels = []
+    for fcurve in fcurves:
+        keyFramePoints = fcurve.keyframe_points
+        channels.append([keyFramePoints[frameIndex].co[1] for frameIndex in range(startIndex, startIndex + count)])
+    return list(zip(*channels))
+
+
+def SetChannelValuesInRange(fcurves: list[bpy.types.FCurve], startIndex: int, samples: list[tuple]):
+    """
+    Inverse of GetChannelValuesInRange. Writes @samples, one tuple per key frame,
+    into the key frames of @fcurves starting at array location @startIndex.
+    The caller must call fcurve.update() after writing all the ranges, updating
+    after each range would recalculate the handles of the whole fcurve every time.
+    """
+    for channelIndex, fcurve in enumerate(fcurves):
+        keyFramePoints = fcurve.keyframe_points
+        for frameIndex, sample in enumerate(samples, startIndex):
+            keyFramePoints[frameIndex].co[1] = sample[channelIndex]
+
+
+def FindKeyFrameIndex(fcurve: bpy.types.FCurve, frameNumber: float) -> int:
+    """
+    Binary search. Returns the array location of the first key frame of @fcurve
+    whose frame number is not less than @frameNumber. Returns the number of key
+    frames if all key frames are before @frameNumber.
+    Only O(log(n)) key frames are accessed.
+    """
+    keyFramePoints = fcurve.keyframe_points
+    low = 0
+    high = len(keyFramePoints)
+    while low < high:
+        middle = (low + high) // 2
+        if keyFramePoints[middle].co.x < frameNumber:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def GetKeyFrameIndexRange(fcurve: bpy.types.FCurve, startFrame: float, endFrame: float) -> list[int, int]:
+    """
+    Returns tuple (startIndex, count) with the array locations of the key frames
+    of @fcurve between frame numbers @startFrame and @endFrame, both inclusive.
+    """
+    startIndex = FindKeyFrameIndex(fcurve, startFrame)
+    endIndex = FindKeyFrameIndex(fcurve, endFrame + 1e-4)
+    return startIndex, max(0, endIndex - startIndex)
+
+
+def TrimActionToFrameRange(action: bpy.types.Action, startFrame: float, endFrame: float) -> int:
+    """
+    Removes from all the fcurves of @action the key frames outside of the
+    frame range [@startFrame, @endFrame].
+    Returns the number of removed key frames.
+    """
+    removedCount = 0
+    for fcurve in action.fcurves:
+        frames, values = GetFCurveKeyFrames(fcurve)
+        # Same bounds as GetKeyFrameIndexRange().
+        startIndex = bisect.bisect_left(frames, startFrame)
+        endIndex = bisect.bisect_left(frames, endFrame + 1e-4)
+        if (startIndex == 0) and (endIndex == len(frames)):
+            continue
+        removedCount += len(frames) - (endIndex - startIndex)
+        SetFCurveKeyFrames(fcurve, frames[startIndex:endIndex], values[startIndex:endIndex])
+    return removedCount
+
+
 def GetKeyFramesRangeInfoFromFCurve(fcurve: bpy.types.FCurve) -> list[int, int, int]:
     """
     returns tuple (startFrameNumber, endFrameNumber, numKeyFrames)
@@ -159,19 +309,56 @@ def CreateFCurveForArmatureObj(armatureObj: bpy.types.Armature, fCurveDataPath:
     """
     fcurve = GetArmatureFCurveFromDataPath(armatureObj, fCurveDataPath)
     if fcurve is not None:
-        print(f"The fcurve {fCurveDataPath[0]} at index {fCurveDataPath[1]} already exists")
+        _logger.debug("The fcurve %s at index %d already exists", fCurveDataPath[0], fCurveDataPath[1])
         return fcurve
     if not armatureObj.keyframe_insert(fCurveDataPath[0], index=fCurveDataPath[1], frame=1):
-        print(f"Failed to insert new empty KeyFrame at path {fCurveDataPath[0]} index {fCurveDataPath[1]}")
+        _logger.error("Failed to insert new empty KeyFrame at path %s index %d", fCurveDataPath[0], fCurveDataPath[1])
         return None
     return GetArmatureFCurveFromDataPath(armatureObj, fCurveDataPath)
 
 
+def AllocateArmatureKeyFrames(armatureObj: bpy.types.Armature, fCurveDataPaths: list[FCurveDataPath],
+                              keyFramesCount: int) -> list[bpy.types.FCurve]:
+    """
+    Bulk version of Allocate*KeyFramesFromPoseBoneToArmature(). The fcurves of
+    @armatureObj at @fCurveDataPaths are created if they don't exist, and resized
+    to @keyFramesCount key frames. The frame numbers and values are not set, they
+    are written afterwards with SetChannelKeyFramesInRange(), one window at a
+    time, so the frame numbers of the whole range are never in memory at once.
+    The caller must call fcurve.update() when all the key frames are written.
+    Returns the list of fcurves.
+    """
+    fcurves = []
+    for dataPath in fCurveDataPaths:
+        fcurve = CreateFCurveForArmatureObj(armatureObj, dataPath)
+        keyFramePoints = fcurve.keyframe_points
+        while len(keyFramePoints) > keyFramesCount:
+            keyFramePoints.remove(keyFramePoints[-1], fast=True)
+        if len(keyFramePoints) < keyFramesCount:
+            keyFramePoints.add(keyFramesCount - len(keyFramePoints))
+        fcurves.append(fcurve)
+    return fcurves
+
+
+def SetChannelKeyFramesInRange(fcurves: list[bpy.types.FCurve], startIndex: int, frames: list[float],
+                               samples: list[tuple]):
+    """
+    Same as SetChannelValuesInRange(), but the frame numbers of the key frames
+    are written too, from @frames. Used to fill the key frames allocated by
+    AllocateArmatureKeyFrames(). The caller must call fcurve.update() when done.
+    """
+    for channelIndex, fcurve in enumerate(fcurves):
+        keyFramePoints = fcurve.keyframe_points
+        for frameIndex, (frame, sample) in enumerate(zip(frames, samples), startIndex):
+            keyFramePoints[frameIndex].co = (frame, sample[channelIndex])
+
+
 def _RemoveKeyFrames(fcurve: bpy.types.FCurve, fromFrameIndex: int = 0):
     """
     Removes key frames from @fcurve, starting at array location @fromFrameIndex.
     Remark:  @fromFrameIndex is a regular array index, it is not a Frame Number.
         FYI, the Frame Number is fcurve.keyframe_points[@fromFrameIndex].co.x
+    The removal is fast, the caller must call fcurve.update() when done.
     """
     targetLength = fromFrameIndex
     while len(fcurve.keyframe_points) > targetLength:
@@ -202,11 +389,11 @@ def _CopyKeyFrame(dstKfp: bpy.types.Keyframe, srcKfp: bpy.types.Keyframe):
 def _CopyKeyFrames(dstFcurve, srcFcurve, setDefaultValue=False, defaultValue=0.0, emptySrcStartingAtFrameIndex = -1):
     keyFramesCount = len(srcFcurve.keyframe_points)
     if keyFramesCount < 1:
-        print("The source fcurve was already empty")
+        _logger.debug("The source fcurve was already empty")
         return
     #Clear all existing keyframes in dstFcurve.
     _RemoveKeyFrames(dstFcurve)
-    print("Removed all previous keyframes in destination Fcurve")
+    _logger.debug("Removed all previous keyframes in destination Fcurve")
     dstFcurve.keyframe_points.add(keyFramesCount)
     for frameIndex in range(keyFramesCount):
         srcKfp = srcFcurve.keyframe_points[frameIndex]
@@ -214,14 +401,17 @@ def _CopyKeyFrames(dstFcurve, srcFcurve, setDefaultValue=False, defaultValue=0.0
         _CopyKeyFrame(dstKfp, srcKfp)
         if setDefaultValue:
             dstKfp.co[1] = defaultValue
+    # The copied handles belong to the source values, recalculate them once for the whole curve.
+    dstFcurve.update()
     if setDefaultValue:
-        print(f"Copied {keyFramesCount} keyframes from source to destination with defaultValue {defaultValue}")
+        _logger.debug("Copied %d keyframes from source to destination with defaultValue %s", keyFramesCount, defaultValue)
     else:
-        print(f"Copied {keyFramesCount} keyframes from source to destination.")
+        _logger.debug("Copied %d keyframes from source to destination.", keyFramesCount)
     if emptySrcStartingAtFrameIndex < 0:
         return
     _RemoveKeyFrames(srcFcurve, emptySrcStartingAtFrameIndex)
-    print(f"Removed keyframes from source starting at frame index {emptySrcStartingAtFrameIndex}")
+    srcFcurve.update()
+    _logger.debug("Removed keyframes from source starting at frame index %d", emptySrcStartingAtFrameIndex)
 
 
 
@@ -291,16 +481,18 @@ def SubtractLocationDataFromPoseBoneKeyFrames(armatureObj: bpy.types.Armature ,
         fcurve = GetPoseBoneFCurveFromDataPath(armatureObj, boneName, dataPath)
         keyFramesCount = len(fcurve.keyframe_points)
         if keyFramesCount < 1:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' was already empty")
+            _logger.debug("The fcurve from bone '%s' and datapath '%s' was already empty", boneName, dataPath)
             continue
         vectorCount = len(locationsList)
         if  vectorCount < keyFramesCount:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' has {keyFramesCount} key frames, but the input list only has {vectorCount} vectors")
+            _logger.warning("The fcurve from bone '%s' and datapath '%s' has %d key frames, but the input list only has %d vectors",
+                boneName, dataPath, keyFramesCount, vectorCount)
         count = min(vectorCount, keyFramesCount)
         for frameIndex in range(count):
             srcKfp = fcurve.keyframe_points[frameIndex]
             v = locationsList[frameIndex]
             srcKfp.co[1] -= v[axis]
+        fcurve.update()
 
 
 def SetLocationDataForPoseBoneKeyFrames(armatureObj: bpy.types.Armature , boneName: str, locationsList: list[mathutils.Vector]):
@@ -313,16 +505,18 @@ def SetLocationDataForPoseBoneKeyFrames(armatureObj: bpy.types.Armature , boneNa
         fcurve = GetPoseBoneFCurveFromDataPath(armatureObj, boneName, dataPath)
         keyFramesCount = len(fcurve.keyframe_points)
         if keyFramesCount < 1:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' was already empty")
+            _logger.debug("The fcurve from bone '%s' and datapath '%s' was already empty", boneName, dataPath)
             continue
         vectorCount = len(locationsList)
         if  vectorCount < keyFramesCount:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' has {keyFramesCount} key frames, but the input list only has {vectorCount} vectors")
+            _logger.warning("The fcurve from bone '%s' and datapath '%s' has %d key frames, but the input list only has %d vectors",
+                boneName, dataPath, keyFramesCount, vectorCount)
         count = min(vectorCount, keyFramesCount)
         for frameIndex in range(count):
             srcKfp = fcurve.keyframe_points[frameIndex]
             v = locationsList[frameIndex]
             srcKfp.co[1] = v[axis]
+        fcurve.update()
 
 def SetLocationDataForArmatureKeyFrames(armatureObj: bpy.types.Armature, locationsList: list[mathutils.Vector]):
     dataPaths = (
@@ -334,16 +528,18 @@ def SetLocationDataForArmatureKeyFrames(armatureObj: bpy.types.Armature, locatio
         fcurve = GetArmatureFCurveFromDataPath(armatureObj, dataPath)
         keyFramesCount = len(fcurve.keyframe_points)
         if keyFramesCount < 1:
-            print(f"The fcurve from armature '{armatureObj.name}' and datapath '{dataPath}' was already empty")
+            _logger.debug("The fcurve from armature '%s' and datapath '%s' was already empty", armatureObj.name, dataPath)
             continue
         vectorCount = len(locationsList)
         if  vectorCount < keyFramesCount:
-            print(f"The fcurve from armature '{armatureObj.name}' and datapath '{dataPath}' has {keyFramesCount} key frames, but the input list only has {vectorCount} vectors")
+            _logger.warning("The fcurve from armature '%s' and datapath '%s' has %d key frames, but the input list only has %d vectors",
+                armatureObj.name, dataPath, keyFramesCount, vectorCount)
         count = min(vectorCount, keyFramesCount)
         for frameIndex in range(count):
             srcKfp = fcurve.keyframe_points[frameIndex]
             v = locationsList[frameIndex]
             srcKfp.co[1] = v[axis]
+        fcurve.update()
 
 
 #Returns a list of Quaternions
@@ -360,12 +556,14 @@ def GetPoseBoneLocalQuaternionsFromFcurves(armatureObj, boneName):
     lenY = len(fcurveY.keyframe_points)
     lenZ = len(fcurveZ.keyframe_points)
     if (lenW != lenX) or (lenW != lenY) or (lenW != lenZ):
-        print("Was expecting fcurves of the same length. lenW={}, lenX={}, lenY={}, lenZ={}".format(lenW, lenX, lenY, lenZ))
-        return retList
+        _logger.info("The fcurves have different lengths, lenW=%d, lenX=%d, lenY=%d, lenZ=%d. Will resample them in place on a common timeline",
+            lenW, lenX, lenY, lenZ)
+        samples = _AlignFCurvesOnUnionTimeline((fcurveW, fcurveX, fcurveY, fcurveZ), isQuaternion=True)
+        return [mathutils.Quaternion(sample) for sample in samples]
     keyFramesCount = lenW
-    print("Number of Quaternion keyframes in bone {} = {}".format(boneName, lenW))
+    _logger.debug("Number of Quaternion keyframes in bone '%s' = %d", boneName, lenW)
     if keyFramesCount < 1:
-        print("The fcurves are empty!")
+        _logger.warning("The fcurves are empty!")
         return retList
 
     for frameIndex in range(keyFramesCount):
@@ -391,12 +589,14 @@ def GetArmatureLocalQuaternionsFromFcurves(armatureObj: bpy.types.Armature) -> l
     lenY = len(fcurveY.keyframe_points)
     lenZ = len(fcurveZ.keyframe_points)
     if (lenW != lenX) or (lenW != lenY) or (lenW != lenZ):
-        print("Was expecting fcurves of the same length. lenW={}, lenX={}, lenY={}, lenZ={}".format(lenW, lenX, lenY, lenZ))
-        return retList
+        _logger.info("The fcurves have different lengths, lenW=%d, lenX=%d, lenY=%d, lenZ=%d. Will resample them in place on a common timeline",
+            lenW, lenX, lenY, lenZ)
+        samples = _AlignFCurvesOnUnionTimeline((fcurveW, fcurveX, fcurveY, fcurveZ), isQuaternion=True)
+        return [mathutils.Quaternion(sample) for sample in samples]
     keyFramesCount = lenW
-    print("Number of Quaternion keyframes in armature '{}' = {}".format(armatureObj.name, lenW))
+    _logger.debug("Number of Quaternion keyframes in armature '%s' = %d", armatureObj.name, lenW)
     if keyFramesCount < 1:
-        print("The fcurves are empty!")
+        _logger.warning("The fcurves are empty!")
         return retList
 
     for frameIndex in range(keyFramesCount):
@@ -421,16 +621,18 @@ def SetQuaternionDataForPoseBoneFCurves(armatureObj: bpy.types.Armature , boneNa
         fcurve = GetPoseBoneFCurveFromDataPath(armatureObj, boneName, dataPath)
         keyFramesCount = len(fcurve.keyframe_points)
         if keyFramesCount < 1:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' was already empty")
+            _logger.debug("The fcurve from bone '%s' and datapath '%s' was already empty", boneName, dataPath)
             continue
         quaternionCount = len(quaternionList)
         if  quaternionCount < keyFramesCount:
-            print(f"The fcurve from bone '{boneName}' and datapath '{dataPath}' has {keyFramesCount} key frames, but the input list only has {quaternionCount} quaternions")
+            _logger.warning("The fcurve from bone '%s' and datapath '%s' has %d key frames, but the input list only has %d quaternions",
+                boneName, dataPath, keyFramesCount, quaternionCount)
         count = min(quaternionCount, keyFramesCount)
         for frameIndex in range(count):
             srcKfp = fcurve.keyframe_points[frameIndex]
             q = quaternionList[frameIndex]
             srcKfp.co[1] = q[axis]
+        fcurve.update()
 
 
 def SetQuaternionDataForArmatureKeyFrames(armatureObj: bpy.types.Armature, quaternionList: list[mathutils.Quaternion]):
@@ -444,16 +646,18 @@ def SetQuaternionDataForArmatureKeyFrames(armatureObj: bpy.types.Armature, quate
         fcurve = GetArmatureFCurveFromDataPath(armatureObj, dataPath)
         keyFramesCount = len(fcurve.keyframe_points)
         if keyFramesCount < 1:
-            print(f"The fcurve from armature '{armatureObj.name}' and datapath '{dataPath}' was already empty")
+            _logger.debug("The fcurve from armature '%s' and datapath '%s' was already empty", armatureObj.name, dataPath)
             continue
         quaternionCount = len(quaternionList)
         if  quaternionCount < keyFramesCount:
-            print(f"The fcurve from armature '{armatureObj.name}' and datapath '{dataPath}' has {keyFramesCount} key frames, but the input list only has {quaternionCount} quaternions")
+            _logger.warning("The fcurve from armature '%s' and datapath '%s' has %d key frames, but the input list only has %d quaternions",
+                armatureObj.name, dataPath, keyFramesCount, quaternionCount)
         count = min(quaternionCount, keyFramesCount)
         for frameIndex in range(count):
             srcKfp = fcurve.keyframe_points[frameIndex]
             q = quaternionList[frameIndex]
             srcKfp.co[1] = q[axis]
+        fcurve.update()
 
 
 def GetArmatureLocationsFromFcurves(armatureObj: bpy.types.Armature) -> list[mathutils.Vector] :
@@ -467,12 +671,14 @@ def GetArmatureLocationsFromFcurves(armatureObj: bpy.types.Armature) -> list[mat
     lenY = len(fcurveY.keyframe_points)
     lenZ = len(fcurveZ.keyframe_points)
     if (lenX != lenY) or (lenX != lenZ):
-        print("Was expecting fcurves of the same length. lenX={}, lenY={}, lenZ={}".format(lenX, lenY, lenZ))
-        return retList
+        _logger.info("The fcurves have different lengths, lenX=%d, lenY=%d, lenZ=%d. Will resample them in place on a common timeline",
+            lenX, lenY, lenZ)
+        samples = _AlignFCurvesOnUnionTimeline((fcurveX, fcurveY, fcurveZ))
+        return [mathutils.Vector(sample) for sample in samples]
     keyFramesCount = lenX
-    print(f"Number of Quaternion keyframes in armature '{armatureObj.name}' = {lenX}")
+    _logger.debug("Number of location keyframes in armature '%s' = %d", armatureObj.name, lenX)
     if keyFramesCount < 1:
-        print("The fcurves are empty!")
+        _logger.warning("The fcurves are empty!")
         return retList
 
     for frameIndex in range(keyFramesCount):
@@ -482,4 +688,354 @@ def GetArmatureLocationsFromFcurves(armatureObj: bpy.types.Armature) -> list[mat
         v = mathutils.Vector((KfpX.co[1], KfpY.co[1], KfpZ.co[1]))
         retList.append(v)
 
-    return retList
\ No newline at end of file
+    return retList
+
+###############################################################################
+# Resampling
+###############################################################################
+def GetFCurveKeyFrames(fcurve: bpy.types.FCurve) -> list[array, array]:
+    """
+    Bulk read of all the key frames of @fcurve.
+    Returns tuple (frames, values), both are arrays of floats.
+    """
+    keyFramesCount = len(fcurve.keyframe_points)
+    coordinates = array('f', [0.0]) * (keyFramesCount * 2)
+    fcurve.keyframe_points.foreach_get("co", coordinates)
+    return coordinates[0::2], coordinates[1::2]
+
+
+def SetFCurveKeyFrames(fcurve: bpy.types.FCurve, frames: list[float], values: list[float]):
+    """
+    Bulk write. Replaces all the key frames of @fcurve with new key frames
+    at @frames with @values. Existing key frames are reused, so their
+    interpolation settings are preserved. Handles are recalculated once at the end.
+    """
+    keyFramesCount = len(frames)
+    keyFramePoints = fcurve.keyframe_points
+    while len(keyFramePoints) > keyFramesCount:
+        keyFramePoints.remove(keyFramePoints[-1], fast=True)
+    if len(keyFramePoints) < keyFramesCount:
+        keyFramePoints.add(keyFramesCount - len(keyFramePoints))
+    coordinates = array('f', [0.0]) * (keyFramesCount * 2)
+    coordinates[0::2] = array('f', frames)
+    coordinates[1::2] = array('f', values)
+    keyFramePoints.foreach_set("co", coordinates)
+    fcurve.update()
+
+
+def SetFCurvesInterpolation(fcurves: list[bpy.types.FCurve], interpolation: str) -> int:
+    """
+    Bulk change of the interpolation of all the key frames of @fcurves, e.g. 'LINEAR'
+    or 'CONSTANT'. Mixamo clips are baked with one key frame per frame, so bezier
+    interpolation only adds cost to each evaluation and to the FBX export.
+    Handles are recalculated once per fcurve, after all its key frames are changed.
+    Returns the number of changed key frames.
+    """
+    # foreach_set() takes the integer values of the enum items.
+    interpolationValue = bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items[interpolation].value
+    changedCount = 0
+    for fcurve in fcurves:
+        if fcurve is None:
+            continue
+        keyFramesCount = len(fcurve.keyframe_points)
+        fcurve.keyframe_points.foreach_set("interpolation", array('i', [interpolationValue]) * keyFramesCount)
+        changedCount += keyFramesCount
+        fcurve.update()
+    return changedCount
+
+
+def SetActionInterpolation(action: bpy.types.Action, interpolation: str) -> int:
+    """
+    SetFCurvesInterpolation() for all the fcurves of @action.
+    Returns the number of changed key frames.
+    """
+    return SetFCurvesInterpolation(action.fcurves, interpolation)
+
+
+def BuildUniformTimeline(startFrame: float, endFrame: float, sourceFps: float, targetFps: float) -> list[float]:
+    """
+    Returns the list of frame numbers, in the @sourceFps timeline, of the samples
+    of a clip that starts at @startFrame, ends at @endFrame and is sampled at @targetFps.
+    """
+    step = sourceFps / targetFps
+    sampleCount = int((endFrame - startFrame) / step + 1e-4) + 1
+    return [startFrame + idx * step for idx in range(sampleCount)]
+
+
+def BuildUnionTimeline(fcurves: list[bpy.types.FCurve]) -> list[float]:
+    """
+    Returns the sorted list of all the distinct key frame numbers in @fcurves.
+    """
+    frames = set()
+    for fcurve in fcurves:
+        keyFrames, _ = GetFCurveKeyFrames(fcurve)
+        frames.update(keyFrames)
+    return sorted(frames)
+
+
+def SampleLinear(keyFrames: list[float], keyValues: list[float], targetFrames: list[float]) -> list[float]:
+    """
+    Linear interpolation of the key frames (@keyFrames, @keyValues) at each
+    frame in @targetFrames. Both @keyFrames and @targetFrames must be sorted.
+    Values outside of the key frames range are clamped to the first and last keys.
+    """
+    count = len(keyFrames)
+    if count < 1:
+        return [0.0] * len(targetFrames)
+    retList = []
+    keyIndex = 0
+    for frame in targetFrames:
+        while (keyIndex + 2 < count) and (keyFrames[keyIndex + 1] <= frame):
+            keyIndex += 1
+        if (count == 1) or (frame <= keyFrames[0]):
+            retList.append(keyValues[0])
+            continue
+        if frame >= keyFrames[-1]:
+            retList.append(keyValues[-1])
+            continue
+        f0 = keyFrames[keyIndex]
+        f1 = keyFrames[keyIndex + 1]
+        t = (frame - f0) / (f1 - f0)
+        v0 = keyValues[keyIndex]
+        retList.append(v0 + (keyValues[keyIndex + 1] - v0) * t)
+    return retList
+
+
+def MakeQuaternionsContinuous(quaternions: list[tuple]) -> list[tuple]:
+    """
+    q and -q are the same rotation. Returns a new list of (w, x, y, z) tuples
+    where each quaternion is in the same hemisphere as the previous one,
+    this way interpolating between consecutive quaternions takes the short path.
+    """
+    retList = []
+    previous = None
+    for q in quaternions:
+        if (previous is not None) and (sum(a * b for a, b in zip(q, previous)) < 0.0):
+            q = tuple(-c for c in q)
+        retList.append(q)
+        previous = q
+    return retList
+
+
+def _SlerpQuaternion(q0: tuple, q1: tuple, t: float) -> tuple:
+    dot = q0[0] * q1[0] + q0[1] * q1[1] + q0[2] * q1[2] + q0[3] * q1[3]
+    if dot < 0.0:
+        q1 = (-q1[0], -q1[1], -q1[2], -q1[3])
+        dot = -dot
+    if dot > 0.9995:
+        # Nearly parallel, normalized lerp is accurate enough.
+        q = tuple(a + (b - a) * t for a, b in zip(q0, q1))
+        length = math.sqrt(sum(c * c for c in q))
+        return tuple(c / length for c in q)
+    theta = math.acos(dot)
+    sinTheta = math.sin(theta)
+    s0 = math.sin((1.0 - t) * theta) / sinTheta
+    s1 = math.sin(t * theta) / sinTheta
+    return tuple(s0 * a + s1 * b for a, b in zip(q0, q1))
+
+
+def SampleQuaternions(keyFrames: list[float], keyQuaternions: list[tuple], targetFrames: list[float]) -> list[tuple]:
+    """
+    Spherical linear interpolation of the key frames (@keyFrames, @keyQuaternions)
+    at each frame in @targetFrames. Quaternions are (w, x, y, z) tuples.
+    Both @keyFrames and @targetFrames must be sorted.
+    The returned quaternions have hemisphere continuity.
+    """
+    count = len(keyFrames)
+    if count < 1:
+        return [(1.0, 0.0, 0.0, 0.0)] * len(targetFrames)
+    keyQuaternions = MakeQuaternionsContinuous(keyQuaternions)
+    retList = []
+    keyIndex = 0
+    for frame in targetFrames:
+        while (keyIndex + 2 < count) and (keyFrames[keyIndex + 1] <= frame):
+            keyIndex += 1
+        if (count == 1) or (frame <= keyFrames[0]):
+            retList.append(keyQuaternions[0])
+            continue
+        if frame >= keyFrames[-1]:
+            retList.append(keyQuaternions[-1])
+            continue
+        f0 = keyFrames[keyIndex]
+        f1 = keyFrames[keyIndex + 1]
+        t = (frame - f0) / (f1 - f0)
+        retList.append(_SlerpQuaternion(keyQuaternions[keyIndex], keyQuaternions[keyIndex + 1], t))
+    return MakeQuaternionsContinuous(retList)
+
+
+def SampleFCurves(fcurves: list[bpy.types.FCurve], targetFrames: list[float], isQuaternion: bool = False) -> list[tuple]:
+    """
+    Samples the channels in @fcurves at each frame in @targetFrames. The fcurves
+    don't need to have the same amount of key frames.
+    If @isQuaternion is True, @fcurves must be the (w, x, y, z) channels of a
+    quaternion and the samples are slerped, otherwise each channel is lerped.
+    Returns a list with one tuple, of len(@fcurves) values, per target frame.
+    """
+    if not isQuaternion:
+        channels = []
+        for fcurve in fcurves:
+            keyFrames, keyValues = GetFCurveKeyFrames(fcurve)
+            channels.append(SampleLinear(keyFrames, keyValues, targetFrames))
+        return list(zip(*channels))
+    # The channels are first aligned on the union of their key frames,
+    # then the quaternion keys are slerped.
+    keyFrames = BuildUnionTimeline(fcurves)
+    channels = []
+    for fcurve in fcurves:
+        channelFrames, channelValues = GetFCurveKeyFrames(fcurve)
+        channels.append(SampleLinear(channelFrames, channelValues, keyFrames))
+    keyQuaternions = []
+    for q in zip(*channels):
+        length = math.sqrt(sum(c * c for c in q))
+        keyQuaternions.append(tuple(c / length for c in q) if length > 1e-8 else (1.0, 0.0, 0.0, 0.0))
+    return SampleQuaternions(keyFrames, keyQuaternions, targetFrames)
+
+
+def _AlignFCurvesOnUnionTimeline(fcurves: list[bpy.types.FCurve], isQuaternion: bool = False) -> list[tuple]:
+    """
+    Resamples @fcurves on the union of their key frames and writes the samples
+    back, so afterwards all of them have the same key frames, and the
+    Set*KeyFrames() functions, that write by key frame index, stay aligned with
+    the returned samples.
+    Returns a list with one tuple, of len(@fcurves) values, per key frame.
+    """
+    frames = BuildUnionTimeline(fcurves)
+    samples = SampleFCurves(fcurves, frames, isQuaternion)
+    SetChannelKeyFrames(fcurves, frames, samples)
+    return samples
+
+
+def GetChannelKeyFrames(fcurves: list[bpy.types.FCurve], isQuaternion: bool = False) -> list[list[float], list[tuple]]:
+    """
+    Bulk read of the channels in @fcurves, for example the (x, y, z) location fcurves.
+    Returns tuple (frames, samples). samples is a list with one tuple, of
+    len(@fcurves) values, per frame. If the channels don't have key frames at
+    the same frames, they are sampled on the union of their key frames.
+    """
+    channels = [GetFCurveKeyFrames(fcurve) for fcurve in fcurves]
+    frames = channels[0][0]
+    if all(keyFrames == frames for keyFrames, _ in channels):
+        return list(frames), list(zip(*[keyValues for _, keyValues in channels]))
+    frames = BuildUnionTimeline(fcurves)
+    return frames, SampleFCurves(fcurves, frames, isQuaternion)
+
+
+def SetChannelKeyFrames(fcurves: list[bpy.types.FCurve], frames: list[float], samples: list[tuple]):
+    """
+    Bulk write. The inverse of GetChannelKeyFrames(). Replaces all the key frames
+    of the N-th fcurve in @fcurves with key frames at @frames and the N-th value of each sample.
+    """
+    for channel, fcurve in enumerate(fcurves):
+        SetFCurveKeyFrames(fcurve, frames, [sample[channel] for sample in samples])
+
+
+def _GroupActionFCurves(action: bpy.types.Action) -> list[list[bpy.types.FCurve], bool]:
+    """
+    Returns a list of tuples (fcurves, isQuaternion). Each tuple groups the
+    fcurves of the same property (data_path), sorted by array_index.
+    """
+    groups = {}
+    for fcurve in action.fcurves:
+        groups.setdefault(fcurve.data_path, []).append(fcurve)
+    retList = []
+    for dataPath, fcurves in groups.items():
+        fcurves.sort(key=lambda fcurve: fcurve.array_index)
+        isQuaternion = dataPath.endswith("rotation_quaternion") and (len(fcurves) == 4)
+        retList.append((fcurves, isQuaternion))
+    return retList
+
+
+def ResampleAction(action: bpy.types.Action, targetFrames: list[float], newFrameNumbers: list[float] = None):
+    """
+    Rewrites every fcurve of @action with one key frame per frame in @targetFrames.
+    Locations, scales, etc are lerped and quaternions are slerped.
+    After resampling all the channels of @action have key frames at identical indices.
+    @newFrameNumbers Optional. Frame numbers of the new key frames, if they are
+        different from @targetFrames (e.g. When retiming to a different fps).
+    """
+    if newFrameNumbers is None:
+        newFrameNumbers = targetFrames
+    for fcurves, isQuaternion in _GroupActionFCurves(action):
+        samples = SampleFCurves(fcurves, targetFrames, isQuaternion)
+        for channelIndex, fcurve in enumerate(fcurves):
+            SetFCurveKeyFrames(fcurve, newFrameNumbers, [sample[channelIndex] for sample in samples])
+
+
+def ResampleActionsToFps(sceneObj: bpy.types.Scene, actions: list[bpy.types.Action], targetFps: int) -> list[int]:
+    """
+    Retimes each action in @actions, currently played at the frame rate of @sceneObj,
+    to @targetFps. The duration of each clip is preserved, the new key frames are
+    at consecutive frame numbers starting at the first frame of the action.
+    The source frame rate is read once, the frame rate and frame range of @sceneObj
+    are only updated after all the actions were retimed.
+    Returns the new number of key frames of each action.
+    """
+    sourceFps = sceneObj.render.fps / sceneObj.render.fps_base
+    keyFrameCounts = []
+    frameStart, frameEnd = None, None
+    for action in actions:
+        startFrame, endFrame = action.frame_range
+        targetFrames = BuildUniformTimeline(startFrame, endFrame, sourceFps, targetFps)
+        newFrameNumbers = [startFrame + idx for idx in range(len(targetFrames))]
+        ResampleAction(action, targetFrames, newFrameNumbers)
+        keyFrameCounts.append(len(newFrameNumbers))
+        frameStart = newFrameNumbers[0] if frameStart is None else min(frameStart, newFrameNumbers[0])
+        frameEnd = newFrameNumbers[-1] if frameEnd is None else max(frameEnd, newFrameNumbers[-1])
+    sceneObj.render.fps = targetFps
+    sceneObj.render.fps_base = 1.0
+    if frameStart is not None:
+        sceneObj.frame_start = int(frameStart)
+        sceneObj.frame_end = int(frameEnd)
+    return keyFrameCounts
+
+
+def ResampleActionToFps(sceneObj: bpy.types.Scene, action: bpy.types.Action, targetFps: int) -> int:
+    """
+    ResampleActionsToFps() for a single action.
+    Returns the new number of key frames.
+    """
+    return ResampleActionsToFps(sceneObj, [action], targetFps)[0]
+
+
+def _GetPoseBoneTransformFCurves(armatureObj: bpy.types.Armature, boneName: str) -> list[list[bpy.types.FCurve], list[bpy.types.FCurve]]:
+    """
+    Returns tuple (locationFCurves, quaternionFCurves). Missing fcurves are skipped.
+    """
+    locationFCurves = GetPoseBoneFCurves(armatureObj, boneName, LOCATION_DATA_PATHS)
+    quaternionFCurves = GetPoseBoneFCurves(armatureObj, boneName, QUATERNION_DATA_PATHS)
+    return ([fcurve for fcurve in locationFCurves if fcurve is not None],
+            [fcurve for fcurve in quaternionFCurves if fcurve is not None])
+
+
+def ArePoseBoneFCurvesAligned(armatureObj: bpy.types.Armature, boneName: str) -> bool:
+    """
+    Returns True if all the location and quaternion fcurves of @boneName have
+    key frames at the same frame numbers.
+    """
+    locationFCurves, quaternionFCurves = _GetPoseBoneTransformFCurves(armatureObj, boneName)
+    fcurves = locationFCurves + quaternionFCurves
+    if len(fcurves) < 1:
+        return True
+    referenceFrames, _ = GetFCurveKeyFrames(fcurves[0])
+    for fcurve in fcurves[1:]:
+        keyFrames, _ = GetFCurveKeyFrames(fcurve)
+        if keyFrames != referenceFrames:
+            return False
+    return True
+
+
+def AlignPoseBoneFCurves(armatureObj: bpy.types.Armature, boneName: str) -> bool:
+    """
+    If the location and quaternion fcurves of @boneName don't have key frames
+    at the same frame numbers, they are resampled on the union of their key frames.
+    Returns True if the fcurves had to be resampled.
+    """
+    if ArePoseBoneFCurvesAligned(armatureObj, boneName):
+        return False
+    locationFCurves, quaternionFCurves = _GetPoseBoneTransformFCurves(armatureObj, boneName)
+    targetFrames = BuildUnionTimeline(locationFCurves + quaternionFCurves)
+    for fcurves, isQuaternion in ((locationFCurves, False), (quaternionFCurves, len(quaternionFCurves) == 4)):
+        samples = SampleFCurves(fcurves, targetFrames, isQuaternion)
+        for channelIndex, fcurve in enumerate(fcurves):
+            SetFCurveKeyFrames(fcurve, targetFrames, [sample[channelIndex] for sample in samples])
+    return True
@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Motion matching feature database.
+# Each frame of each clip is described by a feature vector, computed in the
+# space of the root (the Armature transform after root motion extraction):
+#   - Position and velocity of each foot bone.
+#   - Velocity of the hip bone.
+#   - Past/future root trajectory points, position (x, y) and facing direction (x, y).
+# The features of all clips are normalized and stored in a single binary file
+# that can be memory mapped and searched without parsing.
+#
+# File layout (little endian). All sections start at 16 bytes aligned offsets:
+#   Header, see _HEADER_FORMAT.
+#   means           float32[dimension]
+#   stds            float32[dimension]
+#   features        float32[frameCount][dimension], normalized.
+#   frameClips      uint32[frameCount], clip index of each row.
+#   kdOrder         uint32[frameCount], row indices in KD-tree order.
+#   kdSplitDims     int32[nodeCount], -1 for leaf nodes.
+#   kdSplitValues   float32[nodeCount]
+#   clips           clipCount records of _CLIP_RECORD_FORMAT.
+#   names           utf-8 clip names, referenced by the clip records.
+
+import math
+import heapq
+import mmap
+import os
+import struct
+from array import array
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import skeletonmixalot as skl
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import skeletonmixalot as skl
+
+
+DEFAULT_FOOT_BONE_PATTERNS = "*LeftFoot, *RightFoot"
+# In seconds, relative to the current frame. Negative values are in the past.
+DEFAULT_TRAJECTORY_TIMES = (-0.333, 0.333, 0.666, 1.0)
+DEFAULT_LEAF_SIZE = 16
+
+FEATURE_DB_MAGIC = b"LMXFEATS"
+FEATURE_DB_VERSION = 1
+_SECTION_NAMES = ("means", "stds", "features", "frameClips", "kdOrder",
+                  "kdSplitDims", "kdSplitValues", "clips", "names")
+# magic, version, dimension, frameCount, clipCount, nodeCount, leafSize, fps,
+# followed by (offset, size) of each section.
+_HEADER_FORMAT = "<8sIIIIIIf" + "QQ" * len(_SECTION_NAMES)
+# firstRow, frameCount, startFrame, nameOffset, nameLength
+_CLIP_RECORD_FORMAT = "<IIiII"
+_ALIGNMENT = 16
+
+
+def GetFeatureDimension(footCount: int, trajectoryTimes: list[float] = DEFAULT_TRAJECTORY_TIMES) -> int:
+    return footCount * 6 + 3 + len(trajectoryTimes) * 4
+
+
+def _GetYawFromMatrix(matrix) -> float:
+    # Same convention as motionmixalot.GetYawFromQuaternion(), the forward
+    # vector is the Y Axis, column 1 of the rotation matrix.
+    return math.atan2(-matrix[0][1], matrix[1][1])
+
+
+def _ToRootSpace(vector: list[float], yaw: float) -> list[float]:
+    """Rotates the world space @vector by -@yaw around Z Axis."""
+    cosYaw = math.cos(-yaw)
+    sinYaw = math.sin(-yaw)
+    return [cosYaw * vector[0] - sinYaw * vector[1],
+            sinYaw * vector[0] + cosYaw * vector[1],
+            vector[2]]
+
+
+def _GetVelocities(positions: list[list[float]], fps: float) -> list[list[float]]:
+    """Backward differences. The first frame gets the velocity of the second frame."""
+    if len(positions) < 2:
+        return [[0.0, 0.0, 0.0] for _ in positions]
+    velocities = [[(current[axis] - previous[axis]) * fps for axis in range(3)]
+                  for previous, current in zip(positions, positions[1:])]
+    return [velocities[0]] + velocities
+
+
+def ComputeClipFeatures(rootPositions: list[list[float]], rootYaws: list[float],
+                        footPositions: list[list[list[float]]], hipPositions: list[list[float]],
+                        fps: float, trajectoryTimes: list[float] = DEFAULT_TRAJECTORY_TIMES) -> list[list[float]]:
+    """
+    Doesn't depend on bpy. All positions are in world space, one entry per frame.
+    @rootPositions (x, y, z) of the root per frame.
+    @rootYaws Facing angle of the root around Z Axis per frame, in radians.
+    @footPositions One list of per frame (x, y, z) positions per foot bone.
+    @hipPositions (x, y, z) of the hip bone per frame.
+    Returns one feature vector per frame, see GetFeatureDimension().
+    Trajectory points beyond the clip boundaries are clamped to the first/last frame.
+    """
+    frameCount = len(rootPositions)
+    footVelocities = [_GetVelocities(positions, fps) for positions in footPositions]
+    hipVelocities = _GetVelocities(hipPositions, fps)
+    frameOffsets = [int(round(seconds * fps)) for seconds in trajectoryTimes]
+    rows = []
+    for frameIndex in range(frameCount):
+        rootPosition = rootPositions[frameIndex]
+        yaw = rootYaws[frameIndex]
+        row = []
+        for positions in footPositions:
+            delta = [positions[frameIndex][axis] - rootPosition[axis] for axis in range(3)]
+            row.extend(_ToRootSpace(delta, yaw))
+        for velocities in footVelocities:
+            row.extend(_ToRootSpace(velocities[frameIndex], yaw))
+        row.extend(_ToRootSpace(hipVelocities[frameIndex], yaw))
+        for frameOffset in frameOffsets:
+            otherIndex = min(max(frameIndex + frameOffset, 0), frameCount - 1)
+            delta = [rootPositions[otherIndex][axis] - rootPosition[axis] for axis in range(3)]
+            localPosition = _ToRootSpace(delta, yaw)
+            yawDelta = rootYaws[otherIndex] - yaw
+            row.extend((localPosition[0], localPosition[1], -math.sin(yawDelta), math.cos(yawDelta)))
+        rows.append(row)
+    return rows
+
+
+def ExtractClipFeatures(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature,
+                        footBoneNames: list[str], hipBoneName: str, frameStart: int, frameEnd: int,
+                        trajectoryTimes: list[float] = DEFAULT_TRAJECTORY_TIMES) -> list[list[float]]:
+    """
+    Evaluates the scene once per frame between @frameStart and @frameEnd, both
+    inclusive, and returns the feature vectors of those frames. The root motion
+    must have been extracted already, the root is the Armature transform.
+    """
+    rootPositions = []
+    rootYaws = []
+    footPositions = [[] for _ in footBoneNames]
+    hipPositions = []
+    footPoseBones = [armatureObj.pose.bones[boneName] for boneName in footBoneNames]
+    hipPoseBone = armatureObj.pose.bones[hipBoneName]
+    for frame in range(frameStart, frameEnd + 1):
+        cmn.SetSceneFrame(sceneObj, frame)
+        worldMatrix = armatureObj.matrix_world
+        rootPositions.append(list(worldMatrix.translation))
+        rootYaws.append(_GetYawFromMatrix(worldMatrix))
+        for positions, poseBone in zip(footPositions, footPoseBones):
+            positions.append(list((worldMatrix @ poseBone.matrix).translation))
+        hipPositions.append(list((worldMatrix @ hipPoseBone.matrix).translation))
+    # Yaws must not jump between -PI and PI, otherwise the facing deltas break.
+    for idx in range(1, len(rootYaws)):
+        delta = rootYaws[idx] - rootYaws[idx - 1]
+        rootYaws[idx] -= 2.0 * math.pi * round(delta / (2.0 * math.pi))
+    return ComputeClipFeatures(rootPositions, rootYaws, footPositions, hipPositions,
+                               cmn.GetSceneFps(sceneObj), trajectoryTimes)
+
+
+###############################################################################
+# Database
+###############################################################################
+class FeatureClip:
+    """
+    @name Clip name.
+    @startFrame Frame number of the first row of the clip.
+    @rows One feature vector per frame.
+    """
+    def __init__(self, name: str, startFrame: int, rows: list[list[float]]):
+        self.name = name
+        self.startFrame = startFrame
+        self.rows = rows
+
+
+class FeatureDatabase:
+    """
+    In memory version of the feature database file. All arrays are flat.
+    """
+    def __init__(self):
+        self.dimension = 0
+        self.frameCount = 0
+        self.fps = 0.0
+        self.leafSize = DEFAULT_LEAF_SIZE
+        self.means = array('f')
+        self.stds = array('f')
+        self.features = array('f')
+        self.frameClips = array('I')
+        self.kdOrder = array('I')
+        self.kdSplitDims = array('i')
+        self.kdSplitValues = array('f')
+        # List of tuples (name, firstRow, frameCount, startFrame)
+        self.clips = []
+
+    def Normalize(self, feature: list[float]) -> list[float]:
+        return NormalizeFeature(feature, self.means, self.stds)
+
+    def Search(self, feature: list[float], count: int = 1) -> list[float, int]:
+        """
+        Returns the @count rows closest to the not normalized @feature, as a
+        list of tuples (squaredDistance, row) sorted by distance.
+        """
+        return SearchKdTree(self.features, self.dimension, self.frameCount, self.kdOrder,
+            self.kdSplitDims, self.kdSplitValues, self.leafSize, self.Normalize(feature), count)
+
+
+def NormalizeFeature(feature: list[float], means: list[float], stds: list[float]) -> list[float]:
+    return [(value - mean) / std for value, mean, std in zip(feature, means, stds)]
+
+
+def _BuildKdTree(features: array, dimension: int, frameCount: int, leafSize: int) -> list[array, array, array]:
+    """
+    Builds an implicit KD-tree. Node N covers a contiguous range of the
+    returned row order, its children are the nodes 2N+1 and 2N+2, and the
+    range is split at its middle. This way only the split dimension and value
+    of each node need to be stored.
+    Returns tuple (order, splitDims, splitValues).
+    """
+    order = list(range(frameCount))
+    splitDims = {}
+    splitValues = {}
+    stack = [(0, 0, frameCount)]
+    while stack:
+        node, low, high = stack.pop()
+        if high - low <= leafSize:
+            continue
+        # Split along the dimension with the largest spread.
+        bestDim = 0
+        bestSpread = -1.0
+        for dim in range(dimension):
+            values = [features[row * dimension + dim] for row in order[low:high]]
+            spread = max(values) - min(values)
+            if spread > bestSpread:
+                bestSpread = spread
+                bestDim = dim
+        order[low:high] = sorted(order[low:high], key=lambda row: features[row * dimension + bestDim])
+        middle = (low + high) // 2
+        splitDims[node] = bestDim
+        splitValues[node] = features[order[middle] * dimension + bestDim]
+        stack.append((2 * node + 1, low, middle))
+        stack.append((2 * node + 2, middle, high))
+    nodeCount = (max(splitDims) * 2 + 3) if splitDims else 1
+    kdSplitDims = array('i', [-1]) * nodeCount
+    kdSplitValues = array('f', [0.0]) * nodeCount
+    for node, dim in splitDims.items():
+        kdSplitDims[node] = dim
+        kdSplitValues[node] = splitValues[node]
+    return array('I', order), kdSplitDims, kdSplitValues
+
+
+def SearchKdTree(features, dimension: int, frameCount: int, kdOrder, kdSplitDims, kdSplitValues,
+                 leafSize: int, query: list[float], count: int = 1) -> list[float, int]:
+    """
+    Nearest neighbor search in the implicit KD-tree built by _BuildKdTree().
+    Works with arrays and with memoryviews of a memory mapped file.
+    @query Normalized feature vector.
+    Returns the @count closest rows as a list of tuples (squaredDistance, row),
+    sorted by distance.
+    """
+    # Max heap of (-squaredDistance, row).
+    best = []
+    nodeCount = len(kdSplitDims)
+    stack = [(0, 0, frameCount, 0.0)]
+    while stack:
+        node, low, high, boundDistance = stack.pop()
+        if (len(best) == count) and (boundDistance >= -best[0][0]):
+            continue
+        if (node >= nodeCount) or (kdSplitDims[node] < 0):
+            for orderIndex in range(low, high):
+                row = kdOrder[orderIndex]
+                base = row * dimension
+                distance = 0.0
+                for dim in range(dimension):
+                    diff = features[base + dim] - query[dim]
+                    distance += diff * diff
+                if len(best) < count:
+                    heapq.heappush(best, (-distance, row))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, row))
+            continue
+        middle = (low + high) // 2
+        diff = query[kdSplitDims[node]] - kdSplitValues[node]
+        nearChild = (2 * node + 1, low, middle) if diff < 0.0 else (2 * node + 2, middle, high)
+        farChild = (2 * node + 2, middle, high) if diff < 0.0 else (2 * node + 1, low, middle)
+        # The far child is pushed first, so the near child is visited first.
+        stack.append(farChild + (max(boundDistance, diff * diff),))
+        stack.append(nearChild + (boundDistance,))
+    return sorted((-negativeDistance, row) for negativeDistance, row in best)
+
+
+def BuildFeatureDatabase(clips: list[FeatureClip], fps: float, leafSize: int = DEFAULT_LEAF_SIZE) -> FeatureDatabase:
+    """
+    Stacks the rows of all @clips into a single normalized float32 matrix,
+    and builds the frame to clip index and the KD-tree.
+    """
+    database = FeatureDatabase()
+    database.fps = fps
+    database.leafSize = leafSize
+    rows = []
+    for clipIndex, clip in enumerate(clips):
+        database.clips.append((clip.name, len(rows), len(clip.rows), clip.startFrame))
+        database.frameClips.extend([clipIndex] * len(clip.rows))
+        rows.extend(clip.rows)
+    if len(rows) < 1:
+        raise Exception("Can not build a feature database without frames")
+    dimension = len(rows[0])
+    frameCount = len(rows)
+    means = [sum(row[dim] for row in rows) / frameCount for dim in range(dimension)]
+    stds = []
+    for dim in range(dimension):
+        variance = sum((row[dim] - means[dim]) ** 2 for row in rows) / frameCount
+        std = math.sqrt(variance)
+        # Constant features would divide by zero.
+        stds.append(std if std > 1e-6 else 1.0)
+    database.dimension = dimension
+    database.frameCount = frameCount
+    database.means = array('f', means)
+    database.stds = array('f', stds)
+    database.features = array('f', [value for row in rows for value in NormalizeFeature(row, means, stds)])
+    database.kdOrder, database.kdSplitDims, database.kdSplitValues = _BuildKdTree(
+        database.features, dimension, frameCount, leafSize)
+    return database
+
+
+def _Align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def WriteFeatureDatabase(filePath: str, database: FeatureDatabase):
+    """
+    Writes @database in the binary format described at the top of this file.
+    """
+    names = bytearray()
+    clipRecords = bytearray()
+    for name, firstRow, frameCount, startFrame in database.clips:
+        encodedName = name.encode('utf-8')
+        clipRecords += struct.pack(_CLIP_RECORD_FORMAT, firstRow, frameCount, startFrame, len(names), len(encodedName))
+        names += encodedName
+    sections = [database.means, database.stds, database.features, database.frameClips, database.kdOrder,
+                database.kdSplitDims, database.kdSplitValues, clipRecords, names]
+    sectionBytes = []
+    for section in sections:
+        if isinstance(section, array):
+            if section.itemsize != 4:
+                raise Exception(f"Unexpected item size {section.itemsize} in feature database section")
+            if struct.pack("=I", 1) != struct.pack("<I", 1):
+                section = array(section.typecode, section)
+                section.byteswap()
+            sectionBytes.append(section.tobytes())
+        else:
+            sectionBytes.append(bytes(section))
+    offset = _Align(struct.calcsize(_HEADER_FORMAT))
+    descriptors = []
+    for data in sectionBytes:
+        descriptors.extend((offset, len(data)))
+        offset = _Align(offset + len(data))
+    header = struct.pack(_HEADER_FORMAT, FEATURE_DB_MAGIC, FEATURE_DB_VERSION, database.dimension,
+        database.frameCount, len(database.clips), len(database.kdSplitDims), database.leafSize,
+        database.fps, *descriptors)
+    with open(filePath, 'wb') as outfile:
+        outfile.write(header)
+        for data, sectionOffset in zip(sectionBytes, descriptors[0::2]):
+            outfile.write(b"\0" * (sectionOffset - outfile.tell()))
+            outfile.write(data)
+
+
+class FeatureDatabaseReader:
+    """
+    Memory maps a feature database file. Nothing is parsed or copied, all
+    the sections are memoryviews of the mapped file.
+    Assumes a little endian host, like all the platforms supported by O3DE.
+    Use it as a context manager, or call Close() when done.
+    """
+    def __init__(self, filePath: str):
+        self._file = open(filePath, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sections = {}
+        self._castViews = []
+        fields = struct.unpack_from(_HEADER_FORMAT, self._view, 0)
+        magic, version, self.dimension, self.frameCount, clipCount, nodeCount, self.leafSize, self.fps = fields[:8]
+        if magic != FEATURE_DB_MAGIC:
+            self.Close()
+            raise Exception(f"'{filePath}' is not a feature database file")
+        if version != FEATURE_DB_VERSION:
+            self.Close()
+            raise Exception(f"'{filePath}' has version {version}, expected version {FEATURE_DB_VERSION}")
+        descriptors = fields[8:]
+        for sectionIndex, name in enumerate(_SECTION_NAMES):
+            offset = descriptors[sectionIndex * 2]
+            size = descriptors[sectionIndex * 2 + 1]
+            self._sections[name] = self._view[offset:offset + size]
+        self.means = self._CastSection("means", 'f')
+        self.stds = self._CastSection("stds", 'f')
+        self.features = self._CastSection("features", 'f')
+        self.frameClips = self._CastSection("frameClips", 'I')
+        self.kdOrder = self._CastSection("kdOrder", 'I')
+        self.kdSplitDims = self._CastSection("kdSplitDims", 'i')
+        self.kdSplitValues = self._CastSection("kdSplitValues", 'f')
+        self.clipCount = clipCount
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+    def Close(self):
+        if self._mmap is None:
+            return
+        # All the memoryviews must be released before the mmap can be closed.
+        for view in self._castViews + list(self._sections.values()):
+            view.release()
+        self._castViews = []
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+
+    def _CastSection(self, name: str, typecode: str) -> memoryview:
+        view = self._sections[name].cast(typecode)
+        self._castViews.append(view)
+        return view
+
+    def GetRow(self, row: int) -> memoryview:
+        """Returns the normalized feature vector of @row."""
+        return self.features[row * self.dimension:(row + 1) * self.dimension]
+
+    def GetClip(self, clipIndex: int) -> list[str, int, int, int]:
+        """Returns tuple (name, firstRow, frameCount, startFrame)."""
+        firstRow, frameCount, startFrame, nameOffset, nameLength = struct.unpack_from(
+            _CLIP_RECORD_FORMAT, self._sections["clips"], clipIndex * struct.calcsize(_CLIP_RECORD_FORMAT))
+        name = bytes(self._sections["names"][nameOffset:nameOffset + nameLength]).decode('utf-8')
+        return name, firstRow, frameCount, startFrame
+
+    def GetClipFrame(self, row: int) -> list[str, int]:
+        """Returns tuple (clipName, frameNumber) of @row."""
+        name, firstRow, _, startFrame = self.GetClip(self.frameClips[row])
+        return name, startFrame + row - firstRow
+
+    def Normalize(self, feature: list[float]) -> list[float]:
+        return NormalizeFeature(feature, self.means, self.stds)
+
+    def Search(self, feature: list[float], count: int = 1) -> list[float, int]:
+        """
+        Returns the @count rows closest to the not normalized @feature, as a
+        list of tuples (squaredDistance, row) sorted by distance.
+        """
+        return SearchKdTree(self.features, self.dimension, self.frameCount, self.kdOrder,
+            self.kdSplitDims, self.kdSplitValues, self.leafSize, self.Normalize(feature), count)
+
+
+###############################################################################
+# Batch building
+###############################################################################
+def BuildFeatureDatabaseFromFbxFiles(sceneObj: bpy.types.Scene,
+                                     fbxFilePaths: list[str],
+                                     outputFilePath: str,
+                                     footBonePatterns: list[str] = None,
+                                     trajectoryTimes: list[float] = DEFAULT_TRAJECTORY_TIMES,
+                                     leafSize: int = DEFAULT_LEAF_SIZE):
+    """
+    Imports, one at a time, each of the already converted motion clips in
+    @fbxFilePaths, extracts its features and writes the feature database
+    to @outputFilePath. All the objects in @sceneObj are removed.
+    All clips must have the same frame rate and the same foot bones.
+    """
+    if footBonePatterns is None:
+        footBonePatterns = skl.ParseBonePatterns(DEFAULT_FOOT_BONE_PATTERNS)
+    clips = []
+    fps = None
+    footBoneNames = None
+    for fbxFilePath in fbxFilePaths:
+        cmn.ClearSceneObjects(sceneObj)
+        cmn.ImportFBX(fbxFilePath)
+        armatureObj = cmn.GetFirstAmature(sceneObj)
+        if (armatureObj is None) or (armatureObj.animation_data is None) or (armatureObj.animation_data.action is None):
+            raise Exception(f"'{fbxFilePath}' doesn't have an animated Armature")
+        clipFps = cmn.GetSceneFps(sceneObj)
+        if fps is None:
+            fps = clipFps
+        elif not math.isclose(fps, clipFps):
+            raise Exception(f"'{fbxFilePath}' runs at {clipFps} fps, expected {fps} fps")
+        clipFootBoneNames = sorted(skl.FindBonesByPatterns(armatureObj, footBonePatterns))
+        if footBoneNames is None:
+            footBoneNames = clipFootBoneNames
+            if len(footBoneNames) < 1:
+                raise Exception(f"No foot bones match the patterns {footBonePatterns}")
+        elif clipFootBoneNames != footBoneNames:
+            raise Exception(f"'{fbxFilePath}' has foot bones {clipFootBoneNames}, expected {footBoneNames}")
+        hipBoneName = cmn.GetRootBone(armatureObj).name
+        frameStart, frameEnd = (int(round(frame)) for frame in armatureObj.animation_data.action.frame_range)
+        rows = ExtractClipFeatures(sceneObj, armatureObj, footBoneNames, hipBoneName,
+                                   frameStart, frameEnd, trajectoryTimes)
+        name, _ = os.path.splitext(os.path.basename(fbxFilePath))
+        clips.append(FeatureClip(name, frameStart, rows))
+        yield Status(f"Extracted {len(rows)} feature vectors from '{fbxFilePath}'")
+    cmn.ClearSceneObjects(sceneObj)
+    if fps is None:
+        raise Exception("No FBX files to process")
+
+    database = BuildFeatureDatabase(clips, fps, leafSize)
+    yield Status(f"Built feature database with {database.frameCount} frames of dimension {database.dimension}")
+    WriteFeatureDatabase(outputFilePath, database)
+    yield Status(f"Feature database written to '{outputFilePath}'")
+
+
+def FindFbxFiles(directoryPath: str) -> list[str]:
+    """Returns the sorted list of paths of the .fbx files in @directoryPath."""
+    return sorted(os.path.join(directoryPath, filename) for filename in os.listdir(directoryPath)
+                  if filename.lower().endswith(".fbx"))
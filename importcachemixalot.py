@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Cache of imported FBX scenes.
+# Right after an FBX file is imported, and before it is modified, the new
+# objects are saved in a .blend file named after the sha1 of the FBX content.
+# Importing the same FBX file again appends the objects from the .blend file,
+# which is much faster than parsing the FBX file.
+# The cache directory is bounded in size. The least recently used entries are
+# evicted first, the modification time of an entry is updated on every hit.
+
+import hashlib
+import json
+import os
+import tempfile
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), "lumbermixalot-import-cache")
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def GetFileHash(filePath: str) -> str:
+    """Returns the sha1 hex digest of the content of @filePath."""
+    sha1 = hashlib.sha1()
+    with open(filePath, 'rb') as fileObj:
+        while True:
+            chunk = fileObj.read(1024 * 1024)
+            if not chunk:
+                break
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _GetEntryPaths(cacheDirectory: str, fileHash: str) -> list[str, str]:
+    """Returns tuple (blendPath, infoPath) of a cache entry."""
+    return (os.path.join(cacheDirectory, f"{fileHash}.blend"),
+            os.path.join(cacheDirectory, f"{fileHash}.json"))
+
+
+def _ReadEntryInfo(infoPath: str) -> dict:
+    if not os.path.exists(infoPath):
+        return None
+    try:
+        with open(infoPath) as infoFile:
+            info = json.load(infoFile)
+    except (OSError, ValueError):
+        return None
+    # .blend files written by other Blender versions may not load the same way.
+    if (info.get("version") != CACHE_FORMAT_VERSION) or (info.get("blenderVersion") != bpy.app.version_string):
+        return None
+    return info
+
+
+def _Touch(filePaths: list[str]):
+    for filePath in filePaths:
+        try:
+            os.utime(filePath)
+        except FileNotFoundError:
+            pass
+
+
+def LoadFromCache(scene: bpy.types.Scene, cacheDirectory: str, fileHash: str) -> bool:
+    """
+    Appends the objects of the cache entry @fileHash into @scene, and restores
+    the frame rate and frame range of the original import.
+    Returns False if there's no valid cache entry.
+    """
+    blendPath, infoPath = _GetEntryPaths(cacheDirectory, fileHash)
+    info = _ReadEntryInfo(infoPath)
+    if (info is None) or not os.path.exists(blendPath):
+        return False
+    with bpy.data.libraries.load(blendPath, link=False) as (dataFrom, dataTo):
+        dataTo.objects = [name for name in dataFrom.objects if name in info["objects"]]
+    for obj in dataTo.objects:
+        if obj is not None:
+            scene.collection.objects.link(obj)
+    scene.render.fps = info["fps"]
+    scene.render.fps_base = info["fpsBase"]
+    scene.frame_start = info["frameStart"]
+    scene.frame_end = info["frameEnd"]
+    _Touch((blendPath, infoPath))
+    return True
+
+
+def SaveToCache(scene: bpy.types.Scene, cacheDirectory: str, fileHash: str, objects: list[bpy.types.Object],
+                maxCacheBytes: int = DEFAULT_CACHE_MAX_BYTES):
+    """
+    Saves @objects, and all the data they use (meshes, armatures, actions,
+    materials, images), as the cache entry @fileHash. Then evicts old entries
+    until the cache is not bigger than @maxCacheBytes.
+    """
+    os.makedirs(cacheDirectory, exist_ok=True)
+    blendPath, infoPath = _GetEntryPaths(cacheDirectory, fileHash)
+    # Write to temporary names first, other Blender processes may share the cache.
+    temporaryBlendPath = f"{blendPath}.{os.getpid()}.tmp"
+    bpy.data.libraries.write(temporaryBlendPath, set(objects), path_remap='ABSOLUTE', fake_user=True)
+    os.replace(temporaryBlendPath, blendPath)
+    info = {
+        "version": CACHE_FORMAT_VERSION,
+        "blenderVersion": bpy.app.version_string,
+        "objects": [obj.name for obj in objects],
+        "fps": scene.render.fps,
+        "fpsBase": scene.render.fps_base,
+        "frameStart": scene.frame_start,
+        "frameEnd": scene.frame_end,
+    }
+    temporaryInfoPath = f"{infoPath}.{os.getpid()}.tmp"
+    with open(temporaryInfoPath, 'w') as infoFile:
+        json.dump(info, infoFile, indent=4)
+    os.replace(temporaryInfoPath, infoPath)
+    EvictCacheEntries(cacheDirectory, maxCacheBytes, keepHash=fileHash)
+
+
+def EvictCacheEntries(cacheDirectory: str, maxCacheBytes: int, keepHash: str = None) -> int:
+    """
+    Removes the least recently used entries until the total size of the cache
+    is not bigger than @maxCacheBytes. The entry @keepHash is never removed.
+    Returns the number of removed entries.
+    """
+    entries = {}
+    for filename in os.listdir(cacheDirectory):
+        fileHash, extension = os.path.splitext(filename)
+        if extension not in (".blend", ".json"):
+            continue
+        filePath = os.path.join(cacheDirectory, filename)
+        try:
+            stat = os.stat(filePath)
+        except FileNotFoundError:
+            continue
+        size, lastUsed = entries.get(fileHash, (0, 0.0))
+        entries[fileHash] = (size + stat.st_size, max(lastUsed, stat.st_mtime))
+    totalBytes = sum(size for size, _ in entries.values())
+    removedCount = 0
+    for fileHash, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if totalBytes <= maxCacheBytes:
+            break
+        if fileHash == keepHash:
+            continue
+        for filePath in _GetEntryPaths(cacheDirectory, fileHash):
+            try:
+                os.remove(filePath)
+            except FileNotFoundError:
+                pass
+        totalBytes -= size
+        removedCount += 1
+    return removedCount
+
+
+def ImportFBXCached(fbxFilepath: str, cacheDirectory: str = DEFAULT_CACHE_DIRECTORY,
+                    maxCacheBytes: int = DEFAULT_CACHE_MAX_BYTES) -> bool:
+    """
+    Imports @fbxFilepath into the current scene, from the cache if possible.
+    Returns True if it was a cache hit.
+    """
+    scene = bpy.context.scene
+    fileHash = GetFileHash(fbxFilepath)
+    if LoadFromCache(scene, cacheDirectory, fileHash):
+        _logger.info("Loaded '%s' from the import cache", fbxFilepath)
+        return True
+    previousObjects = set(scene.objects)
+    bpy.ops.import_scene.fbx(filepath=fbxFilepath)
+    importedObjects = [obj for obj in scene.objects if obj not in previousObjects]
+    try:
+        SaveToCache(scene, cacheDirectory, fileHash, importedObjects, maxCacheBytes)
+    except OSError as e:
+        # A full or read only cache directory must not break the import.
+        _logger.warning("Failed to save '%s' in the import cache: %s", fbxFilepath, e)
+    return False
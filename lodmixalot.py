@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+import os
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import skeletonmixalot as skl
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import skeletonmixalot as skl
+
+
+class MotionLod:
+    """
+    Settings of a reduced quality variant of a motion.
+    @level LOD level, starting at 1. LOD 0 is the full quality motion.
+    @fps Sample rate of the exported animation.
+    @excludedBonePatterns fnmatch style patterns. Matching bones, and all their
+        descendants, are not animated in this LOD.
+    """
+    def __init__(self, level: int, fps: float, excludedBonePatterns: list[str]):
+        self.level = level
+        self.fps = fps
+        self.excludedBonePatterns = excludedBonePatterns
+
+
+def MakeMotionLodFilename(fbxFilename: str, level: int) -> str:
+    """
+    Returns the file name of the LOD @level of @fbxFilename.
+    Example: "Walking.fbx" -> "Walking_lod1.fbx"
+    """
+    name, _ = os.path.splitext(fbxFilename)
+    return f"{name}_lod{level}.fbx"
+
+
+def _CreatePrunedArmatureCopy(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature,
+                              boneNames: set[str], action: bpy.types.Action) -> bpy.types.Object:
+    """
+    Returns a copy of @armatureObj, with its own armature data, without the
+    bones named in @boneNames and animated by @action. The copy is linked to
+    @sceneObj and is left as the only selected object.
+    The copy takes the name of @armatureObj, which is renamed until
+    _RemovePrunedArmatureCopy() is called, so the root node of the exported
+    file has the same name as in the full quality motion.
+    """
+    sourceName = armatureObj.name
+    prunedObj = armatureObj.copy()
+    prunedObj.data = armatureObj.data.copy()
+    armatureObj.name = f"{sourceName}_lodsource"
+    prunedObj.name = sourceName
+    sceneObj.collection.objects.link(prunedObj)
+    prunedObj.animation_data.action = action
+    cmn.SelectOnlyObjects(sceneObj, [prunedObj])
+    cmn.RemoveBones(prunedObj, boneNames)
+    return prunedObj
+
+
+def _RemovePrunedArmatureCopy(armatureObj: bpy.types.Armature, prunedObj: bpy.types.Object):
+    sourceName = prunedObj.name
+    prunedData = prunedObj.data
+    bpy.data.objects.remove(prunedObj, do_unlink=True)
+    bpy.data.armatures.remove(prunedData)
+    armatureObj.name = sourceName
+
+
+def ExportMotionLods(sceneObj: bpy.types.Scene,
+                     armatureObj: bpy.types.Armature,
+                     fbxFilename: str,
+                     fbxOutputPath: str,
+                     motionLods: list[MotionLod],
+                     exportFormat: str = cmn.EXPORT_FORMAT_FBX,
+                     exportProfile: str = cmn.EXPORT_PROFILE_DEFAULT):
+    """
+    Exports cheaper variants of the current action of @armatureObj, next to the
+    full quality FBX named @fbxFilename. Each variant is sampled at a lower
+    rate and is exported with a temporary copy of the armature without the
+    excluded bones, so the exporters don't bake them. See MotionLod.
+    Only the armature is exported, meshes are not part of motion LODs.
+    The current action and @armatureObj are not modified.
+    @exportFormat cmn.EXPORT_FORMAT_FBX or cmn.EXPORT_FORMAT_GLB.
+    @exportProfile One of the cmn.EXPORT_PROFILE_* constants, except cmn.EXPORT_PROFILE_AUTO.
+    """
+    action = armatureObj.animation_data.action
+    if action is None:
+        raise Exception(f"The armature '{armatureObj.name}' has no action to export")
+    sourceFps = cmn.GetSceneFps(sceneObj)
+    viewLayer = bpy.context.view_layer
+    previousActiveObj = viewLayer.objects.active
+    previousSelection = [obj for obj in sceneObj.objects if obj.select_get()]
+    for motionLod in motionLods:
+        excludedBoneNames = skl.FindBonesToPrune(armatureObj, motionLod.excludedBonePatterns)
+        lodAction = action.copy()
+        lodAction.name = f"{action.name}_lod{motionLod.level}"
+        prunedObj = None
+        try:
+            removedCount = skl.RemovePoseBoneFCurvesFromAction(lodAction, excludedBoneNames)
+            prunedObj = _CreatePrunedArmatureCopy(sceneObj, armatureObj, excludedBoneNames, lodAction)
+            yield Status(f"LOD {motionLod.level}: removed {len(excludedBoneNames)} bones and {removedCount} fcurves")
+
+            lodFilename = MakeMotionLodFilename(fbxFilename, motionLod.level)
+            outputFilename = cmn._MakeFilePathForFBX(lodFilename, fbxOutputPath, exportFormat)
+            if outputFilename is None:
+                raise Exception("Undefined output filename")
+            bakeAnimStep = max(1.0, sourceFps / motionLod.fps)
+            # GLB files can't be sampled at fractional steps, the actual rate is reported.
+            bakeAnimStep = cmn._ExportInternal(outputFilename, exportFormat, bakeAnimStep=bakeAnimStep,
+                                               useSelection=True, exportProfile=exportProfile)
+            yield Status(f"LOD {motionLod.level}: exported '{outputFilename}' sampled at {sourceFps / bakeAnimStep:.2f} fps")
+        finally:
+            if prunedObj is not None:
+                _RemovePrunedArmatureCopy(armatureObj, prunedObj)
+            bpy.data.actions.remove(lodAction)
+            cmn.SelectOnlyObjects(sceneObj, previousSelection)
+            viewLayer.objects.active = previousActiveObj
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Leveled logging of lumbermixalot, built on the standard logging module.
+# Each module gets its own logger under the "lumbermixalot" logger:
+#   _logger = log.GetLogger(__name__)
+#   _logger.debug("Copied %d keyframes", count)
+# Messages go to:
+#   - The console. In quiet mode only warnings and errors are printed, console
+#     I/O slows down long batches.
+#   - An in-memory ring buffer with the most recent messages, shown in the UI.
+# This module doesn't depend on bpy.
+
+import collections
+import logging
+import sys
+
+ROOT_LOGGER_NAME = "lumbermixalot"
+DEFAULT_RING_BUFFER_SIZE = 500
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_CONSOLE_FORMAT = "%(message)s"
+_RING_BUFFER_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the formatted text of the last @capacity log records.
+    """
+    def __init__(self, capacity: int = DEFAULT_RING_BUFFER_SIZE):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.records.append((record.levelno, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+
+def _ConfigureRootLogger():
+    rootLogger = logging.getLogger(ROOT_LOGGER_NAME)
+    # When this module is reloaded the handlers of the previous instance
+    # must be removed, otherwise each message would be printed twice.
+    for handler in list(rootLogger.handlers):
+        if getattr(handler, "lumbermixalotHandler", False):
+            rootLogger.removeHandler(handler)
+    consoleHandler = logging.StreamHandler(sys.stdout)
+    consoleHandler.setFormatter(logging.Formatter(_CONSOLE_FORMAT))
+    consoleHandler.lumbermixalotHandler = True
+    ringBufferHandler = RingBufferHandler()
+    ringBufferHandler.setFormatter(logging.Formatter(_RING_BUFFER_FORMAT))
+    ringBufferHandler.lumbermixalotHandler = True
+    rootLogger.addHandler(consoleHandler)
+    rootLogger.addHandler(ringBufferHandler)
+    rootLogger.setLevel(logging.INFO)
+    # Blender and other addons may configure the python root logger.
+    rootLogger.propagate = False
+    return rootLogger, consoleHandler, ringBufferHandler
+
+
+_rootLogger, _consoleHandler, _ringBufferHandler = _ConfigureRootLogger()
+
+
+def GetLogger(moduleName: str) -> logging.Logger:
+    """
+    Returns the logger of a lumbermixalot module.
+    @moduleName Usually __name__. Works for both, package and standalone mode.
+    """
+    shortName = moduleName.rsplit(".", 1)[-1]
+    return _rootLogger.getChild(shortName)
+
+
+def _GetLevel(level) -> int:
+    if isinstance(level, str):
+        if level.upper() not in LEVEL_NAMES:
+            raise Exception(f"Invalid log level '{level}'. Valid levels are {', '.join(LEVEL_NAMES)}")
+        return getattr(logging, level.upper())
+    return level
+
+
+def SetLevel(level):
+    """
+    Messages below @level are discarded by all loggers, this is the cheapest way
+    to get rid of them because they are not even formatted.
+    @level One of LEVEL_NAMES or a logging level number.
+    """
+    _rootLogger.setLevel(_GetLevel(level))
+
+
+def SetQuietMode(quiet: bool):
+    """
+    In quiet mode only warnings and errors are printed to the console.
+    The ring buffer still receives all the messages at or above the current level.
+    """
+    _consoleHandler.setLevel(logging.WARNING if quiet else logging.NOTSET)
+
+
+def IsQuietMode() -> bool:
+    return _consoleHandler.level >= logging.WARNING
+
+
+def GetRecentMessages(count: int = 0, level="DEBUG") -> list[str]:
+    """
+    Returns the text of the most recent messages in the ring buffer, oldest first.
+    @count If 0, returns all of them.
+    @level Only messages at or above this level are returned.
+    """
+    minLevel = _GetLevel(level)
+    messages = [text for levelno, text in _ringBufferHandler.records if levelno >= minLevel]
+    if count > 0:
+        return messages[-count:]
+    return messages
+
+
+def ClearRecentMessages():
+    _ringBufferHandler.records.clear()
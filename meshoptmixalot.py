@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Index buffer reordering for GPU vertex cache and vertex fetch locality.
+# This module doesn't depend on bpy, all functions work with flat lists of
+# triangle vertex indices, where triangle N is
+# (indices[3*N], indices[3*N + 1], indices[3*N + 2]).
+
+DEFAULT_CACHE_SIZE = 32
+
+# Tunables of the Forsyth algorithm, as published in:
+# https://tomforsyth1000.github.io/papers/fast_vert_cache_opt.html
+_CACHE_DECAY_POWER = 1.5
+_LAST_TRIANGLE_SCORE = 0.75
+_VALENCE_BOOST_SCALE = 2.0
+_VALENCE_BOOST_POWER = 0.5
+
+
+def CalculateACMR(indices: list[int], cacheSize: int = DEFAULT_CACHE_SIZE) -> float:
+    """
+    Returns the Average Cache Miss Ratio of the triangle list @indices, which is
+    the average number of vertices transformed per triangle, for a FIFO post
+    transform vertex cache of @cacheSize entries. Lower is better, the range
+    is [0.5, 3.0].
+    """
+    triangleCount = len(indices) // 3
+    if triangleCount < 1:
+        return 0.0
+    cache = []
+    cached = set()
+    misses = 0
+    for vertexIndex in indices:
+        if vertexIndex in cached:
+            continue
+        misses += 1
+        cache.append(vertexIndex)
+        cached.add(vertexIndex)
+        if len(cache) > cacheSize:
+            cached.discard(cache.pop(0))
+    return misses / triangleCount
+
+
+def _GetVertexScore(cachePosition: int, remainingValence: int, cacheSize: int) -> float:
+    if remainingValence < 1:
+        return -1.0
+    score = 0.0
+    if cachePosition >= 0:
+        if cachePosition < 3:
+            # The vertices of the last triangle get a fixed score, this way
+            # the algorithm doesn't favor strips.
+            score = _LAST_TRIANGLE_SCORE
+        else:
+            scaler = 1.0 / (cacheSize - 3)
+            score = (1.0 - (cachePosition - 3) * scaler) ** _CACHE_DECAY_POWER
+    # Bonus points for vertices with few triangles left, this way
+    # the algorithm gets rid of lone vertices.
+    score += _VALENCE_BOOST_SCALE * (remainingValence ** -_VALENCE_BOOST_POWER)
+    return score
+
+
+def OptimizeTriangleOrder(indices: list[int], vertexCount: int, cacheSize: int = DEFAULT_CACHE_SIZE) -> list[int]:
+    """
+    Tom Forsyth's linear-speed vertex cache optimization.
+    Returns a list with the triangle numbers of @indices sorted in the order
+    they should be drawn to maximize post transform vertex cache hits.
+    """
+    triangleCount = len(indices) // 3
+    if triangleCount < 1:
+        return []
+    vertexTriangles = [[] for _ in range(vertexCount)]
+    for triangleIndex in range(triangleCount):
+        for corner in range(3):
+            vertexTriangles[indices[triangleIndex * 3 + corner]].append(triangleIndex)
+    remainingValence = [len(triangles) for triangles in vertexTriangles]
+    vertexScores = [_GetVertexScore(-1, valence, cacheSize) for valence in remainingValence]
+    triangleScores = [0.0] * triangleCount
+    for triangleIndex in range(triangleCount):
+        base = triangleIndex * 3
+        triangleScores[triangleIndex] = (vertexScores[indices[base]] +
+            vertexScores[indices[base + 1]] + vertexScores[indices[base + 2]])
+    triangleAdded = [False] * triangleCount
+
+    drawOrder = []
+    cache = []
+    bestTriangle = max(range(triangleCount), key=triangleScores.__getitem__)
+    # Used to find the next triangle when none of the vertices in the cache
+    # has triangles left. Triangles before the cursor are all added, and the
+    # cursor only moves forward, so all the dead ends together cost O(T).
+    linearCursor = 0
+    while bestTriangle >= 0:
+        triangleAdded[bestTriangle] = True
+        drawOrder.append(bestTriangle)
+        base = bestTriangle * 3
+        triangleVertices = indices[base:base + 3]
+        for vertexIndex in triangleVertices:
+            remainingValence[vertexIndex] -= 1
+            vertexTriangles[vertexIndex].remove(bestTriangle)
+
+        # Move the vertices of the added triangle to the front of the LRU cache.
+        newCache = list(triangleVertices)
+        for vertexIndex in cache:
+            if vertexIndex not in triangleVertices:
+                newCache.append(vertexIndex)
+        # The cache keeps 3 extra entries, so the scores of the vertices that
+        # were just evicted are updated too.
+        cache = newCache[:cacheSize + 3]
+
+        # Update the scores of the vertices in the cache and their triangles.
+        bestTriangle = -1
+        bestScore = -1.0
+        touchedTriangles = set()
+        for position, vertexIndex in enumerate(cache):
+            cachePosition = position if position < cacheSize else -1
+            newScore = _GetVertexScore(cachePosition, remainingValence[vertexIndex], cacheSize)
+            delta = newScore - vertexScores[vertexIndex]
+            vertexScores[vertexIndex] = newScore
+            for triangleIndex in vertexTriangles[vertexIndex]:
+                triangleScores[triangleIndex] += delta
+                touchedTriangles.add(triangleIndex)
+        for triangleIndex in touchedTriangles:
+            if triangleScores[triangleIndex] > bestScore:
+                bestScore = triangleScores[triangleIndex]
+                bestTriangle = triangleIndex
+        cache = cache[:cacheSize]
+
+        if bestTriangle < 0:
+            # Dead end, e.g. the end of a mesh island. Continue with the first
+            # triangle that wasn't added, scanning all of them for the best
+            # score would be quadratic on meshes with many islands.
+            while (linearCursor < triangleCount) and triangleAdded[linearCursor]:
+                linearCursor += 1
+            if linearCursor < triangleCount:
+                bestTriangle = linearCursor
+    return drawOrder
+
+
+def ReorderTriangles(indices: list[int], drawOrder: list[int]) -> list[int]:
+    """
+    Returns a new triangle list with the triangles of @indices in the order
+    given by @drawOrder.
+    """
+    newIndices = []
+    for triangleIndex in drawOrder:
+        base = triangleIndex * 3
+        newIndices.extend(indices[base:base + 3])
+    return newIndices
+
+
+def OptimizeVertexFetchOrder(indices: list[int], vertexCount: int) -> list[int]:
+    """
+    Returns a list, indexed by the current vertex index, with the new index of
+    each vertex. Vertices are renumbered in the order they are first referenced by
+    @indices, so the vertex buffer is read as linearly as possible.
+    Unreferenced vertices are moved to the end of the vertex buffer.
+    """
+    remap = [-1] * vertexCount
+    nextIndex = 0
+    for vertexIndex in indices:
+        if remap[vertexIndex] < 0:
+            remap[vertexIndex] = nextIndex
+            nextIndex += 1
+    for vertexIndex in range(vertexCount):
+        if remap[vertexIndex] < 0:
+            remap[vertexIndex] = nextIndex
+            nextIndex += 1
+    return remap
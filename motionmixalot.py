@@ -26,6 +26,7 @@ from mathutils import *
 import math
 import sys
 import os
+import json
 
 
 if __package__ is None or __package__ == "":
@@ -33,11 +34,15 @@ if __package__ is None or __package__ == "":
     from commonmixalot import Status
     import commonmixalot as cmn
     import fcurvesmixalot as fcv
+    import logmixalot as log
 else:
     # When running as an installed AddOn, then it runs in package mode.
     from .commonmixalot import Status
     from . import commonmixalot as cmn
     from . import fcurvesmixalot as fcv
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
 
 #Directory for CSV files generated if debugging is enabled.
 #Customize to your needs.
@@ -72,7 +77,7 @@ def _DumpBoundBox(bound_box):
     """
     for idx, rawVec in enumerate(bound_box):
         v = Vector(rawVec)
-        print(f"bbIdx[{idx}] = {v}")
+        _logger.debug("bbIdx[%d] = %s", idx, v)
 
 
 def _GetBBOXBaseCenter(vecMin, vecMax):
@@ -83,32 +88,54 @@ def _GetBBOXBaseCenter(vecMin, vecMax):
 
 
 def _DumpBone(matrixWorld, bone):
-    print("Head", bone.head)
-    print("Tail", bone.tail)
-    print("Location", bone.location)
+    _logger.debug("Head %s", bone.head)
+    _logger.debug("Tail %s", bone.tail)
+    _logger.debug("Location %s", bone.location)
     worldLocation = (matrixWorld @ bone.matrix).to_translation()
-    print("World Location", worldLocation)
+    _logger.debug("World Location %s", worldLocation)
 
 
 
-def _GetBBoxWorldLocations(sceneObj: bpy.types.Scene , armatureObj: bpy.types.Armature, keyFrameNumbersList: list[int]) -> list[Vector]:
+def _GetBBoxWorldLocations(sceneObj: bpy.types.Scene , armatureObj: bpy.types.Armature, keyFrameNumbersList: list[int],
+                           worldMatrix: Matrix = None) -> list[Vector]:
     """
     Returns an array of Vector. Each vector is the world location of the center of the bottom plane
     of the bounding box  per key frame.
+    @worldMatrix Optional. If given, it is used instead of the evaluated armatureObj.matrix_world.
+    """
+    worldMatrices = None if worldMatrix is None else [worldMatrix]
+    return _GetBBoxWorldLocationsForArmatures(sceneObj, [armatureObj], [keyFrameNumbersList], worldMatrices)[0]
+
+
+def _GetBBoxWorldLocationsForArmatures(sceneObj: bpy.types.Scene, armatureObjs: list[bpy.types.Armature],
+                                       keyFrameNumbersLists: list[list[int]],
+                                       worldMatrices: list[Matrix] = None) -> list[list[Vector]]:
+    """
+    Same as _GetBBoxWorldLocations() for several armatures, but the timeline is swept
+    only once: sceneObj.frame_set() is called once per frame in the union of
+    @keyFrameNumbersLists, and all the armatures with a key frame at that frame
+    are sampled after the same depsgraph evaluation.
+    Returns one list of Vector per armature, in the same order as @armatureObjs.
     """
-    vectorList = []
-    for frameNumber in keyFrameNumbersList:
-        sceneObj.frame_set(frameNumber)
-        (vecMin, vecMax) = _GetBBOX(armatureObj.bound_box)
-        #_DumpBoundBox(armatureObj.bound_box)
-        # It is very important to multiply by armatureObj.matrix_world,
-        # Because usually the Armature as it comes from Mixamo, it is rotate 90def around
-        # the X axis, and with 0.01 uniform scale across all axis.
-        vecMin = armatureObj.matrix_world @ vecMin
-        vecMax = armatureObj.matrix_world @ vecMax
-        v = _GetBBOXBaseCenter(vecMin, vecMax)
-        vectorList.append(v)
-    return vectorList
+    armaturesPerFrame = {}
+    for armatureIndex, keyFrameNumbersList in enumerate(keyFrameNumbersLists):
+        for keyIndex, frameNumber in enumerate(keyFrameNumbersList):
+            armaturesPerFrame.setdefault(frameNumber, []).append((armatureIndex, keyIndex))
+    vectorLists = [[None] * len(keyFrameNumbersList) for keyFrameNumbersList in keyFrameNumbersLists]
+    for frameNumber in sorted(armaturesPerFrame):
+        cmn.SetSceneFrame(sceneObj, frameNumber)
+        for armatureIndex, keyIndex in armaturesPerFrame[frameNumber]:
+            armatureObj = armatureObjs[armatureIndex]
+            (vecMin, vecMax) = _GetBBOX(armatureObj.bound_box)
+            #_DumpBoundBox(armatureObj.bound_box)
+            # It is very important to multiply by armatureObj.matrix_world,
+            # Because usually the Armature as it comes from Mixamo, it is rotate 90def around
+            # the X axis, and with 0.01 uniform scale across all axis.
+            matrix = armatureObj.matrix_world if worldMatrices is None else worldMatrices[armatureIndex]
+            vecMin = matrix @ vecMin
+            vecMax = matrix @ vecMax
+            vectorLists[armatureIndex][keyIndex] = _GetBBOXBaseCenter(vecMin, vecMax)
+    return vectorLists
 
 
 #@vectorList is a list of MathUtils.Vector
@@ -190,7 +217,7 @@ def _TransformPoseBoneLocalQuaternionsToWorldQuaternions(armatureObj: bpy.types.
                                                          poseBoneObj: bpy.types.PoseBone,
                                                          localQuaternionsList: list[Quaternion]):
     restMatrix = _GetRestPoseMatrixFromPoseBone(poseBoneObj)
-    print(f"restMatrix={restMatrix}")
+    _logger.debug("restMatrix=%s", restMatrix)
     transformMatrix = armatureObj.matrix_world @ restMatrix
     return transformMatrix, _TransformQuaternionsList(transformMatrix, localQuaternionsList)
     
@@ -218,7 +245,7 @@ def ExtractAngleAroundUpVectorFromQuaternion(upVector: Vector, forwardVector: Ve
     # the angle is 0.
     delta = 1.0 - abs(qmForward.dot(upVector))
     if delta < 0.01:
-        print("Too Close")
+        _logger.debug("Too Close")
         return 0
     qCrossed = qmForward.cross(upVector)
     qCrossed.normalize()
@@ -333,7 +360,7 @@ def _SaveVectorListAsCsv(vectorList, startFrame, fileName):
     try:
         fileObj = open(filename, 'w+')
     except:
-        print("Failed to create ", filename)
+        _logger.error("Failed to create %s", filename)
         return
     fileObj.write("Frame,x,y,z\n")
     frameId = startFrame
@@ -341,7 +368,7 @@ def _SaveVectorListAsCsv(vectorList, startFrame, fileName):
         fileObj.write("{},{},{},{}\n".format(frameId, v.x, v.y, v.z))
         frameId += 1
     fileObj.close()
-    print("{} was created".format(fileName))
+    _logger.info("%s was created", fileName)
 
 
 #Debug function that dumps a list of Quaternion as a CSV file.
@@ -350,7 +377,7 @@ def _SaveQuaternionListAsCsv(quaternionsList, startFrame, fileName):
     try:
         fileObj = open(filename, 'w+')
     except:
-        print("Failed to create ", filename)
+        _logger.error("Failed to create %s", filename)
         return
     fileObj.write("Frame,w,x,y,z\n")
     frameId = startFrame
@@ -358,7 +385,7 @@ def _SaveQuaternionListAsCsv(quaternionsList, startFrame, fileName):
         fileObj.write("{},{},{},{},{}\n".format(frameId, q.w, q.x, q.y, q.z))
         frameId += 1
     fileObj.close()
-    print("{} was created".format(fileName))
+    _logger.info("%s was created", fileName)
 
 
 def _SaveAxisAnglesListAsCsv(anglesList, axisVector, startFrame, fileName):
@@ -366,7 +393,7 @@ def _SaveAxisAnglesListAsCsv(anglesList, axisVector, startFrame, fileName):
     try:
         fileObj = open(filename, 'w+')
     except:
-        print("Failed to create ", filename)
+        _logger.error("Failed to create %s", filename)
         return
     fileObj.write("Frame,w,x,y,z\n")
     frameId = startFrame
@@ -374,7 +401,7 @@ def _SaveAxisAnglesListAsCsv(anglesList, axisVector, startFrame, fileName):
         fileObj.write("{},{},{},{},{}\n".format(frameId, deg, axisVector.x, axisVector.y, axisVector.z))
         frameId += 1
     fileObj.close()
-    print("{} was created".format(fileName))
+    _logger.info("%s was created", fileName)
 
 
 def _GetVectorListAxisAsArray(vectorList, axis):
@@ -405,7 +432,7 @@ def _BuildVectorListFromArrays(arrayDataX, arrayDataY, arrayDataZ):
 
 
 def _ClearDataForAxes(vectorList, clearX, clearY, clearZ):
-    print("Will clear axes: ", clearX, clearY, clearZ)
+    _logger.debug("Will clear axes: %s %s %s", clearX, clearY, clearZ)
     for v in vectorList:
         if clearX:
             v.x = 0.0
@@ -420,65 +447,181 @@ def AddLinearRotationToArmatureLocalRotationData(sceneObj: bpy.types.Scene, arma
     @angularSpeed: In radians per second.
     REMARK: This function works well, but the rotation is local.
     """
-    fcurve = fcv.GetArmatureFCurveFromDataPath(armatureObj, fcv.FCurveDataPath.QUATERNION_W)
-    if fcurve is None:
-        #Need to allocate the quaternion fcurves according to the root bone.
-        rootBoneName = cmn.GetRootBone(armatureObj).name
-        fcv.AllocateQuaternionKeyFramesFromPoseBoneToArmature(rootBoneName, armatureObj)
-        print(f"Created the same amount of quaternion key frames from bone '{rootBoneName}'' in the armature '{armatureObj.name}'")
-    else:
-        print(f"The armature '{armatureObj.name}' already has quaternion data.")
-    # The fcurves exist, let's fetch all the quaternions for each keyframe.
-    quaternionList = fcv.GetArmatureLocalQuaternionsFromFcurves(armatureObj)
-    print(f"Collected the quaternion data from the armature '{armatureObj.name}'.")
-    #r s   r
-    #- - = -
-    #s f   f
-    radsPerFrame = angularSpeed * (1.0/animationFps)
-    print(f"radsPerFrame={radsPerFrame}")
-    radians = 0.0
-    newQuaternionList = []
-    for q in quaternionList:
-        parentQ = Quaternion(axis, radians)
-        newQ = parentQ @ q
-        newQuaternionList.append(newQ)
-        radians += radsPerFrame
-    print(f"Transformed the quaternion data from the armature '{armatureObj.name}'.")
-    fcv.SetQuaternionDataForArmatureKeyFrames(armatureObj, newQuaternionList)
-    print(f"Finished injecting additional rotation animation to the armature '{armatureObj.name}'.")
+    for _ in ApplyPostProcessOps(armatureObj, [SpinOp(axis, angularSpeed, animationFps)]):
+        pass
+    _logger.info("Finished injecting additional rotation animation to the armature '%s'.", armatureObj.name)
 
 
-def ExtractRootMotion(sceneObj:bpy.types.Scene,
-                      armatureObj: bpy.types.Armature,
-                      hipBoneName: str,
-                      extractTranslationX: bool,
-                      extractTranslationY: bool,
-                      extractTranslationZ: bool,
-                      extractRotationZ: bool,
-                      dumpCSVs: bool =False):
+def _GetKeyFrameWindows(hipFCurve: bpy.types.FCurve, frameRanges: list[int, int], chunkSize: int) -> list[int, int]:
     """
-    Extracts root motion animation data from the Hip Bone and assigns it
-    as new animation key frames to the @armatureObj transform.
-
-    In Short: Transfers root motion
-     from the Hips bone to the "Armature" object. The motion data is transferred
-     from Hips bone FCurves to  the "Armature" FCurves.
-
-    @sceneObj (bpy.types.Scene)
-    @armatureObj (bpy.types.Object). Object.type is assumed to be 'ARMATURE'
-    @hipBoneName (string). Name of the "Hips" bone as originated by Mixamo.
-    @extractTranslationX,Y,Z (bool). Extract X,Y,Z Axis Translation.
-    @extractRotationZ (bool). Extract Rotation around Z Axis.
-    @dumpCSVs (bool) DEBUG Only. Dump motion vector data as CSV files
+    Returns a list of tuples (startIndex, count) with the array locations of the
+    hip key frames to process. There's at least one window per frame range, and
+    windows are never longer than @chunkSize key frames (if @chunkSize > 0).
+    If @frameRanges is empty, all key frames are processed.
+    """
+    keyFrameCount = len(hipFCurve.keyframe_points)
+    if frameRanges:
+        indexRanges = [fcv.GetKeyFrameIndexRange(hipFCurve, startFrame, endFrame) for startFrame, endFrame in frameRanges]
+    else:
+        indexRanges = [(0, keyFrameCount)]
+    windows = []
+    for startIndex, count in indexRanges:
+        windowSize = chunkSize if chunkSize > 0 else max(1, count)
+        for windowStart in range(startIndex, startIndex + count, windowSize):
+            windows.append((windowStart, min(windowSize, startIndex + count - windowStart)))
+    return windows
+
+
+def _ExtractRootMotionWindowed(sceneObj: bpy.types.Scene,
+                               armatureObj: bpy.types.Armature,
+                               hipBoneName: str,
+                               extractTranslationX: bool,
+                               extractTranslationY: bool,
+                               extractTranslationZ: bool,
+                               extractRotationZ: bool,
+                               frameRanges: list[int, int],
+                               chunkSize: int):
+    """
+    Same algorithm as ExtractRootMotion, but only the hip key frames inside
+    @frameRanges are read, evaluated and written, and they are processed in
+    windows of at most @chunkSize key frames. The cost is proportional to the
+    length of the frame ranges, and peak memory usage is proportional to
+    @chunkSize instead of the length of the clip.
+    The Armature fcurves only get key frames inside @frameRanges.
+    It is assumed the current rotation of the armature was already applied as 0,0,0.
     """
-    print(f"Armature world matrix before resetting orientation:\n{armatureObj.matrix_world}")
+    extractTranslation = extractTranslationX or extractTranslationY or extractTranslationZ
+    poseBoneObj = cmn.GetPoseBoneFromArmature(armatureObj, hipBoneName)
+    # The armature transform gets animated while the root motion is written,
+    # all frames must use the transform it had before extraction.
+    worldMatrix = armatureObj.matrix_world.copy()
+    worldMatrixInv = worldMatrix.inverted()
+    hipWorldMatrix = worldMatrix @ _GetRestPoseMatrixFromPoseBone(poseBoneObj)
+    hipWorldMatrixInv = hipWorldMatrix.inverted()
+
+    hipLocationFCurves = fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.LOCATION_DATA_PATHS)
+    windows = _GetKeyFrameWindows(hipLocationFCurves[0], frameRanges, chunkSize)
+    windows = [(startIndex, count) for startIndex, count in windows if count > 0]
+    if len(windows) < 1:
+        raise Exception(f"There are no key frames of '{hipBoneName}' bone inside the requested frame ranges")
+    keyFrameCount = sum(count for _, count in windows)
+    keyFrameStart, = fcv.GetKeyFrameNumbersInRange(hipLocationFCurves[0], windows[0][0], 1)
+    keyFrameEnd, = fcv.GetKeyFrameNumbersInRange(hipLocationFCurves[0], windows[-1][0] + windows[-1][1] - 1, 1)
+    sceneObj.frame_start = keyFrameStart
+    sceneObj.frame_end = keyFrameEnd
+    yield Status(f"Will process {keyFrameCount} key frames, between frames {keyFrameStart} and {keyFrameEnd}, in {len(windows)} windows")
+
+    # The Armature key frames are allocated in bulk, only for the processed frames.
+    # Each window writes the frame numbers and values of its Armature key frames,
+    # window N starting at armatureStartIndices[N].
+    armatureStartIndices = []
+    armatureKeyFrameCount = 0
+    for _, count in windows:
+        armatureStartIndices.append(armatureKeyFrameCount)
+        armatureKeyFrameCount += count
+    if extractTranslation:
+        armatureLocationFCurves = fcv.AllocateArmatureKeyFrames(armatureObj, fcv.LOCATION_DATA_PATHS,
+            armatureKeyFrameCount)
+        yield Status(f"Allocated 'location' KeyFrames in Armature named '{armatureObj.name}'")
+    if extractRotationZ:
+        hipQuaternionFCurves = fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.QUATERNION_DATA_PATHS)
+        armatureQuaternionFCurves = fcv.AllocateArmatureKeyFrames(armatureObj, fcv.QUATERNION_DATA_PATHS,
+            armatureKeyFrameCount)
+        yield Status(f"Inserted empty rotation keyframes in '{armatureObj.name}' quaternions FCurve")
+
+    for (startIndex, count), armatureStartIndex in zip(windows, armatureStartIndices):
+        keyFrameNumbers = fcv.GetKeyFrameNumbersInRange(hipLocationFCurves[0], startIndex, count)
+        if extractTranslation:
+            hipLocalLocations = [Vector(v) for v in fcv.GetChannelValuesInRange(hipLocationFCurves, startIndex, count)]
+            hipWorldLocations = _TransformVectorList(hipWorldMatrix, hipLocalLocations)
+            bboxBaseLocations = _GetBBoxWorldLocations(sceneObj, armatureObj, keyFrameNumbers, worldMatrix)
+            rawFeetWorldAxisDataZ = _GetVectorListAxisAsArray(bboxBaseLocations, 2)
+            _ClearCloseToZeroDataFromArrayInPlace(rawFeetWorldAxisDataZ)
+            feetWorldLocations = _BuildVectorListFromArrays(
+                _GetVectorListAxisAsArray(hipWorldLocations, 0),
+                _GetVectorListAxisAsArray(hipWorldLocations, 1),
+                rawFeetWorldAxisDataZ)
+            _ClearDataForAxes(feetWorldLocations, not extractTranslationX,
+                              not extractTranslationY, not extractTranslationZ)
+            hipBoneWorldLocationDeltas = _SubtractVectorLists(hipWorldLocations, feetWorldLocations)
+            newHipLocalLocations = _TransformVectorList(hipWorldMatrixInv, hipBoneWorldLocationDeltas)
+            fcv.SetChannelValuesInRange(hipLocationFCurves, startIndex, newHipLocalLocations)
+            fcv.SetChannelKeyFramesInRange(armatureLocationFCurves, armatureStartIndex, keyFrameNumbers,
+                                           feetWorldLocations)
+
+        if extractRotationZ:
+            localQuaternionsList = [Quaternion(q) for q in fcv.GetChannelValuesInRange(hipQuaternionFCurves, startIndex, count)]
+            worldQuaternionsList = _TransformQuaternionsList(hipWorldMatrix, localQuaternionsList)
+            zAxisWorldQuaternionsList, _, _ = _ExtractZaxisWorldQuaternions(armatureObj, worldQuaternionsList)
+            noZAxisWorldQuaternionsList = _RemoveInfluenceOfQuaternionsFromQuaternions(zAxisWorldQuaternionsList, worldQuaternionsList)
+            hipsLocalQuaternionsListNoZ = _TransformQuaternionsList(hipWorldMatrixInv, noZAxisWorldQuaternionsList)
+            rootLocalQuaternionsListOnlyZ = _TransformQuaternionsList(worldMatrixInv, zAxisWorldQuaternionsList)
+            fcv.SetChannelValuesInRange(hipQuaternionFCurves, startIndex, hipsLocalQuaternionsListNoZ)
+            fcv.SetChannelKeyFramesInRange(armatureQuaternionFCurves, armatureStartIndex, keyFrameNumbers,
+                                           rootLocalQuaternionsListOnlyZ)
+
+        yield Status(f"Processed key frames {startIndex} to {startIndex + count - 1}")
+
+    # Handles are recalculated once, after all the windows were written.
+    for fcurve in armatureObj.animation_data.action.fcurves:
+        fcurve.update()
+    yield Status(f"Completed root motion extraction from '{hipBoneName}' bone to '{armatureObj.name}'")
 
-    # We need to set the current rotation as 0,0,0
-    cmn.ApplyCurrentRotationAs000(armatureObj)
-    yield Status(f"Applied current rotation of '{armatureObj.name}' as 0,0,0")
 
+def _RetimeArmatureActions(sceneObj: bpy.types.Scene, armatureObjs: list[bpy.types.Armature], targetFps: int):
+    """
+    Optional retiming of the actions of @armatureObjs. All the actions are
+    retimed from the same source frame rate, the scene frame rate only changes
+    after the last one. Armatures that share an action retime it once.
+    """
+    sourceFps = cmn.GetSceneFps(sceneObj)
+    if (targetFps <= 0) or (abs(sourceFps - targetFps) <= 1e-3):
+        return
+    actions = []
+    for armatureObj in armatureObjs:
+        action = armatureObj.animation_data.action
+        if action not in actions:
+            actions.append(action)
+    keyFrameCounts = fcv.ResampleActionsToFps(sceneObj, actions, targetFps)
+    for action, keyFrameCount in zip(actions, keyFrameCounts):
+        yield Status(f"Retimed the action '{action.name}' from {sourceFps:.2f} to {targetFps} fps ({keyFrameCount} key frames)")
+    for armatureObj in armatureObjs:
+        # The cached ground heights were sampled at the previous frame rate.
+        ClearSourceTracks(armatureObj)
+
+
+def _PrepareHipBoneFCurves(armatureObj: bpy.types.Armature, hipBoneName: str):
+    """
+    Resampling of the hip bone fcurves on a common timeline.
+    """
+    if fcv.AlignPoseBoneFCurves(armatureObj, hipBoneName):
+        yield Status(f"Resampled the fcurves of '{hipBoneName}' bone on a common timeline")
+
+
+def _TrimToFrameRange(armatureObj: bpy.types.Armature, frameRanges: list[int, int], trimToFrameRange: bool):
+    if trimToFrameRange and frameRanges and (len(frameRanges) == 1):
+        startFrame, endFrame = frameRanges[0]
+        removedCount = fcv.TrimActionToFrameRange(armatureObj.animation_data.action, startFrame, endFrame)
+        yield Status(f"Trimmed the action to frames {startFrame}-{endFrame}, removed {removedCount} key frames")
+
+
+def _ExtractRootMotionFromAllKeyFrames(sceneObj: bpy.types.Scene,
+                                       armatureObj: bpy.types.Armature,
+                                       hipBoneName: str,
+                                       extractTranslationX: bool,
+                                       extractTranslationY: bool,
+                                       extractTranslationZ: bool,
+                                       extractRotationZ: bool,
+                                       dumpCSVs: bool = False,
+                                       bboxBaseLocations: list[Vector] = None):
+    """
+    Extraction over all the hip key frames. It is assumed the current rotation
+    of the armature was already applied as 0,0,0.
+    @bboxBaseLocations Optional. The bottom plane center world location per key
+        frame, if it was already sampled with _GetBBoxWorldLocationsForArmatures().
+    """
     hipLocalLocations, hipWorldMatrix, hipWorldLocations = _GetPoseBoneLocations(armatureObj, hipBoneName)
-    print(f"hipWorldMatrix = {hipWorldMatrix}")
+    _logger.debug("hipWorldMatrix = %s", hipWorldMatrix)
     yield Status("Got '{}' bone local and world locations".format(hipBoneName))
     if dumpCSVs:
         _SaveVectorListAsCsv(hipLocalLocations, 0,
@@ -488,7 +631,7 @@ def ExtractRootMotion(sceneObj:bpy.types.Scene,
 
     if extractRotationZ:
         (localQuaternionsList, transformMatrix, worldQuaternionsList) = _GetPoseBoneQuaternions(armatureObj, hipBoneName)
-        print(f"transformMatrix = {transformMatrix}")
+        _logger.debug("transformMatrix = %s", transformMatrix)
         yield Status("Got '{}' bone local and world rotations".format(hipBoneName))
         if dumpCSVs:
             _SaveQuaternionListAsCsv(localQuaternionsList, 0, "hipLocalQuaternionsList.csv")
@@ -517,16 +660,20 @@ def ExtractRootMotion(sceneObj:bpy.types.Scene,
     keyFrameStart = keyFrameNumbersList[0]
     keyFrameEnd = keyFrameNumbersList[-1]
     keyFrameCount = len(keyFrameNumbersList)
-    print("Frame Count is ", keyFrameCount)
+    _logger.debug("Frame Count is %d", keyFrameCount)
     sceneObj.frame_start = keyFrameStart
     sceneObj.frame_end = keyFrameEnd
 
     #Extract World Positions of the center of the bottom plane center point
     #of the Bound Box per key frame.
     #This data will be used to calculate root motion in the Z(Up) axis
-    bboxBaseLocations = _GetBBoxWorldLocations(
-        sceneObj, armatureObj, keyFrameNumbersList)
-    yield Status("Got Armature bottom plane center world location per keyframe")
+    if bboxBaseLocations is None:
+        bboxBaseLocations = _GetBBoxWorldLocations(
+            sceneObj, armatureObj, keyFrameNumbersList)
+        yield Status("Got Armature bottom plane center world location per keyframe")
+    if not HasSourceTracks(armatureObj):
+        _SaveSourceTracks(armatureObj, hipBoneName, bboxBaseLocations)
+        yield Status(f"Saved the source tracks of '{hipBoneName}' bone in action '{armatureObj.animation_data.action.name}'")
     if dumpCSVs:
         _SaveVectorListAsCsv(bboxBaseLocations, keyFrameStart, "BBoxWorldLocations.csv")
 
@@ -600,6 +747,394 @@ def ExtractRootMotion(sceneObj:bpy.types.Scene,
     yield Status(f"Completed root motion extraction from '{hipBoneName}' bone to '{armatureObj.name}'")
 
 
+def ExtractRootMotion(sceneObj:bpy.types.Scene,
+                      armatureObj: bpy.types.Armature,
+                      hipBoneName: str,
+                      extractTranslationX: bool,
+                      extractTranslationY: bool,
+                      extractTranslationZ: bool,
+                      extractRotationZ: bool,
+                      dumpCSVs: bool =False,
+                      targetFps: int = 0,
+                      chunkSize: int = 0,
+                      frameRanges: list[int, int] = None,
+                      trimToFrameRange: bool = False):
+    """
+    Extracts root motion animation data from the Hip Bone and assigns it
+    as new animation key frames to the @armatureObj transform.
+
+    In Short: Transfers root motion
+     from the Hips bone to the "Armature" object. The motion data is transferred
+     from Hips bone FCurves to  the "Armature" FCurves.
+
+    @sceneObj (bpy.types.Scene)
+    @armatureObj (bpy.types.Object). Object.type is assumed to be 'ARMATURE'
+    @hipBoneName (string). Name of the "Hips" bone as originated by Mixamo.
+    @extractTranslationX,Y,Z (bool). Extract X,Y,Z Axis Translation.
+    @extractRotationZ (bool). Extract Rotation around Z Axis.
+    @dumpCSVs (bool) DEBUG Only. Dump motion vector data as CSV files
+    @targetFps (int) Optional. If greater than 0, the action is first resampled
+        to this frame rate (e.g. The frame rate of the O3DE project).
+    @chunkSize (int) Optional. If greater than 0, the clip is processed in windows
+        of @chunkSize key frames, this way memory usage doesn't grow with the
+        length of the clip. CSV files are not generated in this mode.
+    @frameRanges (list of (startFrame, endFrame)) Optional. If not empty, only the
+        key frames inside these non overlapping frame ranges are processed. Frame
+        numbers are relative to the retimed clip if @targetFps is used.
+        Use ExportFBXClips() to export one file per range.
+    @trimToFrameRange (bool) Optional. If True and there's exactly one range in
+        @frameRanges, all the key frames outside the range are removed from the action.
+    """
+    _logger.debug("Armature world matrix before resetting orientation:\n%s", armatureObj.matrix_world)
+
+    if HasSourceTracks(armatureObj):
+        # Extracted before, start again from the original tracks instead of reimporting.
+        yield from RevertRootMotionExtraction(sceneObj, armatureObj)
+
+    yield from _RetimeArmatureActions(sceneObj, [armatureObj], targetFps)
+    yield from _PrepareHipBoneFCurves(armatureObj, hipBoneName)
+
+    # We need to set the current rotation as 0,0,0
+    cmn.ApplyCurrentRotationAs000(armatureObj)
+    yield Status(f"Applied current rotation of '{armatureObj.name}' as 0,0,0")
+
+    if (chunkSize > 0) or frameRanges:
+        yield from _ExtractRootMotionWindowed(sceneObj, armatureObj, hipBoneName,
+            extractTranslationX, extractTranslationY, extractTranslationZ,
+            extractRotationZ, frameRanges, chunkSize)
+        yield from _TrimToFrameRange(armatureObj, frameRanges, trimToFrameRange)
+        return
+
+    yield from _ExtractRootMotionFromAllKeyFrames(sceneObj, armatureObj, hipBoneName,
+        extractTranslationX, extractTranslationY, extractTranslationZ, extractRotationZ, dumpCSVs,
+        _GetCachedBBoxBaseLocations(armatureObj))
+
+
+def ExtractRootMotionFromArmatures(sceneObj: bpy.types.Scene,
+                                   armatureObjs: list[bpy.types.Armature],
+                                   hipBoneNames: list[str],
+                                   extractTranslationX: bool,
+                                   extractTranslationY: bool,
+                                   extractTranslationZ: bool,
+                                   extractRotationZ: bool,
+                                   targetFps: int = 0,
+                                   chunkSize: int = 0,
+                                   frameRanges: list[int, int] = None,
+                                   trimToFrameRange: bool = False):
+    """
+    Same as ExtractRootMotion() for several armatures in one pass. Each frame_set()
+    evaluates the whole scene, so instead of one timeline sweep per armature,
+    the bounding boxes of all the armatures are sampled in a single sweep.
+    The current rotation of all the armatures is applied with one operator call.
+    @hipBoneNames The hip bone name of each armature in @armatureObjs.
+    See ExtractRootMotion() for the other parameters. Windowed extraction (@chunkSize or
+    @frameRanges) still processes one armature at a time, to keep its memory bounds.
+    """
+    if len(armatureObjs) != len(hipBoneNames):
+        raise Exception(f"Got {len(armatureObjs)} armatures but {len(hipBoneNames)} hip bone names")
+    for armatureObj in armatureObjs:
+        if HasSourceTracks(armatureObj):
+            yield from RevertRootMotionExtraction(sceneObj, armatureObj)
+    yield from _RetimeArmatureActions(sceneObj, armatureObjs, targetFps)
+    for armatureObj, hipBoneName in zip(armatureObjs, hipBoneNames):
+        yield from _PrepareHipBoneFCurves(armatureObj, hipBoneName)
+
+    cmn.ApplyCurrentRotationAs000ToObjects(armatureObjs)
+    yield Status(f"Applied current rotation of {len(armatureObjs)} armatures as 0,0,0")
+
+    # Each armature sets the scene frame range to its own key frames,
+    # at the end the scene frame range covers all of them.
+    sceneFrameRanges = []
+    if (chunkSize > 0) or frameRanges:
+        for armatureObj, hipBoneName in zip(armatureObjs, hipBoneNames):
+            yield from _ExtractRootMotionWindowed(sceneObj, armatureObj, hipBoneName,
+                extractTranslationX, extractTranslationY, extractTranslationZ,
+                extractRotationZ, frameRanges, chunkSize)
+            yield from _TrimToFrameRange(armatureObj, frameRanges, trimToFrameRange)
+            sceneFrameRanges.append((sceneObj.frame_start, sceneObj.frame_end))
+    else:
+        # Only the armatures without cached ground heights need the timeline sweep.
+        bboxBaseLocationsLists = [_GetCachedBBoxBaseLocations(armatureObj) for armatureObj in armatureObjs]
+        sweepIndices = [index for index, bboxBaseLocations in enumerate(bboxBaseLocationsLists) if bboxBaseLocations is None]
+        if len(sweepIndices) > 0:
+            keyFrameNumbersLists = [fcv.GetKeyFrameNumbersListPoseBoneDataPath(armatureObjs[index], hipBoneNames[index],
+                                    fcv.FCurveDataPath.LOCATION_X) for index in sweepIndices]
+            sweptLocationsLists = _GetBBoxWorldLocationsForArmatures(sceneObj,
+                [armatureObjs[index] for index in sweepIndices], keyFrameNumbersLists)
+            for index, bboxBaseLocations in zip(sweepIndices, sweptLocationsLists):
+                bboxBaseLocationsLists[index] = bboxBaseLocations
+            frameCount = len(set().union(*keyFrameNumbersLists))
+            yield Status(f"Got bottom plane center world locations of {len(sweepIndices)} armatures in one sweep of {frameCount} frames")
+        for armatureObj, hipBoneName, bboxBaseLocations in zip(armatureObjs, hipBoneNames, bboxBaseLocationsLists):
+            yield from _ExtractRootMotionFromAllKeyFrames(sceneObj, armatureObj, hipBoneName,
+                extractTranslationX, extractTranslationY, extractTranslationZ, extractRotationZ,
+                bboxBaseLocations=bboxBaseLocations)
+            sceneFrameRanges.append((sceneObj.frame_start, sceneObj.frame_end))
+    sceneObj.frame_start = min(frameStart for frameStart, _ in sceneFrameRanges)
+    sceneObj.frame_end = max(frameEnd for _, frameEnd in sceneFrameRanges)
+
+
+###############################################################################
+# Source tracks cache
+# The first extraction saves the original hip tracks, and the ground heights
+# sampled with frame_set(), as a custom property of the action. Extracting
+# again, with other options, or reverting, restores the hip fcurves from the
+# cache: no reimport and no timeline sweep.
+# Only the extraction over all the key frames saves the source tracks, the
+# windowed extraction (chunk size or frame ranges) doesn't.
+###############################################################################
+SOURCE_TRACKS_PROPERTY = "lumbermixalot_source_tracks"
+SOURCE_TRACKS_VERSION = 1
+
+
+def _GetSourceTracks(armatureObj: bpy.types.Armature):
+    if (armatureObj.animation_data is None) or (armatureObj.animation_data.action is None):
+        return None
+    sourceTracks = armatureObj.animation_data.action.get(SOURCE_TRACKS_PROPERTY)
+    if (sourceTracks is None) or (sourceTracks.get("version") != SOURCE_TRACKS_VERSION):
+        return None
+    return sourceTracks
+
+
+def HasSourceTracks(armatureObj: bpy.types.Armature) -> bool:
+    """
+    Returns True if the action of @armatureObj has the source tracks saved by a previous extraction.
+    """
+    return _GetSourceTracks(armatureObj) is not None
+
+
+def _SaveSourceTracks(armatureObj: bpy.types.Armature, hipBoneName: str, bboxBaseLocations: list[Vector]):
+    """
+    Saves the current hip fcurves, which must not be modified yet, and the ground
+    height per hip key frame in the action of @armatureObj. Values are stored
+    as flat float arrays.
+    """
+    frames, locations = fcv.GetChannelKeyFrames(fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.LOCATION_DATA_PATHS))
+    sourceTracks = {
+        "version": SOURCE_TRACKS_VERSION,
+        "hipBoneName": hipBoneName,
+        "frames": [float(frame) for frame in frames],
+        "hipLocations": [value for location in locations for value in location],
+        "groundHeights": [v.z for v in bboxBaseLocations],
+        "armatureLocation": list(armatureObj.location),
+        "armatureQuaternion": list(armatureObj.rotation_quaternion),
+    }
+    quaternionFCurves = fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.QUATERNION_DATA_PATHS)
+    if all(fcurve is not None for fcurve in quaternionFCurves):
+        quaternionFrames, quaternions = fcv.GetChannelKeyFrames(quaternionFCurves, isQuaternion=True)
+        sourceTracks["quaternionFrames"] = [float(frame) for frame in quaternionFrames]
+        sourceTracks["hipQuaternions"] = [value for quaternion in quaternions for value in quaternion]
+    armatureObj.animation_data.action[SOURCE_TRACKS_PROPERTY] = sourceTracks
+
+
+def _GetCachedBBoxBaseLocations(armatureObj: bpy.types.Armature) -> list[Vector]:
+    """
+    Returns the ground locations saved by the first extraction, only the Z
+    component is meaningful. Returns None if there are no source tracks.
+    """
+    sourceTracks = _GetSourceTracks(armatureObj)
+    if sourceTracks is None:
+        return None
+    return [Vector((0.0, 0.0, height)) for height in sourceTracks["groundHeights"]]
+
+
+def _UnflattenSamples(values: list[float], channelCount: int) -> list[tuple]:
+    return [tuple(values[index:index + channelCount]) for index in range(0, len(values), channelCount)]
+
+
+def RevertRootMotionExtraction(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature):
+    """
+    Restores the hip fcurves saved by the first extraction and removes the root
+    motion fcurves of @armatureObj. Root motion post processing is lost too.
+    The source tracks are kept, so the root motion can be extracted again.
+    """
+    sourceTracks = _GetSourceTracks(armatureObj)
+    if sourceTracks is None:
+        raise Exception(f"The action of '{armatureObj.name}' has no source tracks. Extract the root motion first")
+    hipBoneName = sourceTracks["hipBoneName"]
+    fcv.SetChannelKeyFrames(fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.LOCATION_DATA_PATHS),
+        list(sourceTracks["frames"]), _UnflattenSamples(list(sourceTracks["hipLocations"]), 3))
+    if "hipQuaternions" in sourceTracks:
+        fcv.SetChannelKeyFrames(fcv.GetPoseBoneFCurves(armatureObj, hipBoneName, fcv.QUATERNION_DATA_PATHS),
+            list(sourceTracks["quaternionFrames"]), _UnflattenSamples(list(sourceTracks["hipQuaternions"]), 4))
+    yield Status(f"Restored the source tracks of '{hipBoneName}' bone")
+
+    action = armatureObj.animation_data.action
+    for dataPath in fcv.LOCATION_DATA_PATHS + fcv.QUATERNION_DATA_PATHS:
+        fcurve = fcv.GetArmatureFCurveFromDataPath(armatureObj, dataPath)
+        if fcurve is not None:
+            action.fcurves.remove(fcurve)
+    armatureObj.location = sourceTracks["armatureLocation"]
+    armatureObj.rotation_quaternion = sourceTracks["armatureQuaternion"]
+    cmn.SetSceneFrame(sceneObj, sceneObj.frame_current)
+    yield Status(f"Removed the root motion of '{armatureObj.name}'")
+
+
+def ClearSourceTracks(armatureObj: bpy.types.Armature):
+    """
+    Removes the source tracks from the action of @armatureObj. Later extractions
+    start from the current hip fcurves.
+    """
+    if HasSourceTracks(armatureObj):
+        del armatureObj.animation_data.action[SOURCE_TRACKS_PROPERTY]
+
+
+###############################################################################
+# Post processing pipeline
+###############################################################################
+class PostProcessOp:
+    """
+    Base class of the root motion post processing operations. Each operation
+    is described by a transform of the Armature locations and a rotation of
+    the Armature quaternions, this way a list of operations can be composed
+    and applied in a single read/transform/write pass over the fcurves.
+    """
+    def GetLocationMatrix(self) -> Matrix:
+        """Returns the 4x4 matrix applied to all the Armature locations."""
+        return Matrix.Identity(4)
+
+    def GetRotation(self) -> list[Vector, float, float]:
+        """
+        Returns None if the quaternions are not changed by this operation, otherwise
+        returns tuple (axis, angle, radsPerFrame). The rotation applied to the
+        quaternion of the key frame at index K is: angle + radsPerFrame * K around axis.
+        """
+        return None
+
+
+class ZeroAxesOp(PostProcessOp):
+    """Forces to 0.0 the selected axes of the Armature locations."""
+    def __init__(self, zeroOutTranslationX: bool, zeroOutTranslationY: bool, zeroOutTranslationZ: bool):
+        self.zeroOutTranslationX = zeroOutTranslationX
+        self.zeroOutTranslationY = zeroOutTranslationY
+        self.zeroOutTranslationZ = zeroOutTranslationZ
+
+    def GetLocationMatrix(self) -> Matrix:
+        return Matrix.Diagonal((
+            0.0 if self.zeroOutTranslationX else 1.0,
+            0.0 if self.zeroOutTranslationY else 1.0,
+            0.0 if self.zeroOutTranslationZ else 1.0,
+            1.0))
+
+
+class RotateOp(PostProcessOp):
+    """Rotates both the locations and the orientations by @angle radians around @axis."""
+    def __init__(self, axis: Vector, angle: float):
+        self.axis = axis
+        self.angle = angle
+
+    def GetLocationMatrix(self) -> Matrix:
+        return Matrix.Rotation(self.angle, 4, self.axis)
+
+    def GetRotation(self) -> list[Vector, float, float]:
+        return (self.axis, self.angle, 0.0)
+
+
+class SpinOp(PostProcessOp):
+    """
+    Adds a linearly increasing rotation around @axis to the orientations.
+    @angularSpeed: In radians per second.
+    """
+    def __init__(self, axis: Vector, angularSpeed: float, animationFps: float):
+        self.axis = axis
+        self.angularSpeed = angularSpeed
+        self.animationFps = animationFps
+
+    def GetRotation(self) -> list[Vector, float, float]:
+        return (self.axis, 0.0, self.angularSpeed / self.animationFps)
+
+
+class ScaleOp(PostProcessOp):
+    """Scales the Armature locations by @factor."""
+    def __init__(self, factor: float):
+        self.factor = factor
+
+    def GetLocationMatrix(self) -> Matrix:
+        return Matrix.Scale(self.factor, 4)
+
+
+class OffsetOp(PostProcessOp):
+    """Adds @offset to the Armature locations."""
+    def __init__(self, offset: Vector):
+        self.offset = Vector(offset)
+
+    def GetLocationMatrix(self) -> Matrix:
+        return Matrix.Translation(self.offset)
+
+
+def ComposePostProcessLocationMatrix(postProcessOps: list[PostProcessOp]) -> Matrix:
+    """
+    Returns the single 4x4 matrix equivalent to applying the location transform
+    of each operation in @postProcessOps, in order.
+    """
+    locationMatrix = Matrix.Identity(4)
+    for op in postProcessOps:
+        locationMatrix = op.GetLocationMatrix() @ locationMatrix
+    return locationMatrix
+
+
+def _ComposePostProcessRotations(postProcessOps: list[PostProcessOp], frames: list[float]) -> list[Quaternion]:
+    """
+    Returns the list of rotations, one per frame in @frames, equivalent to
+    applying the rotation of each operation in @postProcessOps, in order.
+    Returns None if none of the operations change the orientations.
+    """
+    rotations = [rotation for rotation in (op.GetRotation() for op in postProcessOps) if rotation is not None]
+    if len(rotations) < 1:
+        return None
+    # Same as AddLinearRotationToArmatureLocalRotationData() used to do, the
+    # spin advances by one frame per key frame, no matter the frame numbers.
+    axis = rotations[0][0]
+    if all(rotationAxis == axis for rotationAxis, _, _ in rotations):
+        # Rotations around the same axis commute, so they collapse into one
+        # angle that changes linearly with time.
+        angle = sum(rotationAngle for _, rotationAngle, _ in rotations)
+        radsPerFrame = sum(rotationRadsPerFrame for _, _, rotationRadsPerFrame in rotations)
+        return [Quaternion(axis, angle + radsPerFrame * keyFrameIndex) for keyFrameIndex in range(len(frames))]
+    retList = []
+    for keyFrameIndex in range(len(frames)):
+        q = Quaternion()
+        for rotationAxis, rotationAngle, rotationRadsPerFrame in rotations:
+            q = Quaternion(rotationAxis, rotationAngle + rotationRadsPerFrame * keyFrameIndex) @ q
+        retList.append(q)
+    return retList
+
+
+def ApplyPostProcessOps(armatureObj: bpy.types.Armature, postProcessOps: list[PostProcessOp]):
+    """
+    Applies all the operations in @postProcessOps, in order, to the root motion
+    of @armatureObj. The operations are composed first, this way the location
+    and quaternion fcurves are read once, transformed once and written once, no
+    matter how many operations there are.
+    """
+    locationMatrix = ComposePostProcessLocationMatrix(postProcessOps)
+    if locationMatrix != Matrix.Identity(4):
+        locationFCurves = fcv.GetArmatureFCurves(armatureObj, fcv.LOCATION_DATA_PATHS)
+        if None in locationFCurves:
+            raise Exception(f"The armature '{armatureObj.name}' doesn't have location animation data")
+        frames, locations = fcv.GetChannelKeyFrames(locationFCurves)
+        yield Status(f"Read {len(frames)} location key frames from armature '{armatureObj.name}'")
+        transformedLocations = [locationMatrix @ Vector(v) for v in locations]
+        fcv.SetChannelKeyFrames(locationFCurves, frames, transformedLocations)
+        yield Status(f"Applied the composed location transform to '{armatureObj.name}' locations FCurve")
+
+    if not any(op.GetRotation() is not None for op in postProcessOps):
+        return
+    fcurve = fcv.GetArmatureFCurveFromDataPath(armatureObj, fcv.FCurveDataPath.QUATERNION_W)
+    if fcurve is None:
+        #Need to allocate the quaternion fcurves according to the root bone.
+        rootBoneName = cmn.GetRootBone(armatureObj).name
+        fcv.AllocateQuaternionKeyFramesFromPoseBoneToArmature(rootBoneName, armatureObj)
+        yield Status(f"Created the same amount of quaternion key frames from bone '{rootBoneName}'' in the armature '{armatureObj.name}'")
+    quaternionFCurves = fcv.GetArmatureFCurves(armatureObj, fcv.QUATERNION_DATA_PATHS)
+    frames, quaternions = fcv.GetChannelKeyFrames(quaternionFCurves, isQuaternion=True)
+    yield Status(f"Read {len(frames)} quaternion key frames from armature '{armatureObj.name}'")
+    rotations = _ComposePostProcessRotations(postProcessOps, frames)
+    transformedQuaternions = [rotation @ Quaternion(q) for rotation, q in zip(rotations, quaternions)]
+    fcv.SetChannelKeyFrames(quaternionFCurves, frames, transformedQuaternions)
+    yield Status(f"Applied the composed rotation to '{armatureObj.name}' quaternions FCurve")
+
+
 def ClearRootMotionTranslation(armatureObj: bpy.types.Armature,
                   zeroOutTranslationX: bool,
                   zeroOutTranslationY: bool,
@@ -610,16 +1145,10 @@ def ClearRootMotionTranslation(armatureObj: bpy.types.Armature,
 
     @zeroOutTranslationX,Y,Z  Switches for Axis to clear.
     """
-    feetWorldLocations = fcv.GetArmatureLocalLocationsFromFcurves(armatureObj)
-    yield Status(f"Extracted local location data from armature '{armatureObj.name}'")
-
-    _ClearDataForAxes(feetWorldLocations,
-        zeroOutTranslationX, zeroOutTranslationY, zeroOutTranslationZ)
+    yield from ApplyPostProcessOps(armatureObj,
+        [ZeroAxesOp(zeroOutTranslationX, zeroOutTranslationY, zeroOutTranslationZ)])
     yield Status(f"Cleared motion data for the following axes X({zeroOutTranslationX}), Y({zeroOutTranslationY}), Z({zeroOutTranslationZ})")
 
-    fcv.SetLocationDataForArmatureKeyFrames(armatureObj, feetWorldLocations)
-    yield Status(f"New root motion translation has been applied to '{armatureObj.name}' locations FCurve")
-
 
 # REMARK: This function breaks for cases where the hip bone contains
 # weird rotation in between frames.
@@ -648,27 +1177,200 @@ def RotateArmatureAnimationData(armatureObj: bpy.types.Armature, axis: Vector, a
     Rotates both the translation and orientation of the armature by the axis+angle
     @angle is in radians
     """
-    originalLocations = fcv.GetArmatureLocationsFromFcurves(armatureObj)
-    yield Status("Got current locations from animation data")
-    rotMatrix4x4 = Matrix.Rotation(angle, 4, axis)
-    transformedLocations = _TransformVectorList(rotMatrix4x4, originalLocations)
-    yield Status("Transformed current locations in list")
-    fcv.SetLocationDataForArmatureKeyFrames(armatureObj, transformedLocations)
-    yield Status("Applied transformed locations into the Armature fcurves")
+    yield from ApplyPostProcessOps(armatureObj, [RotateOp(axis, angle)])
 
-    #Now let's change the orientation of the armature.
-    fcurve = fcv.GetArmatureFCurveFromDataPath(armatureObj, fcv.FCurveDataPath.QUATERNION_W)
-    if fcurve is None:
-        #Need to allocate the quaternion fcurves according to the root bone.
-        rootBoneName = cmn.GetRootBone(armatureObj).name
-        fcv.AllocateQuaternionKeyFramesFromPoseBoneToArmature(rootBoneName, armatureObj)
-        yield Status(f"Created the same amount of quaternion key frames from bone '{rootBoneName}'' in the armature '{armatureObj.name}'")
+
+###############################################################################
+# Root motion metadata
+###############################################################################
+ROOT_MOTION_METADATA_VERSION = 1
+
+
+def GetYawFromQuaternion(q: list[float]) -> float:
+    """
+    Returns the angle, in radians, around Z Axis (Z Up) of the forward vector
+    (Y Axis) rotated by the quaternion @q, given as (w, x, y, z).
+    The angle is 0.0 when facing +Y and grows counter clockwise.
+    """
+    w, x, y, z = q
+    # Column 1 of the rotation matrix of q.
+    forwardX = 2.0 * (x * y - w * z)
+    forwardY = 1.0 - 2.0 * (x * x + z * z)
+    return math.atan2(-forwardX, forwardY)
+
+
+def _UnwrapAngles(angles: list[float]) -> list[float]:
+    """
+    Returns a new list where jumps bigger than PI between consecutive angles
+    are removed by adding multiples of 2*PI.
+    """
+    retList = []
+    offset = 0.0
+    previous = None
+    for angle in angles:
+        if previous is not None:
+            delta = angle - previous
+            if delta > math.pi:
+                offset -= 2.0 * math.pi
+            elif delta < -math.pi:
+                offset += 2.0 * math.pi
+        previous = angle
+        retList.append(angle + offset)
+    return retList
+
+
+def _MakeTransformDict(frame: float, location: list[float], quaternion: list[float], yaw: float) -> dict:
+    return {
+        "frame": frame,
+        "location": [float(c) for c in location],
+        "rotation": [float(c) for c in quaternion],
+        "yaw": yaw,
+    }
+
+
+def BuildRootMotionMetadataFromSamples(frames: list[float], locations: list[tuple], quaternions: list[tuple],
+                                       fps: float, segmentCount: int = 4, trajectorySampleRate: float = 10.0) -> dict:
+    """
+    Summarizes a root motion track. Doesn't depend on bpy.
+    @frames Sorted key frame numbers.
+    @locations One (x, y, z) tuple per frame.
+    @quaternions One (w, x, y, z) tuple per frame.
+    @fps Frame rate of the clip.
+    @segmentCount The clip is split in this many segments of equal duration,
+        and the average velocity of each segment is reported.
+    @trajectorySampleRate Samples per second of the downsampled trajectory.
+    Returns a dictionary that can be serialized as json. Distances are in
+    meters, angles in radians and times in seconds.
+    """
+    keyFrameCount = len(frames)
+    if keyFrameCount < 1:
+        raise Exception("Can not build root motion metadata without key frames")
+    yaws = _UnwrapAngles([GetYawFromQuaternion(q) for q in quaternions])
+    duration = (frames[-1] - frames[0]) / fps
+    startLocation = locations[0]
+    endLocation = locations[-1]
+    displacement = [endLocation[axis] - startLocation[axis] for axis in range(3)]
+    distance = 0.0
+    for previous, current in zip(locations, locations[1:]):
+        distance += math.dist(previous, current)
+    totalYawChange = yaws[-1] - yaws[0]
+
+    # The displacement and turn between the last and the first frame, in the
+    # local space of the first frame. Used to stitch loops.
+    cosYaw = math.cos(-yaws[0])
+    sinYaw = math.sin(-yaws[0])
+    loopDelta = {
+        "location": [cosYaw * displacement[0] - sinYaw * displacement[1],
+                     sinYaw * displacement[0] + cosYaw * displacement[1],
+                     displacement[2]],
+        "yaw": totalYawChange,
+    }
+
+    segments = []
+    segmentCount = max(1, min(segmentCount, keyFrameCount - 1))
+    for segmentIndex in range(segmentCount):
+        startIndex = (segmentIndex * (keyFrameCount - 1)) // segmentCount
+        endIndex = ((segmentIndex + 1) * (keyFrameCount - 1)) // segmentCount
+        segmentDuration = (frames[endIndex] - frames[startIndex]) / fps
+        if segmentDuration > 0.0:
+            velocity = [(locations[endIndex][axis] - locations[startIndex][axis]) / segmentDuration for axis in range(3)]
+            yawRate = (yaws[endIndex] - yaws[startIndex]) / segmentDuration
+        else:
+            velocity = [0.0, 0.0, 0.0]
+            yawRate = 0.0
+        segments.append({
+            "startFrame": frames[startIndex],
+            "endFrame": frames[endIndex],
+            "velocity": velocity,
+            "speed": math.hypot(*velocity),
+            "yawRate": yawRate,
+        })
+
+    trajectory = []
+    step = max(1, int(round(fps / trajectorySampleRate))) if trajectorySampleRate > 0.0 else keyFrameCount
+    trajectoryIndices = list(range(0, keyFrameCount, step))
+    if trajectoryIndices[-1] != keyFrameCount - 1:
+        trajectoryIndices.append(keyFrameCount - 1)
+    for index in trajectoryIndices:
+        trajectory.append([(frames[index] - frames[0]) / fps] +
+                          [float(c) for c in locations[index]] + [yaws[index]])
+
+    return {
+        "version": ROOT_MOTION_METADATA_VERSION,
+        "fps": fps,
+        "startFrame": frames[0],
+        "endFrame": frames[-1],
+        "duration": duration,
+        "keyFrameCount": keyFrameCount,
+        "displacement": displacement,
+        "distance": distance,
+        "averageSpeed": (distance / duration) if duration > 0.0 else 0.0,
+        "totalYawChange": totalYawChange,
+        "start": _MakeTransformDict(frames[0], startLocation, quaternions[0], yaws[0]),
+        "end": _MakeTransformDict(frames[-1], endLocation, quaternions[-1], yaws[-1]),
+        "loopDelta": loopDelta,
+        "segments": segments,
+        # Each point is [time, x, y, z, yaw].
+        "trajectory": trajectory,
+    }
+
+
+def BuildRootMotionMetadata(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature,
+                            frameRange: list[int, int] = None, segmentCount: int = 4,
+                            trajectorySampleRate: float = 10.0) -> dict:
+    """
+    Returns the root motion metadata dictionary of the Armature animation, see
+    BuildRootMotionMetadataFromSamples(). The Armature location and quaternion
+    fcurves are read in bulk, without evaluating the scene.
+    @frameRange Optional tuple (startFrame, endFrame). If None the whole action is used.
+    """
+    action = armatureObj.animation_data.action if armatureObj.animation_data else None
+    if action is None:
+        raise Exception(f"The armature '{armatureObj.name}' doesn't have animation data")
+    locationFCurves = fcv.GetArmatureFCurves(armatureObj, fcv.LOCATION_DATA_PATHS)
+    quaternionFCurves = fcv.GetArmatureFCurves(armatureObj, fcv.QUATERNION_DATA_PATHS)
+    hasLocations = None not in locationFCurves
+    hasQuaternions = None not in quaternionFCurves
+    if hasLocations:
+        frames, locations = fcv.GetChannelKeyFrames(locationFCurves)
+    elif hasQuaternions:
+        frames, _ = fcv.GetChannelKeyFrames(quaternionFCurves, isQuaternion=True)
+        locations = [(0.0, 0.0, 0.0)] * len(frames)
+    else:
+        raise Exception(f"The armature '{armatureObj.name}' doesn't have root motion")
+    if hasQuaternions:
+        quaternions = fcv.SampleFCurves(quaternionFCurves, frames, isQuaternion=True)
     else:
-        yield Status(f"The armature '{armatureObj.name}' already has quaternion data.")
-    # The fcurves exist, let's fetch all the quaternions for each keyframe.
-    quaternionList = fcv.GetArmatureLocalQuaternionsFromFcurves(armatureObj)
-    yield Status(f"Collected the quaternion data from the armature '{armatureObj.name}'.")
-    newQuaternionList = _TransformQuaternionsList(rotMatrix4x4, quaternionList)
-    yield Status(f"Transformed the quaternion data from the armature '{armatureObj.name}'.")
-    fcv.SetQuaternionDataForArmatureKeyFrames(armatureObj, newQuaternionList)
-    yield Status("Applied transformed quaternions into the Armature fcurves")
\ No newline at end of file
+        quaternions = [(1.0, 0.0, 0.0, 0.0)] * len(frames)
+    if frameRange is not None:
+        startFrame, endFrame = frameRange
+        indices = [idx for idx, frame in enumerate(frames) if startFrame <= frame <= endFrame]
+        frames = [frames[idx] for idx in indices]
+        locations = [locations[idx] for idx in indices]
+        quaternions = [quaternions[idx] for idx in indices]
+    metadata = BuildRootMotionMetadataFromSamples(frames, locations, quaternions,
+        cmn.GetSceneFps(sceneObj), segmentCount, trajectorySampleRate)
+    metadata["name"] = action.name
+    return metadata
+
+
+def MakeRootMotionMetadataFilename(fbxFilename: str) -> str:
+    """
+    Returns the file name of the root motion metadata of @fbxFilename.
+    Example: "Walking.fbx" -> "Walking_rootmotion.json"
+    """
+    name, _ = os.path.splitext(os.path.basename(fbxFilename))
+    return f"{name}_rootmotion.json"
+
+
+def ExportRootMotionMetadata(sceneObj: bpy.types.Scene, armatureObj: bpy.types.Armature,
+                             fbxFilePath: str, frameRange: list[int, int] = None) -> str:
+    """
+    Writes the root motion metadata next to the exported FBX file @fbxFilePath.
+    Returns the fully qualified path of the json file.
+    """
+    metadata = BuildRootMotionMetadata(sceneObj, armatureObj, frameRange)
+    filename = os.path.join(os.path.dirname(fbxFilePath), MakeRootMotionMetadataFilename(fbxFilePath))
+    with open(filename, 'w') as outfile:
+        json.dump(metadata, outfile, indent=4)
+    return filename
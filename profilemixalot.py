@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Opt-in profiler of the bpy RNA traffic of the add-on.
+# cProfile shows most of the time inside a few Python functions, but not which
+# RNA operations are behind it. When enabled, this profiler replaces the
+# functions of fcurvesmixalot and commonmixalot, and bpy.ops, with wrappers
+# that count and time each call, grouped by pipeline stage and by category:
+# key frame reads, key frame writes, fcurve lookups, bpy.ops calls and frame_set.
+# The stages are the methods of apimixalot.Pipeline, or any name given with
+# Profiler.Stage().
+#
+#   profiler = StartProfiling()
+#   pipeline.ProcessMotion("/path/Walking.fbx", "/path/output")
+#   StopProfiling()
+#   profiler.LogReport()
+#
+# The wrappers add overhead to each call, the times are only meaningful
+# relative to each other.
+
+import contextlib
+import time
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+    import apimixalot as api
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import commonmixalot as cmn
+    from . import fcurvesmixalot as fcv
+    from . import apimixalot as api
+    from . import logmixalot as log
+
+
+_logger = log.GetLogger(__name__)
+
+CATEGORY_KEYFRAME_READ = "keyframe read"
+CATEGORY_KEYFRAME_WRITE = "keyframe write"
+CATEGORY_FCURVE_LOOKUP = "fcurve lookup"
+CATEGORY_OPERATOR = "bpy.ops"
+CATEGORY_FRAME_SET = "frame_set"
+CATEGORY_OTHER = "other"
+
+NO_STAGE = "(no stage)"
+DEFAULT_REPORT_ROWS = 25
+
+_FCURVE_LOOKUP_FUNCTIONS = {
+    "GetPoseBoneFCurveFromArmature",
+    "GetPoseBoneFCurveFromDataPath",
+    "GetArmatureFCurveFromDataPath",
+    "GetPoseBoneFCurves",
+    "GetArmatureFCurves",
+    "_GetPoseBoneTransformFCurves",
+    "_GroupActionFCurves",
+}
+_KEYFRAME_WRITE_PREFIXES = ("Set", "Allocate", "Copy", "Subtract", "Create", "Trim", "Resample", "Align",
+                            "_RemoveKeyFrames", "_CopyKeyFrame")
+_KEYFRAME_READ_PREFIXES = ("Get", "Find", "Are", "Sample", "_Sample", "BuildUnionTimeline")
+# Pure Python helpers, they don't touch RNA and are called per sample, so
+# wrapping them would only add overhead to the report.
+_UNWRAPPED_FUNCTIONS = {
+    "BuildPoseBoneFCurveDataPath",
+    "GetPoseBoneNameFromDataPath",
+    "BuildUniformTimeline",
+    "SampleLinear",
+    "SampleQuaternions",
+    "MakeQuaternionsContinuous",
+    "_SlerpQuaternion",
+    "Dump",
+    "ParseFrameRanges",
+    "MakeClipFilename",
+    "MakeArmatureFilename",
+}
+
+
+def GetCategory(module, functionName: str) -> str:
+    """
+    Returns the category of the RNA operations done by the function @functionName of @module.
+    """
+    if functionName == "SetSceneFrame":
+        return CATEGORY_FRAME_SET
+    if module is not fcv:
+        return CATEGORY_OTHER
+    if functionName in _FCURVE_LOOKUP_FUNCTIONS:
+        return CATEGORY_FCURVE_LOOKUP
+    if functionName.startswith(_KEYFRAME_WRITE_PREFIXES):
+        return CATEGORY_KEYFRAME_WRITE
+    if functionName.startswith(_KEYFRAME_READ_PREFIXES):
+        return CATEGORY_KEYFRAME_READ
+    return CATEGORY_OTHER
+
+
+class ProfileEntry:
+    """
+    Accumulated calls of one function in one stage.
+    @totalSeconds Includes the time of the profiled functions it calls.
+    @selfSeconds Excludes the time of the profiled functions it calls.
+    """
+    __slots__ = ("stage", "category", "name", "calls", "totalSeconds", "selfSeconds")
+
+    def __init__(self, stage: str, category: str, name: str):
+        self.stage = stage
+        self.category = category
+        self.name = name
+        self.calls = 0
+        self.totalSeconds = 0.0
+        self.selfSeconds = 0.0
+
+
+class Profiler:
+    def __init__(self):
+        self._entries = {}
+        self._stage = NO_STAGE
+        # Seconds spent in profiled callees, one item per active call.
+        self._childSeconds = []
+        # Tuples (owner, attributeName, originalValue) of the replaced functions.
+        self._originals = []
+
+    def IsEnabled(self) -> bool:
+        return len(self._originals) > 0
+
+    def Enable(self):
+        """
+        Replaces the functions of fcurvesmixalot and commonmixalot, bpy.ops and
+        the methods of apimixalot.Pipeline with profiling wrappers.
+        """
+        if self.IsEnabled():
+            return
+        for module in (fcv, cmn):
+            for name, value in list(vars(module).items()):
+                if (not callable(value)) or isinstance(value, type) or (name in _UNWRAPPED_FUNCTIONS):
+                    continue
+                if getattr(value, "__module__", None) != module.__name__:
+                    continue
+                self._Replace(module, name, self._WrapCall(GetCategory(module, name), f"{module.__name__}.{name}", value))
+        for name, value in list(vars(api.Pipeline).items()):
+            if callable(value) and not name.startswith("_"):
+                self._Replace(api.Pipeline, name, self._WrapStage(name, value))
+        # Every bpy.ops.<module>.<operator>() call ends up in bpy.ops._op_call(idname, ...).
+        opCall = getattr(bpy.ops, "_op_call", None)
+        if opCall is not None:
+            self._Replace(bpy.ops, "_op_call", self._WrapOperatorCall(opCall))
+        else:
+            _logger.warning("bpy.ops calls can't be profiled in this version of Blender")
+
+    def Disable(self):
+        """
+        Restores all the original functions. The collected data is kept.
+        """
+        for owner, name, value in reversed(self._originals):
+            setattr(owner, name, value)
+        self._originals.clear()
+
+    def Reset(self):
+        self._entries.clear()
+
+    def _Replace(self, owner, name: str, wrapper):
+        self._originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, wrapper)
+
+    @contextlib.contextmanager
+    def Stage(self, stage: str):
+        """
+        All the calls inside the with block are accounted to @stage. Stages
+        can be nested, the innermost one is used.
+        """
+        previousStage = self._stage
+        self._stage = stage
+        try:
+            yield
+        finally:
+            self._stage = previousStage
+
+    def _Record(self, category: str, name: str, function, args, kwargs):
+        self._childSeconds.append(0.0)
+        startTime = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            totalSeconds = time.perf_counter() - startTime
+            childSeconds = self._childSeconds.pop()
+            if self._childSeconds:
+                self._childSeconds[-1] += totalSeconds
+            key = (self._stage, name)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = ProfileEntry(self._stage, category, name)
+                self._entries[key] = entry
+            entry.calls += 1
+            entry.totalSeconds += totalSeconds
+            entry.selfSeconds += totalSeconds - childSeconds
+
+    def _WrapCall(self, category: str, name: str, function):
+        def ProfiledCall(*args, **kwargs):
+            return self._Record(category, name, function, args, kwargs)
+        ProfiledCall.__name__ = function.__name__
+        ProfiledCall.__doc__ = function.__doc__
+        ProfiledCall.__wrapped__ = function
+        return ProfiledCall
+
+    def _WrapOperatorCall(self, opCall):
+        def ProfiledOperatorCall(idname, *args, **kwargs):
+            return self._Record(CATEGORY_OPERATOR, f"bpy.ops.{idname}", opCall, (idname,) + args, kwargs)
+        return ProfiledOperatorCall
+
+    def _WrapStage(self, stage: str, method):
+        profiler = self
+        def ProfiledStage(*args, **kwargs):
+            with profiler.Stage(stage):
+                return method(*args, **kwargs)
+        ProfiledStage.__name__ = method.__name__
+        ProfiledStage.__doc__ = method.__doc__
+        ProfiledStage.__wrapped__ = method
+        return ProfiledStage
+
+    def GetEntries(self, stage: str = None) -> list[ProfileEntry]:
+        """
+        Returns the entries of @stage, or of all the stages if None, sorted
+        by self time, the most expensive first.
+        """
+        entries = [entry for entry in self._entries.values() if (stage is None) or (entry.stage == stage)]
+        entries.sort(key=lambda entry: entry.selfSeconds, reverse=True)
+        return entries
+
+    def GetCategoryTotals(self) -> dict:
+        """
+        Returns a dictionary, (stage, category) to tuple (calls, selfSeconds).
+        """
+        totals = {}
+        for entry in self._entries.values():
+            calls, selfSeconds = totals.get((entry.stage, entry.category), (0, 0.0))
+            totals[(entry.stage, entry.category)] = (calls + entry.calls, selfSeconds + entry.selfSeconds)
+        return totals
+
+    def FormatReport(self, maxRows: int = DEFAULT_REPORT_ROWS) -> list[str]:
+        """
+        Returns the report as a list of lines: the totals per stage and category,
+        then the @maxRows most expensive functions by self time.
+        """
+        entries = self.GetEntries()
+        if len(entries) == 0:
+            return ["RNA profile: no calls recorded"]
+        grandTotal = sum(entry.selfSeconds for entry in entries)
+        lines = [f"RNA profile: {sum(entry.calls for entry in entries)} calls, {grandTotal * 1000.0:.1f} ms",
+                 f"{'stage':<28} {'category':<16} {'calls':>9} {'self ms':>10} {'%':>6}"]
+        categoryTotals = sorted(self.GetCategoryTotals().items(), key=lambda item: item[1][1], reverse=True)
+        for (stage, category), (calls, selfSeconds) in categoryTotals:
+            percent = 100.0 * selfSeconds / grandTotal if grandTotal > 0.0 else 0.0
+            lines.append(f"{stage:<28} {category:<16} {calls:>9} {selfSeconds * 1000.0:>10.2f} {percent:>6.1f}")
+        lines.append(f"{'stage':<28} {'function':<52} {'calls':>9} {'self ms':>10} {'total ms':>10} {'us/call':>9}")
+        for entry in entries[:maxRows]:
+            microsecondsPerCall = 1e6 * entry.selfSeconds / entry.calls
+            lines.append(f"{entry.stage:<28} {entry.name:<52} {entry.calls:>9} {entry.selfSeconds * 1000.0:>10.2f}"
+                         f" {entry.totalSeconds * 1000.0:>10.2f} {microsecondsPerCall:>9.1f}")
+        return lines
+
+    def LogReport(self, maxRows: int = DEFAULT_REPORT_ROWS):
+        for line in self.FormatReport(maxRows):
+            _logger.info("%s", line)
+
+
+_activeProfiler = None
+
+
+def GetActiveProfiler() -> Profiler:
+    """
+    Returns the profiler started with StartProfiling(), None if profiling is off.
+    """
+    return _activeProfiler
+
+
+def StartProfiling() -> Profiler:
+    """
+    Enables a new profiler, or returns the one that is already enabled.
+    """
+    global _activeProfiler
+    if _activeProfiler is None:
+        _activeProfiler = Profiler()
+        _activeProfiler.Enable()
+    return _activeProfiler
+
+
+def StopProfiling() -> Profiler:
+    """
+    Disables the active profiler and returns it, with all its data, or None if profiling was off.
+    """
+    global _activeProfiler
+    profiler = _activeProfiler
+    if profiler is not None:
+        profiler.Disable()
+    _activeProfiler = None
+    return profiler
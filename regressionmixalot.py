@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Golden output regression harness.
+# Runs the whole pipeline (load, root motion extraction, post processing and
+# export) on a set of reference clips, then compares every fcurve of the
+# resulting action against the golden arrays stored in one json file per clip.
+# A run fails if any channel differs by more than its tolerance, or if any
+# stage takes longer than its recorded time budget plus a margin.
+#
+# The reference clips are synthetic armatures built by this module, plus the
+# optional FBX files checked in a clips directory. The golden files of the
+# synthetic clips are checked in, in tests/golden.
+# The time budgets depend on the machine, they are kept in a separate file
+# that is not checked in, and they are only checked if that file is given.
+#
+# Usage:
+#   Check:          blender -b -P regressionmixalot.py --
+#   Record:         blender -b -P regressionmixalot.py -- --update
+#   Record budgets: blender -b -P regressionmixalot.py -- --time-budgets <file> --update-time-budgets
+#   Check both:     blender -b -P regressionmixalot.py -- --time-budgets <file> [--time-margin 0.5]
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    # or from the command line with "blender -b -P regressionmixalot.py".
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+    import apimixalot as api
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import fcurvesmixalot as fcv
+    from . import apimixalot as api
+    from . import logmixalot as log
+
+
+_logger = log.GetLogger(__name__)
+
+GOLDEN_FILE_VERSION = 2
+GOLDEN_FILE_EXTENSION = ".golden.json"
+DEFAULT_GOLDEN_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "golden")
+TIME_BUDGETS_FILE_VERSION = 1
+
+# The stages of the pipeline, in the order they run. Each one has its own time budget.
+STAGES = ("load", "extract", "postProcess", "export")
+
+# A stage fails when it takes longer than budget * (1 + margin).
+DEFAULT_TIME_MARGIN = 0.5
+# Budgets shorter than this are raised to this value, for such short
+# stages the timer noise is bigger than any real regression.
+DEFAULT_MIN_TIME_BUDGET_SECONDS = 0.05
+
+# Max absolute difference per channel, by the name of the animated property.
+DEFAULT_TOLERANCE = 1e-4
+CHANNEL_TOLERANCES = {
+    "location": 1e-4,
+    "rotation_quaternion": 1e-5,
+    "rotation_euler": 1e-5,
+    "scale": 1e-5,
+}
+FRAME_TOLERANCE = 1e-3
+
+
+class ReferenceClip:
+    """
+    A clip processed by the regression run.
+    @name Unique name of the clip, also the name of its golden file.
+    @options Dictionary of apimixalot.PipelineOptions for this clip.
+    @buildFunction For synthetic clips. Called with the empty scene, returns the new Armature.
+    @fbxFilePath For checked in clips. Imported with apimixalot.Pipeline.Import().
+    """
+    def __init__(self, name: str, options: dict = None, buildFunction=None, fbxFilePath: str = None):
+        self.name = name
+        self.options = options if options is not None else {}
+        self.buildFunction = buildFunction
+        self.fbxFilePath = fbxFilePath
+
+    def Load(self, sceneObj: bpy.types.Scene, pipeline: api.Pipeline) -> bpy.types.Armature:
+        if self.fbxFilePath is not None:
+            return pipeline.Import(self.fbxFilePath)
+        cmn.ClearSceneObjects(sceneObj)
+        return self.buildFunction(sceneObj)
+
+
+###############################################################################
+# Synthetic clips
+# A minimal biped in Blender units, Z is up: (name, parent, head, tail).
+_SYNTHETIC_BONES = (
+    ("Hips", None, (0.0, 0.0, 1.0), (0.0, 0.0, 1.1)),
+    ("Spine", "Hips", (0.0, 0.0, 1.1), (0.0, 0.0, 1.5)),
+    ("LeftUpLeg", "Hips", (0.1, 0.0, 1.0), (0.1, 0.0, 0.55)),
+    ("LeftLeg", "LeftUpLeg", (0.1, 0.0, 0.55), (0.1, 0.0, 0.1)),
+    ("LeftFoot", "LeftLeg", (0.1, 0.0, 0.1), (0.1, -0.15, 0.0)),
+    ("RightUpLeg", "Hips", (-0.1, 0.0, 1.0), (-0.1, 0.0, 0.55)),
+    ("RightLeg", "RightUpLeg", (-0.1, 0.0, 0.55), (-0.1, 0.0, 0.1)),
+    ("RightFoot", "RightLeg", (-0.1, 0.0, 0.1), (-0.1, -0.15, 0.0)),
+)
+_SYNTHETIC_FPS = 30
+_SYNTHETIC_FRAME_COUNT = 60
+_STEP_PERIOD_FRAMES = 30.0
+
+
+def _CreateSyntheticArmature(sceneObj: bpy.types.Scene, name: str, mixamoTransform: bool) -> bpy.types.Armature:
+    """
+    @mixamoTransform If True, the bones are Y up and in centimeters, and the
+        object is rotated 90 degrees around X and scaled by 0.01, same as the
+        armatures imported from Mixamo FBX files.
+    """
+    armatureData = bpy.data.armatures.new(name)
+    armatureObj = bpy.data.objects.new(name, armatureData)
+    sceneObj.collection.objects.link(armatureObj)
+    bpy.context.view_layer.objects.active = armatureObj
+    bpy.ops.object.mode_set(mode='EDIT')
+    for boneName, parentName, head, tail in _SYNTHETIC_BONES:
+        editBone = armatureData.edit_bones.new(boneName)
+        if mixamoTransform:
+            head = (100.0 * head[0], 100.0 * head[2], -100.0 * head[1])
+            tail = (100.0 * tail[0], 100.0 * tail[2], -100.0 * tail[1])
+        editBone.head = head
+        editBone.tail = tail
+        if parentName is not None:
+            editBone.parent = armatureData.edit_bones[parentName]
+    bpy.ops.object.mode_set(mode='OBJECT')
+    if mixamoTransform:
+        armatureObj.rotation_euler = (math.radians(90.0), 0.0, 0.0)
+        armatureObj.scale = (0.01, 0.01, 0.01)
+    for poseBone in armatureObj.pose.bones:
+        poseBone.rotation_mode = 'QUATERNION'
+    sceneObj.render.fps = _SYNTHETIC_FPS
+    sceneObj.render.fps_base = 1.0
+    sceneObj.frame_start = 1
+    sceneObj.frame_end = _SYNTHETIC_FRAME_COUNT
+    return armatureObj
+
+
+def _KeySyntheticMotion(armatureObj: bpy.types.Armature, hipMotionFunction, legSwingDegrees: float):
+    """
+    Keys all the frames of the synthetic clip.
+    @hipMotionFunction Called with the frame number, returns tuple (location, quaternion)
+        of the Hips bone, in bone local space.
+    @legSwingDegrees Amplitude of the walk cycle of the legs.
+    """
+    poseBones = armatureObj.pose.bones
+    for frame in range(1, _SYNTHETIC_FRAME_COUNT + 1):
+        hipLocation, hipQuaternion = hipMotionFunction(frame)
+        poseBones["Hips"].location = hipLocation
+        poseBones["Hips"].rotation_quaternion = hipQuaternion
+        poseBones["Hips"].keyframe_insert("location", frame=frame)
+        poseBones["Hips"].keyframe_insert("rotation_quaternion", frame=frame)
+        phase = 2.0 * math.pi * frame / _STEP_PERIOD_FRAMES
+        swing = math.radians(legSwingDegrees) * math.sin(phase)
+        for boneName, sign in (("LeftUpLeg", 1.0), ("RightUpLeg", -1.0)):
+            halfAngle = 0.5 * sign * swing
+            poseBones[boneName].rotation_quaternion = (math.cos(halfAngle), math.sin(halfAngle), 0.0, 0.0)
+            poseBones[boneName].keyframe_insert("rotation_quaternion", frame=frame)
+        for boneName, sign in (("LeftLeg", 1.0), ("RightLeg", -1.0)):
+            halfAngle = 0.5 * max(0.0, sign * swing)
+            poseBones[boneName].rotation_quaternion = (math.cos(halfAngle), math.sin(halfAngle), 0.0, 0.0)
+            poseBones[boneName].keyframe_insert("rotation_quaternion", frame=frame)
+
+
+def _WalkHipMotion(frame: int):
+    # The Hips bone points up, so its local Y axis is the up axis of the armature.
+    phase = 2.0 * math.pi * frame / _STEP_PERIOD_FRAMES
+    location = (0.03 * math.sin(phase), 0.02 * abs(math.sin(phase)), -0.04 * frame)
+    return location, (1.0, 0.0, 0.0, 0.0)
+
+
+def _TurnHipMotion(frame: int):
+    halfAngle = 0.5 * math.radians(90.0) * frame / _SYNTHETIC_FRAME_COUNT
+    phase = 2.0 * math.pi * frame / _STEP_PERIOD_FRAMES
+    location = (0.02 * math.sin(phase), 0.0, 0.0)
+    return location, (math.cos(halfAngle), 0.0, math.sin(halfAngle), 0.0)
+
+
+def _JumpHipMotion(frame: int):
+    height = max(0.0, math.sin(math.pi * (frame - 15) / 30.0)) if 15 <= frame <= 45 else 0.0
+    return (0.0, 0.4 * height, -0.02 * frame), (1.0, 0.0, 0.0, 0.0)
+
+
+def _MakeSyntheticBuilder(hipMotionFunction, legSwingDegrees: float, mixamoTransform: bool = False):
+    def BuildClip(sceneObj: bpy.types.Scene) -> bpy.types.Armature:
+        armatureObj = _CreateSyntheticArmature(sceneObj, "Armature", mixamoTransform)
+        _KeySyntheticMotion(armatureObj, hipMotionFunction, legSwingDegrees)
+        return armatureObj
+    return BuildClip
+
+
+def GetSyntheticClips() -> list[ReferenceClip]:
+    """
+    Returns the built in reference clips. Between them they cover the full
+    extraction, the windowed extraction, retiming, Z rotation extraction and
+    all the post processing operations.
+    """
+    return [
+        ReferenceClip("synthetic_walk", {},
+            _MakeSyntheticBuilder(_WalkHipMotion, 30.0)),
+        ReferenceClip("synthetic_walk_mixamo", {"rotateAroundZAxis": True, "rootMotionScale": 2.0,
+            "rootMotionOffset": (0.5, 0.0, 0.0)},
+            _MakeSyntheticBuilder(_WalkHipMotion, 30.0, mixamoTransform=True)),
+        ReferenceClip("synthetic_walk_windowed", {"streamingChunkSize": 16, "frameRanges": "5-50"},
+            _MakeSyntheticBuilder(_WalkHipMotion, 30.0)),
+        ReferenceClip("synthetic_walk_retimed", {"retimeFps": 24, "zeroOutTranslationZ": True},
+            _MakeSyntheticBuilder(_WalkHipMotion, 30.0)),
+        ReferenceClip("synthetic_turn", {"extractRotationZ": True, "rotateAroundZAxis": True, "spinDegreesPerSecond": 45.0},
+            _MakeSyntheticBuilder(_TurnHipMotion, 15.0)),
+        ReferenceClip("synthetic_jump", {"extractTranslationX": False},
+            _MakeSyntheticBuilder(_JumpHipMotion, 10.0)),
+    ]
+
+
+def FindFbxClips(clipsDirectory: str) -> list[ReferenceClip]:
+    """
+    Returns one reference clip, with the default options, per .fbx file in @clipsDirectory.
+    """
+    clips = []
+    for filename in sorted(os.listdir(clipsDirectory)):
+        clipName, extension = os.path.splitext(filename)
+        if extension.lower() == ".fbx":
+            clips.append(ReferenceClip(clipName, fbxFilePath=os.path.join(clipsDirectory, filename)))
+    return clips
+
+
+###############################################################################
+# Golden files
+def GetChannelName(fcurve: bpy.types.FCurve) -> str:
+    return f"{fcurve.data_path}[{fcurve.array_index}]"
+
+
+def GetChannelTolerance(channelName: str, tolerances: dict = CHANNEL_TOLERANCES) -> float:
+    """
+    Returns the tolerance of @channelName, as returned by GetChannelName(), by the
+    name of its animated property. Example: 'pose.bones["Hips"].location[0]' uses
+    the "location" tolerance.
+    """
+    dataPath = channelName.rsplit("[", 1)[0]
+    propertyName = dataPath.rsplit(".", 1)[-1]
+    return tolerances.get(propertyName, DEFAULT_TOLERANCE)
+
+
+def CaptureChannels(armatureObj: bpy.types.Armature) -> dict:
+    """
+    Returns a dictionary, channel name to tuple (frames, values), with all the
+    key frames of all the fcurves of the action of @armatureObj.
+    """
+    channels = {}
+    if (armatureObj.animation_data is None) or (armatureObj.animation_data.action is None):
+        return channels
+    for fcurve in armatureObj.animation_data.action.fcurves:
+        frames, values = fcv.GetFCurveKeyFrames(fcurve)
+        channels[GetChannelName(fcurve)] = (list(frames), list(values))
+    return channels
+
+
+def GetGoldenFilePath(goldenDirectory: str, clipName: str) -> str:
+    return os.path.join(goldenDirectory, clipName + GOLDEN_FILE_EXTENSION)
+
+
+def WriteGoldenFile(goldenFilePath: str, clipName: str, channels: dict):
+    goldenDict = {
+        "version": GOLDEN_FILE_VERSION,
+        "clip": clipName,
+        "channels": {channelName: {"frames": frames, "values": values}
+                     for channelName, (frames, values) in sorted(channels.items())},
+    }
+    with open(goldenFilePath, "w") as fileObj:
+        json.dump(goldenDict, fileObj, indent=1)
+
+
+def ReadGoldenFile(goldenFilePath: str) -> dict:
+    """
+    Returns the channels, same format as CaptureChannels().
+    """
+    with open(goldenFilePath, "r") as fileObj:
+        goldenDict = json.load(fileObj)
+    if goldenDict.get("version") != GOLDEN_FILE_VERSION:
+        raise Exception(f"'{goldenFilePath}' has version {goldenDict.get('version')}, expected {GOLDEN_FILE_VERSION}. Record it again")
+    return {channelName: (channelDict["frames"], channelDict["values"])
+            for channelName, channelDict in goldenDict["channels"].items()}
+
+
+def ReadTimeBudgets(timeBudgetsFilePath: str) -> dict:
+    """
+    Returns a dictionary, clip name to the dictionary of seconds per stage.
+    Returns an empty dictionary if the file doesn't exist.
+    """
+    if not os.path.exists(timeBudgetsFilePath):
+        return {}
+    with open(timeBudgetsFilePath, "r") as fileObj:
+        budgetsDict = json.load(fileObj)
+    if budgetsDict.get("version") != TIME_BUDGETS_FILE_VERSION:
+        raise Exception(f"'{timeBudgetsFilePath}' has version {budgetsDict.get('version')}, expected {TIME_BUDGETS_FILE_VERSION}. Record it again")
+    return budgetsDict["clips"]
+
+
+def WriteTimeBudgets(timeBudgetsFilePath: str, timeBudgets: dict):
+    budgetsDict = {
+        "version": TIME_BUDGETS_FILE_VERSION,
+        "clips": {clipName: timeBudgets[clipName] for clipName in sorted(timeBudgets)},
+    }
+    with open(timeBudgetsFilePath, "w") as fileObj:
+        json.dump(budgetsDict, fileObj, indent=1)
+
+
+###############################################################################
+# Comparisons. They don't depend on bpy.
+def _GetMaxDifference(listA: list[float], listB: list[float]) -> list[float, int]:
+    """
+    Returns tuple (maxAbsoluteDifference, index).
+    """
+    maxDifference = 0.0
+    maxIndex = 0
+    for index, (a, b) in enumerate(zip(listA, listB)):
+        difference = abs(a - b)
+        if difference > maxDifference:
+            maxDifference = difference
+            maxIndex = index
+    return maxDifference, maxIndex
+
+
+def CompareChannels(goldenChannels: dict, channels: dict, tolerances: dict = CHANNEL_TOLERANCES) -> list[str]:
+    """
+    Compares @channels against @goldenChannels, both as returned by CaptureChannels().
+    Returns the list of failure messages, empty if all the channels match.
+    """
+    failures = []
+    for channelName in sorted(set(goldenChannels) - set(channels)):
+        failures.append(f"Missing channel {channelName}")
+    for channelName in sorted(set(channels) - set(goldenChannels)):
+        failures.append(f"Unexpected channel {channelName}")
+    for channelName in sorted(set(goldenChannels) & set(channels)):
+        goldenFrames, goldenValues = goldenChannels[channelName]
+        frames, values = channels[channelName]
+        if len(goldenFrames) != len(frames):
+            failures.append(f"Channel {channelName} has {len(frames)} key frames, expected {len(goldenFrames)}")
+            continue
+        frameDifference, index = _GetMaxDifference(goldenFrames, frames)
+        if frameDifference > FRAME_TOLERANCE:
+            failures.append(f"Channel {channelName} key frame {index} is at frame {frames[index]}, expected {goldenFrames[index]}")
+            continue
+        tolerance = GetChannelTolerance(channelName, tolerances)
+        valueDifference, index = _GetMaxDifference(goldenValues, values)
+        if valueDifference > tolerance:
+            failures.append(f"Channel {channelName} at frame {frames[index]} is {values[index]}, expected {goldenValues[index]}"
+                            f" (difference {valueDifference:.3g} > tolerance {tolerance:.3g})")
+    return failures
+
+
+def CompareTimings(timeBudgets: dict, timings: dict, timeMargin: float = DEFAULT_TIME_MARGIN,
+                   minTimeBudget: float = DEFAULT_MIN_TIME_BUDGET_SECONDS) -> list[str]:
+    """
+    @timeBudgets The recorded seconds per stage.
+    @timings The measured seconds per stage.
+    Returns the list of failure messages, one per stage slower than its budget
+    by more than @timeMargin, as a fraction of the budget.
+    """
+    failures = []
+    for stage, budget in timeBudgets.items():
+        if stage not in timings:
+            continue
+        allowedSeconds = max(budget, minTimeBudget) * (1.0 + timeMargin)
+        if timings[stage] > allowedSeconds:
+            failures.append(f"Stage '{stage}' took {timings[stage]:.3f}s, budget is {budget:.3f}s"
+                            f" (max {allowedSeconds:.3f}s with margin {timeMargin:.0%})")
+    return failures
+
+
+###############################################################################
+# Regression runs
+def RunClip(sceneObj: bpy.types.Scene, clip: ReferenceClip, outputDirectory: str) -> list[dict, dict]:
+    """
+    Runs all the stages of the pipeline on @clip, exporting to @outputDirectory.
+    Returns tuple (channels, timings). @channels as returned by CaptureChannels(),
+    @timings is a dictionary of seconds per stage.
+    """
+    pipeline = api.Pipeline(sceneObj, api.PipelineOptions(**clip.options))
+    timings = {}
+
+    startTime = time.perf_counter()
+    armatureObj = clip.Load(sceneObj, pipeline)
+    timings["load"] = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    pipeline.ExtractRootMotion(armatureObj)
+    timings["extract"] = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    pipeline.PostProcess(armatureObj)
+    timings["postProcess"] = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    pipeline.Export(armatureObj, clip.name + ".fbx", outputDirectory)
+    timings["export"] = time.perf_counter() - startTime
+
+    return CaptureChannels(armatureObj), timings
+
+
+def RunRegression(sceneObj: bpy.types.Scene, goldenDirectory: str, clips: list[ReferenceClip],
+                  update: bool = False, timeBudgetsFilePath: str = None, updateTimeBudgets: bool = False,
+                  timeMargin: float = DEFAULT_TIME_MARGIN,
+                  minTimeBudget: float = DEFAULT_MIN_TIME_BUDGET_SECONDS):
+    """
+    Runs all the @clips and compares their output against their golden files in
+    @goldenDirectory. Yields one Status per clip.
+    @update If True, the golden files are written instead of compared.
+    @timeBudgetsFilePath Optional. File with the time budgets of this machine.
+        If None, the timings are not checked.
+    @updateTimeBudgets If True, the time budgets of the clips that match their
+        golden channels are recorded in @timeBudgetsFilePath instead of checked,
+        e.g. after moving to another machine. The golden files are not modified.
+    Returns the list of failures as tuples (clipName, message).
+    """
+    os.makedirs(goldenDirectory, exist_ok=True)
+    if updateTimeBudgets and (timeBudgetsFilePath is None):
+        raise Exception("Recording the time budgets requires the path of the time budgets file")
+    timeBudgets = ReadTimeBudgets(timeBudgetsFilePath) if timeBudgetsFilePath else {}
+    failedList = []
+    with tempfile.TemporaryDirectory(prefix="lumbermixalot-regression-") as outputDirectory:
+        for clip in clips:
+            goldenFilePath = GetGoldenFilePath(goldenDirectory, clip.name)
+            try:
+                channels, timings = RunClip(sceneObj, clip, outputDirectory)
+            except Exception as e:
+                failedList.append((clip.name, f"Pipeline error: {e}"))
+                yield Status(f"FAILED clip '{clip.name}': pipeline error: {e}")
+                continue
+            timingsText = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+            if update:
+                WriteGoldenFile(goldenFilePath, clip.name, channels)
+                yield Status(f"Recorded {len(channels)} channels of clip '{clip.name}' ({timingsText})")
+                continue
+            if not os.path.exists(goldenFilePath):
+                failedList.append((clip.name, f"Missing golden file '{goldenFilePath}', record it with --update"))
+                yield Status(f"FAILED clip '{clip.name}': no golden file")
+                continue
+            failures = CompareChannels(ReadGoldenFile(goldenFilePath), channels)
+            if updateTimeBudgets:
+                if not failures:
+                    timeBudgets[clip.name] = timings
+            elif clip.name in timeBudgets:
+                failures.extend(CompareTimings(timeBudgets[clip.name], timings, timeMargin, minTimeBudget))
+            for failure in failures:
+                failedList.append((clip.name, failure))
+                _logger.error("%s: %s", clip.name, failure)
+            result = "FAILED" if failures else "Passed"
+            yield Status(f"{result} clip '{clip.name}', {len(channels)} channels, {len(failures)} failures ({timingsText})")
+    cmn.ClearSceneObjects(sceneObj)
+    if updateTimeBudgets:
+        WriteTimeBudgets(timeBudgetsFilePath, timeBudgets)
+        yield Status(f"Recorded the time budgets of {len(timeBudgets)} clips in '{timeBudgetsFilePath}'")
+    return failedList
+
+
+def ParseArguments(argv: list[str]) -> argparse.Namespace:
+    """
+    @argv The command line arguments. Only the arguments after "--" are
+        parsed, the ones before belong to Blender.
+    """
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="blender -b -P regressionmixalot.py --",
+        description="Compares the output of the pipeline on reference clips against golden files.")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN_DIRECTORY,
+                        help="Directory with the golden files. Defaults to the checked in tests/golden")
+    parser.add_argument("--clips", default=None, help="Optional. Directory with checked in FBX reference clips")
+    parser.add_argument("--clip", action="append", default=[], help="Only run this clip. Can be repeated")
+    parser.add_argument("--no-synthetic", action="store_true", help="Skip the built in synthetic clips")
+    parser.add_argument("--update", action="store_true", help="Record the golden files instead of comparing")
+    parser.add_argument("--time-budgets", default=None,
+                        help="Optional. File with the time budgets of this machine. Timings are only checked if it is given")
+    parser.add_argument("--update-time-budgets", action="store_true",
+                        help="Record the time budgets in --time-budgets, only for the clips whose channels match")
+    parser.add_argument("--time-margin", type=float, default=DEFAULT_TIME_MARGIN,
+                        help="Allowed slowdown per stage, as a fraction of its budget")
+    parser.add_argument("--min-time-budget", type=float, default=DEFAULT_MIN_TIME_BUDGET_SECONDS,
+                        help="Seconds. Shorter budgets are raised to this value")
+    parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors")
+    parser.add_argument("--log-level", default="INFO", choices=log.LEVEL_NAMES, help="Minimum level of the log messages")
+    args = parser.parse_args(argv)
+    if args.update_time_budgets and (args.time_budgets is None):
+        parser.error("--update-time-budgets requires --time-budgets")
+    log.SetLevel(args.log_level)
+    log.SetQuietMode(args.quiet)
+    return args
+
+
+def main(argv: list[str]) -> int:
+    args = ParseArguments(argv)
+    clips = [] if args.no_synthetic else GetSyntheticClips()
+    if args.clips:
+        clips.extend(FindFbxClips(args.clips))
+    if args.clip:
+        clips = [clip for clip in clips if clip.name in args.clip]
+    if not clips:
+        _logger.error("No reference clips to run")
+        return 1
+    regressionIterator = RunRegression(bpy.context.scene, args.golden, clips,
+        update=args.update, timeBudgetsFilePath=args.time_budgets, updateTimeBudgets=args.update_time_budgets,
+        timeMargin=args.time_margin, minTimeBudget=args.min_time_budget)
+    try:
+        while True:
+            # Each Status logs its own message.
+            next(regressionIterator)
+    except StopIteration as result:
+        failedList = result.value
+    for clipName, message in failedList:
+        _logger.error("FAILED: '%s': %s", clipName, message)
+    return 1 if failedList else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
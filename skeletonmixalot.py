@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+import fnmatch
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import fcurvesmixalot as fcv
+
+
+# Fingers and the "End" leaf bones of Mixamo rigs.
+DEFAULT_PRUNE_PATTERNS = "*HandThumb*, *HandIndex*, *HandMiddle*, *HandRing*, *HandPinky*, *_End"
+
+# Value of each animated property when a bone is at its rest pose.
+_REST_VALUES = {
+    'location': (0.0, 0.0, 0.0),
+    'rotation_quaternion': (1.0, 0.0, 0.0, 0.0),
+    'rotation_euler': (0.0, 0.0, 0.0),
+    'rotation_axis_angle': (0.0, 0.0, 1.0, 0.0),
+    'scale': (1.0, 1.0, 1.0),
+}
+
+
+def ParseBonePatterns(patternsText: str) -> list[str]:
+    """
+    Splits a comma or semicolon separated list of fnmatch style patterns.
+    """
+    patterns = []
+    for pattern in patternsText.replace(";", ",").split(","):
+        pattern = pattern.strip()
+        if pattern != "":
+            patterns.append(pattern)
+    return patterns
+
+
+def FindBonesByPatterns(armatureObj: bpy.types.Armature, patterns: list[str]) -> set[str]:
+    """
+    Returns the names of the bones of @armatureObj that match at least one
+    of the fnmatch style @patterns. Matching is case sensitive.
+    """
+    boneNames = set()
+    for bone in armatureObj.data.bones:
+        for pattern in patterns:
+            if fnmatch.fnmatchcase(bone.name, pattern):
+                boneNames.add(bone.name)
+                break
+    return boneNames
+
+
+def _IsStaticAtRestPose(fcurve: bpy.types.FCurve, propertyName: str, tolerance: float) -> bool:
+    restValues = _REST_VALUES.get(propertyName)
+    if (restValues is None) or (fcurve.array_index >= len(restValues)):
+        return False
+    restValue = restValues[fcurve.array_index]
+    values = fcv.GetFCurveKeyFrameValues(fcurve)
+    if (propertyName == 'rotation_quaternion') and (fcurve.array_index == 0):
+        # q and -q are the same rotation.
+        return all(abs(abs(value) - restValue) <= tolerance for value in values)
+    return all(abs(value - restValue) <= tolerance for value in values)
+
+
+def FindStaticBones(armatureObj: bpy.types.Armature, tolerance: float) -> set[str]:
+    """
+    Returns the names of the bones of @armatureObj that never move away from
+    their rest pose, by more than @tolerance, in any of the actions.
+    Returns an empty set if there is no bone animation data at all.
+    """
+    movingBoneNames = set()
+    hasBoneAnimation = False
+    for action in bpy.data.actions:
+        for fcurve in action.fcurves:
+            boneName = fcv.GetPoseBoneNameFromDataPath(fcurve.data_path)
+            if boneName is None:
+                continue
+            hasBoneAnimation = True
+            if boneName in movingBoneNames:
+                continue
+            propertyName = fcurve.data_path.rsplit(".", 1)[-1]
+            if not _IsStaticAtRestPose(fcurve, propertyName, tolerance):
+                movingBoneNames.add(boneName)
+    if not hasBoneAnimation:
+        return set()
+    return {bone.name for bone in armatureObj.data.bones if bone.name not in movingBoneNames}
+
+
+def _GetPrunableSubtrees(armatureObj: bpy.types.Armature, boneNames: set[str], wholeSubtreeRequired: bool) -> set[str]:
+    """
+    Bones are always pruned together with all their descendants, this way the
+    animation data of the kept bones remains relative to the same parent.
+    If @wholeSubtreeRequired is True, a bone in @boneNames is only pruned if all its
+    descendants are in @boneNames as well, otherwise its descendants are pruned with it.
+    The root bone is never pruned.
+    """
+    rootBone = cmn.GetRootBone(armatureObj)
+    prunedBoneNames = set()
+    for bone in armatureObj.data.bones:
+        if (bone.name not in boneNames) or (bone == rootBone):
+            continue
+        descendantNames = {child.name for child in bone.children_recursive}
+        if wholeSubtreeRequired and not descendantNames.issubset(boneNames):
+            continue
+        prunedBoneNames.add(bone.name)
+        prunedBoneNames.update(descendantNames)
+    return prunedBoneNames
+
+
+def _ReassignSkinWeights(armatureObj: bpy.types.Armature, prunedBoneNames: set[str]) -> int:
+    """
+    Adds the skin weights of the pruned bones to the vertex group of their
+    nearest kept ancestor, and removes the vertex groups of the pruned bones.
+    Returns the number of removed vertex groups.
+    """
+    bones = armatureObj.data.bones
+    targetBoneNames = {}
+    for boneName in prunedBoneNames:
+        ancestor = cmn.GetNearestAncestorBoneNotIn(bones[boneName], prunedBoneNames)
+        if ancestor is not None:
+            targetBoneNames[boneName] = ancestor.name
+    removedGroupsCount = 0
+    for meshObj in cmn.GetSkinnedChildMeshes(armatureObj):
+        vertexGroups = meshObj.vertex_groups
+        prunedGroups = [vertexGroup for vertexGroup in vertexGroups if vertexGroup.name in prunedBoneNames]
+        if len(prunedGroups) < 1:
+            continue
+        groupTargets = {vertexGroup.index: targetBoneNames.get(vertexGroup.name) for vertexGroup in prunedGroups}
+        additions = {}
+        for vertex in meshObj.data.vertices:
+            for element in vertex.groups:
+                if element.group not in groupTargets:
+                    continue
+                targetName = groupTargets[element.group]
+                if targetName is None:
+                    continue
+                weights = additions.setdefault(targetName, {})
+                weights[vertex.index] = weights.get(vertex.index, 0.0) + element.weight
+        for targetName, weights in additions.items():
+            targetGroup = vertexGroups.get(targetName)
+            if targetGroup is None:
+                targetGroup = vertexGroups.new(name=targetName)
+            # One call per distinct weight instead of one per vertex.
+            weightIndices = {}
+            for vertexIndex, weight in weights.items():
+                weightIndices.setdefault(weight, []).append(vertexIndex)
+            for weight, vertexIndices in weightIndices.items():
+                targetGroup.add(vertexIndices, weight, 'ADD')
+        for vertexGroup in prunedGroups:
+            vertexGroups.remove(vertexGroup)
+        removedGroupsCount += len(prunedGroups)
+    return removedGroupsCount
+
+
+def _GetArmatureActions(armatureObj: bpy.types.Armature) -> list[bpy.types.Action]:
+    """
+    Returns the actions used by @armatureObj: its active action and the
+    actions of the strips of its NLA tracks, without duplicates.
+    """
+    actions = []
+    animationData = armatureObj.animation_data
+    if animationData is None:
+        return actions
+    if animationData.action is not None:
+        actions.append(animationData.action)
+    for track in animationData.nla_tracks:
+        for strip in track.strips:
+            if (strip.action is not None) and (strip.action not in actions):
+                actions.append(strip.action)
+    return actions
+
+
+def _RemovePoseBoneFCurves(armatureObj: bpy.types.Armature, prunedBoneNames: set[str]) -> int:
+    """
+    Removes the fcurves of the pruned bones from the actions used by @armatureObj.
+    Actions of other armatures, that may have bones with the same names, are not modified.
+    Returns the number of removed fcurves.
+    """
+    removedCount = 0
+    for action in _GetArmatureActions(armatureObj):
+        removedCount += RemovePoseBoneFCurvesFromAction(action, prunedBoneNames)
+    return removedCount
+
+
+def FindBonesToPrune(armatureObj: bpy.types.Armature, patterns: list[str]) -> set[str]:
+    """
+    Returns the names of the bones that match @patterns, plus all their descendants.
+    """
+    matchedBoneNames = FindBonesByPatterns(armatureObj, patterns)
+    return _GetPrunableSubtrees(armatureObj, matchedBoneNames, wholeSubtreeRequired=False)
+
+
+def RemovePoseBoneFCurvesFromAction(action: bpy.types.Action, boneNames: set[str]) -> int:
+    """
+    Removes the fcurves of the bones named in @boneNames from @action.
+    Returns the number of removed fcurves.
+    """
+    removedCount = 0
+    fcurves = action.fcurves
+    for fcurve in list(fcurves):
+        if fcv.GetPoseBoneNameFromDataPath(fcurve.data_path) in boneNames:
+            fcurves.remove(fcurve)
+            removedCount += 1
+    for group in list(action.groups):
+        if (group.name in boneNames) and (len(group.channels) < 1):
+            action.groups.remove(group)
+    return removedCount
+
+
+def PruneSkeleton(armatureObj: bpy.types.Armature,
+                  bonePatterns: list[str] = None,
+                  pruneStaticBones: bool = False,
+                  motionTolerance: float = 0.001):
+    """
+    Removes unnecessary bones from @armatureObj in a single pass. The skin
+    weights of the removed bones are reassigned to their nearest kept ancestor,
+    and their fcurves are removed from the actions used by @armatureObj.
+
+    @bonePatterns fnmatch style patterns. Matching bones are pruned
+        together with all their descendants.
+    @pruneStaticBones If True, bones (and subtrees) that never move away
+        from their rest pose by more than @motionTolerance are pruned as well.
+    """
+    prunedBoneNames = set()
+    if bonePatterns:
+        prunedBoneNames.update(FindBonesToPrune(armatureObj, bonePatterns))
+        yield Status(f"Found {len(prunedBoneNames)} bones to prune by name")
+
+    if pruneStaticBones:
+        staticBoneNames = FindStaticBones(armatureObj, motionTolerance)
+        staticBoneNames.update(prunedBoneNames)
+        prunedBoneNames.update(_GetPrunableSubtrees(armatureObj, staticBoneNames, wholeSubtreeRequired=True))
+        yield Status(f"Found {len(prunedBoneNames)} bones to prune after checking for bones without motion")
+
+    if len(prunedBoneNames) < 1:
+        yield Status(f"There are no bones to prune in '{armatureObj.name}'")
+        return
+
+    removedGroupsCount = _ReassignSkinWeights(armatureObj, prunedBoneNames)
+    yield Status(f"Reassigned skin weights of {removedGroupsCount} vertex groups to the nearest kept bones")
+
+    removedFCurvesCount = _RemovePoseBoneFCurves(armatureObj, prunedBoneNames)
+    yield Status(f"Removed {removedFCurvesCount} fcurves of pruned bones")
+
+    cmn.RemoveBones(armatureObj, prunedBoneNames)
+    yield Status(f"Pruned {len(prunedBoneNames)} bones from '{armatureObj.name}'")
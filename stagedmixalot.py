@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Staged batch conversion.
+# Each file goes through three stages, each stage runs in its own background
+# Blender processes, this way a file is imported while the previous one is
+# being processed and the one before is being exported:
+#   import:   FBX -> <temp>/<id>_imported.blend
+#   process:  root motion extraction, <id>_imported.blend -> <id>_processed.blend
+#   export:   <id>_processed.blend -> FBX (and textures) in the output directory.
+# The stages are connected by bounded queues, when a downstream stage falls
+# behind the upstream stages block, so at most a few intermediate .blend
+# files exist at any time.
+#
+# The coordinator doesn't depend on bpy:
+#   python stagedmixalot.py --input <dir> --output <dir> --blender <path to blender>
+# The stage workers are started as:
+#   blender -b -P stagedmixalot.py -- --stage import|process|export
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script.
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import watchmixalot as wmx
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import watchmixalot as wmx
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+
+STAGES = ("import", "process", "export")
+DEFAULT_QUEUE_SIZE = 2
+
+
+###############################################################################
+# Worker side, runs inside Blender.
+###############################################################################
+def _RunImportStage(request: dict):
+    import bpy
+    import commonmixalot as cmn
+    cmn.ClearSceneObjects(bpy.context.scene)
+    cmn.ImportFBX(request["input"])
+    bpy.ops.wm.save_as_mainfile(filepath=request["outputBlend"], check_existing=False)
+    return f"Imported '{request['input']}'"
+
+
+def _RunProcessStage(request: dict):
+    import bpy
+    import apimixalot as api
+    import batchmixalot
+    import commonmixalot as cmn
+    bpy.ops.wm.open_mainfile(filepath=request["inputBlend"])
+    options = batchmixalot.BatchOptions("", request["outputDir"], **request.get("options", {}))
+    pipeline = api.Pipeline(bpy.context.scene, batchmixalot.MakePipelineOptions(options))
+    armatureObj = cmn.GetFirstAmature(bpy.context.scene)
+    if armatureObj is None:
+        raise Exception(f"'{request['input']}' doesn't have an Armature")
+    pipeline.ExtractRootMotion(armatureObj)
+    bpy.ops.wm.save_as_mainfile(filepath=request["outputBlend"], check_existing=False)
+    return f"Extracted root motion of '{request['input']}'"
+
+
+def _RunExportStage(request: dict):
+    import bpy
+    import apimixalot as api
+    import batchmixalot
+    import commonmixalot as cmn
+    bpy.ops.wm.open_mainfile(filepath=request["inputBlend"])
+    options = batchmixalot.BatchOptions("", request["outputDir"], **request.get("options", {}))
+    pipeline = api.Pipeline(bpy.context.scene, batchmixalot.MakePipelineOptions(options))
+    armatureObj = cmn.GetFirstAmature(bpy.context.scene)
+    if armatureObj is None:
+        raise Exception(f"'{request['input']}' doesn't have an Armature")
+    outputFilenames = pipeline.Export(armatureObj, os.path.basename(request["input"]), request["outputDir"])
+    return f"Exported {', '.join(outputFilenames)}"
+
+
+def RunStageWorker(stage: str):
+    """
+    Worker loop of @stage. Reads requests from stdin until it is closed.
+    The log is quiet, errors are sent to the coordinator in the replies.
+    """
+    log.SetQuietMode(True)
+    stageFunctions = {"import": _RunImportStage, "process": _RunProcessStage, "export": _RunExportStage}
+    stageFunction = stageFunctions[stage]
+    for line in sys.stdin:
+        line = line.strip()
+        if line == "":
+            continue
+        request = json.loads(line)
+        startTime = time.perf_counter()
+        reply = {"id": request["id"], "ok": True, "message": ""}
+        try:
+            reply["message"] = stageFunction(request)
+        except Exception as e:
+            reply["ok"] = False
+            reply["message"] = str(e)
+        reply["seconds"] = time.perf_counter() - startTime
+        wmx.WriteWorkerReply(reply)
+
+
+###############################################################################
+# Coordinator side.
+###############################################################################
+class StagedJob:
+    def __init__(self, jobId: int, relativePath: str, inputFilePath: str, outputDirectory: str, tempDirectory: str):
+        self.jobId = jobId
+        self.relativePath = relativePath
+        self.inputFilePath = inputFilePath
+        self.outputDirectory = outputDirectory
+        self.importedBlend = os.path.join(tempDirectory, f"{jobId}_imported.blend")
+        self.processedBlend = os.path.join(tempDirectory, f"{jobId}_processed.blend")
+        # Seconds spent in each stage.
+        self.stageSeconds = {}
+        self.error = None
+
+    def GetStageFiles(self, stage: str) -> list[str, str]:
+        """Returns tuple (inputBlend, outputBlend) of @stage."""
+        if stage == "import":
+            return None, self.importedBlend
+        if stage == "process":
+            return self.importedBlend, self.processedBlend
+        return self.processedBlend, None
+
+
+def _RemoveFile(filePath: str):
+    if (filePath is not None) and os.path.exists(filePath):
+        os.remove(filePath)
+    # Blender keeps a backup of overwritten .blend files.
+    if (filePath is not None) and os.path.exists(filePath + "1"):
+        os.remove(filePath + "1")
+
+
+class StagedPipeline:
+    """
+    @workerCounts Number of Blender processes per stage, in the order of STAGES.
+    @queueSize Max number of files waiting between two stages.
+    """
+    def __init__(self, inputDirectory: str, outputDirectory: str, blenderPath: str, options: dict,
+                 workerCounts: list[int] = (1, 1, 1), queueSize: int = DEFAULT_QUEUE_SIZE,
+                 tempDirectory: str = None):
+        self.inputDirectory = inputDirectory
+        self.outputDirectory = outputDirectory
+        self.blenderPath = blenderPath
+        self.options = options
+        self.workerCounts = workerCounts
+        self.queueSize = queueSize
+        self.tempDirectory = tempDirectory
+        self._lock = threading.Lock()
+        self.finishedJobs = []
+
+    def _Report(self, job: StagedJob, stage: str, reply: dict):
+        with self._lock:
+            status = "done" if reply["ok"] else "FAILED"
+            _logger.info("[%s] %s '%s' in %.2fs %s", stage, status, job.relativePath, reply['seconds'], reply['message'])
+
+    def _StageLoop(self, stage: str, worker: wmx.WorkerProcess, inputQueue: queue.Queue, outputQueue: queue.Queue):
+        worker.Start()
+        while True:
+            job = inputQueue.get()
+            if job is None:
+                break
+            inputBlend, outputBlend = job.GetStageFiles(stage)
+            reply = worker.Run({"id": job.jobId, "input": job.inputFilePath, "outputDir": job.outputDirectory,
+                                "inputBlend": inputBlend, "outputBlend": outputBlend, "options": self.options})
+            self._Report(job, stage, reply)
+            job.stageSeconds[stage] = reply["seconds"]
+            # The intermediate file of the previous stage is not needed anymore.
+            _RemoveFile(inputBlend)
+            if not reply["ok"]:
+                job.error = f"{stage}: {reply['message']}"
+                _RemoveFile(outputBlend)
+            if (outputQueue is None) or (job.error is not None):
+                with self._lock:
+                    self.finishedJobs.append(job)
+            else:
+                # Blocks while the next stage is behind.
+                outputQueue.put(job)
+        worker.Stop()
+
+    def Run(self, relativePaths: list[str]) -> list[StagedJob]:
+        """
+        Converts all the files in @relativePaths (relative to the input directory).
+        Returns the list of finished jobs, check StagedJob.error.
+        """
+        tempDirectory = tempfile.mkdtemp(prefix="lumbermixalot-", dir=self.tempDirectory)
+        queues = [queue.Queue(maxsize=self.queueSize) for _ in STAGES]
+        stageThreads = []
+        for stageIndex, stage in enumerate(STAGES):
+            outputQueue = queues[stageIndex + 1] if stageIndex + 1 < len(STAGES) else None
+            threads = []
+            for workerIndex in range(max(1, self.workerCounts[stageIndex])):
+                worker = wmx.WorkerProcess(f"{stage}{workerIndex}", self.blenderPath, ["--stage", stage],
+                                           os.path.abspath(__file__))
+                thread = threading.Thread(target=self._StageLoop, args=(stage, worker, queues[stageIndex], outputQueue),
+                                          daemon=True)
+                thread.start()
+                threads.append(thread)
+            stageThreads.append(threads)
+        try:
+            for jobId, relativePath in enumerate(relativePaths):
+                queues[0].put(StagedJob(jobId, relativePath, os.path.join(self.inputDirectory, relativePath),
+                    os.path.join(self.outputDirectory, os.path.dirname(relativePath)), tempDirectory))
+            # Each stage is stopped after all the stages before it are done.
+            for stageIndex, threads in enumerate(stageThreads):
+                for _ in threads:
+                    queues[stageIndex].put(None)
+                for thread in threads:
+                    thread.join()
+        finally:
+            shutil.rmtree(tempDirectory, ignore_errors=True)
+        return sorted(self.finishedJobs, key=lambda job: job.jobId)
+
+
+def ParseArguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="stagedmixalot.py",
+        description="Converts all the FBX files in a directory with pipelined import, process and export stages.")
+    parser.add_argument("--stage", choices=STAGES, help="Internal. Runs a stage worker inside Blender")
+    parser.add_argument("--input", help="Directory with the input FBX files")
+    parser.add_argument("--output", help="Output directory")
+    parser.add_argument("--blender", default="blender", help="Path to the Blender executable")
+    parser.add_argument("--import-workers", type=int, default=1)
+    parser.add_argument("--process-workers", type=int, default=1)
+    parser.add_argument("--export-workers", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Max number of files waiting between two stages")
+    parser.add_argument("--temp-dir", default=None, help="Directory for the intermediate .blend files")
+    parser.add_argument("--axes", default="XYZ", help="Translation axes to extract, example: XY")
+    parser.add_argument("--rotation-z", action="store_true", help="Also extract the rotation around Z axis")
+    parser.add_argument("--unpack-textures", action="store_true", help="Unpack the textures next to the exported files")
+    args = parser.parse_args(argv)
+    if (args.stage is None) and ((args.input is None) or (args.output is None)):
+        parser.error("--input and --output are required")
+    return args
+
+
+def main(argv: list[str]) -> int:
+    # Inside Blender, the arguments of the script come after "--".
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = argv[1:]
+    args = ParseArguments(argv)
+    if args.stage is not None:
+        RunStageWorker(args.stage)
+        return 0
+    axes = args.axes.upper()
+    options = {
+        "extractTranslationX": "X" in axes,
+        "extractTranslationY": "Y" in axes,
+        "extractTranslationZ": "Z" in axes,
+        "extractRotationZ": args.rotation_z,
+        "unpackTextures": args.unpack_textures,
+    }
+    inputDirectory = os.path.abspath(args.input)
+    relativePaths = []
+    for directory, _, filenames in os.walk(inputDirectory):
+        for filename in filenames:
+            if filename.lower().endswith(".fbx"):
+                relativePaths.append(os.path.relpath(os.path.join(directory, filename), inputDirectory))
+    pipeline = StagedPipeline(inputDirectory, os.path.abspath(args.output), args.blender, options,
+        (args.import_workers, args.process_workers, args.export_workers), args.queue_size, args.temp_dir)
+    startTime = time.perf_counter()
+    jobs = pipeline.Run(sorted(relativePaths))
+    failedJobs = [job for job in jobs if job.error is not None]
+    for job in failedJobs:
+        _logger.error("FAILED: '%s': %s", job.relativePath, job.error)
+    _logger.info("Converted %d of %d files in %.1fs", len(jobs) - len(failedJobs), len(jobs), time.perf_counter() - startTime)
+    return 1 if failedJobs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# batchmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+# Only the shards and the lock files are tested, no scene is used.
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import batchmixalot as batch
+
+
+STALE_LOCK_SECONDS = 60.0
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class GetShardIndexTest(unittest.TestCase):
+
+    def test_StableAndInRange(self):
+        relativePaths = [f"characters/clip_{idx}.fbx" for idx in range(200)]
+        shards = [batch.GetShardIndex(relativePath, 4) for relativePath in relativePaths]
+        self.assertEqual(shards, [batch.GetShardIndex(relativePath, 4) for relativePath in relativePaths])
+        self.assertTrue(all(0 <= shard < 4 for shard in shards))
+        # Every shard gets some of the files.
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertEqual(batch.GetShardIndex("walk.fbx", 1), 0)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ClaimTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDirectory = tempfile.TemporaryDirectory()
+        self.lockDirectory = self.tempDirectory.name
+        self.relativePath = "characters/walk.fbx"
+        self.lockPath = batch._GetMarkerPath(self.lockDirectory, self.relativePath, ".lock")
+
+    def tearDown(self):
+        self.tempDirectory.cleanup()
+
+    def _WriteOtherHostLock(self, ageSeconds: float = 0.0):
+        with open(self.lockPath, 'w') as lockFile:
+            json.dump({"file": self.relativePath, "owner": "otherhost:1", "time": time.time()}, lockFile)
+        lockTime = time.time() - ageSeconds
+        os.utime(self.lockPath, (lockTime, lockTime))
+
+    def _ListMarkers(self) -> list[str]:
+        return sorted(os.path.splitext(filename)[1] for filename in os.listdir(self.lockDirectory))
+
+    def test_FreshClaim(self):
+        self.assertTrue(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        self.assertTrue(batch.OwnsClaim(self.lockDirectory, self.relativePath))
+        self.assertTrue(batch.RefreshClaim(self.lockDirectory, self.relativePath))
+        # The lock is taken, even by the same process.
+        self.assertFalse(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        batch.ReleaseClaim(self.lockDirectory, self.relativePath, True)
+        self.assertTrue(batch.IsDone(self.lockDirectory, self.relativePath))
+        self.assertEqual(self._ListMarkers(), [".done"])
+
+    def test_FailedReleaseIsRetried(self):
+        self.assertTrue(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        batch.ReleaseClaim(self.lockDirectory, self.relativePath, False, "broken file")
+        self.assertFalse(batch.IsDone(self.lockDirectory, self.relativePath))
+        self.assertEqual(self._ListMarkers(), [".failed"])
+        self.assertTrue(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        batch.ReleaseClaim(self.lockDirectory, self.relativePath, True)
+        self.assertEqual(self._ListMarkers(), [".done"])
+
+    def test_LiveLockIsRefused(self):
+        self._WriteOtherHostLock(ageSeconds=1.0)
+        self.assertFalse(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        self.assertFalse(batch.OwnsClaim(self.lockDirectory, self.relativePath))
+        self.assertFalse(batch.RefreshClaim(self.lockDirectory, self.relativePath))
+        self.assertEqual(self._ListMarkers(), [".lock"])
+
+    def test_StaleLockIsStolen(self):
+        self._WriteOtherHostLock(ageSeconds=2.0 * STALE_LOCK_SECONDS)
+        self.assertTrue(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        self.assertTrue(batch.OwnsClaim(self.lockDirectory, self.relativePath))
+        # Only the new lock is left, without the renamed stale one.
+        self.assertEqual(self._ListMarkers(), [".lock"])
+
+    def test_FreshLockReplacedDuringStealIsPutBack(self):
+        self._WriteOtherHostLock(ageSeconds=2.0 * STALE_LOCK_SECONDS)
+        rename = os.rename
+
+        def RenameAfterOtherHostRefresh(src, dst):
+            # Another host steals the stale lock between the age check and the rename.
+            self._WriteOtherHostLock(ageSeconds=0.0)
+            rename(src, dst)
+
+        with mock.patch.object(batch.os, "rename", RenameAfterOtherHostRefresh):
+            self.assertFalse(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        self.assertEqual(self._ListMarkers(), [".lock"])
+        self.assertFalse(batch.OwnsClaim(self.lockDirectory, self.relativePath))
+
+    def test_ReleaseIsSkippedIfAnotherHostOwnsTheLock(self):
+        self.assertTrue(batch.TryClaim(self.lockDirectory, self.relativePath, STALE_LOCK_SECONDS))
+        # Another host stole the lock, e.g. this one was paused for too long.
+        self._WriteOtherHostLock()
+        self.assertFalse(batch.RefreshClaim(self.lockDirectory, self.relativePath))
+        batch.ReleaseClaim(self.lockDirectory, self.relativePath, True)
+        self.assertFalse(batch.IsDone(self.lockDirectory, self.relativePath))
+        self.assertEqual(self._ListMarkers(), [".lock"])
+        with open(self.lockPath, 'r') as lockFile:
+            self.assertEqual(json.load(lockFile)["owner"], "otherhost:1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# clipstoremixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import clipstoremixalot as clipstore
+    import commonmixalot as cmn
+
+
+def _MakeColumns(trackCount: int, frameCount: int) -> list[list[float]]:
+    channelCount = len(clipstore.CHANNELS)
+    return [[float(column * 100 + frameIndex) for frameIndex in range(frameCount)]
+            for column in range(trackCount * channelCount)]
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ClipStoreRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDirectory = tempfile.TemporaryDirectory()
+        self.storeDirectory = self.tempDirectory.name
+        self.tracks = [clipstore.ARMATURE_TRACK, "Hips", "Spine"]
+        self.frames = [1.0, 2.0, 3.0, 4.5]
+        self.columns = _MakeColumns(len(self.tracks), len(self.frames))
+        self.filePath = clipstore.MakeClipStoreFilename(self.storeDirectory, "walk")
+        clipstore.WriteClip(self.filePath, "walk", 30.0, self.frames, self.tracks, self.columns)
+
+    def tearDown(self):
+        self.tempDirectory.cleanup()
+
+    def test_ReadBack(self):
+        channelCount = len(clipstore.CHANNELS)
+        with clipstore.ClipReader(self.filePath) as reader:
+            self.assertEqual(reader.name, "walk")
+            self.assertEqual(reader.fps, 30.0)
+            self.assertEqual(reader.frameCount, len(self.frames))
+            self.assertEqual(reader.tracks, self.tracks)
+            self.assertEqual(list(reader.GetFrames()), self.frames)
+            self.assertTrue(reader.HasTrack("Spine"))
+            self.assertFalse(reader.HasTrack("LeftFoot"))
+            for trackIndex, trackName in enumerate(self.tracks):
+                for channelIndex in range(channelCount):
+                    self.assertEqual(list(reader.GetChannel(trackName, channelIndex)),
+                                     self.columns[trackIndex * channelCount + channelIndex])
+            hipsColumns = self.columns[channelCount:2 * channelCount]
+            self.assertEqual(reader.GetLocations("Hips"), list(zip(*hipsColumns[0:3])))
+            self.assertEqual(reader.GetQuaternions("Hips"), list(zip(*hipsColumns[3:7])))
+
+    def test_CloseReleasesTheViews(self):
+        reader = clipstore.ClipReader(self.filePath)
+        frames = reader.GetFrames()
+        channel = reader.GetChannel("Hips", 1)
+        # Copies made with GetLocations() stay valid after closing.
+        locations = reader.GetLocations("Spine")
+        reader.Close()
+        with self.assertRaises(ValueError):
+            frames[0]
+        with self.assertRaises(ValueError):
+            channel[0]
+        self.assertEqual(len(locations), len(self.frames))
+        # Closing twice is allowed.
+        reader.Close()
+        # The file is no longer mapped, it can be replaced.
+        os.remove(self.filePath)
+
+    def test_ClipStore(self):
+        store = clipstore.ClipStore(self.storeDirectory)
+        self.assertEqual(store.GetClipNames(), ["walk"])
+        self.assertEqual(store.GetClipIndices()["walk"]["frameCount"], len(self.frames))
+        self.assertEqual(clipstore.ClipStore(os.path.join(self.storeDirectory, "missing")).GetClipNames(), [])
+
+    def test_WrongColumnLengthRaises(self):
+        columns = _MakeColumns(1, 3)
+        with self.assertRaises(Exception):
+            clipstore.WriteClip(self.filePath, "bad", 30.0, self.frames, [clipstore.ARMATURE_TRACK], columns)
+
+    def test_NotAClipFileRaises(self):
+        filePath = os.path.join(self.storeDirectory, "bad.lmxclip")
+        with open(filePath, 'wb') as outfile:
+            outfile.write(b"\0" * 64)
+        with self.assertRaises(Exception):
+            clipstore.ClipReader(filePath)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class PartiallyKeyedTrackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sceneObj = bpy.context.scene
+        cmn.ClearSceneObjects(self.sceneObj)
+        armatureData = bpy.data.armatures.new("Armature")
+        self.armatureObj = bpy.data.objects.new("Armature", armatureData)
+        self.sceneObj.collection.objects.link(self.armatureObj)
+        bpy.context.view_layer.objects.active = self.armatureObj
+        bpy.ops.object.mode_set(mode='EDIT')
+        editBone = armatureData.edit_bones.new("Hips")
+        editBone.tail = (0.0, 0.0, 0.1)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    def tearDown(self):
+        cmn.ClearSceneObjects(self.sceneObj)
+
+    def test_OnlyMissingChannelsUseRestValues(self):
+        poseBone = self.armatureObj.pose.bones["Hips"]
+        for frame in (1, 5):
+            poseBone.location = (0.0, float(frame), 0.0)
+            poseBone.keyframe_insert("location", index=1, frame=frame)
+        columns = clipstore._SampleTrack(self.armatureObj, "Hips", [1.0, 5.0])
+        self.assertEqual(columns[0], [0.0, 0.0])
+        self.assertEqual(columns[1], [1.0, 5.0])
+        self.assertEqual(columns[2], [0.0, 0.0])
+        self.assertEqual(columns[3], [1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
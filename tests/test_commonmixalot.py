@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# commonmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import commonmixalot as cmn
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ParseFrameRangesTest(unittest.TestCase):
+
+    def test_SortedRanges(self):
+        self.assertEqual(cmn.ParseFrameRanges(" 150-300, 1-120 ,, 121-121"), [(1, 120), (121, 121), (150, 300)])
+
+    def test_Empty(self):
+        self.assertEqual(cmn.ParseFrameRanges(""), [])
+        self.assertEqual(cmn.ParseFrameRanges(" , "), [])
+
+    def test_MalformedRangesRaise(self):
+        for frameRangesText in ("1", "1-2-3", "a-10", "1-", "1.5-10", "-5-10"):
+            with self.assertRaises(Exception, msg=frameRangesText):
+                cmn.ParseFrameRanges(frameRangesText)
+
+    def test_ReversedRangeRaises(self):
+        with self.assertRaisesRegex(Exception, "Start frame is greater than end frame"):
+            cmn.ParseFrameRanges("120-1")
+
+    def test_OverlappingRangesRaise(self):
+        for frameRangesText in ("1-120, 100-200", "100-200, 1-100", "1-10, 1-10", "1-300, 50-60"):
+            with self.assertRaisesRegex(Exception, "overlaps", msg=frameRangesText):
+                cmn.ParseFrameRanges(frameRangesText)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class MakeClipFilenameTest(unittest.TestCase):
+
+    def test_Filename(self):
+        self.assertEqual(cmn.MakeClipFilename("Walking.fbx", 1, 120), "Walking_1_120.fbx")
+        self.assertEqual(cmn.MakeClipFilename("Walk.Fast.FBX", 5, 5), "Walk.Fast_5_5.fbx")
+        self.assertEqual(cmn.MakeClipFilename("Walking", 0, 10), "Walking_0_10.fbx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# fcurvesmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+    import logmixalot as log
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class MisalignedLocationFCurvesTest(unittest.TestCase):
+
+    def setUp(self):
+        log.SetQuietMode(True)
+        self.sceneObj = bpy.context.scene
+        cmn.ClearSceneObjects(self.sceneObj)
+        armatureData = bpy.data.armatures.new("Armature")
+        self.armatureObj = bpy.data.objects.new("Armature", armatureData)
+        self.sceneObj.collection.objects.link(self.armatureObj)
+        bpy.context.view_layer.objects.active = self.armatureObj
+        bpy.ops.object.mode_set(mode='EDIT')
+        editBone = armatureData.edit_bones.new("Hips")
+        editBone.tail = (0.0, 0.0, 0.1)
+        bpy.ops.object.mode_set(mode='OBJECT')
+        # X and Z are keyed on every frame, Y only on frames 1, 5 and 9.
+        poseBone = self.armatureObj.pose.bones["Hips"]
+        for frame in range(1, 10):
+            poseBone.location = (float(frame), 0.5 * frame, -float(frame))
+            poseBone.keyframe_insert("location", index=0, frame=frame)
+            poseBone.keyframe_insert("location", index=2, frame=frame)
+            if frame in (1, 5, 9):
+                poseBone.keyframe_insert("location", index=1, frame=frame)
+
+    def tearDown(self):
+        cmn.ClearSceneObjects(self.sceneObj)
+        log.SetQuietMode(False)
+
+    def test_ReadModifyWriteStaysAligned(self):
+        locations = fcv.GetPoseBoneLocalLocationsFromFcurves(self.armatureObj, "Hips")
+        self.assertEqual(len(locations), 9)
+        self.assertTrue(fcv.ArePoseBoneFCurvesAligned(self.armatureObj, "Hips"))
+        fcv.SetLocationDataForPoseBoneKeyFrames(self.armatureObj, "Hips", [2.0 * location for location in locations])
+        fcurves = fcv.GetPoseBoneFCurves(self.armatureObj, "Hips", fcv.LOCATION_DATA_PATHS)
+        for frame in range(1, 10):
+            self.assertAlmostEqual(fcurves[0].evaluate(frame), 2.0 * frame, places=4)
+            self.assertAlmostEqual(fcurves[1].evaluate(frame), 1.0 * frame, places=4)
+            self.assertAlmostEqual(fcurves[2].evaluate(frame), -2.0 * frame, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# featuredbmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+# Only its pure Python parts are tested, no scene is used.
+import math
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import featuredbmixalot as fdb
+
+
+def _MakeRandomClips(clipCount: int, frameCount: int, dimension: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [fdb.FeatureClip(f"clip{clipIndex}", 10 * clipIndex,
+                            [[rng.gauss(0.0, 1.0 + dim) for dim in range(dimension)] for _ in range(frameCount)])
+            for clipIndex in range(clipCount)]
+
+
+def _BruteForceSearch(features, dimension: int, frameCount: int, query: list[float], count: int) -> list:
+    distances = []
+    for row in range(frameCount):
+        distance = sum((features[row * dimension + dim] - query[dim]) ** 2 for dim in range(dimension))
+        distances.append((distance, row))
+    return sorted(distances)[:count]
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ComputeClipFeaturesTest(unittest.TestCase):
+
+    def test_DimensionAndRootSpace(self):
+        frameCount = 30
+        fps = 30.0
+        # The root walks along world X, facing +X (yaw -90 degrees, the forward vector is Y).
+        rootPositions = [[0.1 * frame, 0.0, 0.0] for frame in range(frameCount)]
+        rootYaws = [-0.5 * math.pi] * frameCount
+        footPositions = [[[0.1 * frame + 0.2, 0.0, 0.0] for frame in range(frameCount)],
+                         [[0.1 * frame, 0.3, 0.0] for frame in range(frameCount)]]
+        hipPositions = [[0.1 * frame, 0.0, 1.0] for frame in range(frameCount)]
+        rows = fdb.ComputeClipFeatures(rootPositions, rootYaws, footPositions, hipPositions, fps)
+        self.assertEqual(len(rows), frameCount)
+        dimension = fdb.GetFeatureDimension(2)
+        self.assertTrue(all(len(row) == dimension for row in rows))
+        row = rows[10]
+        # The first foot is 0.2 ahead of the root.
+        for value, expected in zip(row[0:3], (0.0, 0.2, 0.0)):
+            self.assertAlmostEqual(value, expected, places=6)
+        # The hip moves forward at 3 units per second.
+        for value, expected in zip(row[12:15], (0.0, 3.0, 0.0)):
+            self.assertAlmostEqual(value, expected, places=6)
+        # Future trajectory point at +0.333s, 10 frames ahead, same facing.
+        trajectory = row[15 + 4:15 + 8]
+        for value, expected in zip(trajectory, (0.0, 1.0, 0.0, 1.0)):
+            self.assertAlmostEqual(value, expected, places=6)
+
+    def test_TrajectoryIsClampedToTheClip(self):
+        frameCount = 5
+        rootPositions = [[0.0, 0.1 * frame, 0.0] for frame in range(frameCount)]
+        rows = fdb.ComputeClipFeatures(rootPositions, [0.0] * frameCount, [], rootPositions, 30.0,
+                                       trajectoryTimes=(-1.0, 1.0))
+        self.assertEqual(len(rows[0]), fdb.GetFeatureDimension(0, (-1.0, 1.0)))
+        # At the last frame, the future point is the last frame itself.
+        for value, expected in zip(rows[-1][3 + 4:3 + 8], (0.0, 0.0, 0.0, 1.0)):
+            self.assertAlmostEqual(value, expected, places=6)
+        # At the first frame, the past point is the first frame itself.
+        for value, expected in zip(rows[0][3:3 + 4], (0.0, 0.0, 0.0, 1.0)):
+            self.assertAlmostEqual(value, expected, places=6)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class FeatureDatabaseTest(unittest.TestCase):
+
+    def test_NormalizedFeatures(self):
+        database = fdb.BuildFeatureDatabase(_MakeRandomClips(3, 50, 5, 1), 30.0)
+        self.assertEqual(database.frameCount, 150)
+        self.assertEqual(database.dimension, 5)
+        for dim in range(database.dimension):
+            values = database.features[dim::database.dimension]
+            self.assertAlmostEqual(sum(values) / len(values), 0.0, places=4)
+        self.assertEqual(database.clips[2], ("clip2", 100, 50, 20))
+
+    def test_EmptyDatabaseRaises(self):
+        with self.assertRaises(Exception):
+            fdb.BuildFeatureDatabase([], 30.0)
+
+    def test_SearchMatchesBruteForce(self):
+        dimension = 6
+        for leafSize in (1, 4, fdb.DEFAULT_LEAF_SIZE, 1000):
+            database = fdb.BuildFeatureDatabase(_MakeRandomClips(4, 60, dimension, leafSize), 30.0, leafSize)
+            rng = random.Random(leafSize)
+            for _ in range(20):
+                query = [rng.gauss(0.0, 1.5) for _ in range(dimension)]
+                for count in (1, 5):
+                    result = fdb.SearchKdTree(database.features, dimension, database.frameCount, database.kdOrder,
+                        database.kdSplitDims, database.kdSplitValues, leafSize, query, count)
+                    expected = _BruteForceSearch(database.features, dimension, database.frameCount, query, count)
+                    self.assertEqual([row for _, row in result], [row for _, row in expected])
+                    for (distance, _), (expectedDistance, _) in zip(result, expected):
+                        self.assertAlmostEqual(distance, expectedDistance, places=5)
+
+    def test_SearchFindsExactRow(self):
+        clips = _MakeRandomClips(2, 40, 4, 5)
+        database = fdb.BuildFeatureDatabase(clips, 30.0, leafSize=2)
+        distance, row = database.Search(clips[1].rows[7])[0]
+        self.assertEqual(row, 47)
+        self.assertAlmostEqual(distance, 0.0, places=6)
+
+    def test_WriteReadRoundTrip(self):
+        clips = _MakeRandomClips(3, 25, 7, 9)
+        database = fdb.BuildFeatureDatabase(clips, 24.0, leafSize=4)
+        with tempfile.TemporaryDirectory() as directory:
+            filePath = os.path.join(directory, "features.lmxfeats")
+            fdb.WriteFeatureDatabase(filePath, database)
+            reader = fdb.FeatureDatabaseReader(filePath)
+            with reader:
+                self.assertEqual(reader.dimension, database.dimension)
+                self.assertEqual(reader.frameCount, database.frameCount)
+                self.assertEqual(reader.clipCount, len(clips))
+                self.assertEqual(reader.leafSize, 4)
+                self.assertAlmostEqual(reader.fps, 24.0)
+                self.assertEqual(list(reader.means), list(database.means))
+                self.assertEqual(list(reader.stds), list(database.stds))
+                self.assertEqual(list(reader.features), list(database.features))
+                self.assertEqual(list(reader.kdOrder), list(database.kdOrder))
+                self.assertEqual(list(reader.kdSplitDims), list(database.kdSplitDims))
+                self.assertEqual(list(reader.kdSplitValues), list(database.kdSplitValues))
+                for clipIndex, clip in enumerate(database.clips):
+                    self.assertEqual(reader.GetClip(clipIndex), clip)
+                self.assertEqual(reader.GetClipFrame(30), ("clip1", 10 + 5))
+                query = clips[2].rows[3]
+                self.assertEqual(reader.Search(query, 3), database.Search(query, 3))
+            # Closing releases the mapped file.
+            with self.assertRaises(ValueError):
+                reader.features[0]
+            with self.assertRaises(Exception):
+                fdb.FeatureDatabaseReader(os.path.join(directory, "missing.lmxfeats"))
+
+
+if __name__ == "__main__":
+    unittest.main()
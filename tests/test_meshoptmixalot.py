@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# meshoptmixalot doesn't depend on bpy, these tests run with any Python:
+#   python -m unittest discover -s tests
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import meshoptmixalot as mopt
+
+
+def _MakeGridIndices(columns: int, rows: int) -> list[int]:
+    """
+    Triangle list of a grid of @columns x @rows quads, two triangles per quad,
+    in row order. The grid has (columns + 1) * (rows + 1) vertices.
+    """
+    indices = []
+    for row in range(rows):
+        for column in range(columns):
+            v0 = row * (columns + 1) + column
+            v1 = v0 + 1
+            v2 = v0 + columns + 1
+            v3 = v2 + 1
+            indices.extend((v0, v1, v2, v2, v1, v3))
+    return indices
+
+
+def _ShuffleTriangles(indices: list[int], seed: int) -> list[int]:
+    drawOrder = list(range(len(indices) // 3))
+    random.Random(seed).shuffle(drawOrder)
+    return mopt.ReorderTriangles(indices, drawOrder)
+
+
+def _GetTriangles(indices: list[int]) -> list[tuple]:
+    return sorted(tuple(indices[base:base + 3]) for base in range(0, len(indices), 3))
+
+
+class OptimizeTriangleOrderTest(unittest.TestCase):
+
+    def _CheckDrawOrder(self, indices: list[int], vertexCount: int) -> list[int]:
+        drawOrder = mopt.OptimizeTriangleOrder(indices, vertexCount)
+        self.assertEqual(sorted(drawOrder), list(range(len(indices) // 3)))
+        newIndices = mopt.ReorderTriangles(indices, drawOrder)
+        self.assertEqual(_GetTriangles(newIndices), _GetTriangles(indices))
+        return newIndices
+
+    def test_EmptyMesh(self):
+        self.assertEqual(mopt.OptimizeTriangleOrder([], 0), [])
+        self.assertEqual(mopt.CalculateACMR([]), 0.0)
+
+    def test_GridIsPermutationAndACMRDoesNotGetWorse(self):
+        columns, rows = 40, 40
+        vertexCount = (columns + 1) * (rows + 1)
+        for indices in (_MakeGridIndices(columns, rows), _ShuffleTriangles(_MakeGridIndices(columns, rows), 7)):
+            newIndices = self._CheckDrawOrder(indices, vertexCount)
+            self.assertLessEqual(mopt.CalculateACMR(newIndices), mopt.CalculateACMR(indices))
+
+    def test_ShuffledGridACMRImproves(self):
+        indices = _ShuffleTriangles(_MakeGridIndices(40, 40), 11)
+        newIndices = self._CheckDrawOrder(indices, 41 * 41)
+        self.assertLess(mopt.CalculateACMR(newIndices), 0.8 * mopt.CalculateACMR(indices))
+
+    def test_ManyIslands(self):
+        # Every triangle is its own island, each one is a dead end.
+        triangleCount = 5000
+        indices = list(range(triangleCount * 3))
+        newIndices = self._CheckDrawOrder(indices, len(indices))
+        self.assertAlmostEqual(mopt.CalculateACMR(newIndices), 3.0)
+
+
+class CalculateACMRTest(unittest.TestCase):
+
+    def test_Bounds(self):
+        indices = _MakeGridIndices(10, 10)
+        acmr = mopt.CalculateACMR(indices)
+        self.assertGreaterEqual(acmr, 0.5)
+        self.assertLessEqual(acmr, 3.0)
+
+    def test_SharedVertexIsCached(self):
+        # The second triangle only adds one new vertex.
+        self.assertEqual(mopt.CalculateACMR([0, 1, 2, 2, 1, 3]), 2.0)
+
+    def test_SmallCacheEvicts(self):
+        indices = [0, 1, 2, 3, 4, 5, 0, 1, 2]
+        self.assertEqual(mopt.CalculateACMR(indices, cacheSize=32), 2.0)
+        self.assertEqual(mopt.CalculateACMR(indices, cacheSize=3), 3.0)
+
+
+class OptimizeVertexFetchOrderTest(unittest.TestCase):
+
+    def test_RemapIsPermutationInFirstUseOrder(self):
+        indices = _ShuffleTriangles(_MakeGridIndices(8, 8), 3)
+        vertexCount = 9 * 9 + 5  # 5 unreferenced vertices.
+        remap = mopt.OptimizeVertexFetchOrder(indices, vertexCount)
+        self.assertEqual(sorted(remap), list(range(vertexCount)))
+        newIndices = [remap[vertexIndex] for vertexIndex in indices]
+        firstUses = []
+        for vertexIndex in newIndices:
+            if vertexIndex not in firstUses:
+                firstUses.append(vertexIndex)
+        self.assertEqual(firstUses, list(range(len(firstUses))))
+        # Unreferenced vertices go to the end.
+        self.assertEqual(len(firstUses), 9 * 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
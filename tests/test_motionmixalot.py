@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# motionmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import commonmixalot as cmn
+    import logmixalot as log
+    import motionmixalot as motion
+
+
+def _Drain(statusIterator):
+    for _ in statusIterator:
+        pass
+
+
+def _CreateWalkingArmature(sceneObj, name: str, speed: float, frameCount: int):
+    """
+    Armature with a single "Hips" bone that walks @speed units per frame,
+    with one key frame per frame in its own action.
+    """
+    armatureData = bpy.data.armatures.new(name)
+    armatureObj = bpy.data.objects.new(name, armatureData)
+    sceneObj.collection.objects.link(armatureObj)
+    bpy.context.view_layer.objects.active = armatureObj
+    bpy.ops.object.mode_set(mode='EDIT')
+    editBone = armatureData.edit_bones.new("Hips")
+    editBone.head = (0.0, 0.0, 1.0)
+    editBone.tail = (0.0, 0.0, 1.1)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    poseBone = armatureObj.pose.bones["Hips"]
+    poseBone.rotation_mode = 'QUATERNION'
+    for frame in range(1, frameCount + 1):
+        poseBone.location = (0.0, 0.0, -speed * frame)
+        poseBone.keyframe_insert("location", frame=frame)
+        poseBone.keyframe_insert("rotation_quaternion", frame=frame)
+    return armatureObj
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ExtractRootMotionFromArmaturesTest(unittest.TestCase):
+
+    def setUp(self):
+        log.SetQuietMode(True)
+        self.sceneObj = bpy.context.scene
+        cmn.ClearSceneObjects(self.sceneObj)
+        self.sceneObj.render.fps = 30
+        self.sceneObj.render.fps_base = 1.0
+
+    def tearDown(self):
+        cmn.ClearSceneObjects(self.sceneObj)
+        log.SetQuietMode(False)
+
+    def test_RetimesEveryAction(self):
+        armatureObjs = [_CreateWalkingArmature(self.sceneObj, "WalkerA", 0.04, 31),
+                        _CreateWalkingArmature(self.sceneObj, "WalkerB", 0.02, 31)]
+        actions = [armatureObj.animation_data.action for armatureObj in armatureObjs]
+        self.assertNotEqual(actions[0], actions[1])
+        _Drain(motion.ExtractRootMotionFromArmatures(self.sceneObj, armatureObjs, ["Hips", "Hips"],
+            True, True, False, False, targetFps=15))
+        self.assertAlmostEqual(cmn.GetSceneFps(self.sceneObj), 15.0)
+        # One second at 15 fps, from frame 1.
+        for action in actions:
+            for fcurve in action.fcurves:
+                self.assertEqual(len(fcurve.keyframe_points), 16, f"{action.name} {fcurve.data_path}")
+                self.assertAlmostEqual(fcurve.keyframe_points[-1].co[0], 16.0)
+        self.assertEqual((self.sceneObj.frame_start, self.sceneObj.frame_end), (1, 16))
+
+
+def _YawQuaternion(yaw: float) -> tuple:
+    return (math.cos(0.5 * yaw), 0.0, 0.0, math.sin(0.5 * yaw))
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class BuildRootMotionMetadataFromSamplesTest(unittest.TestCase):
+
+    def test_StraightWalk(self):
+        frames = [float(frame) for frame in range(1, 32)]
+        locations = [(0.0, 0.05 * index, 0.0) for index in range(31)]
+        quaternions = [_YawQuaternion(0.0)] * 31
+        metadata = motion.BuildRootMotionMetadataFromSamples(frames, locations, quaternions, 30.0)
+        self.assertEqual((metadata["startFrame"], metadata["endFrame"], metadata["keyFrameCount"]), (1.0, 31.0, 31))
+        self.assertAlmostEqual(metadata["duration"], 1.0)
+        self.assertAlmostEqual(metadata["distance"], 1.5)
+        self.assertAlmostEqual(metadata["averageSpeed"], 1.5)
+        self.assertAlmostEqual(metadata["totalYawChange"], 0.0)
+        self.assertEqual([(segment["startFrame"], segment["endFrame"]) for segment in metadata["segments"]],
+                         [(1.0, 8.0), (8.0, 16.0), (16.0, 23.0), (23.0, 31.0)])
+        for segment in metadata["segments"]:
+            self.assertAlmostEqual(segment["speed"], 1.5)
+            self.assertAlmostEqual(segment["velocity"][1], 1.5)
+        # Every third frame at 10 samples per second, the last frame included.
+        trajectory = metadata["trajectory"]
+        self.assertEqual(len(trajectory), 11)
+        self.assertAlmostEqual(trajectory[-1][0], 1.0)
+        self.assertAlmostEqual(trajectory[-1][2], 1.5)
+
+    def test_UnwrapsYaw(self):
+        # Two full turns, in steps smaller than PI that wrap around at +-PI.
+        yaws = [0.5 * math.pi * index for index in range(9)]
+        frames = [float(frame) for frame in range(1, 10)]
+        metadata = motion.BuildRootMotionMetadataFromSamples(frames, [(0.0, 0.0, 0.0)] * 9,
+                                                             [_YawQuaternion(yaw) for yaw in yaws], 8.0)
+        self.assertAlmostEqual(metadata["totalYawChange"], 4.0 * math.pi)
+        self.assertAlmostEqual(metadata["loopDelta"]["yaw"], 4.0 * math.pi)
+        for point, yaw in zip(metadata["trajectory"], yaws):
+            self.assertAlmostEqual(point[4], yaw)
+        for segment in metadata["segments"]:
+            self.assertAlmostEqual(segment["yawRate"], 4.0 * math.pi)
+
+    def test_LoopDeltaIsInTheStartSpace(self):
+        # Facing -X, walks 2 meters forward and goes up half a meter.
+        frames = [1.0, 2.0, 3.0]
+        locations = [(1.0, 1.0, 0.0), (0.0, 1.0, 0.25), (-1.0, 1.0, 0.5)]
+        quaternions = [_YawQuaternion(0.5 * math.pi)] * 3
+        metadata = motion.BuildRootMotionMetadataFromSamples(frames, locations, quaternions, 30.0)
+        for value, expectedValue in zip(metadata["displacement"], [-2.0, 0.0, 0.5]):
+            self.assertAlmostEqual(value, expectedValue)
+        for value, expectedValue in zip(metadata["loopDelta"]["location"], [0.0, 2.0, 0.5]):
+            self.assertAlmostEqual(value, expectedValue)
+        self.assertAlmostEqual(metadata["start"]["yaw"], 0.5 * math.pi)
+
+    def test_SingleKeyFrame(self):
+        metadata = motion.BuildRootMotionMetadataFromSamples([5.0], [(1.0, 2.0, 3.0)], [_YawQuaternion(0.0)], 30.0)
+        self.assertEqual(metadata["duration"], 0.0)
+        self.assertEqual(metadata["averageSpeed"], 0.0)
+        self.assertEqual(len(metadata["segments"]), 1)
+        self.assertEqual(metadata["segments"][0]["velocity"], [0.0, 0.0, 0.0])
+        self.assertEqual(metadata["trajectory"], [[0.0, 1.0, 2.0, 3.0, 0.0]])
+
+    def test_NoKeyFramesRaises(self):
+        with self.assertRaises(Exception):
+            motion.BuildRootMotionMetadataFromSamples([], [], [], 30.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# Checks the synthetic clips against the golden files in tests/golden.
+# regressionmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+# After an intended change of the output, record the golden files again with:
+#   blender -b -P regressionmixalot.py -- --update
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import logmixalot as log
+    import regressionmixalot as regression
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class GoldenFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        log.SetQuietMode(True)
+
+    def tearDown(self):
+        log.SetQuietMode(False)
+
+    def test_SyntheticClipsMatchTheirGoldenFiles(self):
+        clips = regression.GetSyntheticClips()
+        self.assertTrue(clips)
+        regressionIterator = regression.RunRegression(bpy.context.scene, regression.DEFAULT_GOLDEN_DIRECTORY, clips)
+        try:
+            while True:
+                next(regressionIterator)
+        except StopIteration as result:
+            failedList = result.value
+        self.assertEqual(failedList, [], "\n".join(f"{clipName}: {message}" for clipName, message in failedList))
+
+
+if __name__ == "__main__":
+    unittest.main()
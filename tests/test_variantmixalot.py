@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+# variantmixalot needs bpy, these tests are skipped unless the bpy module is installed:
+#   python -m unittest discover -s tests
+# Only the track transforms are tested, no scene is used.
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    import variantmixalot as variant
+
+
+def _BonePath(boneName: str, propertyName: str) -> str:
+    return f'pose.bones["{boneName}"].{propertyName}'
+
+
+def _AssertSamplesAlmostEqual(testCase, samples: list[tuple], expectedSamples: list[tuple]):
+    testCase.assertEqual(len(samples), len(expectedSamples))
+    for sample, expectedSample in zip(samples, expectedSamples):
+        for value, expectedValue in zip(sample, expectedSample):
+            testCase.assertAlmostEqual(value, expectedValue, places=5)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class ParseClipVariantsTest(unittest.TestCase):
+
+    def test_Parse(self):
+        clipVariants = variant.ParseClipVariants(" mirror, speed:1.5 ,, Mirror + turn:-45")
+        self.assertEqual([clipVariant.GetName() for clipVariant in clipVariants],
+                         ["mirror", "speed150", "mirror_turnR45"])
+        self.assertTrue(clipVariants[2].mirror)
+        self.assertEqual(clipVariants[2].turnDegreesPerSecond, -45.0)
+        self.assertEqual(variant.ParseClipVariants(""), [])
+        self.assertEqual(variant.ClipVariant().GetName(), "copy")
+        self.assertEqual(variant.ClipVariant(turnDegreesPerSecond=30.0).GetName(), "turnL30")
+
+    def test_InvalidVariantsRaise(self):
+        for variantsText in ("jump", "speed", "speed:fast", "speed:0", "speed:-1", "mirror:1", "turn:"):
+            with self.assertRaises(Exception, msg=variantsText):
+                variant.ParseClipVariants(variantsText)
+
+    def test_Filename(self):
+        self.assertEqual(variant.MakeClipVariantFilename("Walking.fbx", variant.ClipVariant(mirror=True)),
+                         "Walking_mirror.fbx")
+
+    def test_MirroredBoneNames(self):
+        self.assertEqual(variant.GetMirroredBoneName("mixamorig:LeftArm"), "mixamorig:RightArm")
+        self.assertEqual(variant.GetMirroredBoneName("mixamorig:RightUpLeg"), "mixamorig:LeftUpLeg")
+        self.assertEqual(variant.GetMirroredBoneName("hand.L"), "hand.R")
+        self.assertEqual(variant.GetMirroredBoneName("foot_r"), "foot_l")
+        self.assertEqual(variant.GetMirroredBoneName("mixamorig:Hips"), "mixamorig:Hips")
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class MirrorTracksTest(unittest.TestCase):
+
+    def test_SwapsSidesAndNegates(self):
+        frames = [1.0, 2.0]
+        tracks = {
+            _BonePath("LeftArm", "location"): variant.ChannelTrack(frames, [(1.0, 2.0, 3.0)] * 2, [0, 1, 2], False),
+            _BonePath("RightArm", "location"): variant.ChannelTrack(frames, [(4.0, 5.0, 6.0)] * 2, [0, 1, 2], False),
+            _BonePath("LeftHand", "rotation_quaternion"): variant.ChannelTrack(frames,
+                [(0.5, 0.5, 0.5, 0.5)] * 2, [0, 1, 2, 3], True),
+            "location": variant.ChannelTrack(frames, [(1.0, 1.0, 0.0), (2.0, 3.0, 0.0)], [0, 1, 2], False),
+        }
+        mirroredTracks = variant.MirrorTracks(tracks)
+        self.assertEqual(sorted(mirroredTracks), sorted(tracks))
+        self.assertEqual(mirroredTracks[_BonePath("RightArm", "location")].samples, [(-1.0, 2.0, 3.0)] * 2)
+        self.assertEqual(mirroredTracks[_BonePath("LeftArm", "location")].samples, [(-4.0, 5.0, 6.0)] * 2)
+        # The other hand isn't animated, it is mirrored in place.
+        self.assertEqual(mirroredTracks[_BonePath("LeftHand", "rotation_quaternion")].samples,
+                         [(0.5, 0.5, -0.5, -0.5)] * 2)
+        self.assertEqual(mirroredTracks["location"].samples, [(-1.0, 1.0, 0.0), (-2.0, 3.0, 0.0)])
+        # Mirroring twice is the identity.
+        self.assertEqual(variant.MirrorTracks(mirroredTracks)[_BonePath("LeftArm", "location")].samples,
+                         tracks[_BonePath("LeftArm", "location")].samples)
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class RetimeTracksTest(unittest.TestCase):
+
+    def test_TwiceAsFast(self):
+        frames = [float(frame) for frame in range(1, 12)]
+        tracks = {"location": variant.ChannelTrack(frames, [(frame, 0.0, 0.0) for frame in frames], [0, 1, 2], False)}
+        retimedTracks = variant.RetimeTracks(tracks, 2.0)
+        track = retimedTracks["location"]
+        self.assertEqual(list(track.frames), [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        _AssertSamplesAlmostEqual(self, track.samples, [(frame, 0.0, 0.0) for frame in (1.0, 3.0, 5.0, 7.0, 9.0, 11.0)])
+
+    def test_HalfSpeedSlerpsQuaternions(self):
+        halfAngle = 0.25 * math.pi
+        tracks = {"rotation_quaternion": variant.ChannelTrack([1.0, 2.0],
+            [(1.0, 0.0, 0.0, 0.0), (math.cos(halfAngle), 0.0, 0.0, math.sin(halfAngle))], [0, 1, 2, 3], True)}
+        track = variant.RetimeTracks(tracks, 0.5)["rotation_quaternion"]
+        self.assertEqual(list(track.frames), [1.0, 2.0, 3.0])
+        middle = 0.5 * halfAngle
+        _AssertSamplesAlmostEqual(self, track.samples[1:2], [(math.cos(middle), 0.0, 0.0, math.sin(middle))])
+
+
+@unittest.skipIf(bpy is None, "Requires bpy")
+class AddTurnRateToTracksTest(unittest.TestCase):
+
+    def test_BendsThePathAndTurnsTheRoot(self):
+        frames = [1.0, 2.0, 3.0]
+        tracks = {"location": variant.ChannelTrack(frames, [(0.0, 0.0, 0.5), (0.0, 1.0, 0.5), (0.0, 2.0, 0.5)],
+                                                   [0, 1, 2], False)}
+        # A quarter turn per frame, to the left.
+        turnedTracks = variant.AddTurnRateToTracks(tracks, 0.5 * math.pi, 1.0)
+        _AssertSamplesAlmostEqual(self, turnedTracks["location"].samples,
+                                  [(0.0, 0.0, 0.5), (-1.0, 0.0, 0.5), (-1.0, -1.0, 0.5)])
+        quaternionTrack = turnedTracks["rotation_quaternion"]
+        self.assertTrue(quaternionTrack.isQuaternion)
+        halfAngles = [0.0, 0.25 * math.pi, 0.5 * math.pi]
+        _AssertSamplesAlmostEqual(self, quaternionTrack.samples,
+                                  [(math.cos(angle), 0.0, 0.0, math.sin(angle)) for angle in halfAngles])
+        # The source tracks are not modified.
+        self.assertEqual(tracks["location"].samples[1], (0.0, 1.0, 0.5))
+        self.assertNotIn("rotation_quaternion", tracks)
+
+    def test_NoRootMotion(self):
+        tracks = {_BonePath("Hips", "location"): variant.ChannelTrack([1.0], [(0.0, 0.0, 0.0)], [0, 1, 2], False)}
+        self.assertIs(variant.AddTurnRateToTracks(tracks, 1.0, 30.0), tracks)
+
+    def test_WarnsIfThePathCanNotBeBent(self):
+        frames = [1.0, 2.0]
+        tracks = {"location": variant.ChannelTrack(frames, [(0.0, 0.0), (1.0, 0.0)], [0, 2], False)}
+        with self.assertLogs(variant._logger, level="WARNING"):
+            turnedTracks = variant.AddTurnRateToTracks(tracks, 1.0, 30.0)
+        self.assertIs(turnedTracks["location"], tracks["location"])
+        self.assertIn("rotation_quaternion", turnedTracks)
+
+
+if __name__ == "__main__":
+    unittest.main()
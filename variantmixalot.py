@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Clip variants: mirrored, retimed and turning copies of a processed motion.
+# All the channels of the action are read once with bulk reads, each variant is
+# computed on those arrays and written to a copy of the action with bulk writes.
+# The scene is not re-evaluated per frame.
+import math
+import os
+import re
+
+import bpy
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script from Blender Text View "Run Script"
+    from commonmixalot import Status
+    import commonmixalot as cmn
+    import fcurvesmixalot as fcv
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from .commonmixalot import Status
+    from . import commonmixalot as cmn
+    from . import fcurvesmixalot as fcv
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+# Data path of the root motion channels, they are in the armature object.
+ROOT_LOCATION_DATA_PATH = "location"
+ROOT_QUATERNION_DATA_PATH = "rotation_quaternion"
+
+_POSE_BONE_DATA_PATH_RE = re.compile(r'^pose\.bones\["(.+)"\]\.(\w+)$')
+
+# Bone name suffixes of the non Mixamo naming conventions, as (left, right).
+_MIRROR_SUFFIXES = ((".L", ".R"), ("_L", "_R"), (".l", ".r"), ("_l", "_r"))
+
+# Per property, the array indices that are negated when mirroring across the
+# YZ plane. Same convention as "Paste Flipped Pose" in Blender.
+_MIRROR_NEGATED_INDICES = {
+    "location": (0,),
+    "rotation_quaternion": (2, 3),
+    "rotation_axis_angle": (2, 3),
+    "rotation_euler": (1, 2),
+}
+
+
+class ClipVariant:
+    """
+    Settings of a variant of a motion. The transformations are applied in
+    this order: mirror, speed, turn.
+    @mirror If True, the left and right sides of the motion are swapped.
+    @speed Playback speed factor. 2.0 is twice as fast, so half the frames.
+    @turnDegreesPerSecond Constant turn rate, around the Z axis, added to the root motion.
+        Positive values turn left (counter clockwise seen from above).
+    """
+    def __init__(self, mirror: bool = False, speed: float = 1.0, turnDegreesPerSecond: float = 0.0):
+        self.mirror = mirror
+        self.speed = speed
+        self.turnDegreesPerSecond = turnDegreesPerSecond
+
+    def GetName(self) -> str:
+        """
+        Returns the name of the variant, used as the suffix of its file name.
+        Example: ClipVariant(mirror=True, speed=1.5) -> "mirror_speed150"
+        """
+        parts = []
+        if self.mirror:
+            parts.append("mirror")
+        if not math.isclose(self.speed, 1.0):
+            parts.append(f"speed{round(self.speed * 100)}")
+        if not math.isclose(self.turnDegreesPerSecond, 0.0, abs_tol=0.01):
+            side = "L" if self.turnDegreesPerSecond > 0.0 else "R"
+            parts.append(f"turn{side}{abs(self.turnDegreesPerSecond):g}")
+        return "_".join(parts) if parts else "copy"
+
+
+def ParseClipVariants(variantsText: str) -> list[ClipVariant]:
+    """
+    Parses a comma separated list of clip variants. Each variant is one or more
+    terms joined with '+'. The terms are "mirror", "speed:<factor>" and
+    "turn:<degreesPerSecond>".
+    Example: "mirror, speed:1.5, mirror+turn:-45"
+    Returns an empty list if @variantsText is empty.
+    Raises an exception if a variant is malformed.
+    """
+    clipVariants = []
+    for variantText in variantsText.split(","):
+        variantText = variantText.strip()
+        if variantText == "":
+            continue
+        clipVariant = ClipVariant()
+        for term in variantText.split("+"):
+            name, _, valueText = term.strip().partition(":")
+            name = name.strip().lower()
+            if name == "mirror" and valueText == "":
+                clipVariant.mirror = True
+                continue
+            if name not in ("speed", "turn"):
+                raise Exception(f"Invalid clip variant '{variantText}'. Expected 'mirror', 'speed:<factor>' or 'turn:<degreesPerSecond>'")
+            try:
+                value = float(valueText)
+            except ValueError:
+                raise Exception(f"Invalid clip variant '{variantText}'. '{name}' requires a number")
+            if name == "speed":
+                if value <= 0.0:
+                    raise Exception(f"Invalid clip variant '{variantText}'. The speed must be greater than 0")
+                clipVariant.speed = value
+            else:
+                clipVariant.turnDegreesPerSecond = value
+        clipVariants.append(clipVariant)
+    return clipVariants
+
+
+def MakeClipVariantFilename(fbxFilename: str, clipVariant: ClipVariant) -> str:
+    """
+    Returns the file name of @clipVariant of @fbxFilename.
+    Example: "Walking.fbx" -> "Walking_mirror.fbx"
+    """
+    name, _ = os.path.splitext(fbxFilename)
+    return f"{name}_{clipVariant.GetName()}.fbx"
+
+
+def GetMirroredBoneName(boneName: str) -> str:
+    """
+    Returns the name of the bone at the other side of @boneName.
+    Mixamo names, e.g. "mixamorig:LeftArm" <-> "mixamorig:RightArm", and the
+    .L/.R and _L/_R suffixes are supported. Returns @boneName for center bones.
+    """
+    if "Left" in boneName:
+        return boneName.replace("Left", "Right")
+    if "Right" in boneName:
+        return boneName.replace("Right", "Left")
+    for leftSuffix, rightSuffix in _MIRROR_SUFFIXES:
+        if boneName.endswith(leftSuffix):
+            return boneName[:-len(leftSuffix)] + rightSuffix
+        if boneName.endswith(rightSuffix):
+            return boneName[:-len(rightSuffix)] + leftSuffix
+    return boneName
+
+
+class ChannelTrack:
+    """
+    The key frames of all the fcurves of one property (data_path).
+    @frames Frame numbers.
+    @samples One tuple per frame, with one value per fcurve.
+    @arrayIndices The array_index of each fcurve, sorted.
+    @isQuaternion True if @samples are (w, x, y, z) quaternions.
+    """
+    def __init__(self, frames: list[float], samples: list[tuple], arrayIndices: list[int], isQuaternion: bool):
+        self.frames = frames
+        self.samples = samples
+        self.arrayIndices = arrayIndices
+        self.isQuaternion = isQuaternion
+
+
+def ReadActionTracks(action: bpy.types.Action) -> dict[str, ChannelTrack]:
+    """
+    Bulk read of all the fcurves of @action.
+    Returns a dictionary data_path -> ChannelTrack.
+    """
+    tracks = {}
+    for fcurves, isQuaternion in fcv._GroupActionFCurves(action):
+        frames, samples = fcv.GetChannelKeyFrames(fcurves, isQuaternion)
+        tracks[fcurves[0].data_path] = ChannelTrack(frames, samples,
+            [fcurve.array_index for fcurve in fcurves], isQuaternion)
+    return tracks
+
+
+def WriteActionTracks(action: bpy.types.Action, tracks: dict[str, ChannelTrack]) -> int:
+    """
+    Bulk write of @tracks to the fcurves of @action. Missing fcurves are created.
+    Returns the number of tracks that were skipped because the existing fcurves
+    don't have the same array indices as the track.
+    """
+    groups = {fcurves[0].data_path: fcurves for fcurves, _ in fcv._GroupActionFCurves(action)}
+    skippedCount = 0
+    for dataPath, track in tracks.items():
+        fcurves = groups.get(dataPath)
+        if fcurves is None:
+            match = _POSE_BONE_DATA_PATH_RE.match(dataPath)
+            groupName = match.group(1) if match else "Object Transforms"
+            fcurves = [action.fcurves.new(dataPath, index=arrayIndex, action_group=groupName)
+                       for arrayIndex in track.arrayIndices]
+        elif [fcurve.array_index for fcurve in fcurves] != track.arrayIndices:
+            _logger.warning("Skipped '%s', the fcurves don't match the array indices %s", dataPath, track.arrayIndices)
+            skippedCount += 1
+            continue
+        fcv.SetChannelKeyFrames(fcurves, track.frames, track.samples)
+    return skippedCount
+
+
+def _MirrorSamples(propertyName: str, track: ChannelTrack) -> list[tuple]:
+    negatedIndices = _MIRROR_NEGATED_INDICES.get(propertyName, ())
+    signs = tuple(-1.0 if arrayIndex in negatedIndices else 1.0 for arrayIndex in track.arrayIndices)
+    if all(sign > 0.0 for sign in signs):
+        return track.samples
+    return [tuple(value * sign for value, sign in zip(sample, signs)) for sample in track.samples]
+
+
+def MirrorTracks(tracks: dict[str, ChannelTrack]) -> dict[str, ChannelTrack]:
+    """
+    Returns new tracks with the left and right bones swapped and all the
+    transforms mirrored across the YZ plane. The root motion channels of the
+    armature object are mirrored too.
+    """
+    mirroredTracks = {}
+    for dataPath, track in tracks.items():
+        match = _POSE_BONE_DATA_PATH_RE.match(dataPath)
+        if match:
+            boneName, propertyName = match.group(1), match.group(2)
+            mirroredDataPath = f'pose.bones["{GetMirroredBoneName(boneName)}"].{propertyName}'
+            if mirroredDataPath not in tracks:
+                # The other side isn't animated. Mirror in place.
+                mirroredDataPath = dataPath
+        else:
+            propertyName = dataPath
+            mirroredDataPath = dataPath
+        mirroredTracks[mirroredDataPath] = ChannelTrack(track.frames, _MirrorSamples(propertyName, track),
+            track.arrayIndices, track.isQuaternion)
+    return mirroredTracks
+
+
+def GetTracksFrameRange(tracks: dict[str, ChannelTrack]) -> tuple[float, float]:
+    startFrame = min(track.frames[0] for track in tracks.values() if track.frames)
+    endFrame = max(track.frames[-1] for track in tracks.values() if track.frames)
+    return startFrame, endFrame
+
+
+def RetimeTracks(tracks: dict[str, ChannelTrack], speed: float) -> dict[str, ChannelTrack]:
+    """
+    Returns new tracks that play @speed times faster. The new tracks have one
+    key frame per integer frame, starting at the same frame as @tracks.
+    Locations, scales, etc are lerped and quaternions are slerped.
+    """
+    startFrame, endFrame = GetTracksFrameRange(tracks)
+    frameCount = int((endFrame - startFrame) / speed + 1e-4) + 1
+    targetFrames = [startFrame + frameIdx for frameIdx in range(frameCount)]
+    sourceFrames = [startFrame + frameIdx * speed for frameIdx in range(frameCount)]
+    retimedTracks = {}
+    for dataPath, track in tracks.items():
+        if track.isQuaternion:
+            samples = fcv.SampleQuaternions(track.frames, track.samples, sourceFrames)
+        else:
+            channels = [fcv.SampleLinear(track.frames, [sample[channel] for sample in track.samples], sourceFrames)
+                        for channel in range(len(track.arrayIndices))]
+            samples = list(zip(*channels))
+        retimedTracks[dataPath] = ChannelTrack(targetFrames, samples, track.arrayIndices, track.isQuaternion)
+    return retimedTracks
+
+
+def _RotateQuaternionAroundZ(angle: float, quaternion: tuple) -> tuple:
+    # (cos(angle/2), 0, 0, sin(angle/2)) @ quaternion
+    rotW, rotZ = math.cos(angle * 0.5), math.sin(angle * 0.5)
+    w, x, y, z = quaternion
+    return (rotW * w - rotZ * z, rotW * x - rotZ * y, rotW * y + rotZ * x, rotW * z + rotZ * w)
+
+
+def AddTurnRateToTracks(tracks: dict[str, ChannelTrack], radiansPerSecond: float, fps: float) -> dict[str, ChannelTrack]:
+    """
+    Returns new tracks where the root motion turns around the Z axis at a
+    constant rate of @radiansPerSecond. The root translation of each frame is
+    rotated by the accumulated angle, so the path bends, and the root orientation
+    is rotated by the same angle. If the root has no quaternion channels they
+    are created, with the identity as the starting orientation.
+    The path is only bent if the root location is keyed on both X and Y, and
+    the orientation is only rotated if all its quaternion channels are keyed,
+    otherwise a warning is logged and that track is kept as is.
+    Returns @tracks if there is no root motion.
+    """
+    locationTrack = tracks.get(ROOT_LOCATION_DATA_PATH)
+    quaternionTrack = tracks.get(ROOT_QUATERNION_DATA_PATH)
+    if locationTrack is None and quaternionTrack is None:
+        return tracks
+    turnedTracks = dict(tracks)
+    startFrame, endFrame = GetTracksFrameRange(tracks)
+    radiansPerFrame = radiansPerSecond / fps
+
+    if (locationTrack is not None) and (locationTrack.arrayIndices[:2] != [0, 1]):
+        _logger.warning("The root location is keyed on the axes %s instead of X and Y, its path is not bent by the turn",
+            locationTrack.arrayIndices)
+    elif locationTrack is not None:
+        samples = []
+        newX, newY = 0.0, 0.0
+        previousX, previousY = 0.0, 0.0
+        for sampleIdx, (frame, sample) in enumerate(zip(locationTrack.frames, locationTrack.samples)):
+            x, y = sample[0], sample[1]
+            if sampleIdx == 0:
+                newX, newY = x, y
+            else:
+                angle = (frame - startFrame) * radiansPerFrame
+                cosAngle, sinAngle = math.cos(angle), math.sin(angle)
+                deltaX, deltaY = x - previousX, y - previousY
+                newX += cosAngle * deltaX - sinAngle * deltaY
+                newY += sinAngle * deltaX + cosAngle * deltaY
+            previousX, previousY = x, y
+            samples.append((newX, newY) + tuple(sample[2:]))
+        turnedTracks[ROOT_LOCATION_DATA_PATH] = ChannelTrack(locationTrack.frames, samples,
+            locationTrack.arrayIndices, False)
+
+    if quaternionTrack is None:
+        frames = locationTrack.frames if locationTrack is not None else [startFrame, endFrame]
+        quaternionTrack = ChannelTrack(frames, [(1.0, 0.0, 0.0, 0.0)] * len(frames), [0, 1, 2, 3], True)
+    if not quaternionTrack.isQuaternion:
+        _logger.warning("The root orientation is keyed on the quaternion channels %s instead of all of them, it is not turned",
+            quaternionTrack.arrayIndices)
+    else:
+        samples = [_RotateQuaternionAroundZ((frame - startFrame) * radiansPerFrame, sample)
+                   for frame, sample in zip(quaternionTrack.frames, quaternionTrack.samples)]
+        turnedTracks[ROOT_QUATERNION_DATA_PATH] = ChannelTrack(quaternionTrack.frames, samples,
+            quaternionTrack.arrayIndices, True)
+    return turnedTracks
+
+
+def BuildClipVariantTracks(tracks: dict[str, ChannelTrack], clipVariant: ClipVariant, fps: float) -> dict[str, ChannelTrack]:
+    """
+    Returns the tracks of @clipVariant computed from the source @tracks.
+    """
+    if clipVariant.mirror:
+        tracks = MirrorTracks(tracks)
+    if not math.isclose(clipVariant.speed, 1.0):
+        tracks = RetimeTracks(tracks, clipVariant.speed)
+    if not math.isclose(clipVariant.turnDegreesPerSecond, 0.0, abs_tol=0.01):
+        tracks = AddTurnRateToTracks(tracks, math.radians(clipVariant.turnDegreesPerSecond), fps)
+    return tracks
+
+
+def ExportClipVariants(sceneObj: bpy.types.Scene,
+                       armatureObj: bpy.types.Armature,
+                       fbxFilename: str,
+                       fbxOutputPath: str,
+                       clipVariants: list[ClipVariant],
+                       useSelection: bool = False,
+                       exportFormat: str = cmn.EXPORT_FORMAT_FBX,
+                       exportProfile: str = cmn.EXPORT_PROFILE_DEFAULT):
+    """
+    Exports each variant in @clipVariants of the current action of @armatureObj,
+    next to the FBX named @fbxFilename, see MakeClipVariantFilename().
+    The action is read once. Each variant is written to a temporary copy of
+    the action, which is removed after exporting it.
+    The current action is not modified.
+    @useSelection If True, only the selected objects are exported.
+    @exportFormat cmn.EXPORT_FORMAT_FBX or cmn.EXPORT_FORMAT_GLB.
+    @exportProfile One of the cmn.EXPORT_PROFILE_* constants, except cmn.EXPORT_PROFILE_AUTO.
+    """
+    action = armatureObj.animation_data.action
+    if action is None:
+        raise Exception(f"The armature '{armatureObj.name}' has no action to export")
+    tracks = ReadActionTracks(action)
+    if len(tracks) < 1:
+        raise Exception(f"The action '{action.name}' has no fcurves")
+    yield Status(f"Read {len(tracks)} channels of '{action.name}' for {len(clipVariants)} clip variants")
+    fps = cmn.GetSceneFps(sceneObj)
+    previousFrameRange = (sceneObj.frame_start, sceneObj.frame_end)
+    previousRotationMode = armatureObj.rotation_mode
+    for clipVariant in clipVariants:
+        variantName = clipVariant.GetName()
+        variantTracks = BuildClipVariantTracks(tracks, clipVariant, fps)
+        variantAction = action.copy()
+        variantAction.name = f"{action.name}_{variantName}"
+        try:
+            skippedCount = WriteActionTracks(variantAction, variantTracks)
+            armatureObj.animation_data.action = variantAction
+            if ROOT_QUATERNION_DATA_PATH in variantTracks:
+                armatureObj.rotation_mode = 'QUATERNION'
+            startFrame, endFrame = GetTracksFrameRange(variantTracks)
+            sceneObj.frame_start = int(round(startFrame))
+            sceneObj.frame_end = int(round(endFrame))
+            if skippedCount > 0:
+                yield Status(f"Variant {variantName}: skipped {skippedCount} channels")
+
+            variantFilename = MakeClipVariantFilename(fbxFilename, clipVariant)
+            outputFilename = cmn._MakeFilePathForFBX(variantFilename, fbxOutputPath, exportFormat)
+            if outputFilename is None:
+                raise Exception("Undefined output filename")
+            cmn._ExportInternal(outputFilename, exportFormat, useSelection=useSelection, exportProfile=exportProfile)
+            yield Status(f"Variant {variantName}: exported '{outputFilename}' with frames {sceneObj.frame_start}-{sceneObj.frame_end}")
+        finally:
+            armatureObj.animation_data.action = action
+            armatureObj.rotation_mode = previousRotationMode
+            sceneObj.frame_start, sceneObj.frame_end = previousFrameRange
+            bpy.data.actions.remove(variantAction)
+            cmn.SetSceneFrame(sceneObj, sceneObj.frame_current)
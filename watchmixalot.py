@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2019 Galib F. Arrieta
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of 
+this software and associated documentation files (the "Software"), to deal in 
+the Software without restriction, including without limitation the rights to 
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies 
+of the Software, and to permit persons to whom the Software is furnished to do 
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all 
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE 
+SOFTWARE.
+"""
+# Watch folder daemon.
+# Polls a directory for new or changed FBX files and converts them with a
+# pool of background Blender processes that stay alive between files, this
+# way the cost of starting Blender and loading lumbermixalot is paid once.
+#
+# The daemon doesn't depend on bpy, run it with any Python 3:
+#   python watchmixalot.py --watch <dir> --output <dir> --blender <path to blender> [--workers 2]
+# Each worker is started as:
+#   blender -b -P watchmixalot.py -- --worker
+# and talks to the daemon with one json object per line:
+#   request:  {"id": 7, "input": "<fbx path>", "outputDir": "<dir>", "options": {...}}
+#   reply:    WORKER_REPLY_PREFIX {"id": 7, "ok": true, "message": "", "seconds": 1.3}
+# Blender and the add-on print to stdout too, lines without the prefix are ignored.
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+#The modules of lumbermixalot
+if __package__ is None or __package__ == "":
+    # When running as a standalone script.
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import logmixalot as log
+else:
+    # When running as an installed AddOn, then it runs in package mode.
+    from . import logmixalot as log
+
+_logger = log.GetLogger(__name__)
+
+WORKER_REPLY_PREFIX = "@@lumbermixalot@@ "
+STATUS_LOG_FILENAME = "lumbermixalot-watch-log.jsonl"
+STATE_FILENAME = ".lumbermixalot-watch-state.json"
+DEFAULT_POLL_SECONDS = 1.0
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+
+
+###############################################################################
+# Worker side, runs inside Blender.
+###############################################################################
+def WriteWorkerReply(reply: dict):
+    sys.stdout.write(WORKER_REPLY_PREFIX + json.dumps(reply) + "\n")
+    sys.stdout.flush()
+
+
+def RunWorker():
+    """
+    Worker loop. Reads requests from stdin until it is closed.
+    The log is quiet, errors are sent to the daemon in the replies.
+    """
+    import bpy
+    import batchmixalot
+
+    log.SetQuietMode(True)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if line == "":
+            continue
+        request = json.loads(line)
+        startTime = time.perf_counter()
+        reply = {"id": request["id"], "ok": True, "message": ""}
+        try:
+            inputFilePath = request["input"]
+            options = batchmixalot.BatchOptions(os.path.dirname(inputFilePath), request["outputDir"],
+                                                **request.get("options", {}))
+            for status in batchmixalot.ProcessFile(bpy.context.scene, inputFilePath, request["outputDir"], options):
+                reply["message"] = str(status)
+        except Exception as e:
+            reply["ok"] = False
+            reply["message"] = str(e)
+        reply["seconds"] = time.perf_counter() - startTime
+        WriteWorkerReply(reply)
+
+
+###############################################################################
+# Daemon side.
+###############################################################################
+class ConversionJob:
+    def __init__(self, jobId: int, relativePath: str, inputFilePath: str, outputDirectory: str, signature: tuple):
+        self.jobId = jobId
+        self.relativePath = relativePath
+        self.inputFilePath = inputFilePath
+        self.outputDirectory = outputDirectory
+        self.signature = signature
+
+
+class WorkerProcess:
+    """
+    A background Blender process. Processes one request at a time.
+    It is restarted if it dies.
+    @workerArguments Arguments of the worker script inside Blender, after "--".
+    @scriptPath The worker script. Defaults to this file.
+    """
+    def __init__(self, name: str, blenderPath: str, workerArguments: list[str] = None, scriptPath: str = None):
+        self.name = name
+        self.blenderPath = blenderPath
+        self.workerArguments = workerArguments if workerArguments else ["--worker"]
+        self.scriptPath = scriptPath if scriptPath else os.path.abspath(__file__)
+        self._process = None
+
+    def Start(self):
+        command = [self.blenderPath, "-b", "-P", self.scriptPath, "--"] + self.workerArguments
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def Stop(self):
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+    def Run(self, request: dict) -> dict:
+        """
+        Sends @request to the worker and waits for its reply.
+        """
+        if (self._process is None) or (self._process.poll() is not None):
+            self.Start()
+        try:
+            self._process.stdin.write(json.dumps(request) + "\n")
+            self._process.stdin.flush()
+            for line in self._process.stdout:
+                if line.startswith(WORKER_REPLY_PREFIX):
+                    return json.loads(line[len(WORKER_REPLY_PREFIX):])
+        except OSError:
+            pass
+        # The worker died while processing the request. It will be restarted for the next one.
+        self.Stop()
+        return {"id": request["id"], "ok": False, "message": f"Worker {self.name} died", "seconds": 0.0}
+
+
+class FolderWatcher:
+    """
+    Finds FBX files that are new or changed since they were last converted.
+    A file is only reported once its size and modification time didn't change
+    for @debounceSeconds, this way files that are still being copied are ignored.
+    """
+    def __init__(self, watchDirectory: str, debounceSeconds: float, processedSignatures: dict,
+                 excludedDirectory: str = None):
+        self.watchDirectory = watchDirectory
+        # The output directory may be inside the watched directory, the
+        # exported files must not be converted again.
+        self.excludedDirectory = excludedDirectory
+        self.debounceSeconds = debounceSeconds
+        # relativePath -> signature of the last converted version.
+        self.processedSignatures = processedSignatures
+        # relativePath -> (signature, time when the signature was first seen)
+        self._pending = {}
+        self._inFlight = set()
+
+    def _Scan(self) -> dict:
+        signatures = {}
+        for directory, subdirectories, filenames in os.walk(self.watchDirectory):
+            subdirectories[:] = [subdirectory for subdirectory in subdirectories
+                                 if os.path.join(directory, subdirectory) != self.excludedDirectory]
+            for filename in filenames:
+                if not filename.lower().endswith(".fbx"):
+                    continue
+                filePath = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(filePath)
+                except FileNotFoundError:
+                    continue
+                relativePath = os.path.relpath(filePath, self.watchDirectory).replace(os.sep, "/")
+                signatures[relativePath] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def Poll(self) -> list[str, tuple]:
+        """
+        Returns a list of tuples (relativePath, signature) of the files ready to be converted.
+        """
+        now = time.monotonic()
+        readyList = []
+        for relativePath, signature in self._Scan().items():
+            if (relativePath in self._inFlight) or (self.processedSignatures.get(relativePath) == tuple(signature)):
+                continue
+            pendingSignature, firstSeen = self._pending.get(relativePath, (None, now))
+            if pendingSignature != signature:
+                self._pending[relativePath] = (signature, now)
+                continue
+            if now - firstSeen >= self.debounceSeconds:
+                del self._pending[relativePath]
+                self._inFlight.add(relativePath)
+                readyList.append((relativePath, signature))
+        return readyList
+
+    def MarkProcessed(self, relativePath: str, signature: tuple):
+        self._inFlight.discard(relativePath)
+        self.processedSignatures[relativePath] = tuple(signature)
+
+
+class WatchDaemon:
+    def __init__(self, watchDirectory: str, outputDirectory: str, blenderPath: str, workerCount: int,
+                 options: dict, pollSeconds: float = DEFAULT_POLL_SECONDS,
+                 debounceSeconds: float = DEFAULT_DEBOUNCE_SECONDS):
+        self.watchDirectory = watchDirectory
+        self.outputDirectory = outputDirectory
+        self.options = options
+        self.pollSeconds = pollSeconds
+        os.makedirs(outputDirectory, exist_ok=True)
+        self._statePath = os.path.join(outputDirectory, STATE_FILENAME)
+        self._statusLogPath = os.path.join(outputDirectory, STATUS_LOG_FILENAME)
+        self.watcher = FolderWatcher(watchDirectory, debounceSeconds, self._LoadState(), outputDirectory)
+        self.workers = [WorkerProcess(f"worker{idx}", blenderPath) for idx in range(workerCount)]
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._nextJobId = 0
+        self._threads = []
+
+    def _LoadState(self) -> dict:
+        if not os.path.exists(self._statePath):
+            return {}
+        with open(self._statePath) as stateFile:
+            return {relativePath: tuple(signature) for relativePath, signature in json.load(stateFile).items()}
+
+    def _SaveState(self):
+        temporaryPath = self._statePath + ".tmp"
+        with open(temporaryPath, 'w') as stateFile:
+            json.dump(self.watcher.processedSignatures, stateFile, indent=4)
+        os.replace(temporaryPath, self._statePath)
+
+    def _Log(self, job: ConversionJob, status: str, **fields):
+        entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "file": job.relativePath, "status": status}
+        entry.update(fields)
+        with open(self._statusLogPath, 'a') as logFile:
+            logFile.write(json.dumps(entry) + "\n")
+        _logger.info("[%s] %s: '%s' %s", entry['time'], status, job.relativePath, fields.get('message', ''))
+
+    def _WorkerLoop(self, worker: WorkerProcess):
+        worker.Start()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            self._results.put((job, "started", {"worker": worker.name}))
+            reply = worker.Run({"id": job.jobId, "input": job.inputFilePath,
+                                "outputDir": job.outputDirectory, "options": self.options})
+            self._results.put((job, "done" if reply["ok"] else "failed",
+                               {"worker": worker.name, "seconds": round(reply["seconds"], 3), "message": reply["message"]}))
+        worker.Stop()
+
+    def _DrainResults(self):
+        changed = False
+        while True:
+            try:
+                job, status, fields = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._Log(job, status, **fields)
+            if status in ("done", "failed"):
+                # Failed files are retried only when they change.
+                self.watcher.MarkProcessed(job.relativePath, job.signature)
+                changed = True
+        if changed:
+            self._SaveState()
+
+    def Run(self):
+        """Runs until interrupted with Ctrl+C."""
+        for worker in self.workers:
+            thread = threading.Thread(target=self._WorkerLoop, args=(worker,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        _logger.info("Watching '%s' with %d workers", self.watchDirectory, len(self.workers))
+        try:
+            while True:
+                for relativePath, signature in self.watcher.Poll():
+                    self._nextJobId += 1
+                    outputDirectory = os.path.join(self.outputDirectory, os.path.dirname(relativePath))
+                    job = ConversionJob(self._nextJobId, relativePath,
+                        os.path.join(self.watchDirectory, relativePath), outputDirectory, signature)
+                    self._Log(job, "queued")
+                    self._jobs.put(job)
+                self._DrainResults()
+                time.sleep(self.pollSeconds)
+        except KeyboardInterrupt:
+            _logger.info("Stopping workers...")
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=60)
+        self._DrainResults()
+
+
+def ParseArguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="watchmixalot.py",
+        description="Converts the FBX files dropped in a directory with background Blender workers.")
+    parser.add_argument("--worker", action="store_true", help="Internal. Runs the worker loop inside Blender")
+    parser.add_argument("--watch", help="Directory to watch")
+    parser.add_argument("--output", help="Output directory")
+    parser.add_argument("--blender", default="blender", help="Path to the Blender executable")
+    parser.add_argument("--workers", type=int, default=2, help="Number of background Blender processes")
+    parser.add_argument("--poll-seconds", type=float, default=DEFAULT_POLL_SECONDS)
+    parser.add_argument("--debounce-seconds", type=float, default=DEFAULT_DEBOUNCE_SECONDS,
+                        help="A file must stay unchanged this long before it is converted")
+    parser.add_argument("--axes", default="XYZ", help="Translation axes to extract, example: XY")
+    parser.add_argument("--rotation-z", action="store_true", help="Also extract the rotation around Z axis")
+    parser.add_argument("--unpack-textures", action="store_true", help="Unpack the textures next to the exported files")
+    parser.add_argument("--format", default="FBX", choices=("FBX", "GLB", "BOTH"),
+                        help="Output file format. BOTH reports the export time and size of each format")
+    parser.add_argument("--export-profile", default="DEFAULT", choices=("DEFAULT", "AUTO", "ACTOR", "MOTION"),
+                        help="Exporter settings. MOTION skips meshes, leaf bones and non deform bones")
+    parser.add_argument("--interpolation", default="KEEP", choices=("KEEP", "LINEAR", "CONSTANT"),
+                        help="Interpolation of all the key frames. LINEAR or CONSTANT make extraction and export faster")
+    parser.add_argument("--variants", default="",
+                        help="Optional. Clip variants exported next to each file, example: \"mirror, speed:1.5, turn:45\"")
+    args = parser.parse_args(argv)
+    if (not args.worker) and ((args.watch is None) or (args.output is None)):
+        parser.error("--watch and --output are required")
+    return args
+
+
+def main(argv: list[str]) -> int:
+    # Inside Blender, the arguments of the script come after "--".
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = argv[1:]
+    args = ParseArguments(argv)
+    if args.worker:
+        RunWorker()
+        return 0
+    axes = args.axes.upper()
+    options = {
+        "extractTranslationX": "X" in axes,
+        "extractTranslationY": "Y" in axes,
+        "extractTranslationZ": "Z" in axes,
+        "extractRotationZ": args.rotation_z,
+        "unpackTextures": args.unpack_textures,
+        "keyFrameInterpolation": args.interpolation,
+        "exportFormat": args.format,
+        "exportProfile": args.export_profile,
+        "clipVariants": args.variants,
+    }
+    daemon = WatchDaemon(os.path.abspath(args.watch), os.path.abspath(args.output), args.blender,
+                         max(1, args.workers), options, args.poll_seconds, args.debounce_seconds)
+    daemon.Run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))